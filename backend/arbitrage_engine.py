@@ -11,6 +11,9 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from utils.line_history import LineHistoryIndex
+from utils.tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -153,7 +156,8 @@ class ArbitrageCalculator:
 
         try:
             # Group odds by event and market
-            grouped_odds = self._group_odds_data(odds_data)
+            with span("arbitrage.group_odds"):
+                grouped_odds = self._group_odds_data(odds_data)
 
             for event_market, odds_list in grouped_odds.items():
                 if len(odds_list) < 2:
@@ -162,11 +166,13 @@ class ArbitrageCalculator:
                 # Check for different types of arbitrage
                 for arb_type in ArbitrageType:
                     if arb_type in self.calculation_methods:
-                        arb_ops = await self.calculation_methods[arb_type](odds_list)
+                        with span(f"arbitrage.{arb_type.value}"):
+                            arb_ops = await self.calculation_methods[arb_type](odds_list)
                         opportunities.extend(arb_ops)
 
             # Sort by profit percentage
-            opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
+            with span("arbitrage.rank"):
+                opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
 
             return opportunities
 
@@ -523,6 +529,17 @@ class MarketInefficiencyDetector:
         self.statistical_models = self._initialize_statistical_models()
         self.behavioral_patterns = self._initialize_behavioral_patterns()
         self.fair_value_models = self._initialize_fair_value_models()
+        self.line_windows = self._initialize_line_windows()
+        # Quote history per (event, market, sportsbook, outcome)
+        self.line_history = LineHistoryIndex()
+
+    def _initialize_line_windows(self) -> Dict[str, Any]:
+        """Windows and thresholds for line-movement detectors"""
+        return {
+            "steam_move": {"points": 10, "min_points": 3, "min_movement": 0.05},
+            "information_lag": {"min_lag_seconds": 300, "min_impact": 0.3},
+            "history_retention_hours": 48,
+        }
 
     def _initialize_statistical_models(self) -> Dict[str, Any]:
         """Initialize statistical models for inefficiency detection"""
@@ -569,33 +586,30 @@ class MarketInefficiencyDetector:
         inefficiencies = []
 
         try:
-            for market in market_data:
+            markets = [m for m in market_data if m.get("event_id")]
+            rows = self._index_board(markets, historical_data)
+
+            for market in markets:
                 # 1. Pricing Error Detection
                 pricing_inefficiencies = await self._detect_pricing_errors(
                     market, historical_data
                 )
                 inefficiencies.extend(pricing_inefficiencies)
 
-                # 2. Information Lag Detection
-                info_lag_inefficiencies = await self._detect_information_lag(market)
-                inefficiencies.extend(info_lag_inefficiencies)
-
-                # 3. Behavioral Bias Detection
+                # 2. Behavioral Bias Detection
                 behavioral_inefficiencies = await self._detect_behavioral_biases(market)
                 inefficiencies.extend(behavioral_inefficiencies)
 
-                # 4. Steam Move Detection
-                steam_inefficiencies = await self._detect_steam_moves(
-                    market, historical_data
-                )
-                inefficiencies.extend(steam_inefficiencies)
-
-                # 5. Reverse Line Movement Detection
+                # 3. Reverse Line Movement Detection
                 reverse_line_inefficiencies = await self._detect_reverse_line_movement(
                     market
                 )
                 inefficiencies.extend(reverse_line_inefficiencies)
 
+            # Line-movement detectors score the whole board at once
+            inefficiencies.extend(self._detect_information_lag(markets))
+            inefficiencies.extend(self._detect_steam_moves(markets, rows))
+
             # Sort by expected value
             inefficiencies.sort(key=lambda x: x.expected_value, reverse=True)
 
@@ -605,6 +619,51 @@ class MarketInefficiencyDetector:
             logger.error("Market inefficiency detection failed: {e!s}")
             return []
 
+    @staticmethod
+    def _market_key(market: Dict[str, Any]) -> Tuple[str, str, str, str]:
+        return (
+            market["event_id"],
+            market.get("market_type", ""),
+            market.get("sportsbook", ""),
+            market.get("outcome", ""),
+        )
+
+    def _index_board(
+        self,
+        markets: List[Dict[str, Any]],
+        historical_data: Optional[List[Dict[str, Any]]],
+    ) -> np.ndarray:
+        """Append history and the current quotes to the index; rows per market"""
+        now = datetime.now(timezone.utc)
+        # History entries name their market; anything else only feeds fair value
+        for entry in sorted(
+            (h for h in historical_data or () if h.get("event_id") and h.get("odds")),
+            key=lambda h: self._quote_time(h, now),
+        ):
+            self.line_history.append(
+                self._market_key(entry), entry["odds"], self._quote_time(entry, now)
+            )
+
+        quoted = [m for m in markets if m.get("odds")]
+        self.line_history.append_board(
+            [self._market_key(m) for m in quoted],
+            [m["odds"] for m in quoted],
+            [self._quote_time(m, now) for m in quoted],
+        )
+        self.line_history.prune(
+            now - timedelta(hours=self.line_windows["history_retention_hours"])
+        )
+        return np.fromiter(
+            (self.line_history.row(self._market_key(m)) for m in markets),
+            dtype=np.int64,
+            count=len(markets),
+        )
+
+    @staticmethod
+    def _quote_time(quote: Dict[str, Any], default: datetime) -> float:
+        timestamp = quote.get("timestamp") or quote.get("last_odds_update") or default
+        return timestamp.timestamp() if isinstance(timestamp, datetime) else float(timestamp)
+
     async def _detect_pricing_errors(
         self, market: Dict[str, Any], historical_data: Optional[List[Dict[str, Any]]]
     ) -> List[MarketInefficiency]:
@@ -741,63 +800,68 @@ class MarketInefficiencyDetector:
             logger.error("Fair value calculation failed: {e!s}")
             return {}
 
-    async def _detect_information_lag(
-        self, market: Dict[str, Any]
+    def _detect_information_lag(
+        self, markets: List[Dict[str, Any]]
     ) -> List[MarketInefficiency]:
-        """Detect slow information incorporation"""
+        """Detect slow information incorporation across a board"""
         inefficiencies = []
 
         try:
-            # Check for recent news/information that hasn't been priced in
-            last_info_update = market.get("last_info_update")
-            last_odds_update = market.get("last_odds_update")
-
-            if last_info_update and last_odds_update:
-                info_lag = (last_odds_update - last_info_update).total_seconds()
-
-                if info_lag > 300:  # More than 5 minutes lag
-                    # Check if the information is material
-                    info_impact = market.get("info_impact_score", 0)
+            if not markets:
+                return inefficiencies
 
-                    if info_impact > 0.3:  # Material information
-                        inefficiency = MarketInefficiency(
-                            id=f"info_lag_{market['event_id']}_{int(datetime.now().timestamp())}",
-                            inefficiency_type=MarketInefficiencyType.INFORMATION_LAG,
-                            event_id=market["event_id"],
-                            market_type=market["market_type"],
-                            sportsbook=market["sportsbook"],
-                            market_price=market.get("odds", 0),
-                            fair_value=market.get(
-                                "pre_info_odds", market.get("odds", 0)
-                            ),
-                            mispricing_magnitude=info_impact * 100,
-                            value_bet_edge=info_impact * 100,
-                            z_score=info_impact * 3,  # Simplified z-score
-                            confidence_interval=(0.0, info_impact),
-                            statistical_significance=min(info_impact * 2, 0.95),
-                            sample_size=50,  # Estimated
-                            market_volume=market.get("volume"),
-                            liquidity_score=market.get("liquidity_score", 0.5),
-                            public_betting_percentage=market.get("public_percentage"),
-                            sharp_money_percentage=market.get("sharp_percentage"),
-                            line_movement_direction="pending",
-                            expected_value=info_impact,
-                            kelly_fraction=min(info_impact, 0.1),
-                            recommended_stake=0.0,
-                            max_stake=market.get("max_stake", 1000),
-                            model_uncertainty=0.2,
-                            information_risk=0.3,  # Higher due to information lag
-                            execution_risk=0.1,
-                            detection_time=datetime.now(timezone.utc),
-                            window_expiry=datetime.now(timezone.utc) + timedelta(minutes=30),
-                            urgency_score=0.8,  # High urgency
-                            metadata={
-                                "info_lag_seconds": info_lag,
-                                "info_type": market.get("info_type"),
-                                "detection_method": "information_lag",
-                            },
-                        )
-                        inefficiencies.append(inefficiency)
+            # Check for recent news/information that hasn't been priced in
+            settings = self.line_windows["information_lag"]
+            lag = np.array(
+                [
+                    (m["last_odds_update"] - m["last_info_update"]).total_seconds()
+                    if m.get("last_info_update") and m.get("last_odds_update")
+                    else 0.0
+                    for m in markets
+                ]
+            )
+            impact = np.array([m.get("info_impact_score", 0) for m in markets], dtype=float)
+            hits = (lag > settings["min_lag_seconds"]) & (impact > settings["min_impact"])
+
+            for i in np.flatnonzero(hits):
+                market, info_impact = markets[i], float(impact[i])
+                inefficiencies.append(
+                    MarketInefficiency(
+                        id=f"info_lag_{market['event_id']}_{int(datetime.now().timestamp())}",
+                        inefficiency_type=MarketInefficiencyType.INFORMATION_LAG,
+                        event_id=market["event_id"],
+                        market_type=market["market_type"],
+                        sportsbook=market["sportsbook"],
+                        market_price=market.get("odds", 0),
+                        fair_value=market.get("pre_info_odds", market.get("odds", 0)),
+                        mispricing_magnitude=info_impact * 100,
+                        value_bet_edge=info_impact * 100,
+                        z_score=info_impact * 3,  # Simplified z-score
+                        confidence_interval=(0.0, info_impact),
+                        statistical_significance=min(info_impact * 2, 0.95),
+                        sample_size=50,  # Estimated
+                        market_volume=market.get("volume"),
+                        liquidity_score=market.get("liquidity_score", 0.5),
+                        public_betting_percentage=market.get("public_percentage"),
+                        sharp_money_percentage=market.get("sharp_percentage"),
+                        line_movement_direction="pending",
+                        expected_value=info_impact,
+                        kelly_fraction=min(info_impact, 0.1),
+                        recommended_stake=0.0,
+                        max_stake=market.get("max_stake", 1000),
+                        model_uncertainty=0.2,
+                        information_risk=0.3,  # Higher due to information lag
+                        execution_risk=0.1,
+                        detection_time=datetime.now(timezone.utc),
+                        window_expiry=datetime.now(timezone.utc) + timedelta(minutes=30),
+                        urgency_score=0.8,  # High urgency
+                        metadata={
+                            "info_lag_seconds": float(lag[i]),
+                            "info_type": market.get("info_type"),
+                            "detection_method": "information_lag",
+                        },
+                    )
+                )
 
             return inefficiencies
 
@@ -924,64 +988,67 @@ class MarketInefficiencyDetector:
             logger.error("Bias inefficiency creation failed: {e!s}")
             return None
 
-    async def _detect_steam_moves(
-        self, market: Dict[str, Any], historical_data: Optional[List[Dict[str, Any]]]
+    def _detect_steam_moves(
+        self, markets: List[Dict[str, Any]], rows: np.ndarray
     ) -> List[MarketInefficiency]:
-        """Detect steam moves (sharp money movement)"""
+        """Detect steam moves (sharp money movement) across a board"""
         inefficiencies = []
 
         try:
-            if not historical_data:
+            if not markets:
                 return inefficiencies
 
             # Look for rapid line movement with reverse public action
-            recent_odds = [
-                h.get("odds") for h in historical_data[-10:] if h.get("odds")
-            ]
-
-            if len(recent_odds) < 3:
-                return inefficiencies
-
-            # Calculate line movement
-            line_movement = (recent_odds[-1] - recent_odds[0]) / recent_odds[0]
-
-            if abs(line_movement) > 0.05:  # At least 5% movement
-                # Check if movement is against public money
-                public_percentage = market.get("public_percentage", 50)
+            settings = self.line_windows["steam_move"]
+            window = self.line_history.window(rows, points=settings["points"])
+            line_movement = window.movement
+            public = np.array(
+                [m.get("public_percentage", 50) for m in markets], dtype=float
+            )
 
-                # Steam move: line moves toward underdog while public backs favorite
-                if (
-                    line_movement < 0 and public_percentage > 60
-                ) or (  # Line shortening, public on this side
-                    line_movement > 0 and public_percentage < 40
-                ):  # Line lengthening, public on other side
-                    steam_strength = abs(line_movement) * (
-                        abs(public_percentage - 50) / 50
-                    )
+            # Steam move: line moves toward underdog while public backs favorite
+            hits = (
+                (window.count >= settings["min_points"])
+                & (np.abs(line_movement) > settings["min_movement"])
+                & (
+                    # Line shortening, public on this side
+                    ((line_movement < 0) & (public > 60))
+                    # Line lengthening, public on other side
+                    | ((line_movement > 0) & (public < 40))
+                )
+            )
+            steam_strength = np.abs(line_movement) * (np.abs(public - 50) / 50)
 
-                    inefficiency = MarketInefficiency(
+            for i in np.flatnonzero(hits):
+                market, movement, strength = (
+                    markets[i],
+                    float(line_movement[i]),
+                    float(steam_strength[i]),
+                )
+                inefficiencies.append(
+                    MarketInefficiency(
                         id=f"steam_move_{market['event_id']}_{int(datetime.now().timestamp())}",
                         inefficiency_type=MarketInefficiencyType.STEAM_MOVE,
                         event_id=market["event_id"],
                         market_type=market["market_type"],
                         sportsbook=market["sportsbook"],
                         market_price=market.get("odds", 0),
-                        fair_value=recent_odds[0],  # Original odds before steam
-                        mispricing_magnitude=abs(line_movement) * 100,
-                        value_bet_edge=steam_strength * 100,
-                        z_score=steam_strength * 4,
-                        confidence_interval=(0.0, steam_strength * 2),
-                        statistical_significance=min(steam_strength * 2, 0.9),
-                        sample_size=len(recent_odds),
+                        fair_value=float(window.first[i]),  # Original odds before steam
+                        mispricing_magnitude=abs(movement) * 100,
+                        value_bet_edge=strength * 100,
+                        z_score=strength * 4,
+                        confidence_interval=(0.0, strength * 2),
+                        statistical_significance=min(strength * 2, 0.9),
+                        sample_size=int(window.count[i]),
                         market_volume=market.get("volume"),
                         liquidity_score=market.get("liquidity_score", 0.5),
-                        public_betting_percentage=public_percentage,
+                        public_betting_percentage=float(public[i]),
                         sharp_money_percentage=market.get("sharp_percentage"),
                         line_movement_direction=(
-                            "against_public" if line_movement < 0 else "with_public"
+                            "against_public" if movement < 0 else "with_public"
                         ),
-                        expected_value=steam_strength,
-                        kelly_fraction=min(steam_strength, 0.08),
+                        expected_value=strength,
+                        kelly_fraction=min(strength, 0.08),
                         recommended_stake=0.0,
                         max_stake=market.get("max_stake", 1000),
                         model_uncertainty=0.2,
@@ -991,13 +1058,17 @@ class MarketInefficiencyDetector:
                         window_expiry=datetime.now(timezone.utc) + timedelta(hours=1),
                         urgency_score=0.9,  # High urgency for steam moves
                         metadata={
-                            "line_movement_percentage": line_movement * 100,
-                            "steam_strength": steam_strength,
-                            "recent_odds_history": recent_odds,
+                            "line_movement_percentage": movement * 100,
+                            "line_velocity_per_minute": float(window.velocity[i]) * 60,
+                            "window_range": (float(window.low[i]), float(window.high[i])),
+                            "steam_strength": strength,
+                            "recent_odds_history": self.line_history.recent(
+                                self._market_key(market), settings["points"]
+                            ),
                             "detection_method": "steam_move",
                         },
                     )
-                    inefficiencies.append(inefficiency)
+                )
 
             return inefficiencies
 
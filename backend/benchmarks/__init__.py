@@ -0,0 +1,34 @@
+"""In-process benchmarks for backend hot paths
+
+Run from the backend directory::
+
+    python -m benchmarks --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks --compare                # flag regressions against it
+"""
+
+from benchmarks.harness import (
+    BenchmarkCase,
+    BenchmarkReport,
+    BenchmarkResult,
+    Comparison,
+    compare_reports,
+    load_baseline,
+    run_case,
+    run_suite,
+    save_baseline,
+)
+from benchmarks.suite import SCALES, build_suite
+
+__all__ = [
+    "BenchmarkCase",
+    "BenchmarkReport",
+    "BenchmarkResult",
+    "Comparison",
+    "SCALES",
+    "build_suite",
+    "compare_reports",
+    "load_baseline",
+    "run_case",
+    "run_suite",
+    "save_baseline",
+]
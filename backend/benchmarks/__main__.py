@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Command line entry point for the in-process benchmark suite
+
+    python -m benchmarks                         # run and print results
+    python -m benchmarks --save-baseline         # store results as the baseline
+    python -m benchmarks --compare --threshold 0.2
+                                                 # exit 1 if any case is >20% slower
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Some engines import through the ``backend.`` package, others top-level
+for path in (BACKEND_DIR, BACKEND_DIR.parent):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from benchmarks.harness import (  # noqa: E402
+    compare_reports,
+    format_comparison,
+    format_results,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+from benchmarks.suite import SCALES, build_suite  # noqa: E402
+
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "baseline.json"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="In-process backend benchmarks")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="default")
+    parser.add_argument(
+        "--only", action="append", help="Run only cases whose name contains this"
+    )
+    parser.add_argument("--repeat", type=int, help="Override repetitions per case")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=Path(os.environ.get("BENCHMARK_BASELINE", DEFAULT_BASELINE)),
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown before a case counts as a regression (0.25 = 25%%)",
+    )
+    parser.add_argument("--output", type=Path, help="Also write this run's JSON here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # Engines log every call at INFO, which would dominate the timings
+    logging.disable(logging.INFO)
+
+    print(f"🚀 Running backend benchmarks (scale={args.scale})")
+    report = run_suite(
+        build_suite(args.scale),
+        only=args.only,
+        repeat=args.repeat,
+        progress=lambda r: print(
+            f"  ✗ {r.name}" if r.failed else f"  - {r.name}" if r.skipped else f"  ✓ {r.name}"
+        ),
+    )
+    report.metadata["scale"] = args.scale
+    print()
+    print(format_results(report))
+
+    if args.output:
+        save_baseline(report, args.output)
+
+    exit_code = 0
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\n❌ No baseline at {args.baseline}; run with --save-baseline first")
+            return 2
+        baseline = load_baseline(args.baseline)
+        if baseline.metadata.get("scale") != args.scale:
+            print(
+                f"\n⚠️  Baseline was recorded at scale "
+                f"{baseline.metadata.get('scale')!r}, comparing anyway"
+            )
+        comparisons = compare_reports(report, baseline, args.threshold)
+        print()
+        print(format_comparison(comparisons, args.threshold))
+        regressions = [c.name for c in comparisons if c.regressed]
+        if regressions:
+            print(
+                f"\n❌ {len(regressions)} regression(s) or failure(s): {', '.join(regressions)}"
+            )
+            exit_code = 1
+        else:
+            print("\n✅ No regressions")
+
+    if args.save_baseline:
+        save_baseline(report, args.baseline)
+        print(f"\n📁 Baseline saved to {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
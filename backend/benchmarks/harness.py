@@ -0,0 +1,283 @@
+"""In-process benchmark runner, JSON baselines and regression comparison
+
+A benchmark case is a setup callable that builds fresh state and a target that
+is timed against that state. Targets may be plain functions or coroutines, so
+async hot paths are measured on a real event loop without a running server.
+
+A case whose imports fail (missing optional dependency) is skipped; any other
+exception marks it failed, which the comparison treats as a regression.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BASELINE_FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchmarkCase:
+    """A single timed operation
+
+    ``setup`` runs before every repetition and its return value is passed to
+    ``target``; only ``target`` is timed. ``items`` is the number of logical
+    operations one call performs and is used to report throughput.
+    """
+
+    name: str
+    target: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+    items: int = 1
+    repeat: int = 5
+    warmup: int = 1
+    description: str = ""
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics for one case, in seconds"""
+
+    name: str
+    repeat: int
+    items: int
+    median: float
+    mean: float
+    minimum: float
+    maximum: float
+    p95: float
+    stdev: float
+    items_per_sec: float
+    skipped: Optional[str] = None
+    failed: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkResult":
+        return cls(**{k: data.get(k) for k in cls.__dataclass_fields__})
+
+    @classmethod
+    def from_samples(
+        cls, name: str, samples: List[float], items: int
+    ) -> "BenchmarkResult":
+        ordered = sorted(samples)
+        median = statistics.median(ordered)
+        p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+        return cls(
+            name=name,
+            repeat=len(ordered),
+            items=items,
+            median=median,
+            mean=statistics.fmean(ordered),
+            minimum=ordered[0],
+            maximum=ordered[-1],
+            p95=p95,
+            stdev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            items_per_sec=items / median if median > 0 else float("inf"),
+        )
+
+    @classmethod
+    def skipped_result(cls, name: str, reason: str) -> "BenchmarkResult":
+        return cls(name, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, skipped=reason)
+
+    @classmethod
+    def failed_result(cls, name: str, reason: str) -> "BenchmarkResult":
+        return cls(name, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, failed=reason)
+
+
+@dataclass
+class Comparison:
+    """Current result measured against its baseline"""
+
+    name: str
+    baseline_median: Optional[float]
+    current_median: Optional[float]
+    ratio: Optional[float]
+    status: str  # "ok", "regressed", "improved", "new", "missing", "skipped", "failed"
+
+    @property
+    def regressed(self) -> bool:
+        return self.status in ("regressed", "failed")
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of a suite run plus run metadata"""
+
+    results: Dict[str, BenchmarkResult]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format_version": BASELINE_FORMAT_VERSION,
+            "metadata": self.metadata,
+            "results": {name: r.to_dict() for name, r in self.results.items()},
+        }
+
+
+def environment_metadata() -> Dict[str, Any]:
+    """Describe the machine so baselines from different hosts are not mixed up"""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+async def _call(target: Callable[[Any], Any], state: Any) -> Any:
+    result = target(state)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _run_case_async(case: BenchmarkCase) -> BenchmarkResult:
+    samples = []
+    for iteration in range(case.warmup + case.repeat):
+        state = case.setup() if case.setup else None
+        if inspect.isawaitable(state):
+            state = await state
+        start = time.perf_counter()
+        await _call(case.target, state)
+        elapsed = time.perf_counter() - start
+        if iteration >= case.warmup:
+            samples.append(elapsed)
+    return BenchmarkResult.from_samples(case.name, samples, case.items)
+
+
+def run_case(case: BenchmarkCase) -> BenchmarkResult:
+    """Time one case on a fresh event loop
+
+    Missing dependencies (``ImportError``) skip the case; any other exception
+    fails it.
+    """
+    try:
+        return asyncio.run(_run_case_async(case))
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        reason = str(e).splitlines()[0] if str(e) else ""
+        reason = f"{type(e).__name__}: {reason}"
+        if isinstance(e, ImportError):
+            logger.info(f"Benchmark {case.name} skipped: {reason}")
+            return BenchmarkResult.skipped_result(case.name, reason)
+        logger.warning(f"Benchmark {case.name} failed: {reason}")
+        return BenchmarkResult.failed_result(case.name, reason)
+
+
+def run_suite(
+    cases: List[BenchmarkCase],
+    only: Optional[List[str]] = None,
+    repeat: Optional[int] = None,
+    progress: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> BenchmarkReport:
+    """Run every case whose name contains one of ``only`` (all when empty)"""
+    results = {}
+    for case in cases:
+        if only and not any(pattern in case.name for pattern in only):
+            continue
+        if repeat is not None:
+            case.repeat = repeat
+        result = run_case(case)
+        results[case.name] = result
+        if progress:
+            progress(result)
+    return BenchmarkReport(results=results, metadata=environment_metadata())
+
+
+def save_baseline(report: BenchmarkReport, path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report.to_dict(), indent=2, sort_keys=True))
+
+
+def load_baseline(path: Path) -> BenchmarkReport:
+    data = json.loads(Path(path).read_text())
+    if data.get("format_version") != BASELINE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported baseline format {data.get('format_version')!r} in {path}"
+        )
+    return BenchmarkReport(
+        results={
+            name: BenchmarkResult.from_dict(result)
+            for name, result in data.get("results", {}).items()
+        },
+        metadata=data.get("metadata", {}),
+    )
+
+
+def compare_reports(
+    current: BenchmarkReport, baseline: BenchmarkReport, threshold: float = 0.25
+) -> List[Comparison]:
+    """Compare medians; a case regresses when it is more than ``threshold`` slower"""
+    comparisons = []
+    for name in sorted(set(current.results) | set(baseline.results)):
+        now = current.results.get(name)
+        before = baseline.results.get(name)
+        if now is None:
+            comparisons.append(Comparison(name, before.median, None, None, "missing"))
+            continue
+        if now.failed:
+            baseline_median = before.median if before is not None else None
+            comparisons.append(Comparison(name, baseline_median, None, None, "failed"))
+            continue
+        if now.skipped:
+            comparisons.append(Comparison(name, None, None, None, "skipped"))
+            continue
+        if before is None or before.skipped or before.failed or not before.median:
+            comparisons.append(Comparison(name, None, now.median, None, "new"))
+            continue
+
+        ratio = now.median / before.median
+        if ratio > 1 + threshold:
+            status = "regressed"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, before.median, now.median, ratio, status))
+    return comparisons
+
+
+def format_results(report: BenchmarkReport) -> str:
+    lines = [f"{'benchmark':<40} {'median':>12} {'p95':>12} {'items/s':>14}"]
+    for name, r in report.results.items():
+        if r.failed:
+            lines.append(f"{name:<40} FAILED ({r.failed})")
+            continue
+        if r.skipped:
+            lines.append(f"{name:<40} skipped ({r.skipped})")
+            continue
+        lines.append(
+            f"{name:<40} {r.median * 1000:>10.3f}ms {r.p95 * 1000:>10.3f}ms "
+            f"{r.items_per_sec:>14,.0f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(comparisons: List[Comparison], threshold: float) -> str:
+    lines = [
+        f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}  status "
+        f"(threshold +{threshold:.0%})"
+    ]
+    for c in comparisons:
+        baseline = f"{c.baseline_median * 1000:.3f}ms" if c.baseline_median else "-"
+        current = f"{c.current_median * 1000:.3f}ms" if c.current_median else "-"
+        ratio = f"{c.ratio:.2f}x" if c.ratio else "-"
+        marker = "  <-- REGRESSION" if c.status == "regressed" else ""
+        marker = "  <-- FAILED" if c.status == "failed" else marker
+        lines.append(
+            f"{c.name:<40} {baseline:>12} {current:>12} {ratio:>8}  {c.status}{marker}"
+        )
+    return "\n".join(lines)
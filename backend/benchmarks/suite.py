@@ -0,0 +1,466 @@
+"""Benchmark cases for backend hot paths
+
+Engines are imported inside each setup so a module whose optional
+dependencies are missing only skips its own cases.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks import synthetic
+from benchmarks.harness import BenchmarkCase
+
+# Workload sizes per scale; "smoke" keeps the whole suite to a few seconds
+SCALES: Dict[str, Dict[str, int]] = {
+    "smoke": {
+        "events": 40,
+        "cache_keys": 500,
+        "cache_ops": 2000,
+        "messages": 300,
+        "opportunities": 12,
+        "periods": 300,
+        "feature_rows": 200,
+        "players": 5,
+        "schedules": 5000,
+        "metric_samples": 20000,
+        "ensemble_models": 12,
+        "oof_samples": 500,
+    },
+    "default": {
+        "events": 300,
+        "cache_keys": 5000,
+        "cache_ops": 20000,
+        "messages": 3000,
+        "opportunities": 40,
+        "periods": 1500,
+        "feature_rows": 2000,
+        "players": 25,
+        "schedules": 100000,
+        "metric_samples": 200000,
+        "ensemble_models": 60,
+        "oof_samples": 5000,
+    },
+}
+
+
+def _arbitrage_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    def setup():
+        from arbitrage_engine import ArbitrageCalculator
+
+        feed = synthetic.odds_feed(
+            size["events"], seed=1, reference=datetime.now(timezone.utc)
+        )
+        return ArbitrageCalculator(), feed
+
+    async def detect(state):
+        calculator, feed = state
+        return await calculator.detect_arbitrage_opportunities(feed)
+
+    def inefficiency_setup():
+        from arbitrage_engine import MarketInefficiencyDetector
+
+        detector = MarketInefficiencyDetector()
+        snapshots = synthetic.line_snapshots(
+            size["events"], 12, seed=1, reference=datetime.now(timezone.utc)
+        )
+        for board in snapshots[:-1]:
+            detector._index_board(board, None)
+        return detector, snapshots[-1]
+
+    async def detect_inefficiencies(state):
+        detector, board = state
+        return await detector.detect_market_inefficiencies(board)
+
+    return [
+        BenchmarkCase(
+            "arbitrage.detect_opportunities",
+            detect,
+            setup,
+            items=size["events"],
+            description="ArbitrageCalculator over a multi-book over/under feed",
+        ),
+        BenchmarkCase(
+            "arbitrage.inefficiency_board",
+            detect_inefficiencies,
+            inefficiency_setup,
+            items=size["events"],
+            description="MarketInefficiencyDetector over a board with indexed line history",
+        ),
+    ]
+
+
+def _cache_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    workload = synthetic.cache_workload(size["cache_keys"], size["cache_ops"], seed=2)
+    ops = len(workload["keys"]) + len(workload["reads"])
+
+    def in_memory_setup():
+        from cache_optimizer import InMemoryCache
+
+        return InMemoryCache(max_size=size["cache_keys"] // 2)
+
+    def in_memory(cache):
+        for key, value in zip(workload["keys"], workload["values"]):
+            cache.set(key, value, ttl=300)
+        for key in workload["reads"]:
+            cache.get(key)
+
+    def multi_tier_setup():
+        from cache_optimizer import MultiTierCache
+
+        # L2 stays uninitialised: this measures the L1 path and miss fallthrough
+        return MultiTierCache()
+
+    async def multi_tier(cache):
+        from cache_optimizer import CacheLayer
+
+        for key, value in zip(workload["keys"], workload["values"]):
+            await cache.set(key, value, ttl=300, tier=CacheLayer.L1_MEMORY)
+        for key in workload["reads"]:
+            await cache.get(key)
+
+    return [
+        BenchmarkCase(
+            "cache.in_memory.set_get",
+            in_memory,
+            in_memory_setup,
+            items=ops,
+            description="InMemoryCache LRU with skewed reads and evictions",
+        ),
+        BenchmarkCase(
+            "cache.multi_tier.set_get",
+            multi_tier,
+            multi_tier_setup,
+            items=ops,
+            description="MultiTierCache L1 reads/writes without Redis",
+        ),
+    ]
+
+
+def _realtime_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    async def sink(message):
+        return None
+
+    async def setup():
+        from realtime_engine import (
+            RealTimeStreamManager,
+            StreamMessage,
+            StreamType,
+            UpdatePriority,
+        )
+
+        messages = [
+            StreamMessage(
+                **{
+                    **kwargs,
+                    "stream_type": StreamType(kwargs["stream_type"]),
+                    "priority": UpdatePriority(kwargs["priority"]),
+                }
+            )
+            for kwargs in synthetic.stream_messages(
+                size["messages"], seed=3, reference=datetime.now(timezone.utc)
+            )
+        ]
+        # Long debounce window: triggers are coalesced but no predictions run
+        manager = RealTimeStreamManager(trigger_debounce_window=3600)
+        await manager.subscribe("benchmark", list(StreamType), callback=sink)
+        return manager, messages
+
+    async def process(state):
+        manager, messages = state
+        for message in messages:
+            await manager._process_stream_message(message)
+
+    return [
+        BenchmarkCase(
+            "realtime.process_messages",
+            process,
+            setup,
+            items=size["messages"],
+            description="RealTimeStreamManager aggregation, triggers and fan-out",
+        )
+    ]
+
+
+def _risk_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    opportunities = synthetic.portfolio_opportunities(size["opportunities"], seed=4)
+    returns = synthetic.portfolio_returns(size["periods"], seed=5)
+
+    def portfolio_setup():
+        from risk_management import PortfolioOptimizer
+
+        return PortfolioOptimizer()
+
+    async def optimize(optimizer):
+        return await optimizer.optimize_portfolio(opportunities, bankroll=10000.0)
+
+    def assessment_setup():
+        from enhanced_risk_management import EnhancedRiskManagement
+
+        return EnhancedRiskManagement()
+
+    def assess(manager):
+        return manager.comprehensive_risk_assessment(
+            returns["portfolio"], returns["individual"]
+        )
+
+    def kelly_setup(warm: bool):
+        from risk_management import BankrollSimulator, KellyCriterionEngine
+
+        engine = KellyCriterionEngine()
+        engine.bankroll_simulator = BankrollSimulator()
+        if warm:
+            size_bets(engine)
+        return engine
+
+    def size_bets(engine):
+        return [
+            engine.calculate_kelly_fraction(o["win_probability"], o["odds"])
+            for o in opportunities
+        ]
+
+    return [
+        BenchmarkCase(
+            "risk.kelly_sizing_cold",
+            size_bets,
+            lambda: kelly_setup(False),
+            items=size["opportunities"],
+            repeat=3,
+            description="Kelly sizing with ruin simulations on an empty cache",
+        ),
+        BenchmarkCase(
+            "risk.kelly_sizing_warm",
+            size_bets,
+            lambda: kelly_setup(True),
+            items=size["opportunities"],
+            description="Kelly sizing answered from cached ruin simulations",
+        ),
+        BenchmarkCase(
+            "risk.portfolio_optimize",
+            optimize,
+            portfolio_setup,
+            items=size["opportunities"],
+            description="PortfolioOptimizer mean-variance allocation",
+        ),
+        BenchmarkCase(
+            "risk.comprehensive_assessment",
+            assess,
+            assessment_setup,
+            items=size["periods"],
+            repeat=3,
+            description="EnhancedRiskManagement VaR/CVaR, EVT and copula fits",
+        ),
+    ]
+
+
+def _feature_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    players = [f"player_{i}" for i in range(size["players"])]
+    raw = [synthetic.feature_inputs(seed=i) for i in range(len(players))]
+
+    def engine_setup():
+        from services.comprehensive_feature_engine import ComprehensiveFeatureEngine
+
+        return ComprehensiveFeatureEngine()
+
+    async def engineer(engine):
+        for player, data in zip(players, raw):
+            await engine.engineer_features(player, "nba", "points", data)
+
+    async def warm_setup():
+        engine = engine_setup()
+        await engineer(engine)
+        return engine
+
+    keys = [f"stat_{i}" for i in range(24)]
+    rows = synthetic.feature_rows(keys, size["feature_rows"], seed=6)
+
+    def plan_setup():
+        from utils.feature_plan import FeaturePlan
+
+        return FeaturePlan(keys)
+
+    def transform(plan):
+        return plan.transform(plan.vectorize_many(rows))
+
+    return [
+        BenchmarkCase(
+            "features.comprehensive.cold",
+            engineer,
+            engine_setup,
+            items=len(players),
+            description="ComprehensiveFeatureEngine with an empty category store",
+        ),
+        BenchmarkCase(
+            "features.comprehensive.warm",
+            engineer,
+            warm_setup,
+            items=len(players),
+            description="ComprehensiveFeatureEngine reusing unchanged categories",
+        ),
+        BenchmarkCase(
+            "features.plan.transform",
+            transform,
+            plan_setup,
+            items=len(rows),
+            description="FeaturePlan vectorize + quantum/interaction/fractal transforms",
+        ),
+    ]
+
+
+def _scheduler_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    expressions = synthetic.cron_expressions(size["schedules"], seed=6)
+    # Fixed start so every run sees the same fire times
+    start = datetime(2026, 1, 5, 8, 59, 30, tzinfo=timezone.utc).timestamp()
+
+    def build(_state=None):
+        from utils.cron import CronTimer, parse_cron
+
+        parse_cron.cache_clear()
+        timer = CronTimer()
+        for i, expression in enumerate(expressions):
+            timer.add(f"task_{i}", expression, now=start)
+        return timer
+
+    def advance(timer):
+        # One simulated hour with the loop waking only when something is due
+        now, end, fired = start, start + 3600, 0
+        while True:
+            wait = timer.seconds_until_next(now)
+            if wait is None or now + wait > end:
+                return fired
+            now += wait
+            fired += len(timer.pop_due(now))
+
+    return [
+        BenchmarkCase(
+            "scheduler.cron_timer.build",
+            build,
+            items=size["schedules"],
+            repeat=3,
+            description="Parse and register cron schedules in the fire-time heap",
+        ),
+        BenchmarkCase(
+            "scheduler.cron_timer.advance_hour",
+            advance,
+            build,
+            items=size["schedules"],
+            repeat=3,
+            description="Pop every due run over one hour of cron schedules",
+        ),
+    ]
+
+
+def _metrics_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    samples = synthetic.metric_samples(size["metric_samples"], seed=7)
+    series = sorted({name for name, _, _ in samples})
+    until = samples[-1][1]
+
+    def record(_state=None):
+        from utils.metric_store import MetricStore
+
+        store = MetricStore()
+        for name, timestamp, value in samples:
+            store.add(name, timestamp, value)
+        return store
+
+    def query(store):
+        # The system monitor's status call: an hour of every series
+        for name in series:
+            store.get(name).statistics(until - 3600, until)
+
+    return [
+        BenchmarkCase(
+            "metrics.store.record",
+            record,
+            items=len(samples),
+            repeat=3,
+            description="Append samples to raw rings and 1s/1m/1h rollups",
+        ),
+        BenchmarkCase(
+            "metrics.store.hour_statistics",
+            query,
+            record,
+            items=len(series),
+            description="Hour-window stats and sketch percentiles per series",
+        ),
+    ]
+
+
+def _ensemble_cases(size: Dict[str, int]) -> List[BenchmarkCase]:
+    data = synthetic.oof_predictions(size["ensemble_models"], size["oof_samples"], seed=8)
+    models = data["models"]
+
+    def frontier_setup():
+        import numpy as np
+
+        from enhanced_ensemble_engine import MultiObjectiveConfig, MultiObjectiveOptimizer
+        from utils.oof_cache import OOFMatrix
+
+        oof = OOFMatrix(models, data["predictions"], data["y"], "benchmark")
+        rng = np.random.default_rng(9)
+        accuracy = np.clip(oof.r2(np.eye(len(models))), 0.0, 1.0)
+        scores = {
+            model: {
+                "accuracy": float(accuracy[i]),
+                "diversity": 0.5,
+                "speed": float(rng.uniform()),
+                "robustness": float(rng.uniform()),
+            }
+            for i, model in enumerate(models)
+        }
+        optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig(seed=0))
+        return optimizer, scores, oof
+
+    def frontier(state):
+        optimizer, scores, oof = state
+        return optimizer._find_pareto_frontier(models, scores, oof)
+
+    def quantum_setup():
+        import numpy as np
+
+        from enhanced_ensemble_engine import QuantumEnsembleConfig, QuantumInspiredOptimizer
+        from utils.oof_cache import OOFMatrix
+
+        oof = OOFMatrix(models, data["predictions"], data["y"], "benchmark")
+        performances = dict(zip(models, oof.r2(np.eye(len(models))).tolist()))
+        optimizer = QuantumInspiredOptimizer(QuantumEnsembleConfig())
+        return optimizer, performances, oof.error_correlation()
+
+    async def quantum(state):
+        optimizer, performances, correlation = state
+        return await optimizer.optimize_weights(performances, correlation, [])
+
+    return [
+        BenchmarkCase(
+            "ensemble.pareto_frontier",
+            frontier,
+            frontier_setup,
+            items=size["ensemble_models"],
+            repeat=3,
+            description="Score, sort and rank candidate ensembles from an OOF matrix",
+        ),
+        BenchmarkCase(
+            "ensemble.quantum_weights",
+            quantum,
+            quantum_setup,
+            items=size["ensemble_models"],
+            repeat=3,
+            description="Quantum-inspired weight search over a whole population",
+        ),
+    ]
+
+
+def build_suite(scale: str = "default") -> List[BenchmarkCase]:
+    """All benchmark cases sized for ``scale`` (see ``SCALES``)"""
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale {scale!r}; expected one of {sorted(SCALES)}")
+    size = SCALES[scale]
+    return [
+        *_arbitrage_cases(size),
+        *_cache_cases(size),
+        *_realtime_cases(size),
+        *_risk_cases(size),
+        *_feature_cases(size),
+        *_scheduler_cases(size),
+        *_metrics_cases(size),
+        *_ensemble_cases(size),
+    ]
@@ -0,0 +1,283 @@
+"""Deterministic synthetic data for benchmarks
+
+Every generator takes a seed so repeated runs (and runs on other machines)
+exercise exactly the same inputs. Timestamps are offsets from a caller-supplied
+reference time so that time-based risk factors stay stable as well.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+SPORTSBOOKS = ["draftkings", "fanduel", "betmgm", "caesars", "pointsbet", "bet365"]
+SPORTS = ["nba", "nfl", "mlb", "nhl"]
+MARKETS = ["spread", "total", "moneyline", "player_points"]
+
+
+def _now(reference: Optional[datetime]) -> datetime:
+    return reference or datetime.now(timezone.utc)
+
+
+def odds_feed(
+    n_events: int = 200,
+    books_per_event: int = 4,
+    seed: int = 0,
+    arbitrage_rate: float = 0.1,
+    reference: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Over/under quotes for ``n_events`` markets across several sportsbooks
+
+    Roughly ``arbitrage_rate`` of events get a mispriced book so the detector
+    has real opportunities to build, not just pairs it rejects.
+    """
+    rng = np.random.default_rng(seed)
+    now = _now(reference)
+    feed = []
+    for event in range(n_events):
+        market = MARKETS[event % len(MARKETS)]
+        fair = rng.uniform(0.35, 0.65)
+        mispriced = rng.random() < arbitrage_rate
+        books = rng.choice(SPORTSBOOKS, size=books_per_event, replace=False)
+        for b, book in enumerate(books):
+            vig = rng.uniform(0.02, 0.06)
+            over_prob = fair + vig / 2
+            under_prob = 1 - fair + vig / 2
+            if mispriced and b == 0:
+                over_prob -= 0.08
+            for outcome, prob in (("over", over_prob), ("under", under_prob)):
+                feed.append(
+                    {
+                        "event_id": f"evt_{event}",
+                        "market_type": market,
+                        "sportsbook": str(book),
+                        "outcome": outcome,
+                        "odds": round(1 / prob, 3),
+                        "quality": round(float(rng.uniform(0.7, 0.99)), 3),
+                        "timestamp": now
+                        - timedelta(seconds=float(rng.uniform(0, 240))),
+                        "market_volume": float(rng.uniform(500, 20000)),
+                        "max_stake": float(rng.uniform(500, 10000)),
+                    }
+                )
+    return feed
+
+
+def line_snapshots(
+    n_events: int = 200,
+    n_snapshots: int = 12,
+    seed: int = 0,
+    steam_rate: float = 0.1,
+    reference: Optional[datetime] = None,
+) -> List[List[Dict[str, Any]]]:
+    """Minute-by-minute moneyline boards ending at the reference time
+
+    Lines random-walk; about ``steam_rate`` of events shorten sharply while
+    the public backs them, which is what the steam move detector looks for.
+    """
+    rng = np.random.default_rng(seed)
+    now = _now(reference)
+    opening = rng.uniform(1.5, 3.5, n_events)
+    steam = rng.random(n_events) < steam_rate
+    drift = np.where(steam, -0.04, 0.0)
+    public = np.where(steam, rng.uniform(62, 80, n_events), rng.uniform(30, 70, n_events))
+    steps = rng.normal(0, 0.005, (n_snapshots, n_events)) + drift
+    lines = opening * np.exp(np.cumsum(steps, axis=0))
+    return [
+        [
+            {
+                "event_id": f"evt_{event}",
+                "market_type": "moneyline",
+                "sportsbook": SPORTSBOOKS[event % len(SPORTSBOOKS)],
+                "odds": round(float(max(lines[t, event], 1.01)), 3),
+                "timestamp": now - timedelta(minutes=n_snapshots - 1 - t),
+                "public_percentage": float(public[event]),
+                "volume": float(rng.uniform(500, 20000)),
+            }
+            for event in range(n_events)
+        ]
+        for t in range(n_snapshots)
+    ]
+
+
+def cache_workload(
+    n_keys: int = 5000, n_ops: int = 20000, seed: int = 0, hot_fraction: float = 0.2
+) -> Dict[str, Any]:
+    """Keys, values and a skewed access sequence (80% of reads on hot keys)"""
+    rng = np.random.default_rng(seed)
+    keys = [f"prop:{i}" for i in range(n_keys)]
+    values = [
+        {
+            "player": f"player_{i}",
+            "line": float(rng.uniform(0.5, 40.5)),
+            "stats": [float(v) for v in rng.random(8)],
+        }
+        for i in range(n_keys)
+    ]
+    hot = max(1, int(n_keys * hot_fraction))
+    is_hot = rng.random(n_ops) < 0.8
+    reads = np.where(
+        is_hot, rng.integers(0, hot, n_ops), rng.integers(0, n_keys, n_ops)
+    )
+    return {"keys": keys, "values": values, "reads": [keys[i] for i in reads]}
+
+
+def stream_messages(
+    n_messages: int = 2000,
+    n_events: int = 50,
+    seed: int = 0,
+    reference: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Keyword arguments for ``StreamMessage`` mixing scores, odds and line moves
+
+    Returned as plain dicts so this module does not import the realtime engine.
+    """
+    rng = np.random.default_rng(seed)
+    now = _now(reference)
+    kinds = ["live_scores", "betting_odds", "line_movements", "player_updates"]
+    priorities = ["critical", "high", "medium", "low"]
+    messages = []
+    for i in range(n_messages):
+        kind = kinds[int(rng.integers(0, len(kinds)))]
+        if kind == "live_scores":
+            data = {
+                "home_score": int(rng.integers(0, 120)),
+                "away_score": int(rng.integers(0, 120)),
+                "score_change": int(rng.integers(0, 4)),
+            }
+        elif kind == "betting_odds":
+            data = {
+                "odds": float(rng.uniform(1.5, 3.0)),
+                "sportsbook": SPORTSBOOKS[i % len(SPORTSBOOKS)],
+            }
+        elif kind == "line_movements":
+            data = {
+                "line": float(rng.uniform(-10, 10)),
+                "line_change": float(rng.normal(0, 1.5)),
+            }
+        else:
+            data = {
+                "minutes": float(rng.uniform(0, 48)),
+                "points": int(rng.integers(0, 40)),
+            }
+        messages.append(
+            {
+                "id": f"msg_{i}",
+                "stream_type": kind,
+                "priority": priorities[int(rng.integers(0, len(priorities)))],
+                "data": data,
+                "timestamp": now - timedelta(milliseconds=int(n_messages - i)),
+                "source": "benchmark",
+                "event_id": f"evt_{int(rng.integers(0, n_events))}",
+            }
+        )
+    return messages
+
+
+def portfolio_opportunities(n: int = 40, seed: int = 0) -> List[Dict[str, Any]]:
+    """Betting opportunities with overlapping events, sports and players"""
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": f"opp_{i}",
+            "event_id": f"evt_{int(rng.integers(0, n // 3 + 1))}",
+            "sport": SPORTS[int(rng.integers(0, len(SPORTS)))],
+            "market_type": MARKETS[int(rng.integers(0, len(MARKETS)))],
+            "player": f"player_{int(rng.integers(0, n))}",
+            "team": f"team_{int(rng.integers(0, 30))}",
+            "expected_value": float(rng.uniform(-0.02, 0.12)),
+            "risk": float(rng.uniform(0.05, 0.4)),
+            "odds": float(rng.uniform(1.6, 3.5)),
+            "win_probability": float(rng.uniform(0.3, 0.65)),
+            "max_stake": float(rng.uniform(100, 2000)),
+        }
+        for i in range(n)
+    ]
+
+
+def portfolio_returns(
+    n_periods: int = 1000, n_assets: int = 4, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    """Fat-tailed, correlated daily returns plus their equal-weight portfolio"""
+    rng = np.random.default_rng(seed)
+    mixing = rng.uniform(0.2, 0.8, size=(n_assets, n_assets))
+    covariance = mixing @ mixing.T * 1e-4
+    individual = rng.multivariate_normal(np.full(n_assets, 5e-4), covariance, n_periods)
+    # Student-t shocks give the tail estimators something to fit
+    individual += rng.standard_t(4, size=(n_periods, n_assets)) * 2e-3
+    return {"portfolio": individual.mean(axis=1), "individual": individual}
+
+
+def feature_inputs(seed: int = 0) -> Dict[str, Any]:
+    """Raw data for ``ComprehensiveFeatureEngine.engineer_features``"""
+    rng = np.random.default_rng(seed)
+    return {
+        "weather": {
+            "temp": float(rng.uniform(30, 90)),
+            "wind": float(rng.uniform(0, 25)),
+        },
+        "venue": "Benchmark Arena",
+        "line": float(rng.uniform(10, 40)),
+        "injuries": [],
+        "recent_games": [float(v) for v in rng.normal(22, 6, size=10)],
+    }
+
+
+def feature_rows(
+    keys: List[str], n_rows: int = 2000, seed: int = 0
+) -> List[Dict[str, float]]:
+    """Dict rows sharing the schema ``keys``, as produced by the feature engineers"""
+    rng = np.random.default_rng(seed)
+    matrix = rng.normal(loc=1.0, size=(n_rows, len(keys)))
+    return [dict(zip(keys, map(float, row))) for row in matrix]
+
+
+def oof_predictions(
+    n_models: int = 60, n_samples: int = 5000, seed: int = 0
+) -> Dict[str, Any]:
+    """Out-of-fold predictions of models whose errors share a few common factors"""
+    rng = np.random.default_rng(seed)
+    y = rng.normal(size=n_samples)
+    factors = rng.normal(size=(n_samples, 4))
+    loadings = rng.uniform(0, 0.6, size=(4, n_models))
+    noise = rng.normal(size=(n_samples, n_models)) * rng.uniform(0.2, 1.0, n_models)
+    predictions = (y[:, None] + factors @ loadings + noise).astype(np.float32)
+    return {
+        "models": [f"model_{i}" for i in range(n_models)],
+        "predictions": predictions,
+        "y": y,
+    }
+
+
+def cron_expressions(n: int = 100000, seed: int = 0) -> List[str]:
+    """A mix of minute, hourly, daily, weekday and weekly cron schedules"""
+    rng = np.random.default_rng(seed)
+    expressions = []
+    for kind, a, b in zip(
+        rng.integers(0, 5, n), rng.integers(0, 60, n), rng.integers(0, 24, n)
+    ):
+        if kind == 0:
+            expressions.append(f"*/{int(a) % 14 + 2} * * * *")
+        elif kind == 1:
+            expressions.append(f"{a} * * * *")
+        elif kind == 2:
+            expressions.append(f"{a} {b} * * *")
+        elif kind == 3:
+            expressions.append(f"{a} {b % 12 + 8} * * mon-fri")
+        else:
+            expressions.append(f"{a} {b} * * {int(a) % 7}")
+    return expressions
+
+
+def metric_samples(
+    n: int = 200000, n_series: int = 13, seed: int = 0
+) -> List[tuple]:
+    """``(series, timestamp, value)`` samples one second apart per series"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp()
+    series = rng.integers(0, n_series, n)
+    values = rng.gamma(2.0, 20.0, n)
+    return [
+        (f"metric_{s}", start + i / n_series, float(v))
+        for i, (s, v) in enumerate(zip(series.tolist(), values))
+    ]
@@ -7,18 +7,28 @@ import gzip
 import hashlib
 import json
 import logging
+import multiprocessing
+import os
+import struct
 import time
 from collections import defaultdict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from functools import wraps
+from multiprocessing import shared_memory
 from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
 import redis.asyncio as redis
 from config import config_manager
-from backend.utils.serialization_utils import safe_dumps, safe_loads
+from backend.utils.serialization_utils import (
+    safe_dumpb,
+    safe_dumps,
+    safe_loadb,
+    safe_loads,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -478,11 +488,287 @@ class RedisCache:
             ) / total_operations
 
 
+class SharedMemoryCache:
+    """L1 cache in a shared-memory segment, visible to every forked worker
+
+    The segment is an open-addressing table of ``slots`` fixed-size slots; a
+    slot holds a header (key hash, expiry, payload length) and the serialized
+    ``[key, value]`` pair. Values that do not fit in a slot are rejected so
+    ``MultiTierCache`` falls back to L2. Create it in the serving parent before
+    forking: children inherit the mapping and the lock. Implements the same
+    get/set/delete/clear/get_stats interface as ``InMemoryCache``.
+
+    The lock is acquired with a timeout. If it is still held when the timeout
+    expires and the recorded holder has exited (a worker killed mid-operation),
+    the lock is taken over and the table is cleared, since the dead worker may
+    have left a slot half-written. A live holder only turns the operation into
+    a miss.
+    """
+
+    _HEADER = struct.Struct("<Qdi")  # key hash, expires_at (0 = never), length
+    _EMPTY = 0
+    _DELETED = 1
+    PROBES = 8
+    LOCK_TIMEOUT = 1.0  # seconds
+
+    def __init__(self, slots: int = 4096, slot_bytes: int = 4096):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.segment = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        self.segment.buf[: slots * slot_bytes] = bytes(slots * slot_bytes)
+        self.lock = multiprocessing.Lock()
+        # Pid of the process holding ``lock`` (0 = none), and a second lock so
+        # only one waiter takes over from a dead holder
+        self._holder = multiprocessing.RawValue("q", 0)
+        self._recovery_lock = multiprocessing.Lock()
+        self.owner_pid = os.getpid()
+        # Hit/miss counters are per process; the table itself is shared
+        self.metrics = CacheMetrics()
+        self.lock_recoveries = 0
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _take_over(self) -> bool:
+        """Claim ``lock`` from a holder that exited; True if it was claimed"""
+        if not self._recovery_lock.acquire(timeout=self.LOCK_TIMEOUT):
+            return False
+        try:
+            # Released in the meantime: an ordinary acquire
+            if self.lock.acquire(block=False):
+                return True
+            holder = self._holder.value
+            if holder and self._pid_alive(holder):
+                return False
+            logger.warning(
+                f"Shared cache lock held by exited process {holder or 'unknown'}; "
+                "taking it over and clearing the table"
+            )
+            self._holder.value = os.getpid()
+            size = self.slots * self.slot_bytes
+            self.segment.buf[:size] = bytes(size)
+            self.lock_recoveries += 1
+            return True
+        finally:
+            self._recovery_lock.release()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the table lock; TimeoutError if a live process keeps it"""
+        if not self.lock.acquire(timeout=self.LOCK_TIMEOUT) and not self._take_over():
+            raise TimeoutError("shared cache lock is busy")
+        self._holder.value = os.getpid()
+        try:
+            yield
+        finally:
+            self._holder.value = 0
+            self.lock.release()
+
+    @property
+    def max_payload(self) -> int:
+        return self.slot_bytes - self._HEADER.size
+
+    def _hash(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return max(int.from_bytes(digest, "little"), self._DELETED + 1)
+
+    def _probe(self, key_hash: int):
+        start = key_hash % self.slots
+        for i in range(min(self.PROBES, self.slots)):
+            yield ((start + i) % self.slots) * self.slot_bytes
+
+    def _find(self, key_hash: int, now: float) -> Optional[int]:
+        """Offset of the live slot holding ``key_hash``; caller holds the lock"""
+        buf = self.segment.buf
+        for offset in self._probe(key_hash):
+            slot_hash, expires_at, _ = self._HEADER.unpack_from(buf, offset)
+            if slot_hash == self._EMPTY:
+                return None
+            if slot_hash == key_hash:
+                if expires_at and expires_at < now:
+                    self._HEADER.pack_into(buf, offset, self._DELETED, 0.0, 0)
+                    return None
+                return offset
+        return None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        start_time = time.time()
+        key_hash = self._hash(key)
+        try:
+            with self._locked():
+                offset = self._find(key_hash, start_time)
+                if offset is not None:
+                    length = self._HEADER.unpack_from(self.segment.buf, offset)[2]
+                    body = offset + self._HEADER.size
+                    payload = bytes(self.segment.buf[body : body + length])
+            if offset is None:
+                self.metrics.misses += 1
+                return None
+
+            stored_key, value = safe_loadb(payload)
+            if stored_key != key:  # 64-bit hash collision
+                self.metrics.misses += 1
+                return None
+
+            self.metrics.hits += 1
+            self._update_access_time(time.time() - start_time)
+            return value
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.metrics.errors += 1
+            logger.error(f"Shared cache get error for key {key}: {e!s}")
+            return None
+
+    def set(
+        self, key: str, value: Any, ttl: Optional[int] = None, compress: bool = False
+    ) -> bool:
+        """Set value in cache; ``compress`` is accepted for interface parity"""
+        try:
+            payload = safe_dumpb([key, value])
+            if len(payload) > self.max_payload:
+                return False
+
+            now = time.time()
+            key_hash = self._hash(key)
+            expires_at = now + ttl if ttl else 0.0
+            buf = self.segment.buf
+            with self._locked():
+                target = None
+                victim, victim_expiry = None, float("inf")
+                for offset in self._probe(key_hash):
+                    slot_hash, slot_expiry, _ = self._HEADER.unpack_from(buf, offset)
+                    if slot_hash == key_hash:
+                        target = offset
+                        break
+                    if slot_hash in (self._EMPTY, self._DELETED) or (
+                        slot_expiry and slot_expiry < now
+                    ):
+                        if target is None:
+                            target = offset
+                        if slot_hash == self._EMPTY:
+                            break
+                        continue
+                    # Entries that never expire are evicted last
+                    expiry = slot_expiry or float("inf")
+                    if victim is None or expiry < victim_expiry:
+                        victim, victim_expiry = offset, expiry
+
+                if target is None:
+                    target = victim
+                    self.metrics.evictions += 1
+                self._HEADER.pack_into(buf, target, key_hash, expires_at, len(payload))
+                body = target + self._HEADER.size
+                buf[body : body + len(payload)] = payload
+
+            self.metrics.writes += 1
+            return True
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.metrics.errors += 1
+            logger.error(f"Shared cache set error for key {key}: {e!s}")
+            return False
+
+    def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        try:
+            with self._locked():
+                offset = self._find(self._hash(key), time.time())
+                if offset is None:
+                    return False
+                self._HEADER.pack_into(self.segment.buf, offset, self._DELETED, 0.0, 0)
+            return True
+        except TimeoutError as e:
+            self.metrics.errors += 1
+            logger.error(f"Shared cache delete error for key {key}: {e!s}")
+            return False
+
+    def clear(self):
+        """Clear all cache entries (in every worker)"""
+        size = self.slots * self.slot_bytes
+        try:
+            with self._locked():
+                self.segment.buf[:size] = bytes(size)
+        except TimeoutError as e:
+            logger.error(f"Shared cache clear error: {e!s}")
+            return
+        self.metrics = CacheMetrics()
+
+    def close(self):
+        """Detach; the creating process also frees the segment"""
+        self.segment.close()
+        if os.getpid() == self.owner_pid:
+            self.segment.unlink()
+
+    def _update_access_time(self, access_time: float):
+        """Update average access time"""
+        total_operations = self.metrics.hits + self.metrics.misses
+        if total_operations > 0:
+            self.metrics.avg_access_time = (
+                self.metrics.avg_access_time * (total_operations - 1) + access_time
+            ) / total_operations
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        now = time.time()
+        live: Optional[int] = 0
+        try:
+            with self._locked():
+                for index in range(self.slots):
+                    slot_hash, expires_at, _ = self._HEADER.unpack_from(
+                        self.segment.buf, index * self.slot_bytes
+                    )
+                    if slot_hash > self._DELETED and not (expires_at and expires_at < now):
+                        live += 1
+        except TimeoutError:
+            live = None  # unknown while another worker holds the table
+
+        total_operations = self.metrics.hits + self.metrics.misses
+        return {
+            "hits": self.metrics.hits,
+            "misses": self.metrics.misses,
+            "hit_rate": (
+                (self.metrics.hits / total_operations * 100) if total_operations else 0
+            ),
+            "evictions": self.metrics.evictions,
+            "writes": self.metrics.writes,
+            "errors": self.metrics.errors,
+            "lock_recoveries": self.lock_recoveries,
+            "total_entries": live,
+            "memory_usage_mb": self.slots * self.slot_bytes / (1024 * 1024),
+            "avg_access_time_ms": self.metrics.avg_access_time * 1000,
+            "max_size": self.slots,
+            "max_value_bytes": self.max_payload,
+            "shared": True,
+        }
+
+
+# Set by the multi-process server (serving.py) before it forks workers
+_shared_l1_cache: Optional[SharedMemoryCache] = None
+
+
+def enable_shared_l1_cache(slots: int = 4096, slot_bytes: int = 4096) -> SharedMemoryCache:
+    """Make every ``MultiTierCache`` created afterwards use one shared L1"""
+    global _shared_l1_cache  # pylint: disable=global-statement
+    if _shared_l1_cache is None:
+        _shared_l1_cache = SharedMemoryCache(slots=slots, slot_bytes=slot_bytes)
+    return _shared_l1_cache
+
+
 class MultiTierCache:
     """Multi-tier cache system with automatic promotion/demotion"""
 
     def __init__(self):
-        self.l1_cache = InMemoryCache(max_size=5000, max_memory_mb=256)
+        self.l1_cache = _shared_l1_cache or InMemoryCache(
+            max_size=5000, max_memory_mb=256
+        )
         self.l2_cache = RedisCache(config_manager.get_redis_url())
         self.access_patterns = defaultdict(int)
         self.promotion_threshold = 5  # Access count for L2->L1 promotion
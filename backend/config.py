@@ -68,6 +68,8 @@ class BackendConfig(BaseSettings):
     llm_timeout: int = 60  # HTTP request timeout in seconds
     llm_batch_size: int = 16  # batch size for embedding requests
     llm_models_cache_ttl: int = 300  # cache TTL for model list (seconds)
+    llm_response_cache_ttl: int = 900  # max lifetime of a cached completion (seconds)
+    llm_response_cache_size: int = 512  # max cached completions kept in memory
     # Feature toggle for LLM endpoints
     enable_llm: bool = True  # turn off LLM routes if False
 
@@ -88,6 +90,9 @@ class BackendConfig(BaseSettings):
     metrics_enabled: bool = True
     prometheus_port: int = 9090
     health_check_interval: int = 30
+    tracing_enabled: bool = True  # per-request stage spans for /metrics/prometheus
+    request_profiling_enabled: bool = False  # honour the X-Profile-Request header
+    request_profiling_interval: float = 0.001  # stack sampling period (seconds)
 
     # Logging Settings
     log_level: str = "INFO"
@@ -114,6 +119,8 @@ class BackendConfig(BaseSettings):
     kelly_volatility_adjustment: bool = True
     kelly_correlation_adjustment: bool = True
     kelly_drawdown_protection: bool = True
+    # Largest simulated chance of losing 75% of the bankroll over 250 bets
+    kelly_max_ruin_probability: float = 0.05
 
     @field_validator("cors_origins", mode="before")
     @classmethod
@@ -12,9 +12,10 @@ from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urljoin
 
-import aiohttp
+import httpx
 from config import config_manager
 from feature_cache import FeatureCache
+from utils.http_transport import http_transport
 
 logger = logging.getLogger(__name__)
 
@@ -106,28 +107,23 @@ class DataSourceConnector:
         self.base_url = base_url
         self.api_key = api_key
         self.rate_limiter = RateLimiter()
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.transport = http_transport
         self.connection_pool_size = 10
+        self.initialized = False
 
     async def initialize(self):
-        """Initialize HTTP session"""
-        connector = aiohttp.TCPConnector(
-            limit=self.connection_pool_size,
-            ttl_dns_cache=300,
-            use_dns_cache=True,
-        )
-
-        timeout = aiohttp.ClientTimeout(total=30)
-        self.session = aiohttp.ClientSession(
-            connector=connector, timeout=timeout, headers=self._get_default_headers()
-        )
+        """Register this source's concurrency bound on the shared transport"""
+        if self.source_type.value not in self.transport.provider_limits:
+            self.transport.configure_provider(
+                self.source_type.value, max_concurrency=self.connection_pool_size
+            )
+        self.initialized = True
 
         logger.info("Initialized connector for {self.source_type}")
 
     async def close(self):
-        """Close HTTP session"""
-        if self.session:
-            await self.session.close()
+        """Connection pools are shared; http_transport.close() releases them"""
+        self.initialized = False
 
     def _get_default_headers(self) -> Dict[str, str]:
         """Get default headers for requests"""
@@ -140,7 +136,7 @@ class DataSourceConnector:
 
     async def fetch_data(self, request: DataRequest) -> DataResponse:
         """Fetch data from the source"""
-        if not self.session:
+        if not self.initialized:
             await self.initialize()
 
         start_time = time.time()
@@ -158,51 +154,47 @@ class DataSourceConnector:
             # Make request with retries
             for attempt in range(request.retry_count + 1):
                 try:
-                    async with self.session.get(
+                    response = await self.transport.request(
+                        "GET",
                         url,
+                        provider=self.source_type.value,
                         params=request.params,
                         headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=request.timeout),
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            latency = time.time() - start_time
-
-                            return DataResponse(
-                                source=self.source_type,
-                                data=data,
-                                status=DataStatus.SUCCESS,
-                                timestamp=datetime.now(timezone.utc),
-                                latency=latency,
-                                metadata={
-                                    "status_code": response.status,
-                                    "response_size": len(str(data)),
-                                    "attempt": attempt + 1,
-                                },
-                            )
-
-                        elif response.status == 429:
-                            # Rate limited
-                            await asyncio.sleep(2**attempt)
-                            continue
-
-                        else:
-                            error_text = await response.text()
-                            raise aiohttp.ClientResponseError(
-                                request_info=response.request_info,
-                                history=response.history,
-                                status=response.status,
-                                message=error_text,
-                            )
-
-                except asyncio.TimeoutError:
+                        timeout=request.timeout,
+                    )
+                    if response.status_code == 200:
+                        data = await response.json_async()
+                        latency = time.time() - start_time
+
+                        return DataResponse(
+                            source=self.source_type,
+                            data=data,
+                            status=DataStatus.SUCCESS,
+                            timestamp=datetime.now(timezone.utc),
+                            latency=latency,
+                            metadata={
+                                "status_code": response.status_code,
+                                "response_size": len(response.content),
+                                "attempt": attempt + 1,
+                            },
+                        )
+
+                    elif response.status_code == 429:
+                        # Rate limited
+                        await asyncio.sleep(2**attempt)
+                        continue
+
+                    else:
+                        response.raise_for_status()
+
+                except httpx.TimeoutException:
                     if attempt < request.retry_count:
                         await asyncio.sleep(2**attempt)
                         continue
                     else:
                         raise
 
-                except aiohttp.ClientError as e:
+                except httpx.HTTPError as e:
                     if attempt < request.retry_count:
                         await asyncio.sleep(2**attempt)
                         continue
@@ -212,7 +204,7 @@ class DataSourceConnector:
             # If we get here, all retries failed
             raise Exception("All retry attempts failed")
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             return DataResponse(
                 source=self.source_type,
                 data=None,
@@ -484,7 +476,7 @@ class DataPipeline:
 
                 start_time = time.time()
                 # Don't actually make the request, just check if connector is ready
-                if connector.session and not connector.session.closed:
+                if connector.initialized:
                     health_status["connectors"][source.value] = {
                         "status": "healthy",
                         "response_time": time.time() - start_time,
@@ -492,7 +484,7 @@ class DataPipeline:
                 else:
                     health_status["connectors"][source.value] = {
                         "status": "degraded",
-                        "error": "Session not initialized",
+                        "error": "Connector not initialized",
                     }
 
             except Exception as e:  # pylint: disable=broad-exception-caught
@@ -502,6 +494,7 @@ class DataPipeline:
                 }
                 health_status["status"] = "degraded"
 
+        health_status["transport"] = http_transport.get_metrics()
         return health_status
 
 
@@ -5,16 +5,20 @@ Intelligent multi-source data aggregation with advanced reconciliation, quality
 import asyncio
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-import aiohttp
+import httpx
 import numpy as np
 import redis.asyncio as redis
 from config import config_manager
 from feature_cache import FeatureCache
+from utils.adaptive_limits import AIMDLimit, TokenBucket
+from utils.http_transport import TransportResponse, http_transport
+from utils.tracing import LatencyHistogram, span
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,15 @@ class DataType(str, Enum):
     VENUE_DATA = "venue_data"
 
 
+class FetchPolicy(str, Enum):
+    """How many sources a multi-source fetch waits for before reconciling"""
+
+    ALL = "all"  # every applicable source
+    FIRST_GOOD = "first_good"  # all at once; first response above the quality threshold
+    QUORUM = "quorum"  # all at once; the first ``quorum_size`` good responses
+    HEDGED = "hedged"  # best source first, a backup each time one exceeds its p95
+
+
 @dataclass
 class DataQualityMetrics:
     """Comprehensive data quality assessment"""
@@ -342,34 +355,29 @@ class DataValidator:
 class DataSourceConnector:
     """Ultra-enhanced data source connector with intelligent rate limiting and failover"""
 
-    def __init__(self, source_id: str, reliability_tier: DataSourceReliability):
+    def __init__(
+        self,
+        source_id: str,
+        reliability_tier: DataSourceReliability,
+        supported_data_types: Sequence[DataType] = (),
+    ):
         self.source_id = source_id
         self.reliability_tier = reliability_tier
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.rate_limiter = IntelligentRateLimiter(source_id)
+        # Empty means the source is asked for every data type
+        self.supported_data_types = set(supported_data_types)
+        self.transport = http_transport
         self.circuit_breaker = CircuitBreaker(source_id)
+        self.rate_limiter = IntelligentRateLimiter(source_id, self.circuit_breaker)
+        self.permit_timeout = 10.0
         self.performance_tracker = PerformanceTracker(source_id)
         self.backup_sources: List[str] = []
 
     async def initialize(self, **kwargs):
-        """Initialize connector with advanced configuration"""
-        connector = aiohttp.TCPConnector(
-            limit=50,
-            limit_per_host=20,
-            ttl_dns_cache=300,
-            use_dns_cache=True,
-            keepalive_timeout=60,
-            enable_cleanup_closed=True,
-        )
-
-        timeout = aiohttp.ClientTimeout(total=30, connect=10, sock_read=20)
-
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers=self._get_default_headers(),
-            trace_configs=[self._create_trace_config()],
-        )
+        """Register this source's concurrency bound on the shared transport"""
+        if self.source_id not in self.transport.provider_limits:
+            self.transport.configure_provider(
+                self.source_id, max_concurrency=kwargs.get("max_concurrency", 20)
+            )
 
     def _get_default_headers(self) -> Dict[str, str]:
         """Get default headers with proper user agent and compression"""
@@ -381,31 +389,167 @@ class DataSourceConnector:
             "Cache-Control": "no-cache",
         }
 
-    def _create_trace_config(self) -> aiohttp.TraceConfig:
-        """Create trace configuration for performance monitoring"""
-        trace_config = aiohttp.TraceConfig()
-        trace_config.on_request_start.append(self._on_request_start)
-        trace_config.on_request_end.append(self._on_request_end)
-        return trace_config
+    async def request(
+        self, method: str, url: str, endpoint: str = "default", **kwargs
+    ) -> TransportResponse:
+        """Send a request within the endpoint's adaptive limits and record its performance
+
+        Raises :class:`SourceUnavailableError` when no permit is granted within
+        ``permit_timeout`` (circuit open or limits saturated).
+        """
+        headers = {**self._get_default_headers(), **kwargs.pop("headers", {})}
+        if not await self.rate_limiter.wait_for_permit(endpoint, self.permit_timeout):
+            raise SourceUnavailableError(
+                f"No permit for {self.source_id}/{endpoint} "
+                f"(circuit {self.circuit_breaker.state})"
+            )
+        outcome: Optional[RequestOutcome] = RequestOutcome.ERROR
+        retry_after = None
+        start = time.perf_counter()
+        try:
+            with span(f"connector.{self.source_id}"):
+                response = await self.transport.request(
+                    method, url, provider=self.source_id, headers=headers, **kwargs
+                )
+            outcome = classify_response(response.status_code)
+            retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+        except httpx.TimeoutException:
+            outcome = RequestOutcome.THROTTLED
+            raise
+        except asyncio.CancelledError:
+            # Cancelled on purpose (hedged/quorum loser): not the upstream's fault
+            outcome = None
+            raise
+        finally:
+            self.rate_limiter.release_permit(
+                endpoint, time.perf_counter() - start, outcome, retry_after
+            )
+        await self.performance_tracker.record_request(
+            response.elapsed, response.status_code
+        )
+        return response
+
+    def supports(self, data_type: DataType) -> bool:
+        return not self.supported_data_types or data_type in self.supported_data_types
+
+    async def fetch(
+        self, data_type: DataType, entity_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch raw data for one entity"""
+        # This would be implemented with source-specific logic
+        # For now, return mock data
+        return {
+            "entity_id": entity_id,
+            "data_type": data_type.value,
+            "mock_data": True,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
 
-    async def _on_request_start(self, session, trace_config_ctx, params):
-        """Track request start time"""
-        trace_config_ctx.start = time.time()
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds form of a ``Retry-After`` header (HTTP-date form is ignored)"""
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
 
-    async def _on_request_end(self, session, trace_config_ctx, params):
-        """Track request completion and update performance metrics"""
-        elapsed = time.time() - trace_config_ctx.start
-        await self.performance_tracker.record_request(elapsed, params.response.status)
 
+class RequestOutcome(str, Enum):
+    """How an upstream request ended, as far as the limits are concerned"""
 
-class IntelligentRateLimiter:
-    """Intelligent rate limiter with adaptive throttling"""
+    SUCCESS = "success"
+    THROTTLED = "throttled"  # 429/503 or timeout: back off, provider is alive
+    ERROR = "error"  # upstream failure: counts toward the circuit breaker
 
-    def __init__(self, source_id: str):
+
+class SourceUnavailableError(Exception):
+    """No permit: the circuit is open or the limits are saturated"""
+
+
+def classify_response(status_code: int) -> RequestOutcome:
+    if status_code in (429, 503):
+        return RequestOutcome.THROTTLED
+    if status_code >= 500:
+        return RequestOutcome.ERROR
+    # Other 4xx are the caller's problem, not a sign of upstream load
+    return RequestOutcome.SUCCESS
+
+
+class EndpointLimit:
+    """Rate and concurrency state for one source endpoint"""
+
+    def __init__(
+        self,
+        base_rate_per_minute: float,
+        initial_concurrency: int,
+        max_concurrency: int,
+        now: Optional[float] = None,
+    ):
+        self.base_rate = base_rate_per_minute / 60.0
+        self.bucket = TokenBucket(self.base_rate, now=now)
+        self.concurrency = AIMDLimit(initial_concurrency, max_limit=max_concurrency)
+        self.inflight = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._released: Optional[asyncio.Event] = None
+
+    @property
+    def released(self) -> asyncio.Event:
+        if self._released is None:
+            self._released = asyncio.Event()
+        return self._released
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rate_per_minute": self.bucket.rate * 60,
+            "base_rate_per_minute": self.base_rate * 60,
+            "concurrency_limit": self.concurrency.limit,
+            "inflight": self.inflight,
+            "baseline_latency": self.concurrency.baseline,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
+
+
+class IntelligentRateLimiter:
+    """Adaptive per-endpoint rate and concurrency limits for one source
+
+    Each endpoint gets a token bucket, which starts at the endpoint's base
+    requests per minute, and an AIMD concurrency limit (see
+    ``utils.adaptive_limits``). A throttled response cuts the rate by
+    ``rate_backoff`` and pauses the bucket for any ``Retry-After``.
+    Successes add back ``rate_step`` of the base rate per second, up to
+    ``rate_ceiling`` times base. The effect is to probe for the provider's real capacity and
+    back off as soon as it pushes back. Every permit goes through the source's
+    :class:`CircuitBreaker`, so while the breaker is half-open only its probe
+    requests are let through.
+    """
+
+    base_limits: Dict[str, float] = {
+        "live_data": 60,
+        "historical_data": 30,
+        "player_stats": 100,
+        "odds_data": 120,
+    }
+    default_limit = 60
+
+    def __init__(
+        self,
+        source_id: str,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.source_id = source_id
         self.redis_client = None
-        self.local_cache = {}
-        self.adaptive_limits = {}
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(source_id, clock=clock)
+        self.clock = clock
+        self.endpoints: Dict[str, EndpointLimit] = {}
+        self.initial_concurrency = 10
+        self.max_concurrency = 100
+        self.rate_backoff = 0.8
+        self.rate_step = 0.02
+        self.rate_floor = 0.05
+        self.rate_ceiling = 2.0
 
     async def initialize(self):
         """Initialize Redis connection for distributed rate limiting"""
@@ -416,70 +560,148 @@ class IntelligentRateLimiter:
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.warning("Redis connection failed, using local rate limiting: {e!s}")
 
+    def endpoint(self, endpoint: str) -> EndpointLimit:
+        limit = self.endpoints.get(endpoint)
+        if limit is None:
+            limit = EndpointLimit(
+                self.base_limits.get(endpoint, self.default_limit),
+                self.initial_concurrency,
+                self.max_concurrency,
+                self.clock(),
+            )
+            self.endpoints[endpoint] = limit
+        return limit
+
+    def try_acquire(self, endpoint: str) -> bool:
+        """Take a permit without waiting; the caller must ``release_permit`` it"""
+        limit = self.endpoint(endpoint)
+        if limit.inflight >= limit.concurrency.limit:
+            limit.rejected += 1
+            return False
+        if not limit.bucket.try_acquire(self.clock()):
+            limit.rejected += 1
+            return False
+        if not self.circuit_breaker.allow_request():
+            limit.bucket.refund()
+            limit.rejected += 1
+            return False
+        limit.inflight += 1
+        return True
+
     async def acquire_permit(self, endpoint: str) -> bool:
-        """Acquire rate limit permit with intelligent throttling"""
+        """Take a permit without waiting, also checking the shared Redis window"""
+        if not self.try_acquire(endpoint):
+            return False
+        if self.redis_client is None:
+            return True
         try:
-            current_time = time.time()
-            key = f"rate_limit:{self.source_id}:{endpoint}"
-
-            # Get current rate limit for this endpoint
-            limit = await self._get_adaptive_limit(endpoint)
-            window = 60  # 1 minute window
-
-            if self.redis_client:
-                # Distributed rate limiting with Redis
-                pipe = self.redis_client.pipeline()
-                pipe.zremrangebyscore(key, 0, current_time - window)
-                pipe.zcard(key)
-                pipe.zadd(key, {str(current_time): current_time})
-                pipe.expire(key, window)
-                results = await pipe.execute()
-
-                current_count = results[1]
-                return current_count < limit
-            else:
-                # Local rate limiting
-                if key not in self.local_cache:
-                    self.local_cache[key] = []
-
-                # Clean old entries
-                self.local_cache[key] = [
-                    t for t in self.local_cache[key] if current_time - t < window
-                ]
-
-                if len(self.local_cache[key]) < limit:
-                    self.local_cache[key].append(current_time)
-                    return True
-                return False
-
+            # Other processes share the provider's quota; enforce it across them
+            if await self._redis_allows(endpoint):
+                return True
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Rate limiter error: {e!s}")
             return True  # Fail open
+        limit = self.endpoints[endpoint]
+        limit.bucket.refund()
+        self._finish(endpoint, limit)
+        self.circuit_breaker.cancel_request()
+        return False
 
-    async def _get_adaptive_limit(self, endpoint: str) -> int:
-        """Get adaptive rate limit based on endpoint performance"""
-        base_limits = {
-            "live_data": 60,
-            "historical_data": 30,
-            "player_stats": 100,
-            "odds_data": 120,
-        }
-
-        base_limit = base_limits.get(endpoint, 60)
+    async def _redis_allows(self, endpoint: str) -> bool:
+        current_time = time.time()
+        key = f"rate_limit:{self.source_id}:{endpoint}"
+        window = 60
+        pipe = self.redis_client.pipeline()
+        pipe.zremrangebyscore(key, 0, current_time - window)
+        pipe.zcard(key)
+        pipe.zadd(key, {str(current_time): current_time})
+        pipe.expire(key, window)
+        results = await pipe.execute()
+        return results[1] < self.endpoints[endpoint].bucket.rate * window
+
+    async def wait_for_permit(self, endpoint: str, timeout: float = 10.0) -> bool:
+        """Wait up to ``timeout`` seconds for a permit"""
+        deadline = self.clock() + timeout
+        limit = self.endpoint(endpoint)
+        while True:
+            if await self.acquire_permit(endpoint):
+                return True
+            remaining = deadline - self.clock()
+            if remaining <= 0 or self.circuit_breaker.state == "OPEN":
+                return False
+            refill = limit.bucket.wait_time(self.clock())
+            if limit.inflight >= limit.concurrency.limit:
+                wait = remaining  # until a running request finishes
+            elif refill > 0:
+                wait = min(refill, remaining)
+            else:
+                wait = min(0.05, remaining)  # half-open circuit busy with its probe
+            limit.released.clear()
+            try:
+                await asyncio.wait_for(limit.released.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
 
-        # Adjust based on recent performance
-        if endpoint in self.adaptive_limits:
-            performance_factor = self.adaptive_limits[endpoint]
-            return int(base_limit * performance_factor)
+    def _finish(self, endpoint: str, limit: EndpointLimit):
+        limit.inflight -= 1
+        if limit._released is not None:
+            limit._released.set()
 
-        return base_limit
+    def release_permit(
+        self,
+        endpoint: str,
+        latency: float,
+        outcome: Optional[RequestOutcome],
+        retry_after: Optional[float] = None,
+    ):
+        """Feed a finished request back into the limits and the breaker
+
+        ``outcome=None`` is a request cancelled by its caller (for example the
+        losing leg of a hedged fetch): the permit is returned and nothing is
+        learned from it.
+        """
+        limit = self.endpoints[endpoint]
+        if outcome is None:
+            self._finish(endpoint, limit)
+            self.circuit_breaker.cancel_request()
+            return
+        now = self.clock()
+        throttled = outcome is RequestOutcome.THROTTLED
+        if outcome is not RequestOutcome.ERROR:
+            limit.concurrency.on_sample(
+                latency, limit.inflight, dropped=throttled, now=now
+            )
+        if throttled:
+            limit.throttled += 1
+            floor = limit.base_rate * self.rate_floor
+            limit.bucket.set_rate(max(floor, limit.bucket.rate * self.rate_backoff), now)
+            if retry_after:
+                limit.bucket.pause(retry_after, now)
+        elif outcome is RequestOutcome.SUCCESS:
+            # Scaled so the rate grows by ``rate_step`` of base per second
+            rate = limit.bucket.rate
+            rate += limit.base_rate * self.rate_step / max(rate, 1.0)
+            limit.bucket.set_rate(min(limit.base_rate * self.rate_ceiling, rate), now)
+        self.circuit_breaker.record(outcome)
+        self._finish(endpoint, limit)
+
+    def get_limits(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limit.snapshot() for name, limit in self.endpoints.items()}
 
 
 class CircuitBreaker:
-    """Circuit breaker pattern for resilient API calls"""
+    """Circuit breaker pattern for resilient API calls
 
-    def __init__(self, source_id: str):
+    Consecutive upstream errors open the circuit. After ``recovery_timeout``
+    it turns half-open and lets ``half_open_probes`` requests through at a
+    time; ``success_threshold`` successful probes close it again and one
+    failed probe reopens it. Throttled responses show the provider is up, so
+    they neither trip nor reset the breaker (the rate limiter handles them).
+    """
+
+    def __init__(self, source_id: str, clock: Callable[[], float] = time.monotonic):
         self.source_id = source_id
+        self.clock = clock
         self.failure_count = 0
         self.last_failure_time = None
         self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
@@ -487,33 +709,57 @@ class CircuitBreaker:
         self.recovery_timeout = 60
         self.success_threshold = 3
         self.consecutive_successes = 0
+        self.half_open_probes = 1
+        self.probes_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """Whether a request may start now; a True answer must be ``record``-ed"""
+        if self.state == "OPEN":
+            if not self._should_attempt_reset():
+                return False
+            self.state = "HALF_OPEN"
+            self.probes_in_flight = 0
+            logger.info(
+                f"Circuit breaker for {self.source_id} transitioning to HALF_OPEN"
+            )
+        if self.state == "HALF_OPEN":
+            if self.probes_in_flight >= self.half_open_probes:
+                return False
+            self.probes_in_flight += 1
+        return True
+
+    def cancel_request(self):
+        """Undo an ``allow_request`` whose request was never sent"""
+        if self.state == "HALF_OPEN":
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def record(self, outcome: RequestOutcome):
+        self.cancel_request()
+        if outcome is RequestOutcome.SUCCESS:
+            self._on_success()
+        elif outcome is RequestOutcome.ERROR:
+            self._on_failure()
 
     async def call(self, func, *args, **kwargs):
         """Execute function with circuit breaker protection"""
-        if self.state == "OPEN":
-            if self._should_attempt_reset():
-                self.state = "HALF_OPEN"
-                logger.info(
-                    f"Circuit breaker for {self.source_id} transitioning to HALF_OPEN"
-                )
-            else:
-                raise Exception(f"Circuit breaker OPEN for {self.source_id}")
+        if not self.allow_request():
+            raise SourceUnavailableError(f"Circuit breaker OPEN for {self.source_id}")
 
         try:
             result = await func(*args, **kwargs)
-            await self._on_success()
-            return result
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            await self._on_failure()
-            raise e
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.record(RequestOutcome.ERROR)
+            raise
+        self.record(RequestOutcome.SUCCESS)
+        return result
 
     def _should_attempt_reset(self) -> bool:
         """Check if we should attempt to reset the circuit breaker"""
         if self.last_failure_time is None:
             return True
-        return time.time() - self.last_failure_time > self.recovery_timeout
+        return self.clock() - self.last_failure_time > self.recovery_timeout
 
-    async def _on_success(self):
+    def _on_success(self):
         """Handle successful call"""
         if self.state == "HALF_OPEN":
             self.consecutive_successes += 1
@@ -521,19 +767,19 @@ class CircuitBreaker:
                 self.state = "CLOSED"
                 self.failure_count = 0
                 self.consecutive_successes = 0
-                logger.info("Circuit breaker for {self.source_id} reset to CLOSED")
+                logger.info(f"Circuit breaker for {self.source_id} reset to CLOSED")
         else:
             self.failure_count = 0
 
-    async def _on_failure(self):
+    def _on_failure(self):
         """Handle failed call"""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = self.clock()
         self.consecutive_successes = 0
 
-        if self.failure_count >= self.failure_threshold:
+        if self.state == "HALF_OPEN" or self.failure_count >= self.failure_threshold:
             self.state = "OPEN"
-            logger.warning("Circuit breaker for {self.source_id} tripped to OPEN")
+            logger.warning(f"Circuit breaker for {self.source_id} tripped to OPEN")
 
 
 class PerformanceTracker:
@@ -552,6 +798,8 @@ class PerformanceTracker:
             "throughput": 0.0,
         }
         self.recent_performance = []
+        # End-to-end fetch times (request plus parsing), used for hedging
+        self.fetch_latencies: deque = deque(maxlen=200)
 
     async def record_request(self, latency: float, status_code: int):
         """Record request performance metrics"""
@@ -578,6 +826,15 @@ class PerformanceTracker:
         if len(self.recent_performance) > 100:
             self.recent_performance.pop(0)
 
+    def record_fetch_latency(self, latency: float):
+        self.fetch_latencies.append(latency)
+
+    def latency_percentile(self, q: float, min_samples: int = 10) -> Optional[float]:
+        """Recent fetch latency percentile, or None while there is too little data"""
+        if len(self.fetch_latencies) < min_samples:
+            return None
+        return float(np.percentile(self.fetch_latencies, q * 100))
+
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get comprehensive performance metrics"""
         total_requests = self.metrics["total_requests"]
@@ -752,6 +1009,33 @@ class DataReconciliationEngine:
         return max(data_points, key=lambda x: x.quality_metrics.confidence)
 
 
+class FetchPolicyStats:
+    """Latency and outcome counters for one fetch policy"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.fetches = 0
+        self.satisfied = 0  # the policy got as many good responses as it needed
+        self.requests = 0  # source fetches started
+        self.hedges = 0  # backup fetches started by the hedge timer
+        self.cancelled = 0  # source fetches abandoned once the policy was satisfied
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "fetches": self.fetches,
+            "satisfied": self.satisfied,
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "cancelled": self.cancelled,
+            "mean_latency": self.latency.total / self.latency.count
+            if self.latency.count
+            else 0.0,
+            "p50_latency": self.latency.quantile(0.5),
+            "p95_latency": self.latency.quantile(0.95),
+            "p99_latency": self.latency.quantile(0.99),
+        }
+
+
 class UltraEnhancedDataSourceManager:
     """Ultimate data source management system"""
 
@@ -763,6 +1047,23 @@ class UltraEnhancedDataSourceManager:
         self.quality_threshold = 0.7
         self.max_concurrent_requests = 50
         self.semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        # Latency-sensitive lookups stop waiting for the slowest provider;
+        # other data types still reconcile every source
+        self.fetch_policies: Dict[DataType, FetchPolicy] = {
+            DataType.LIVE_SCORES: FetchPolicy.HEDGED,
+            DataType.BETTING_ODDS: FetchPolicy.HEDGED,
+            DataType.LINE_MOVEMENTS: FetchPolicy.HEDGED,
+            DataType.PLAYER_PROPS: FetchPolicy.FIRST_GOOD,
+        }
+        self.quorum_size = 2
+        # Hedge delay bounds (seconds); the default applies until a source has
+        # enough latency history for a p95
+        self.hedge_delay_default = 0.25
+        self.hedge_delay_min = 0.01
+        self.hedge_delay_max = 2.0
+        self.policy_stats: Dict[FetchPolicy, FetchPolicyStats] = {
+            policy: FetchPolicyStats() for policy in FetchPolicy
+        }
 
     async def initialize(self):
         """Initialize all data sources and support systems"""
@@ -804,46 +1105,63 @@ class UltraEnhancedDataSourceManager:
 
         for source_id, config in sources_config.items():
             connector = DataSourceConnector(
-                source_id=source_id, reliability_tier=config["reliability_tier"]
+                source_id=source_id,
+                reliability_tier=config["reliability_tier"],
+                supported_data_types=config["supported_data_types"],
             )
-            await connector.initialize()
-            self.data_sources[source_id] = connector
+            await self.register_source(connector)
 
         logger.info("Registered {len(self.data_sources)} data sources")
 
+    async def register_source(self, connector: DataSourceConnector):
+        """Add (or replace) a connector"""
+        await connector.initialize()
+        self.data_sources[connector.source_id] = connector
+
+    async def _connector(
+        self,
+        source_id: str,
+        reliability_tier: DataSourceReliability,
+        supported_data_types: Sequence[DataType] = (),
+    ) -> DataSourceConnector:
+        """Registered connector for ``source_id``, registering it on first use"""
+        connector = self.data_sources.get(source_id)
+        if connector is None:
+            connector = DataSourceConnector(source_id, reliability_tier, supported_data_types)
+            await self.register_source(connector)
+        return connector
+
     async def fetch_multi_source_data(
-        self, data_type: DataType, entity_id: str, max_age_seconds: int = 300
+        self,
+        data_type: DataType,
+        entity_id: str,
+        max_age_seconds: int = 300,
+        policy: Optional[FetchPolicy] = None,
+        quorum: Optional[int] = None,
     ) -> Optional[EnhancedDataPoint]:
-        """Fetch data from multiple sources and return reconciled result"""
+        """Fetch data from multiple sources and return reconciled result
+
+        ``policy`` defaults to ``fetch_policies[data_type]`` (``ALL`` when
+        unset) and ``quorum`` to ``quorum_size``.
+        """
         try:
-            # Get all applicable sources for this data type
+            data_type = DataType(data_type)
+            policy = FetchPolicy(
+                policy or self.fetch_policies.get(data_type, FetchPolicy.ALL)
+            )
             applicable_sources = [
                 source_id
                 for source_id, connector in self.data_sources.items()
-                # This would check if source supports this data type
+                if connector.supports(data_type)
             ]
 
-            # Fetch data concurrently from all sources
-            tasks = []
-            for source_id in applicable_sources:
-                task = self._fetch_from_source(source_id, data_type, entity_id)
-                tasks.append(task)
-
-            # Execute all requests concurrently with semaphore protection
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Filter successful results and validate quality
-            valid_data_points = []
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.warning("Source {applicable_sources[i]} failed: {result!s}")
-                    continue
-
-                if (
-                    result
-                    and result.quality_metrics.confidence >= self.quality_threshold
-                ):
-                    valid_data_points.append(result)
+            valid_data_points = await self._fetch_with_policy(
+                policy,
+                applicable_sources,
+                data_type,
+                entity_id,
+                quorum or self.quorum_size,
+            )
 
             if not valid_data_points:
                 logger.warning("No valid data found for {data_type}:{entity_id}")
@@ -869,6 +1187,117 @@ class UltraEnhancedDataSourceManager:
             logger.error("Multi-source data fetch failed: {e!s}")
             return None
 
+    def _hedge_order(self, source_ids: List[str]) -> List[str]:
+        """Most reliable tier first, then fastest recent p95"""
+        tiers = list(DataSourceReliability)
+
+        def key(source_id: str) -> Tuple[int, float]:
+            connector = self.data_sources[source_id]
+            p95 = connector.performance_tracker.latency_percentile(0.95)
+            return (
+                tiers.index(connector.reliability_tier),
+                self.hedge_delay_default if p95 is None else p95,
+            )
+
+        return sorted(source_ids, key=key)
+
+    def _hedge_delay(self, source_id: str) -> float:
+        """How long to wait on ``source_id`` before starting a backup"""
+        tracker = self.data_sources[source_id].performance_tracker
+        p95 = tracker.latency_percentile(0.95)
+        if p95 is None:
+            return self.hedge_delay_default
+        return min(max(p95, self.hedge_delay_min), self.hedge_delay_max)
+
+    async def _fetch_with_policy(
+        self,
+        policy: FetchPolicy,
+        source_ids: List[str],
+        data_type: DataType,
+        entity_id: str,
+        quorum: int,
+    ) -> List[EnhancedDataPoint]:
+        """Run source fetches until ``policy`` is satisfied; return the good points
+
+        A point is good when its confidence reaches ``quality_threshold``.
+        Fetches still in flight once enough good points are in are cancelled.
+        """
+        stats = self.policy_stats[policy]
+        stats.fetches += 1
+        needed = {
+            FetchPolicy.ALL: len(source_ids),
+            FetchPolicy.FIRST_GOOD: 1,
+            FetchPolicy.QUORUM: min(quorum, len(source_ids)),
+            FetchPolicy.HEDGED: 1,
+        }[policy]
+        if policy is FetchPolicy.HEDGED:
+            waiting = self._hedge_order(source_ids)
+        else:
+            waiting = list(source_ids)
+        pending: Dict[asyncio.Task, str] = {}
+        good: List[EnhancedDataPoint] = []
+        started = time.perf_counter()
+        hedge_deadline = 0.0
+
+        def launch():
+            nonlocal hedge_deadline
+            source_id = waiting.pop(0)
+            task = asyncio.create_task(
+                self._fetch_from_source(source_id, data_type, entity_id)
+            )
+            pending[task] = source_id
+            stats.requests += 1
+            hedge_deadline = time.perf_counter() + self._hedge_delay(source_id)
+
+        if policy is FetchPolicy.HEDGED:
+            if waiting:
+                launch()
+        else:
+            while waiting:
+                launch()
+
+        try:
+            while pending and len(good) < needed:
+                timeout = None
+                if waiting:
+                    timeout = max(hedge_deadline - time.perf_counter(), 0.0)
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # The newest fetch is past its p95; race a backup against it
+                    stats.hedges += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    source_id = pending.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        logger.warning(f"Source {source_id} failed: {error!s}")
+                        continue
+                    result = task.result()
+                    if (
+                        result
+                        and result.quality_metrics.confidence >= self.quality_threshold
+                    ):
+                        good.append(result)
+
+                if waiting and not pending and len(good) < needed:
+                    # Everything in flight failed; move to the next source now
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            stats.cancelled += len(pending)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            stats.latency.observe(time.perf_counter() - started)
+
+        if good and len(good) >= needed:
+            stats.satisfied += 1
+        return good[:needed]
+
     async def _fetch_from_source(
         self, source_id: str, data_type: DataType, entity_id: str
     ) -> Optional[EnhancedDataPoint]:
@@ -878,12 +1307,17 @@ class UltraEnhancedDataSourceManager:
                 connector = self.data_sources[source_id]
 
                 # This would be implemented per source type
-                raw_data = await self._execute_source_request(
-                    connector, data_type, entity_id
-                )
+                started = time.perf_counter()
+                with span(f"connector.{source_id}.fetch"):
+                    raw_data = await self._execute_source_request(
+                        connector, data_type, entity_id
+                    )
 
                 if not raw_data:
                     return None
+                connector.performance_tracker.record_fetch_latency(
+                    time.perf_counter() - started
+                )
 
                 # Create enhanced data point
                 data_point = EnhancedDataPoint(
@@ -902,9 +1336,10 @@ class UltraEnhancedDataSourceManager:
                 )
 
                 # Validate and score data quality
-                quality_metrics = await self.data_validator.validate_data_point(
-                    data_point
-                )
+                with span("connector.validate"):
+                    quality_metrics = await self.data_validator.validate_data_point(
+                        data_point
+                    )
                 data_point.quality_metrics = quality_metrics
 
                 return data_point
@@ -917,14 +1352,7 @@ class UltraEnhancedDataSourceManager:
         self, connector: DataSourceConnector, data_type: DataType, entity_id: str
     ) -> Optional[Dict[str, Any]]:
         """Execute the actual API request for a specific source"""
-        # This would be implemented with source-specific logic
-        # For now, return mock data
-        return {
-            "entity_id": entity_id,
-            "data_type": data_type.value,
-            "mock_data": True,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
+        return await connector.fetch(data_type, entity_id)
 
     async def _normalize_data(
         self, raw_data: Dict[str, Any], data_type: DataType
@@ -963,6 +1391,7 @@ class UltraEnhancedDataSourceManager:
                     ),
                     "circuit_breaker_state": circuit_breaker_state,
                     "performance_metrics": metrics,
+                    "limits": connector.rate_limiter.get_limits(),
                 }
 
                 if circuit_breaker_state == "OPEN":
@@ -975,6 +1404,11 @@ class UltraEnhancedDataSourceManager:
                 }
                 health_status["overall_status"] = "degraded"
 
+        health_status["fetch_policies"] = {
+            policy.value: stats.snapshot()
+            for policy, stats in self.policy_stats.items()
+            if stats.fetches
+        }
         return health_status
 
     async def get_aggregated_data(
@@ -1026,27 +1460,36 @@ class UltraEnhancedDataSourceManager:
                 "Pragma": "no-cache",
             }
 
+            connector = await self._connector(
+                "prizepicks",
+                DataSourceReliability.TIER_3_COMMUNITY,
+                [DataType.PLAYER_PROPS],
+            )
             async with self.semaphore:  # Limit concurrent requests
-                async with aiohttp.ClientSession(
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as session:
-                    async with session.get(
-                        url, params=params, headers=headers
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return (
-                                data.get("data", []) if isinstance(data, dict) else []
-                            )
-                        else:
-                            logger.warning(
-                                f"PrizePicks API returned status {response.status}"
-                            )
-                            return []
+                # Adaptive rate, concurrency and circuit breaker for the endpoint
+                response = await connector.request(
+                    "GET",
+                    url,
+                    endpoint="projections",
+                    params=params,
+                    headers=headers,
+                    timeout=5,
+                )
+                if response.status_code == 200:
+                    data = await response.json_async()
+                    return data.get("data", []) if isinstance(data, dict) else []
+                else:
+                    logger.warning(
+                        f"PrizePicks API returned status {response.status_code}"
+                    )
+                    return []
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             logger.warning("PrizePicks API timeout - using cached/fallback data")
             return []
+        except SourceUnavailableError as e:
+            logger.warning(f"PrizePicks API unavailable: {e}")
+            return []
         except Exception as e:
             logger.error(f"Error fetching PrizePicks data: {e}")
             return []
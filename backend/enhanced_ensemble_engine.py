@@ -22,6 +22,7 @@ from ensemble_engine import (
     UltraAdvancedEnsembleEngine, ModelType, PredictionContext, 
     EnsembleConfiguration, PredictionOutput, ModelMetrics
 )
+from utils.oof_cache import OOFMatrix, OOFPredictionCache
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,8 @@ class QuantumEnsembleConfig:
     measurement_threshold: float = 0.85
     coherence_time: float = 0.5
     noise_level: float = 0.1
+    population_size: int = 64  # candidate weightings evolved together
+    rotation_rate: float = 0.1  # pull towards the best weighting each generation
 
 @dataclass
 class MultiObjectiveConfig:
@@ -52,6 +55,9 @@ class MultiObjectiveConfig:
     weight_constraints: Dict[str, Tuple[float, float]] = None
     convergence_threshold: float = 1e-6
     max_iterations: int = 500
+    max_ensemble_size: int = 8
+    max_candidates: int = 4096  # ensembles compared; beyond this they are sampled
+    seed: Optional[int] = None
 
     def __post_init__(self):
         if self.objectives is None:
@@ -59,8 +65,55 @@ class MultiObjectiveConfig:
         if self.weight_constraints is None:
             self.weight_constraints = {'accuracy': (0.2, 0.8), 'diversity': (0.1, 0.5)}
 
+def non_dominated_sort(scores: np.ndarray, block_size: int = 512) -> np.ndarray:
+    """Pareto front of each row of ``scores`` (0 = non-dominated), maximizing every column
+
+    Rows are first sorted lexicographically, descending, so a row can only be
+    dominated by rows sorted before it. The dominance relation is then
+    computed a block of rows at a time against the rows preceding them, and
+    fronts are peeled off by counting each row's remaining dominators.
+    """
+    scores = np.asarray(scores, dtype=float)
+    n = len(scores)
+    # np.lexsort takes its primary key last
+    order = np.lexsort(-scores[:, ::-1].T)
+    ordered = scores[order]
+    
+    # dominates[i, j]: sorted row i dominates sorted row j (only i < j possible)
+    dominates = np.zeros((n, n), dtype=bool)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        at_least = np.ones((stop - start, n - start), dtype=bool)
+        better = np.zeros((stop - start, n - start), dtype=bool)
+        # One pass per objective keeps the comparisons two-dimensional
+        for column in ordered.T:
+            block, later = column[start:stop, None], column[None, start:]
+            at_least &= block >= later
+            better |= block > later
+        dominates[start:stop, start:] = at_least & better
+    
+    ranks = np.full(n, -1, dtype=np.int64)
+    remaining = dominates.sum(axis=0)
+    rank = 0
+    while (ranks < 0).any():
+        front = np.flatnonzero((remaining == 0) & (ranks < 0))
+        ranks[front] = rank
+        remaining -= dominates[front].sum(axis=0)
+        rank += 1
+    
+    result = np.empty(n, dtype=np.int64)
+    result[order] = ranks
+    return result
+
 class QuantumInspiredOptimizer:
-    """Quantum-inspired optimization for ensemble weights"""
+    """Quantum-inspired optimization for ensemble weights
+
+    A population of ``population_size`` candidate weightings evolves together.
+    Each candidate holds ``superposition_states`` complex amplitudes per model,
+    as a ``(population, models, superposition_states)`` array. Evolution,
+    measurement, noise and scoring are whole-population array operations, so
+    one generation costs a few matrix products whatever the model count.
+    """
     
     def __init__(self, config: QuantumEnsembleConfig):
         self.config = config
@@ -81,12 +134,15 @@ class QuantumInspiredOptimizer:
             if n_models == 0:
                 return {}
             
+            performances = np.array([model_performances[m] for m in models], dtype=float)
+            history, history_mask = self._history_matrix(models, historical_data)
+            
             # Initialize quantum states
             quantum_states = self._initialize_quantum_states(n_models)
             
             # Create entanglement matrix
             entanglement_matrix = self._create_entanglement_matrix(
-                correlation_matrix, self.config.entanglement_strength
+                np.asarray(correlation_matrix, dtype=float), self.config.entanglement_strength
             )
             
             best_weights = None
@@ -95,20 +151,21 @@ class QuantumInspiredOptimizer:
             for iteration in range(self.config.quantum_iterations):
                 # Quantum evolution
                 quantum_states = self._quantum_evolution(
-                    quantum_states, entanglement_matrix, iteration
+                    quantum_states, entanglement_matrix, iteration, best_weights
                 )
                 
-                # Measurement and weight extraction
-                weights = self._measure_quantum_states(quantum_states, models)
+                # Measurement and weight extraction (population x models)
+                weights = self._measure_quantum_states(quantum_states)
                 
-                # Evaluate ensemble performance
-                score = await self._evaluate_quantum_ensemble(
-                    weights, model_performances, historical_data
+                # Evaluate every candidate weighting at once
+                scores = self._evaluate_quantum_ensemble(
+                    weights, performances, history, history_mask
                 )
                 
-                if score > best_score:
-                    best_score = score
-                    best_weights = weights.copy()
+                leader = int(np.argmax(scores))
+                if scores[leader] > best_score:
+                    best_score = scores[leader]
+                    best_weights = weights[leader].copy()
                 
                 # Apply quantum noise for exploration
                 if iteration % 10 == 0:
@@ -116,82 +173,68 @@ class QuantumInspiredOptimizer:
                         quantum_states, self.config.noise_level
                     )
             
-            return best_weights or {model: 1.0/n_models for model in models}
+            if best_weights is None:
+                return {model: 1.0/n_models for model in models}
+            return dict(zip(models, best_weights.tolist()))
             
         except Exception as e:
             logger.error(f"Quantum optimization failed: {e}")
             # Fallback to uniform weights
             return {model: 1.0/len(model_performances) for model in model_performances.keys()}
     
+    @staticmethod
+    def _normalize(states: np.ndarray) -> np.ndarray:
+        """Scale every candidate's amplitudes to unit norm"""
+        norms = np.sqrt((np.abs(states) ** 2).sum(axis=(1, 2), keepdims=True))
+        return np.divide(states, norms, out=states, where=norms > 0)
+    
     def _initialize_quantum_states(self, n_models: int) -> np.ndarray:
         """Initialize quantum states in superposition"""
-        states = np.random.complex128((n_models, self.config.superposition_states))
-        # Normalize to unit magnitude
-        for i in range(n_models):
-            norm = np.linalg.norm(states[i])
-            if norm > 0:
-                states[i] /= norm
-        return states
+        shape = (self.config.population_size, n_models, self.config.superposition_states)
+        states = np.random.normal(size=shape) + 1j * np.random.normal(size=shape)
+        return self._normalize(states)
     
     def _create_entanglement_matrix(
         self, correlation_matrix: np.ndarray, strength: float
     ) -> np.ndarray:
         """Create entanglement matrix based on model correlations"""
-        n_models = correlation_matrix.shape[0]
-        entanglement = np.zeros((n_models, n_models), dtype=complex)
-        
-        for i in range(n_models):
-            for j in range(i+1, n_models):
-                # Entanglement strength based on correlation
-                entanglement[i, j] = strength * correlation_matrix[i, j] * np.exp(1j * np.pi/4)
-                entanglement[j, i] = np.conj(entanglement[i, j])
-        
-        return entanglement
+        # Entanglement strength based on correlation, Hermitian by construction
+        upper = strength * np.triu(correlation_matrix, k=1) * np.exp(1j * np.pi/4)
+        return upper + upper.conj().T
     
     def _quantum_evolution(
-        self, states: np.ndarray, entanglement: np.ndarray, iteration: int
+        self,
+        states: np.ndarray,
+        entanglement: np.ndarray,
+        iteration: int,
+        best_weights: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """Evolve quantum states using Hamiltonian dynamics"""
         dt = self.config.coherence_time / self.config.quantum_iterations
         
-        # Hamiltonian evolution
-        for i in range(len(states)):
-            # Self-evolution
-            phase = np.exp(-1j * iteration * dt)
-            states[i] *= phase
-            
-            # Entanglement effects
-            for j in range(len(states)):
-                if i != j:
-                    coupling = entanglement[i, j] * dt
-                    states[i] += coupling * states[j]
-            
-            # Renormalize
-            norm = np.linalg.norm(states[i])
-            if norm > 0:
-                states[i] /= norm
+        # Self-evolution and entanglement coupling for the whole population
+        states = states * np.exp(-1j * iteration * dt)
+        states = states + dt * np.matmul(entanglement, states)
+        
+        if best_weights is not None and self.config.rotation_rate > 0:
+            # Rotate every candidate towards the amplitudes of the best
+            # weighting measured so far, keeping each state's phase
+            target = np.sqrt(best_weights / self.config.superposition_states)
+            phase = np.exp(1j * np.angle(states))
+            states = (
+                (1.0 - self.config.rotation_rate) * states
+                + self.config.rotation_rate * target[None, :, None] * phase
+            )
         
-        return states
+        return self._normalize(states)
     
-    def _measure_quantum_states(
-        self, states: np.ndarray, models: List[str]
-    ) -> Dict[str, float]:
-        """Measure quantum states to extract classical weights"""
-        weights = {}
-        
-        for i, model in enumerate(models):
-            # Probability amplitude
-            probability = np.sum(np.abs(states[i])**2)
-            weights[model] = float(probability)
-        
-        # Normalize weights
-        total_weight = sum(weights.values())
-        if total_weight > 0:
-            weights = {k: v/total_weight for k, v in weights.items()}
-        else:
-            weights = {model: 1.0/len(models) for model in models}
-        
-        return weights
+    def _measure_quantum_states(self, states: np.ndarray) -> np.ndarray:
+        """Measure quantum states to extract classical weights (population x models)"""
+        # Probability of each model: squared amplitudes over its superposition
+        probabilities = (np.abs(states) ** 2).sum(axis=2)
+        totals = probabilities.sum(axis=1, keepdims=True)
+        uniform = np.full_like(probabilities, 1.0 / probabilities.shape[1])
+        return np.divide(probabilities, totals, out=uniform, where=totals > 0)
     
     def _apply_quantum_noise(
         self, states: np.ndarray, noise_level: float
@@ -199,69 +242,84 @@ class QuantumInspiredOptimizer:
         """Apply quantum decoherence noise"""
         noise = np.random.normal(0, noise_level, states.shape) + \
                 1j * np.random.normal(0, noise_level, states.shape)
-        
-        noisy_states = states + noise
-        
-        # Renormalize
-        for i in range(len(noisy_states)):
-            norm = np.linalg.norm(noisy_states[i])
-            if norm > 0:
-                noisy_states[i] /= norm
-        
-        return noisy_states
+        return self._normalize(states + noise)
     
-    async def _evaluate_quantum_ensemble(
+    @staticmethod
+    def _history_matrix(
+        models: List[str], historical_data: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Recent historical weights (records x models) and which models each record had"""
+        # Last 10 predictions that recorded their weights
+        recent = [d['model_weights'] for d in historical_data[-10:] if 'model_weights' in d]
+        history = np.zeros((len(recent), len(models)))
+        mask = np.zeros((len(recent), len(models)))
+        for row, record in enumerate(recent):
+            for column, model in enumerate(models):
+                if model in record:
+                    history[row, column] = record[model]
+                    mask[row, column] = 1.0
+        return history, mask
+    
+    def _evaluate_quantum_ensemble(
         self,
-        weights: Dict[str, float],
-        performances: Dict[str, float],
-        historical_data: List[Dict[str, Any]]
-    ) -> float:
-        """Evaluate quantum ensemble performance"""
+        weights: np.ndarray,
+        performances: np.ndarray,
+        history: np.ndarray,
+        history_mask: np.ndarray
+    ) -> np.ndarray:
+        """Evaluate quantum ensemble performance of every candidate weighting"""
         # Weighted performance score
-        weighted_performance = sum(
-            weights[model] * performances[model] 
-            for model in weights.keys()
-        )
+        weighted_performance = weights @ performances
         
         # Diversity bonus (entropy of weights)
-        entropy = -sum(w * np.log(w + 1e-10) for w in weights.values())
-        diversity_bonus = entropy / np.log(len(weights)) if len(weights) > 1 else 0
+        n_models = weights.shape[1]
+        entropy = -(weights * np.log(weights + 1e-10)).sum(axis=1)
+        diversity_bonus = entropy / np.log(n_models) if n_models > 1 else np.zeros(len(weights))
         
         # Historical consistency
-        consistency_score = await self._calculate_consistency(weights, historical_data)
+        consistency_score = self._calculate_consistency(weights, history, history_mask)
         
         # Composite score
         return 0.6 * weighted_performance + 0.2 * diversity_bonus + 0.2 * consistency_score
     
-    async def _calculate_consistency(
-        self, weights: Dict[str, float], historical_data: List[Dict[str, Any]]
-    ) -> float:
-        """Calculate consistency of weights with historical performance"""
-        if not historical_data:
-            return 0.5
-        
-        # Simplified consistency calculation
-        recent_data = historical_data[-10:]  # Last 10 predictions
-        consistency_scores = []
-        
-        for data in recent_data:
-            if 'model_weights' in data:
-                historical_weights = data['model_weights']
-                # Calculate weight similarity (cosine similarity)
-                common_models = set(weights.keys()) & set(historical_weights.keys())
-                if common_models:
-                    w1 = np.array([weights.get(m, 0) for m in common_models])
-                    w2 = np.array([historical_weights.get(m, 0) for m in common_models])
-                    
-                    if np.linalg.norm(w1) > 0 and np.linalg.norm(w2) > 0:
-                        similarity = np.dot(w1, w2) / (np.linalg.norm(w1) * np.linalg.norm(w2))
-                        consistency_scores.append(similarity)
-        
-        return np.mean(consistency_scores) if consistency_scores else 0.5
+    def _calculate_consistency(
+        self, weights: np.ndarray, history: np.ndarray, history_mask: np.ndarray
+    ) -> np.ndarray:
+        """Mean cosine similarity of each weighting with recent historical weights
+
+        Each comparison only covers the models the historical record had.
+        Records with no comparable weights are skipped. A candidate with none
+        left scores the neutral 0.5.
+        """
+        if len(history) == 0:
+            return np.full(len(weights), 0.5)
+        
+        dots = weights @ history.T
+        # Candidate norms restricted to each record's models
+        weight_norms = np.sqrt((weights ** 2) @ history_mask.T)
+        history_norms = np.linalg.norm(history, axis=1)[None, :]
+        valid = (weight_norms > 0) & (history_norms > 0)
+        
+        similarity = np.divide(
+            dots, weight_norms * history_norms,
+            out=np.zeros_like(dots), where=valid
+        )
+        counts = valid.sum(axis=1)
+        return np.where(
+            counts > 0, similarity.sum(axis=1) / np.maximum(counts, 1), 0.5
+        )
 
 class MultiObjectiveOptimizer:
     """Multi-objective optimization for ensemble selection"""
     
+    # Default weights for objectives
+    OBJECTIVE_WEIGHTS = {
+        'accuracy': 0.4,
+        'diversity': 0.2,
+        'speed': 0.2,
+        'robustness': 0.2
+    }
+    
     def __init__(self, config: MultiObjectiveConfig):
         self.config = config
         
@@ -269,23 +327,29 @@ class MultiObjectiveOptimizer:
         self,
         candidate_models: List[str],
         model_metrics: Dict[str, ModelMetrics],
-        context: PredictionContext
+        context: PredictionContext,
+        oof: Optional[OOFMatrix] = None
     ) -> Tuple[List[str], Dict[str, float]]:
-        """Optimize ensemble using multi-objective criteria"""
+        """Optimize ensemble using multi-objective criteria
+
+        With ``oof`` (out-of-fold predictions of the candidates), accuracy and
+        diversity are measured on those predictions, and every candidate
+        ensemble is scored from the matrix without running a model.
+        """
         try:
             # Calculate objective scores for each model
             objective_scores = await self._calculate_objective_scores(
-                candidate_models, model_metrics, context
+                candidate_models, model_metrics, context, oof
             )
             
             # Find Pareto optimal solutions
             pareto_solutions = self._find_pareto_frontier(
-                candidate_models, objective_scores
+                candidate_models, objective_scores, oof
             )
             
             # Select best solution from Pareto frontier
             best_solution = await self._select_from_pareto_frontier(
-                pareto_solutions, objective_scores
+                pareto_solutions, objective_scores, oof
             )
             
             # Calculate optimal weights for selected models
@@ -310,17 +374,25 @@ class MultiObjectiveOptimizer:
         self,
         models: List[str],
         metrics: Dict[str, ModelMetrics],
-        context: PredictionContext
+        context: PredictionContext,
+        oof: Optional[OOFMatrix] = None
     ) -> Dict[str, Dict[str, float]]:
         """Calculate scores for each objective"""
         scores = {}
+        if oof is not None:
+            oof = oof.subset(models)
+            # R² of each model alone, from the identity weighting
+            oof_accuracy = np.clip(oof.r2(np.eye(len(models))), 0.0, 1.0)
         
         for model in models:
             model_metrics = metrics[model]
             model_scores = {}
             
             # Accuracy objective
-            model_scores['accuracy'] = model_metrics.accuracy
+            if oof is not None:
+                model_scores['accuracy'] = float(oof_accuracy[models.index(model)])
+            else:
+                model_scores['accuracy'] = model_metrics.accuracy
             
             # Speed objective (inverse of processing time)
             model_scores['speed'] = 1.0 / (1.0 + model_metrics.avg_return)  # Placeholder
@@ -334,16 +406,31 @@ class MultiObjectiveOptimizer:
             scores[model] = model_scores
         
         # Calculate diversity scores
-        await self._calculate_diversity_scores(scores, models)
+        await self._calculate_diversity_scores(scores, models, oof)
         
         return scores
     
     async def _calculate_diversity_scores(
-        self, scores: Dict[str, Dict[str, float]], models: List[str]
+        self,
+        scores: Dict[str, Dict[str, float]],
+        models: List[str],
+        oof: Optional[OOFMatrix] = None
     ):
         """Calculate diversity scores between models"""
         n_models = len(models)
         
+        if oof is not None:
+            # 1 - mean correlation of a model's errors with everyone else's
+            if n_models < 2:
+                for model in models:
+                    scores[model]['diversity'] = 0.0
+                return
+            correlation = oof.error_correlation()
+            mean_correlation = (correlation.sum(axis=1) - np.diag(correlation)) / (n_models - 1)
+            for model, value in zip(models, 1.0 - mean_correlation):
+                scores[model]['diversity'] = float(np.clip(value, 0.0, 1.0))
+            return
+        
         for i, model1 in enumerate(models):
             diversity_sum = 0.0
             
@@ -362,71 +449,136 @@ class MultiObjectiveOptimizer:
     def _find_pareto_frontier(
         self,
         models: List[str],
-        objective_scores: Dict[str, Dict[str, float]]
+        objective_scores: Dict[str, Dict[str, float]],
+        oof: Optional[OOFMatrix] = None
     ) -> List[List[str]]:
-        """Find Pareto optimal solutions"""
-        pareto_solutions = []
+        """Find Pareto optimal solutions
+
+        Candidate ensembles are scored together, ranked with a non-dominated
+        sort, and returned front by front, best weighted score first within a
+        front.
+        """
+        membership = self._candidate_ensembles(models, objective_scores)
+        if len(membership) == 0:
+            return []
         
-        # Generate all possible combinations up to max size
-        from itertools import combinations
+        # Objective scores of every candidate at once (candidates x objectives)
+        aggregated = self._aggregate_membership_scores(membership, models, objective_scores, oof)
+        ranks = non_dominated_sort(aggregated)
+        weighted = aggregated @ self._objective_weights()
+        order = np.lexsort((-weighted, ranks))[:self.config.pareto_frontier_size]
         
-        max_ensemble_size = min(len(models), 8)  # Reasonable limit
+        names = np.asarray(models)
+        return [names[membership[index] > 0].tolist() for index in order]
+    
+    def _objective_weights(self) -> np.ndarray:
+        return np.array([
+            self.OBJECTIVE_WEIGHTS.get(objective, 0.25) for objective in self.config.objectives
+        ])
+    
+    def _candidate_ensembles(
+        self, models: List[str], objective_scores: Dict[str, Dict[str, float]]
+    ) -> np.ndarray:
+        """Membership rows (candidates x models) of the ensembles to compare
+
+        Every combination of 2 to ``max_ensemble_size`` models when there are
+        at most ``max_candidates`` of them. Otherwise, the top-k models by
+        accuracy for each size plus random combinations up to that budget.
+        """
+        from itertools import combinations
+        from math import comb
         
-        for size in range(2, max_ensemble_size + 1):
-            for combination in combinations(models, size):
-                if self._is_pareto_optimal(
-                    list(combination), pareto_solutions, objective_scores
-                ):
-                    pareto_solutions.append(list(combination))
+        n_models = len(models)
+        max_size = min(n_models, self.config.max_ensemble_size)
+        if max_size < 2:
+            return np.zeros((0, n_models))
+        
+        sizes = range(2, max_size + 1)
+        if sum(comb(n_models, size) for size in sizes) <= self.config.max_candidates:
+            return self._membership(
+                [list(c) for size in sizes for c in combinations(models, size)], models
+            )
         
-        return pareto_solutions[:self.config.pareto_frontier_size]
+        # Top-k by accuracy for every size
+        ranked = np.argsort([-objective_scores[m].get('accuracy', 0.0) for m in models])
+        top_k = np.zeros((len(sizes), n_models))
+        for row, size in enumerate(sizes):
+            top_k[row, ranked[:size]] = 1.0
+        
+        # Random combinations: the lowest `size` of a row of random keys
+        rng = np.random.default_rng(self.config.seed)
+        n_random = self.config.max_candidates - len(top_k)
+        random_sizes = rng.integers(2, max_size + 1, size=n_random)
+        keys = rng.random((n_random, n_models))
+        key_ranks = keys.argsort(axis=1).argsort(axis=1)
+        sampled = (key_ranks < random_sizes[:, None]).astype(float)
+        
+        return np.unique(np.vstack([top_k, sampled]), axis=0)
+    
+    @staticmethod
+    def _membership(ensembles: List[List[str]], models: List[str]) -> np.ndarray:
+        """0/1 matrix (ensembles x models) of which models each ensemble uses"""
+        position = {model: i for i, model in enumerate(models)}
+        membership = np.zeros((len(ensembles), len(models)))
+        for row, ensemble in enumerate(ensembles):
+            membership[row, [position[model] for model in ensemble]] = 1.0
+        return membership
     
-    def _is_pareto_optimal(
+    def _aggregate_membership_scores(
         self,
-        candidate: List[str],
-        existing_solutions: List[List[str]],
-        objective_scores: Dict[str, Dict[str, float]]
-    ) -> bool:
-        """Check if candidate solution is Pareto optimal"""
-        candidate_scores = self._aggregate_ensemble_scores(candidate, objective_scores)
-        
-        for existing in existing_solutions:
-            existing_scores = self._aggregate_ensemble_scores(existing, objective_scores)
-            
-            # Check if existing dominates candidate
-            dominates = True
-            for objective in self.config.objectives:
-                if existing_scores[objective] <= candidate_scores[objective]:
-                    dominates = False
-                    break
-            
-            if dominates:
-                return False
+        membership: np.ndarray,
+        models: List[str],
+        objective_scores: Dict[str, Dict[str, float]],
+        oof: Optional[OOFMatrix] = None
+    ) -> np.ndarray:
+        """Objective scores (ensembles x objectives) of equally weighted ensembles"""
+        sizes = membership.sum(axis=1)
+        per_model = np.array(
+            [[objective_scores[model][objective] for objective in self.config.objectives]
+             for model in models]
+        )
+        # Mean of the members' scores, for every objective
+        aggregated = membership @ per_model / sizes[:, None]
+        
+        if oof is not None:
+            oof = oof.subset(models)
+            objectives = self.config.objectives
+            if 'accuracy' in objectives:
+                # R² of the averaged out-of-fold predictions
+                aggregated[:, objectives.index('accuracy')] = np.clip(
+                    oof.r2(membership), 0.0, 1.0
+                )
+            if 'diversity' in objectives and len(models) > 1:
+                # 1 - mean pairwise error correlation among the members
+                correlation = oof.error_correlation()
+                pair_sum = (
+                    np.einsum('ki,ij,kj->k', membership, correlation, membership)
+                    - membership @ np.diag(correlation)
+                )
+                pairs = np.maximum(sizes * (sizes - 1), 1.0)
+                aggregated[:, objectives.index('diversity')] = np.clip(
+                    1.0 - pair_sum / pairs, 0.0, 1.0
+                )
         
-        return True
+        return aggregated
     
     def _aggregate_ensemble_scores(
-        self, ensemble: List[str], objective_scores: Dict[str, Dict[str, float]]
+        self,
+        ensemble: List[str],
+        objective_scores: Dict[str, Dict[str, float]],
+        oof: Optional[OOFMatrix] = None
     ) -> Dict[str, float]:
         """Aggregate objective scores for an ensemble"""
-        aggregated = {}
-        
-        for objective in self.config.objectives:
-            if objective == 'diversity':
-                # For diversity, take the average
-                scores = [objective_scores[model][objective] for model in ensemble]
-                aggregated[objective] = np.mean(scores)
-            else:
-                # For other objectives, take weighted average
-                scores = [objective_scores[model][objective] for model in ensemble]
-                aggregated[objective] = np.mean(scores)
-        
-        return aggregated
+        aggregated = self._aggregate_membership_scores(
+            np.ones((1, len(ensemble))), ensemble, objective_scores, oof
+        )[0]
+        return dict(zip(self.config.objectives, aggregated.tolist()))
     
     async def _select_from_pareto_frontier(
         self,
         pareto_solutions: List[List[str]],
-        objective_scores: Dict[str, Dict[str, float]]
+        objective_scores: Dict[str, Dict[str, float]],
+        oof: Optional[OOFMatrix] = None
     ) -> List[str]:
         """Select best solution from Pareto frontier"""
         if not pareto_solutions:
@@ -434,17 +586,10 @@ class MultiObjectiveOptimizer:
         
         # Score each solution using weighted objectives
         solution_scores = {}
-        
-        # Default weights for objectives
-        objective_weights = {
-            'accuracy': 0.4,
-            'diversity': 0.2,
-            'speed': 0.2,
-            'robustness': 0.2
-        }
+        objective_weights = self.OBJECTIVE_WEIGHTS
         
         for solution in pareto_solutions:
-            aggregated_scores = self._aggregate_ensemble_scores(solution, objective_scores)
+            aggregated_scores = self._aggregate_ensemble_scores(solution, objective_scores, oof)
             
             # Calculate weighted score
             weighted_score = sum(
@@ -494,7 +639,31 @@ class EnhancedEnsembleEngine(UltraAdvancedEnsembleEngine):
         self.multi_objective_optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig())
         self.optimization_strategy = OptimizationStrategy.MULTI_OBJECTIVE
         self.performance_history = []
-        
+        # Out-of-fold predictions the selectors score ensembles on
+        self.oof_cache = OOFPredictionCache()
+        self.oof_predictions: Optional[OOFMatrix] = None
+        
+    async def refresh_oof_predictions(
+        self, X: np.ndarray, y: np.ndarray, models: Optional[List[str]] = None
+    ) -> OOFMatrix:
+        """Compute (or reuse) out-of-fold predictions of the models on ``(X, y)``"""
+        names = models or self.model_registry.get_active_models()
+        estimators = {}
+        for name in names:
+            model = await self._get_or_load_model(name)
+            if model is not None and hasattr(model, "fit"):
+                estimators[name] = model
+        self.oof_predictions = await asyncio.to_thread(self.oof_cache.matrix, estimators, X, y)
+        return self.oof_predictions
+    
+    def _oof_for(self, models: List[str]) -> Optional[OOFMatrix]:
+        """Cached out-of-fold predictions, if they cover every one of ``models``"""
+        if self.oof_predictions is None or not models:
+            return None
+        if not set(models) <= set(self.oof_predictions.models):
+            return None
+        return self.oof_predictions.subset(models)
+    
     async def predict_enhanced(
         self,
         features: Dict[str, float],
@@ -562,11 +731,16 @@ class EnhancedEnsembleEngine(UltraAdvancedEnsembleEngine):
             else:
                 model_performances[model] = 0.5
         
-        # Create correlation matrix (simplified)
-        n_models = len(candidate_models)
-        correlation_matrix = np.random.rand(n_models, n_models)
-        correlation_matrix = (correlation_matrix + correlation_matrix.T) / 2
-        np.fill_diagonal(correlation_matrix, 1.0)
+        oof = self._oof_for(candidate_models)
+        if oof is not None:
+            # How alike the models' out-of-fold errors are
+            correlation_matrix = oof.error_correlation()
+        else:
+            # Create correlation matrix (simplified)
+            n_models = len(candidate_models)
+            correlation_matrix = np.random.rand(n_models, n_models)
+            correlation_matrix = (correlation_matrix + correlation_matrix.T) / 2
+            np.fill_diagonal(correlation_matrix, 1.0)
         
         # Optimize weights
         weights = await self.quantum_optimizer.optimize_weights(
@@ -587,7 +761,10 @@ class EnhancedEnsembleEngine(UltraAdvancedEnsembleEngine):
     ) -> Tuple[List[str], Dict[str, float]]:
         """Select ensemble using multi-objective optimization"""
         return await self.multi_objective_optimizer.optimize_ensemble(
-            candidate_models, self.model_registry.model_metrics, context
+            candidate_models,
+            self.model_registry.model_metrics,
+            context,
+            oof=self._oof_for(candidate_models),
         )
     
     async def _calculate_enhanced_ensemble_prediction(
@@ -821,10 +821,11 @@ class EnhancedRiskManagement:
             jd_result = self.stochastic_processes.jump_diffusion_process(price_series)
             process_results["jump_diffusion"] = jd_result
 
-        # Regime switching
+        # Regime switching (fit on the price path: the model takes log returns,
+        # which are undefined for cumulative returns that dip below zero)
         if len(portfolio_returns) > 50:
             rs_result = self.stochastic_processes.regime_switching_model(
-                np.cumsum(portfolio_returns)
+                np.exp(np.cumsum(portfolio_returns))
             )
             process_results["regime_switching"] = rs_result
 
@@ -3,6 +3,7 @@ Sophisticated ensemble techniques for maximum prediction accuracy including meta
 stacking, blending, and dynamic weight optimization
 """
 
+import asyncio
 import logging
 import warnings
 from collections import defaultdict, deque
@@ -41,20 +42,22 @@ from sklearn.linear_model import (
     SGDRegressor,
     TheilSenRegressor,
 )
-from sklearn.metrics import (
-    explained_variance_score,
-    mean_absolute_error,
-    mean_squared_error,
-    median_absolute_error,
-    r2_score,
-)
-from sklearn.model_selection import cross_val_score
 from sklearn.neighbors import KNeighborsRegressor
 from sklearn.neural_network import MLPRegressor
 from sklearn.svm import SVR
 from sklearn.tree import DecisionTreeRegressor, ExtraTreeRegressor
 from tensorflow import keras
 
+from utils.hyperparameter_search import (
+    ModelEvaluation,
+    ParallelSearchSettings,
+    evaluate_models,
+    fit_and_score,
+    optimize_weights,
+    study_name,
+)
+from utils.oof_cache import OOFMatrix, OOFPredictionCache, dataset_version, model_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -169,9 +172,14 @@ class EnsemblePrediction:
 class AdvancedEnsembleOptimizer:
     """Advanced ensemble optimizer for maximum prediction accuracy"""
 
-    def __init__(self):
+    def __init__(self, search_settings: Optional[ParallelSearchSettings] = None):
+        self.search_settings = search_settings or ParallelSearchSettings()
         self.models = {}
         self.model_performances = {}
+        # Cross-validated predictions per (model, dataset), shared by weighting
+        # and stacking so neither refits base models
+        self.oof_cache = OOFPredictionCache(cv=5)
+        self._oof_dataset: Optional[str] = None
         self.ensemble_configurations = {}
         self.weight_history = defaultdict(deque)
         self.performance_history = defaultdict(deque)
@@ -428,14 +436,22 @@ class AdvancedEnsembleOptimizer:
         optimization_method: WeightOptimizationMethod = WeightOptimizationMethod.BAYESIAN_OPTIMIZATION,
         target_accuracy: float = 0.95,
         max_iterations: int = 100,
+        parallel: Optional[bool] = None,
     ) -> EnsembleConfiguration:
-        """Optimize ensemble for maximum accuracy"""
+        """Optimize ensemble for maximum accuracy
+
+        ``parallel`` (default ``search_settings.enabled``) fits models in a
+        process pool and runs concurrent, pruned Optuna trials whose studies
+        persist to ``search_settings.storage_path``.
+        """
         logger.info("Optimizing ensemble with strategy: {strategy.value}")
         start_time = datetime.now()
+        if parallel is None:
+            parallel = self.search_settings.enabled
 
         # 1. Train and evaluate individual models
         individual_performances = await self._evaluate_individual_models(
-            X_train, y_train, X_val, y_val
+            X_train, y_train, X_val, y_val, parallel=parallel
         )
 
         # 2. Select best performing models
@@ -448,13 +464,23 @@ class AdvancedEnsembleOptimizer:
 
         # 3. Optimize ensemble weights
         optimal_weights = await self._optimize_ensemble_weights(
-            selected_models, X_train, y_train, X_val, y_val, optimization_method
+            selected_models,
+            X_train,
+            y_train,
+            X_val,
+            y_val,
+            optimization_method,
+            parallel=parallel,
         )
 
         # 4. Create ensemble configuration based on strategy
         if strategy == EnsembleStrategy.STACKING:
             config = await self._create_stacking_ensemble(
-                selected_models, optimal_weights, X_train, y_train
+                selected_models,
+                optimal_weights,
+                X_train,
+                y_train,
+                weight_optimization=optimization_method,
             )
         elif strategy == EnsembleStrategy.MULTI_LEVEL_STACKING:
             config = await self._create_multi_level_stacking(
@@ -500,9 +526,31 @@ class AdvancedEnsembleOptimizer:
         y_train: np.ndarray,
         X_val: np.ndarray,
         y_val: np.ndarray,
+        parallel: bool = False,
     ) -> Dict[str, ModelPerformanceMetrics]:
         """Evaluate individual model performances"""
         performances = {}
+        self._oof_dataset = dataset_version(X_train, y_train)
+
+        if parallel:
+            # Fit in worker processes; adopt the fitted estimators they return
+            settings = self.search_settings
+            evaluations = await asyncio.to_thread(
+                evaluate_models,
+                self.models,
+                X_train,
+                y_train,
+                X_val,
+                y_val,
+                max_workers=settings.max_workers,
+                cv_folds=self.oof_cache.cv,
+                timeout=settings.timeout,
+            )
+            for model_name, evaluation in evaluations.items():
+                if evaluation.error is None:
+                    self.models[model_name] = evaluation.model
+                performances[model_name] = self._record_evaluation(evaluation, y_train)
+            return performances
 
         # Use ThreadPoolExecutor for parallel model training
         with ThreadPoolExecutor(max_workers=8) as executor:
@@ -542,81 +590,18 @@ class AdvancedEnsembleOptimizer:
         y_val: np.ndarray,
     ) -> ModelPerformanceMetrics:
         """Train and evaluate a single model"""
-        start_time = datetime.now()
-
-        try:
-            # Train model
-            model.fit(X_train, y_train)
-            training_time = (datetime.now() - start_time).total_seconds()
-
-            # Make predictions
-            pred_start = datetime.now()
-            y_pred = model.predict(X_val)
-            prediction_time = (datetime.now() - pred_start).total_seconds()
-
-            # Calculate metrics
-            mse = mean_squared_error(y_val, y_pred)
-            mae = mean_absolute_error(y_val, y_pred)
-            r2 = r2_score(y_val, y_pred)
-            explained_var = explained_variance_score(y_val, y_pred)
-            median_ae = median_absolute_error(y_val, y_pred)
-            max_err = np.max(np.abs(y_val - y_pred))
-
-            # Cross-validation scores
-            cv_scores = cross_val_score(
-                model, X_train, y_train, cv=5, scoring="r2", n_jobs=-1
-            )
-
-            # Feature importance (if available)
-            feature_importance = {}
-            if hasattr(model, "feature_importances_"):
-                feature_importance = {
-                    f"feature_{i}": importance
-                    for i, importance in enumerate(model.feature_importances_)
-                }
-            elif hasattr(model, "coef_"):
-                feature_importance = {
-                    f"feature_{i}": abs(coef) for i, coef in enumerate(model.coef_)
-                }
-
-            # Calculate additional metrics
-            directional_accuracy = self._calculate_directional_accuracy(y_val, y_pred)
-            stability_score = 1.0 - np.std(cv_scores)
-            overfitting_score = abs(r2 - np.mean(cv_scores))
-
-            return ModelPerformanceMetrics(
-                model_name=model_name,
-                mse=mse,
-                mae=mae,
-                r2_score=r2,
-                explained_variance=explained_var,
-                median_absolute_error=median_ae,
-                max_error=max_err,
-                cv_scores=cv_scores.tolist(),
-                cv_mean=np.mean(cv_scores),
-                cv_std=np.std(cv_scores),
-                training_time=training_time,
-                prediction_time=prediction_time,
-                memory_usage=1.5,  # Calculated based on model size
-                stability_score=stability_score,
-                overfitting_score=overfitting_score,
-                feature_importance=feature_importance,
-                prediction_intervals=(
-                    [(0.85, 1.15), (0.75, 1.25)] if len(y_pred) > 0 else []
-                ),
-                confidence_scores=[
-                    0.85,
-                    0.75,
-                    0.92,
-                ],  # Derived from cross-validation scores
-                directional_accuracy=directional_accuracy,
-                profit_correlation=0.73,  # Calculated correlation with profit
-                sharpe_ratio=1.42,  # Calculated Sharpe ratio
-                last_updated=datetime.now(),
-            )
+        evaluation = fit_and_score(
+            model_name, model, X_train, y_train, X_val, y_val, self.oof_cache.cv
+        )
+        return self._record_evaluation(evaluation, y_train)
 
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Error training model {model_name}: {e}")
+    def _record_evaluation(
+        self, evaluation: ModelEvaluation, y_train: np.ndarray
+    ) -> ModelPerformanceMetrics:
+        """Cache an evaluation's out-of-fold predictions and convert its metrics"""
+        model_name = evaluation.name
+        if evaluation.error is not None:
+            logger.error("Error training model %s: %s", model_name, evaluation.error)
             # Return default metrics for failed models
             return ModelPerformanceMetrics(
                 model_name=model_name,
@@ -643,17 +628,48 @@ class AdvancedEnsembleOptimizer:
                 last_updated=datetime.now(),
             )
 
-    def _calculate_directional_accuracy(
-        self, y_true: np.ndarray, y_pred: np.ndarray
-    ) -> float:
-        """Calculate directional accuracy"""
-        if len(y_true) < 2:
-            return 0.5
-
-        true_directions = np.diff(y_true) > 0
-        pred_directions = np.diff(y_pred) > 0
-
-        return np.mean(true_directions == pred_directions)
+        if self._oof_dataset is not None:
+            self.oof_cache.store(
+                model_name,
+                model_version(evaluation.model),
+                self._oof_dataset,
+                y_train,
+                evaluation.oof_predictions,
+            )
+        metrics = evaluation.metrics
+        cv_scores = np.asarray(metrics["cv_scores"])
+        y_val_pred = evaluation.predictions
+
+        return ModelPerformanceMetrics(
+            model_name=model_name,
+            mse=metrics["mse"],
+            mae=metrics["mae"],
+            r2_score=metrics["r2_score"],
+            explained_variance=metrics["explained_variance"],
+            median_absolute_error=metrics["median_absolute_error"],
+            max_error=metrics["max_error"],
+            cv_scores=cv_scores.tolist(),
+            cv_mean=np.mean(cv_scores),
+            cv_std=np.std(cv_scores),
+            training_time=metrics["training_time"],
+            prediction_time=metrics["prediction_time"],
+            memory_usage=1.5,  # Calculated based on model size
+            stability_score=1.0 - np.std(cv_scores),
+            overfitting_score=abs(metrics["r2_score"] - np.mean(cv_scores)),
+            feature_importance=metrics["feature_importance"],
+            prediction_intervals=(
+                [(0.85, 1.15), (0.75, 1.25)] if len(y_val_pred) > 0 else []
+            ),
+            confidence_scores=[
+                0.85,
+                0.75,
+                0.92,
+            ],  # Derived from cross-validation scores
+            directional_accuracy=metrics["directional_accuracy"],
+            profit_correlation=0.73,  # Calculated correlation with profit
+            sharpe_ratio=1.42,  # Calculated Sharpe ratio
+            last_updated=datetime.now(),
+        )
 
     async def _select_best_models(
         self,
@@ -723,98 +739,124 @@ class AdvancedEnsembleOptimizer:
         X_val: np.ndarray,
         y_val: np.ndarray,
         optimization_method: WeightOptimizationMethod,
+        parallel: bool = False,
     ) -> Dict[str, float]:
-        """Optimize ensemble weights using specified method"""
-        # Get predictions from selected models
-        model_predictions = {}
-        for model_name in selected_models:
-            model = self.models[model_name]
-            model.fit(X_train, y_train)
-            predictions = model.predict(X_val)
-            model_predictions[model_name] = predictions
+        """Optimize ensemble weights using specified method
+
+        Weightings are scored on the selected models' out-of-fold predictions
+        for the training set, so no base model is refit here and the
+        validation set stays unseen until the ensemble is validated.
+        """
+        oof = self._oof_matrix(selected_models, X_train, y_train)
+        model_predictions = oof.as_dict()
 
         if optimization_method == WeightOptimizationMethod.EQUAL_WEIGHTS:
             return {model: 1.0 / len(selected_models) for model in selected_models}
 
         elif optimization_method == WeightOptimizationMethod.PERFORMANCE_BASED:
-            return await self._performance_based_weights(
-                selected_models, model_predictions, y_val
-            )
+            return await self._performance_based_weights(oof)
 
         elif optimization_method == WeightOptimizationMethod.BAYESIAN_OPTIMIZATION:
             return await self._bayesian_optimize_weights(
-                selected_models, model_predictions, y_val
+                selected_models, model_predictions, oof.y, parallel=parallel
             )
 
         elif optimization_method == WeightOptimizationMethod.DIFFERENTIAL_EVOLUTION:
             return await self._differential_evolution_weights(
-                selected_models, model_predictions, y_val
+                selected_models, model_predictions, oof.y
             )
 
         else:
             # Default to performance-based
-            return await self._performance_based_weights(
-                selected_models, model_predictions, y_val
-            )
+            return await self._performance_based_weights(oof)
+
+    def _oof_matrix(
+        self, selected_models: List[str], X_train: np.ndarray, y_train: np.ndarray
+    ) -> OOFMatrix:
+        """Out-of-fold predictions of ``selected_models``; cached after evaluation"""
+        return self.oof_cache.matrix(
+            {model_name: self.models[model_name] for model_name in selected_models},
+            X_train,
+            y_train,
+        )
 
-    async def _performance_based_weights(
-        self, models: List[str], predictions: Dict[str, np.ndarray], y_true: np.ndarray
-    ) -> Dict[str, float]:
+    async def _performance_based_weights(self, oof: OOFMatrix) -> Dict[str, float]:
         """Calculate performance-based weights"""
-        model_scores = {}
-        for model_name in models:
-            r2 = r2_score(y_true, predictions[model_name])
-            model_scores[model_name] = max(0, r2)  # Ensure non-negative
+        # Each model alone is the identity weighting; ensure non-negative
+        model_scores = np.maximum(oof.r2(np.eye(len(oof.models))), 0.0)
 
         # Normalize weights
-        total_score = sum(model_scores.values())
+        total_score = model_scores.sum()
         if total_score == 0:
-            return {model: 1.0 / len(models) for model in models}
+            return {model: 1.0 / len(oof.models) for model in oof.models}
 
-        return {model: score / total_score for model, score in model_scores.items()}
+        return dict(zip(oof.models, (model_scores / total_score).tolist()))
+
+    async def _create_stacking_ensemble(
+        self,
+        selected_models: List[str],
+        weights: Dict[str, float],
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        weight_optimization: WeightOptimizationMethod = WeightOptimizationMethod.PERFORMANCE_BASED,
+        meta_model: str = "meta_ridge",
+    ) -> EnsembleConfiguration:
+        """Fit a meta-learner on the base models' out-of-fold predictions"""
+        oof = self._oof_matrix(selected_models, X_train, y_train)
+        self.meta_models[meta_model].fit(oof.predictions, oof.y)
+
+        now = datetime.now()
+        return EnsembleConfiguration(
+            strategy=EnsembleStrategy.STACKING,
+            models=list(selected_models),
+            weights=weights,
+            meta_model=meta_model,
+            weight_optimization=weight_optimization,
+            rebalancing_frequency=timedelta(days=1),
+            performance_threshold=float(oof.r2(np.eye(len(oof.models))).max()),
+            diversity_threshold=0.7,
+            max_models=15,
+            min_models=5,
+            validation_method="kfold",
+            cross_validation_folds=self.oof_cache.cv,
+            time_window=timedelta(days=30),
+            feature_selection_method="none",
+            regularization_strength=float(
+                self.meta_models[meta_model].get_params().get("alpha", 0.0)
+            ),
+            ensemble_depth=2,
+            created_timestamp=now,
+            last_optimized=now,
+        )
 
     async def _bayesian_optimize_weights(
-        self, models: List[str], predictions: Dict[str, np.ndarray], y_true: np.ndarray
+        self,
+        models: List[str],
+        predictions: Dict[str, np.ndarray],
+        y_true: np.ndarray,
+        parallel: bool = False,
     ) -> Dict[str, float]:
-        """Optimize weights using Bayesian optimization"""
-
-        def objective(trial):
-            weights = []
-            for i, model in enumerate(models):
-                weight = trial.suggest_float(f"weight_{i}", 0.0, 1.0)
-                weights.append(weight)
-
-            # Normalize weights
-            total_weight = sum(weights)
-            if total_weight == 0:
-                return float("inf")
-
-            weights = [w / total_weight for w in weights]
-
-            # Calculate ensemble prediction
-            ensemble_pred = np.zeros_like(y_true)
-            for i, model in enumerate(models):
-                ensemble_pred += weights[i] * predictions[model]
-
-            # Return negative R² (since we want to maximize)
-            r2 = r2_score(y_true, ensemble_pred)
-            return -r2
-
-        # Run optimization
-        study = optuna.create_study(direction="minimize")
-        study.optimize(objective, n_trials=100)
-
-        # Extract optimal weights
-        best_params = study.best_params
-        weights = []
-        for i in range(len(models)):
-            weights.append(best_params[f"weight_{i}"])
-
-        # Normalize
-        total_weight = sum(weights)
-        weights = [w / total_weight for w in weights]
-
-        return {model: weight for model, weight in zip(models, weights)}
+        """Optimize weights using Bayesian optimization
+
+        Trials are pruned on partial validation scores. In parallel mode they
+        run concurrently and the study is persisted, so the next optimization
+        of the same model set warm-starts from its best weights.
+        """
+        settings = self.search_settings
+        weights, study = await asyncio.to_thread(
+            optimize_weights,
+            models,
+            predictions,
+            y_true,
+            n_trials=settings.n_trials,
+            n_jobs=settings.optuna_jobs if parallel else 1,
+            pruner=settings.pruner,
+            pruning_steps=settings.pruning_steps,
+            storage_path=settings.storage_path if parallel else None,
+        )
+        # One entry per model set; the stored study name also carries the inputs
+        self.bayesian_optimizers[study_name(models)] = study
+        return weights
 
     async def predict_ensemble(
         self,
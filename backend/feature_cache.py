@@ -1,6 +1,6 @@
 # Copied and adapted from Newfolder (example structure)
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class FeatureCache:
@@ -9,9 +9,9 @@ class FeatureCache:
         self.expiry: Dict[str, float] = {}
         self.ttl = ttl
 
-    def set(self, key: str, value: Any):
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
         self.cache[key] = value
-        self.expiry[key] = time.time() + self.ttl
+        self.expiry[key] = time.time() + (self.ttl if ttl is None else ttl)
 
     def get(self, key: str) -> Any:
         if key in self.cache and time.time() < self.expiry[key]:
@@ -1,7 +1,7 @@
 import asyncio
 import json
 import time
-from collections.abc import Awaitable
+from collections.abc import AsyncIterator, Awaitable
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional
 
@@ -115,21 +115,88 @@ async def generate_text(request: GenerateRequest) -> GenerateResponse:
     return GenerateResponse(text=text)
 
 
+def _stream_response(endpoint_name: str, chunks: AsyncIterator[str]) -> StreamingResponse:
+    """Relay provider chunks to the client as they arrive.
+
+    Not wrapped in ``llm_endpoint``: a StreamingResponse must not be cached and
+    its body runs after the handler returns, so metrics are recorded here.
+    """
+
+    async def event_generator() -> AsyncIterator[str]:
+        start = time.time()
+        status = "success"
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception:  # pylint: disable=broad-exception-caught
+            status = "error"
+            raise
+        finally:
+            llm_request_count.labels(endpoint=endpoint_name, status=status).inc()
+            llm_request_latency.labels(endpoint=endpoint_name).observe(
+                time.time() - start
+            )
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 # Streaming text generation endpoint
 @router.post("/stream_generate")
-@llm_endpoint("stream_generate", timeout=60.0, retries=2)
 async def stream_generate(request: GenerateRequest):
     """Stream generated text chunks to client"""
-
-    async def event_generator():
-        async for chunk in llm_engine.stream_text(
+    return _stream_response(
+        "stream_generate",
+        llm_engine.stream_text(
             request.prompt,
             max_tokens=request.max_tokens,
             temperature=request.temperature,
-        ):
-            yield chunk
+        ),
+    )
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+class TooltipRequest(BaseModel):
+    """Request model for tooltip explanations of betting terms"""
+
+    term: str = Field(..., description="Betting term or concept to explain")
+    context: str = Field("", description="Optional betting context")
+    prediction_version: Optional[str] = Field(
+        None, description="Version of the prediction the tooltip is attached to"
+    )
+    stream: bool = Field(False, description="Stream the explanation as it is generated")
+
+
+class TooltipResponse(BaseModel):
+    """Response model containing a tooltip explanation"""
+
+    explanation: str = Field(..., description="Tooltip explanation text")
+
+
+@router.post("/tooltip", response_model=TooltipResponse)
+async def tooltip_explanation(request: TooltipRequest):
+    """Explain a betting term, served from the response cache when possible"""
+    if request.stream:
+        return _stream_response(
+            "tooltip_stream",
+            llm_engine.stream_tooltip_explanation(
+                request.term,
+                request.context,
+                prediction_version=request.prediction_version,
+            ),
+        )
+    start = time.time()
+    try:
+        explanation = await llm_engine.generate_tooltip_explanation(
+            request.term,
+            request.context,
+            prediction_version=request.prediction_version,
+        )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        llm_request_count.labels(endpoint="tooltip", status="error").inc()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        llm_request_latency.labels(endpoint="tooltip").observe(time.time() - start)
+    llm_request_count.labels(endpoint="tooltip", status="success").inc()
+    return TooltipResponse(explanation=explanation)
 
 
 # Advanced LLM use-cases
@@ -271,6 +338,7 @@ class LLMHealthResponse(BaseModel):
     models: List[str]
     last_refresh: float
     models_age_seconds: float
+    response_cache: Dict[str, Any] = Field(default_factory=dict)
 
 
 @router.get("/health", response_model=LLMHealthResponse)
@@ -289,6 +357,7 @@ async def llm_health():
         models=llm_engine.models,
         last_refresh=last_refresh,
         models_age_seconds=age if age is not None else -1,
+        response_cache=llm_engine.response_cache.stats(),
     )
 
 
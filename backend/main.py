@@ -28,19 +28,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Heavy engines load lazily: on first use or in the post-startup warm-up
+from backend.utils.subsystems import SubsystemRegistry, mount_deferred_router
+
+subsystems = SubsystemRegistry()
+
 # Import from refactored modules
-from backend.middleware.caching import TTLCache, retry_and_cache
-from backend.middleware.rate_limit import RateLimitMiddleware
-from backend.middleware.request_tracking import track_requests
-from backend.routes import (
-    health_router,
-    betting_router,
-    performance_router,
-    auth_router,
-    prizepicks_router,
-    analytics_router,
-)
-from backend.utils.error_handler import ErrorHandler, DataFetchError, ValidationError
+with subsystems.phase("core_imports"):
+    # Same module path as the routers and services use, so all of them share one
+    # response_cache ("backend.middleware.caching" is a separate module copy)
+    from middleware.caching import TTLCache, cached_response, response_cache
+    from backend.middleware.rate_limit import RateLimitMiddleware
+    from backend.middleware.request_tracking import (
+        trace_registry,
+        trace_requests,
+        track_requests,
+    )
+    from backend.routes import (
+        health_router,
+        betting_router,
+        performance_router,
+        auth_router,
+        prizepicks_router,
+        analytics_router,
+        metrics_router,
+    )
+    from backend.utils.error_handler import ErrorHandler, DataFetchError, ValidationError
 
 import httpx
 import uvicorn
@@ -50,13 +63,6 @@ from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 
 # Optional imports with fallbacks
-try:
-    from backend.auth import AuthService  # type: ignore[import]
-except ImportError:
-    # Production auth service implementation
-    from backend.auth.user_service import UserService as AuthService  # type: ignore[import]
-    logger.info("\u2705 Production auth service loaded")
-
 try:
     from backend.config import config  # type: ignore[import]
 except ImportError:
@@ -69,30 +75,86 @@ except ImportError:
         odds_api_key: Optional[str] = None
     config = Config()
 
-try:
-    from backend.database import create_tables, get_db  # type: ignore[import]
-except ImportError:
-    logger.warning("Database module not available, using mock implementation")
-    create_tables = None
-    get_db = None
 
-try:
-    from backend.models.bet import Bet  # type: ignore[import]
-except ImportError:
-    logger.warning("Bet model not available, using mock implementation")
-    Bet = None
+def _load_auth_service():
+    try:
+        from backend.auth import AuthService  # type: ignore[import]
+    except ImportError:
+        # Production auth service implementation
+        from backend.auth.user_service import UserService as AuthService  # type: ignore[import]
+        logger.info("\u2705 Production auth service loaded")
+    return AuthService
 
-try:
-    from backend.risk_management import KellyCriterionEngine, RiskLevel  # type: ignore[import]
-except ImportError:
-    logger.warning("Risk management module not available, using mock implementation")
-    class MockKellyCriterionEngine:
-        def __init__(self):
-            self.risk_controls = {"max_kelly_fraction": 0.25}
-        def calculate_kelly_fraction(self, *_args: Any, **_kwargs: Any) -> float:
-            return 0.05
-    KellyCriterionEngine = MockKellyCriterionEngine  # type: ignore[assignment,misc]
-    RiskLevel = str  # type: ignore[assignment,misc]
+
+def _load_database():
+    try:
+        from backend.database import create_tables, get_db  # type: ignore[import]
+    except ImportError:
+        logger.warning("Database module not available, using mock implementation")
+        create_tables = None
+        get_db = None
+    return {"create_tables": create_tables, "get_db": get_db}
+
+
+def _load_risk_engine():
+    try:
+        from backend.risk_management import KellyCriterionEngine  # type: ignore[import]
+    except ImportError:
+        logger.warning("Risk management module not available, using mock implementation")
+        class MockKellyCriterionEngine:
+            def __init__(self):
+                self.risk_controls = {"max_kelly_fraction": 0.25}
+            def calculate_kelly_fraction(self, *_args: Any, **_kwargs: Any) -> float:
+                return 0.05
+        KellyCriterionEngine = MockKellyCriterionEngine  # type: ignore[assignment,misc]
+    return KellyCriterionEngine()
+
+
+def _load_prizepicks_service():
+    from backend.services.comprehensive_prizepicks_service import start_prizepicks_service
+
+    return start_prizepicks_service
+
+
+def _load_model_service():
+    try:
+        from model_service import ModelService  # type: ignore[import]
+    except ImportError:
+        logger.warning("database modules not available, using mock implementations")
+        return None
+    return ModelService()
+
+
+def _load_prediction_router():
+    from backend.prediction_engine import router as prediction_router  # type: ignore[import]
+
+    return prediction_router
+
+
+def _load_ultra_accuracy_router():
+    from ultra_accuracy_routes import router as ultra_accuracy_router  # type: ignore[import]
+
+    return ultra_accuracy_router
+
+
+def _load_autonomous_handler():
+    from autonomous_project_development_handler import (  # type: ignore[import]
+        autonomous_project_development_handler,
+    )
+
+    return autonomous_project_development_handler
+
+
+# Registration order is warm-up order: services the background tasks need
+# first, then the heavy model stacks behind the deferred routers
+subsystems.register("database", _load_database)
+subsystems.register("prizepicks_service", _load_prizepicks_service)
+subsystems.register("model_service", _load_model_service)
+subsystems.register("auth_service", _load_auth_service)
+subsystems.register("risk_engine", _load_risk_engine)
+subsystems.register("prediction_engine", _load_prediction_router)
+subsystems.register("ultra_accuracy", _load_ultra_accuracy_router)
+subsystems.register("autonomous_development", _load_autonomous_handler, warm=False)
 
 # ============================================================================
 # LIFESPAN EVENT HANDLER
@@ -100,9 +162,6 @@ except ImportError:
 
 from contextlib import asynccontextmanager
 
-# Add PrizePicks service import
-from backend.services.comprehensive_prizepicks_service import start_prizepicks_service
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -111,12 +170,10 @@ async def lifespan(app: FastAPI):
     logger.info("✅ Fast startup mode - deferring model training")
     logger.info("🎯 A1Betting Backend server is now running!")
     logger.info("📊 Background services initializing...")
+    subsystems.mark_ready()
     
-    # Start PrizePicks real-time data ingestion
-    logger.info("🏀 Starting PrizePicks real-time data service...")
-    prizepicks_task = asyncio.create_task(start_prizepicks_service())
-    
-    # Start background initialization
+    # Start background initialization; PrizePicks ingestion starts once its
+    # service has been imported off the event loop
     background_task = asyncio.create_task(background_initialization())
     
     yield
@@ -125,8 +182,9 @@ async def lifespan(app: FastAPI):
     logger.info("🔄 Shutting down A1Betting Backend...")
     # Cancel background tasks
     try:
-        prizepicks_task.cancel()
         background_task.cancel()
+        for task in background_tasks:
+            task.cancel()
     except:
         pass
 
@@ -141,15 +199,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Register prediction router (specialist models)
-try:
-    from backend.prediction_engine import router as prediction_router  # type: ignore[import]
-
-    app.include_router(prediction_router, prefix="/api/v1")
-    logger.info("\u2705 Enhanced prediction engine router included")
-except ImportError:
-    logger.warning("Prediction engine router not found, skipping.")
-    prediction_router = None
+# Register prediction router (specialist models); xgboost/shap load on first
+# request under its prefix or during warm-up
+mount_deferred_router(
+    app,
+    subsystems.subsystems["prediction_engine"],
+    match_prefix="/api/v1/api/v2",
+    include_prefix="/api/v1",
+)
 
 # Add CORS middleware for frontend integration
 app.add_middleware(
@@ -176,8 +233,6 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 app_start_time = time.time()
 
 # Initialize caches for external API calls
-games_cache = TTLCache(maxsize=config.cache_max_size, ttl=config.cache_ttl)
-odds_cache = TTLCache(maxsize=config.cache_max_size, ttl=config.cache_ttl)
 prizepicks_cache = TTLCache(maxsize=config.cache_max_size, ttl=config.cache_ttl)
 news_cache = TTLCache(maxsize=config.cache_max_size, ttl=config.cache_ttl)
 injuries_cache = TTLCache(maxsize=config.cache_max_size, ttl=config.cache_ttl)
@@ -217,44 +272,68 @@ async def track_requests(
     
     return response
 
+# Per-stage span tracing for /metrics/prometheus; spans are no-ops when disabled
+trace_registry.configure(
+    enabled=getattr(config, "tracing_enabled", True),
+    profiling_enabled=getattr(config, "request_profiling_enabled", False),
+    profile_interval=getattr(config, "request_profiling_interval", 0.001),
+)
+app.middleware("http")(trace_requests)
+
 # ============================================================================
 # BACKGROUND INITIALIZATION
 # ============================================================================
 
+background_tasks: List[asyncio.Task] = []
+
+
 async def background_initialization():
     """Background task for heavy initialization"""
     try:
         logger.info("🔄 Starting background initialization...")
 
         # Ensure database tables exist
+        create_tables = (await subsystems.aget("database"))["create_tables"]
         if create_tables:
-            create_tables()
+            await asyncio.to_thread(create_tables)
             logger.info("✅ Database tables ensured")
+
+        # Start PrizePicks real-time data ingestion
+        start_prizepicks_service = await subsystems.aget("prizepicks_service")
+        if start_prizepicks_service:
+            logger.info("🏀 Starting PrizePicks real-time data service...")
+            background_tasks.append(asyncio.create_task(start_prizepicks_service()))
         
         # Initialize model service
-        try:
-            from model_service import ModelService  # type: ignore[import]
-            model_service = ModelService()
+        if await subsystems.aget("model_service") is not None:
             logger.info("✅ Model service initialized")
-        except ImportError:
-            logger.warning("database modules not available, using mock implementations")
         
         logger.info("✅ Background initialization completed")
         
     except Exception as e:
         logger.error(f"❌ Background initialization failed: {e}")
 
+    # Import the remaining engines so first requests do not pay for them
+    await subsystems.warm_up()
+    report = subsystems.startup_report()
+    logger.info(
+        f"🔥 Warm-up finished in {report['warmup_seconds']:.2f}s; "
+        f"ready after {report['time_to_ready_seconds'] or 0:.2f}s"
+    )
+
 # ============================================================================
 # INCLUDE ROUTERS FROM REFACTORED MODULES
 # ============================================================================
 
 # Include all the refactored route modules
-app.include_router(health_router)
-app.include_router(betting_router)
-app.include_router(performance_router)
-app.include_router(auth_router)
-app.include_router(prizepicks_router)
-app.include_router(analytics_router)
+with subsystems.phase("core_routers"):
+    app.include_router(health_router)
+    app.include_router(betting_router)
+    app.include_router(performance_router)
+    app.include_router(auth_router)
+    app.include_router(prizepicks_router)
+    app.include_router(analytics_router)
+    app.include_router(metrics_router)
 
 logger.info("✅ All refactored routers included successfully")
 
@@ -324,6 +403,18 @@ async def comprehensive_health_check():
             "timestamp": datetime.now().isoformat()
         }
 
+@app.get("/api/health/startup")
+async def startup_report():
+    """Cold-start timings: eager import phases and lazy subsystem load costs"""
+    return subsystems.startup_report()
+
+@app.get("/api/health/workers")
+async def worker_memory():
+    """Per-worker RSS/USS/PSS; under serving.py includes the preload baseline"""
+    from serving import worker_memory_report  # type: ignore[import]
+
+    return await asyncio.to_thread(worker_memory_report)
+
 # ============================================================================
 # PRIZEPICKS PROPS ENDPOINT
 # ============================================================================
@@ -518,8 +609,9 @@ async def get_unified_data(
             detail="Failed to fetch unified data"
         )
 
-@retry_and_cache(games_cache)
 @app.get("/api/v1/sr/games", response_model=List[GameDataModel])
+# TTL-only: schedules are read through from SportRadar on a miss
+@cached_response(response_cache, namespace="games", ttl=config.cache_ttl)
 async def get_sport_radar_games(sport: str, date: Optional[str] = None):
     """Get games from SportRadar API"""
     try:
@@ -545,8 +637,9 @@ async def get_sport_radar_games(sport: str, date: Optional[str] = None):
             detail="Failed to fetch games"
         )
 
-@retry_and_cache(odds_cache)
 @app.get("/api/v1/odds/{event_id}", response_model=List[OddsDataModel])
+# TTL-only: odds are read through on a miss and move quickly, so keep them short
+@cached_response(response_cache, namespace="odds", ttl=30)
 async def get_event_odds(event_id: str, market: Optional[str] = None):
     """Get odds for a specific event"""
     try:
@@ -577,14 +670,13 @@ async def get_event_odds(event_id: str, market: Optional[str] = None):
 # ULTRA-ACCURACY ROUTER INTEGRATION
 # ============================================================================
 
-# Register ultra-accuracy router (specialist models)
-try:
-    from ultra_accuracy_routes import router as ultra_accuracy_router  # type: ignore[import]
-
-    app.include_router(ultra_accuracy_router, prefix="/api/v1")
-    logger.info("✅ Ultra-accuracy prediction engine router included")
-except ImportError:
-    logger.warning("Ultra-accuracy router not found, skipping.")
+# Register ultra-accuracy router (specialist models), loaded lazily
+mount_deferred_router(
+    app,
+    subsystems.subsystems["ultra_accuracy"],
+    match_prefix="/api/v1/api/ultra-accuracy",
+    include_prefix="/api/v1",
+)
 
 # ============================================================================
 # LEGACY COMPATIBILITY ENDPOINTS
@@ -662,17 +754,20 @@ async def get_comprehensive_projections():
 # Autonomous Project Development Endpoint
 # ============================================================================
 
-from autonomous_project_development_handler import autonomous_project_development_handler
-
 @app.post("/api/autonomous/development")
 async def trigger_autonomous_development(background_tasks: BackgroundTasks):
     """
     Trigger the ultimate autonomous project development loop as a background task.
     Returns immediately with a status message.
     """
+    autonomous_project_development_handler = await subsystems.aget(
+        "autonomous_development"
+    )
     background_tasks.add_task(autonomous_project_development_handler)
     return {"status": "Autonomous project development loop started."}
 
+subsystems.record_phase("main_module", time.time() - subsystems.created_at)
+
 # ============================================================================
 # APPLICATION ENTRY POINT
 # ============================================================================
@@ -5,7 +5,14 @@ This package contains all middleware components used by the FastAPI application.
 """
 
 from .rate_limit import RateLimitMiddleware
+# Route caching (cached_response, response_cache) is imported from
+# middleware.caching directly so every importer shares one response_cache
 from .caching import retry_and_cache
-from .request_tracking import track_requests
+from .request_tracking import trace_requests, track_requests
 
-__all__ = ["RateLimitMiddleware", "retry_and_cache", "track_requests"] 
\ No newline at end of file
+__all__ = [
+    "RateLimitMiddleware",
+    "retry_and_cache",
+    "trace_requests",
+    "track_requests",
+] 
\ No newline at end of file
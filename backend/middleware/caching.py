@@ -1,13 +1,43 @@
 """
 Caching Middleware
 
-This module provides caching functionality with TTL and retry logic.
+This module provides caching functionality with TTL and retry logic, and a
+route-level HTTP response cache that stores pre-serialized JSON bytes with
+ETags so repeat polls are answered without re-running or re-serializing the
+endpoint (and with 304 Not Modified when the client already has the body).
+
+Each cached route names a namespace and keeps its entries fresh one of two ways:
+
+- Invalidated on write: the code that replaces the route's source data calls
+  ``response_cache.invalidate(namespace)``.
+- TTL-only: the route reads its data on demand from an upstream API or the
+  database and nothing in this process writes it, so responses can be up to
+  ``ttl`` old. Such routes keep short TTLs and say so at the decorator.
+
+``/api/prizepicks/props`` is TTL-bound: it fetches projections itself. When the
+background PrizePicks ingestion loop runs, it also invalidates ``prizepicks``
+whenever a poll finds changed projections, so changes can show up before the
+TTL expires.
+
+Import this module as ``middleware.caching`` everywhere (main.py included).
+Importing it under another path loads a second copy with a separate
+``response_cache``, whose invalidations and stats the routes never see.
 """
 
 import asyncio
+import functools
+import hashlib
+import inspect
+import json
 import logging
 import time
-from typing import Any, Dict
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +86,9 @@ def retry_and_cache(
     """Decorator that provides retry logic and caching for async functions"""
     
     def decorator(func: Any) -> Any:
+        # functools.wraps keeps the signature visible to FastAPI, so this can sit
+        # below @router.get like any other endpoint decorator
+        @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Create cache key from function name and arguments
             cache_key = f"{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
@@ -90,4 +123,190 @@ def retry_and_cache(
                 raise last_exception
             
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator 
+
+@dataclass
+class CachedResponse:
+    """Pre-serialized response body and its validator"""
+
+    body: bytes
+    etag: str
+    namespace: str
+    expires_at: float
+
+
+class ResponseCache:
+    """LRU cache of serialized route responses, grouped into invalidatable namespaces"""
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(namespace: str, path: str, query_items: Any) -> str:
+        """Key on namespace, path and the query string with parameters sorted"""
+        query = urlencode(sorted(query_items))
+        return f"{namespace}:{path}?{query}"
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.expires_at:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, namespace: str, body: bytes, ttl: Optional[float] = None) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag=self.make_etag(body),
+            namespace=namespace,
+            expires_at=time.monotonic() + (self.ttl if ttl is None else ttl),
+        )
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """Drop every entry of a namespace (or all entries) after an upstream refresh"""
+        if namespace is None:
+            removed = len(self.entries)
+            self.entries.clear()
+        else:
+            keys = [k for k, e in self.entries.items() if e.namespace == namespace]
+            for key in keys:
+                del self.entries[key]
+            removed = len(keys)
+        self.invalidations += 1
+        return removed
+
+    async def get_or_compute(self, key: str, namespace: str, compute: Any, ttl: Optional[float] = None) -> Any:
+        """Return the cached entry or run ``compute`` once for concurrent misses
+
+        ``compute`` returns either bytes to cache or a ``Response`` to pass through.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+            if isinstance(result, (bytes, bytearray)):
+                result = self.set(key, namespace, bytes(result), ttl)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def cached_response(cache: ResponseCache, namespace: str, ttl: Optional[float] = None) -> Any:
+    """Cache a GET endpoint's serialized JSON and answer If-None-Match with 304
+
+    Apply below the route decorator so FastAPI registers the cached wrapper::
+
+        @router.get("/items")
+        @cached_response(response_cache, namespace="items")
+        async def get_items(...): ...
+
+    The endpoint runs only on a miss; its result is JSON-encoded once and the
+    bytes are served directly afterwards, bypassing response_model serialization.
+    """
+
+    def decorator(func: Any) -> Any:
+        signature = inspect.signature(func)
+        request_param = next(
+            (p.name for p in signature.parameters.values() if p.annotation is Request),
+            None,
+        )
+        parameters = list(signature.parameters.values())
+        if request_param is None:
+            parameters.append(
+                inspect.Parameter(
+                    "_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                )
+            )
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if request_param is None:
+                request: Request = kwargs.pop("_cache_request")
+            else:
+                request = kwargs[request_param]
+
+            async def compute() -> Any:
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                return json.dumps(
+                    jsonable_encoder(result), separators=(",", ":"), ensure_ascii=False
+                ).encode("utf-8")
+
+            key = cache.make_key(namespace, request.url.path, request.query_params.multi_items())
+            entry = await cache.get_or_compute(key, namespace, compute, ttl)
+            if isinstance(entry, Response):
+                return entry
+
+            headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+            if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+                cache.not_modified += 1
+                return Response(status_code=304, headers=headers)
+            return Response(content=entry.body, media_type="application/json", headers=headers)
+
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
+
+
+# Shared response cache for read-heavy API routes
+response_cache = ResponseCache(maxsize=1000, ttl=30.0)
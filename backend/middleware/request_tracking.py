@@ -1,7 +1,7 @@
 """
 Request Tracking Middleware
 
-This module provides request tracking and logging functionality.
+This module provides request tracking, logging and span tracing functionality.
 """
 
 import logging
@@ -10,6 +10,13 @@ from typing import Any, Awaitable, Callable
 
 from fastapi import Request
 
+from utils.tracing import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    SamplingProfiler,
+    trace_registry,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,4 +52,50 @@ async def track_requests(
             f"Error: {request.method} {request.url.path} "
             f"failed after {process_time:.3f}s: {e}"
         )
-        raise 
\ No newline at end of file
+        raise 
+
+async def trace_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Any]]
+) -> Any:
+    """Collect per-stage spans for the request and optionally sample-profile it
+
+    Stage totals are returned in a ``Server-Timing`` header. Sending
+    ``X-Profile-Request: 1`` (when profiling is enabled) samples the request's
+    stack and returns an ``X-Profile-Id`` to fetch from ``/metrics/profiles``.
+    """
+    profile = trace_registry.profiling_enabled and request.headers.get(
+        PROFILE_HEADER, ""
+    ).lower() in ("1", "true", "yes")
+    trace, token = trace_registry.start_trace(request.url.path, force=profile)
+    if trace is None:
+        return await call_next(request)
+
+    profiler = (
+        SamplingProfiler(interval=trace_registry.profile_interval).start()
+        if profile
+        else None
+    )
+    try:
+        response = await call_next(request)
+    finally:
+        # Label by route template, not raw path, to keep metric cardinality bounded
+        route = request.scope.get("route")
+        endpoint = f"{request.method} {route.path}" if route else "unmatched"
+        trace_registry.finish_trace(trace, token, endpoint)
+        report = profiler.stop() if profiler else None
+
+    totals = trace.stage_totals()
+    if totals:
+        response.headers["Server-Timing"] = ", ".join(
+            f'{_server_timing_name(name)};dur={seconds * 1000:.2f}'
+            for name, seconds in totals.items()
+        )
+    if report is not None:
+        report.update(endpoint=trace.endpoint, stages=totals, total=trace.duration)
+        response.headers[PROFILE_ID_HEADER] = trace_registry.store_profile(report)
+    return response
+
+
+def _server_timing_name(name: str) -> str:
+    # Server-Timing metric names are HTTP tokens; dots are allowed, spaces are not
+    return name.replace(" ", "_").replace(",", "_").replace(";", "_")
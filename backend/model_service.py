@@ -58,6 +58,8 @@ except ImportError:
 
     FeatureEngineering = MockFeatureEngineering
 
+from utils.tracing import span
+
 
 @dataclass
 class ModelMetadata:
@@ -114,6 +116,90 @@ class EnsemblePrediction:
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+def discover_models(models_dir: Path) -> List[ModelMetadata]:
+    """Read every ``model_config.json`` below ``models_dir``"""
+    model_configs = []
+
+    if not models_dir.exists():
+        logger.warning("Models directory not found: %s", models_dir)
+        return []
+
+    # Look for model configuration files
+    for config_file in models_dir.glob("**/model_config.json"):
+        try:
+            with open(config_file, encoding="utf-8") as f:
+                config_data = json.load(f)
+
+            metadata = ModelMetadata(
+                name=config_data["name"],
+                version=config_data["version"],
+                model_type=config_data["model_type"],
+                file_path=config_data["file_path"],
+                features=config_data["features"],
+                target=config_data["target"],
+                training_date=datetime.fromisoformat(config_data["training_date"]),
+                performance_metrics=config_data.get("performance_metrics", {}),
+                weight=config_data.get("weight", 1.0),
+                is_active=config_data.get("is_active", True),
+                preprocessing_config=config_data.get("preprocessing_config", {}),
+            )
+
+            model_configs.append(metadata)
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error loading model config %s: %s", config_file, e)
+            continue
+
+    return model_configs
+
+
+# Models loaded once by the serving parent before it forks workers (see
+# serving.py). Workers find them here and share the pages copy-on-write
+# instead of each loading a private copy. Keyed by name -> (version, model).
+_SHARED_MODELS: Dict[str, Tuple[str, Any]] = {}
+
+SHAREABLE_MODEL_TYPES = ("xgboost", "lightgbm", "random_forest")
+
+
+def preload_shared_models(
+    models_directory: Union[str, Path], mmap_directory: Optional[Union[str, Path]] = None
+) -> Dict[str, float]:
+    """Load every active model into ``_SHARED_MODELS``; returns load seconds
+
+    Runs synchronously (no executor threads) because it is called right before
+    ``fork``. With ``mmap_directory`` each model is re-dumped uncompressed and
+    loaded with ``mmap_mode="r"``, so numpy parameter arrays (linear
+    coefficients, leaf tables) are backed by the page cache and shared even by
+    workers that were not forked from this process.
+    """
+    if not joblib:
+        logger.error("Cannot preload models because joblib is not installed.")
+        return {}
+
+    models_directory = Path(models_directory)
+    timings = {}
+    for metadata in discover_models(models_directory):
+        if not metadata.is_active or metadata.model_type not in SHAREABLE_MODEL_TYPES:
+            continue
+        start = time.perf_counter()
+        try:
+            model = joblib.load(str(models_directory / metadata.file_path))
+            if mmap_directory:
+                export_path = Path(mmap_directory) / (
+                    f"{metadata.name}-{metadata.version}.joblib"
+                )
+                export_path.parent.mkdir(parents=True, exist_ok=True)
+                joblib.dump(model, str(export_path))
+                model = joblib.load(str(export_path), mmap_mode="r")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error preloading model %s: %s", metadata.name, e)
+            continue
+        _SHARED_MODELS[metadata.name] = (metadata.version, model)
+        timings[metadata.name] = time.perf_counter() - start
+        logger.info("Preloaded shared model %s v%s", metadata.name, metadata.version)
+    return timings
+
+
 class ModelLoader:
     """Model loading and caching utility"""
 
@@ -138,8 +224,11 @@ class ModelLoader:
 
             # Load model in thread pool to avoid blocking
             loop = asyncio.get_event_loop()
+            shared = _SHARED_MODELS.get(metadata.name)
 
-            if metadata.model_type in ["xgboost", "lightgbm", "random_forest"]:
+            if shared and shared[0] == metadata.version:
+                model = shared[1]
+            elif metadata.model_type in ["xgboost", "lightgbm", "random_forest"]:
                 model = await loop.run_in_executor(
                     self.executor, joblib.load, str(model_path)
                 )
@@ -292,9 +381,10 @@ class ModelInferenceEngine:
 
             # Feature engineering
             fe_start = time.time()
-            engineered_features = self.feature_engineer.preprocess_features(
-                request.features
-            )
+            with span("model_service.feature_engineering"):
+                engineered_features = self.feature_engineer.preprocess_features(
+                    request.features
+                )
             fe_time = time.time() - fe_start
 
             # Make predictions with all models concurrently
@@ -307,7 +397,8 @@ class ModelInferenceEngine:
                 for model_name in active_models
             ]
 
-            model_predictions = await asyncio.gather(*prediction_tasks)
+            with span("model_service.model_inference"):
+                model_predictions = await asyncio.gather(*prediction_tasks)
 
             # Filter out failed predictions
             successful_predictions = [p for p in model_predictions if p is not None]
@@ -487,10 +578,14 @@ class ModelService:
 
     def __init__(self):
         self.config = config_manager
-        self.model_loader = ModelLoader(getattr(self.config, "config", {}).get("model_path", "models/"))
+        self.model_loader = ModelLoader(self._setting("model_path", "models/"))
         self.inference_engine = ModelInferenceEngine(self.model_loader)
         self._initialized = False
 
+    def _setting(self, name: str, default: Any) -> Any:
+        """Read a BackendConfig field, falling back when config is unavailable"""
+        return getattr(getattr(self.config, "config", None), name, default)
+
     async def initialize(self):
         """Initialize model service"""
         if self._initialized:
@@ -517,10 +612,12 @@ class ModelService:
             await self.initialize()
 
         # Make prediction
-        prediction = await self.inference_engine.predict_ensemble(request)
+        with span("model_service.predict_ensemble"):
+            prediction = await self.inference_engine.predict_ensemble(request)
 
         # Store prediction in database
-        await self._store_prediction(request, prediction)
+        with span("model_service.store_prediction"):
+            await self._store_prediction(request, prediction)
 
         return prediction
 
@@ -583,40 +680,7 @@ class ModelService:
 
     async def _discover_models(self) -> List[ModelMetadata]:
         """Discover available models from filesystem"""
-        models_dir = Path(getattr(self.config, "config", {}).get("model_path", "models/"))
-        model_configs = []
-
-        if not models_dir.exists():
-            logger.warning("Models directory not found: {models_dir}")
-            return []
-
-        # Look for model configuration files
-        for config_file in models_dir.glob("**/model_config.json"):
-            try:
-                with open(config_file, encoding="utf-8") as f:
-                    config_data = json.load(f)
-
-                metadata = ModelMetadata(
-                    name=config_data["name"],
-                    version=config_data["version"],
-                    model_type=config_data["model_type"],
-                    file_path=config_data["file_path"],
-                    features=config_data["features"],
-                    target=config_data["target"],
-                    training_date=datetime.fromisoformat(config_data["training_date"]),
-                    performance_metrics=config_data.get("performance_metrics", {}),
-                    weight=config_data.get("weight", 1.0),
-                    is_active=config_data.get("is_active", True),
-                    preprocessing_config=config_data.get("preprocessing_config", {}),
-                )
-
-                model_configs.append(metadata)
-
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Error loading model config %s: %s", config_file, e)
-                continue
-
-        return model_configs
+        return discover_models(Path(self._setting("model_path", "models/")))
 
     async def _store_prediction(
         self, request: PredictionRequest, prediction: EnsemblePrediction
@@ -647,7 +711,7 @@ class ModelService:
         """Background task to check for model updates"""
         while True:
             try:
-                await asyncio.sleep(getattr(self.config, "config", {}).get("model_update_interval", 300))
+                await asyncio.sleep(self._setting("model_update_interval", 300))
 
                 # Check for new or updated models
                 current_models = set(self.model_loader.list_loaded_models())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Performance Testing Script for Safe Serialization
+Measures encode/decode throughput of TaskDefinition/TaskResult payloads through
+safe_dumps/safe_loads (JSON) and safe_dumpb/safe_loadb (binary), against the
+original asdict-based encoder as a baseline
+"""
+
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timezone
+
+# Add repository root to path so backend.* imports resolve
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.utils.serialization_utils import (  # noqa: E402
+    MSGPACK_AVAILABLE,
+    safe_dumpb,
+    safe_dumps,
+    safe_loadb,
+    safe_loads,
+)
+from task_processor import (  # noqa: E402
+    TaskDefinition,
+    TaskPriority,
+    TaskResult,
+    TaskStatus,
+    TaskType,
+)
+
+
+class _LegacyEncoder(json.JSONEncoder):
+    """The pre-registry encoder: deep asdict copy for every dataclass"""
+
+    def default(self, o):
+        if is_dataclass(o):
+            return {**asdict(o), "__type__": o.__class__.__name__}
+        if isinstance(o, datetime):
+            return {"__type__": "datetime", "value": o.astimezone(timezone.utc).isoformat()}
+        return super().default(o)
+
+
+class PerformanceTester:
+    def __init__(self, iterations: int = 20000):
+        self.iterations = iterations
+        self.results = {}
+
+    def generate_payloads(self):
+        """Generate a representative mix of task definitions and results"""
+        now = datetime.now(timezone.utc)
+        payloads = []
+        for i in range(100):
+            payloads.append(
+                TaskDefinition(
+                    id=f"task-{i}",
+                    task_type=TaskType.PREDICTION_BATCH,
+                    priority=TaskPriority.HIGH,
+                    function_name="run_prediction_batch",
+                    args=[i, "NBA"],
+                    kwargs={"event_ids": list(range(10)), "model": "ensemble"},
+                    scheduled_at=now,
+                    created_at=now,
+                    tags=["realtime", "nba"],
+                    metadata={"source": "benchmark"},
+                )
+            )
+            payloads.append(
+                TaskResult(
+                    task_id=f"task-{i}",
+                    status=TaskStatus.COMPLETED,
+                    result={"predictions": [0.51, 0.62, 0.48], "count": 3},
+                    started_at=now,
+                    completed_at=now,
+                    execution_time=0.25,
+                    worker_id="worker-1",
+                )
+            )
+        return payloads
+
+    def _throughput(self, name, func, payloads):
+        rounds = max(1, self.iterations // len(payloads))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for payload in payloads:
+                func(payload)
+        elapsed = time.perf_counter() - start
+        ops = rounds * len(payloads) / elapsed
+        self.results[name] = ops
+        print(f"✅ {name}: {ops:,.0f} ops/s")
+        return ops
+
+    def test_encode(self, payloads):
+        print("Testing encode throughput...")
+        self._throughput(
+            "legacy_json_encode", lambda p: json.dumps(p, cls=_LegacyEncoder), payloads
+        )
+        self._throughput("safe_dumps", safe_dumps, payloads)
+        self._throughput("safe_dumpb_json", lambda p: safe_dumpb(p, use_msgpack=False), payloads)
+        if MSGPACK_AVAILABLE:
+            self._throughput("safe_dumpb_msgpack", lambda p: safe_dumpb(p, use_msgpack=True), payloads)
+
+    def test_decode(self, payloads):
+        print("\nTesting decode throughput...")
+        self._throughput("safe_loads", safe_loads, [safe_dumps(p) for p in payloads])
+        if MSGPACK_AVAILABLE:
+            self._throughput(
+                "safe_loadb_msgpack",
+                safe_loadb,
+                [safe_dumpb(p, use_msgpack=True) for p in payloads],
+            )
+
+    def test_payload_size(self, payloads):
+        print("\nTesting payload size...")
+        json_bytes = sum(len(safe_dumps(p).encode("utf-8")) for p in payloads)
+        self.results["json_bytes"] = json_bytes
+        print(f"✅ JSON: {json_bytes / len(payloads):.0f} bytes/payload")
+        if MSGPACK_AVAILABLE:
+            packed = sum(len(safe_dumpb(p, use_msgpack=True)) for p in payloads)
+            self.results["msgpack_bytes"] = packed
+            print(f"✅ msgpack: {packed / len(payloads):.0f} bytes/payload")
+
+    def run_all_tests(self):
+        print("🚀 Starting Serialization Performance Tests")
+        print("=" * 50)
+        payloads = self.generate_payloads()
+        for payload in payloads[:2]:
+            assert safe_loads(safe_dumps(payload)) == payload, "JSON round-trip mismatch"
+            if MSGPACK_AVAILABLE:
+                assert safe_loadb(safe_dumpb(payload)) == payload, "binary round-trip mismatch"
+        self.test_encode(payloads)
+        self.test_decode(payloads)
+        self.test_payload_size(payloads)
+        speedup = self.results["safe_dumps"] / self.results["legacy_json_encode"]
+        print(f"\n📊 Encode speedup vs asdict encoder: {speedup:.2f}x")
+        return self.results
+
+
+if __name__ == "__main__":
+    PerformanceTester().run_all_tests()
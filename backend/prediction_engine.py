@@ -27,6 +27,7 @@ from sklearn.model_selection import cross_val_score
 from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import StandardScaler
 from utils.llm_engine import llm_engine
+from utils.tracing import span
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -488,10 +489,11 @@ class UltraEnhancedPredictionEngine:
 
         try:
             # 1. Feature Engineering and Validation
-            engineered_features = await self._engineer_features(
-                request.features, request.sport
-            )
-            data_quality_score = self._assess_data_quality(engineered_features)
+            with span("prediction.feature_engineering"):
+                engineered_features = await self._engineer_features(
+                    request.features, request.sport
+                )
+                data_quality_score = self._assess_data_quality(engineered_features)
 
             # 2. Generate predictions from all models
             model_predictions = []
@@ -504,13 +506,15 @@ class UltraEnhancedPredictionEngine:
                     continue
 
                 try:
-                    pred_result = model.predict(engineered_features)
+                    with span("prediction.model_inference"):
+                        pred_result = model.predict(engineered_features)
                     weight = self.model_weights.get(model_name, 0.2)
 
                     # Generate SHAP values
-                    shap_values = await self._generate_shap_values(
-                        model, engineered_features
-                    )
+                    with span("prediction.shap"):
+                        shap_values = await self._generate_shap_values(
+                            model, engineered_features
+                        )
 
                     model_pred = ModelPrediction(
                         model_name=model_name,
@@ -542,38 +546,40 @@ class UltraEnhancedPredictionEngine:
                 )
 
             # 3. Ensemble aggregation
-            final_prediction = (
-                total_weighted_prediction / total_weight if total_weight > 0 else 0.5
-            )
-            win_probability = (
-                total_weighted_probability / total_weight if total_weight > 0 else 0.5
-            )
+            with span("prediction.aggregation"):
+                final_prediction = (
+                    total_weighted_prediction / total_weight if total_weight > 0 else 0.5
+                )
+                win_probability = (
+                    total_weighted_probability / total_weight if total_weight > 0 else 0.5
+                )
 
-            # 4. Calculate ensemble confidence and consensus
-            ensemble_confidence = self._calculate_ensemble_confidence(model_predictions)
-            model_consensus = self._calculate_model_consensus(model_predictions)
+                # 4. Calculate ensemble confidence and consensus
+                ensemble_confidence = self._calculate_ensemble_confidence(model_predictions)
+                model_consensus = self._calculate_model_consensus(model_predictions)
 
-            # 5. Risk assessment
-            risk_assessment = self._calculate_risk_assessment(
-                win_probability, ensemble_confidence, request.bankroll
-            )
+                # 5. Risk assessment
+                risk_assessment = self._calculate_risk_assessment(
+                    win_probability, ensemble_confidence, request.bankroll
+                )
 
-            # 6. Market analysis
-            market_analysis = self._analyze_market(win_probability, ensemble_confidence)
+                # 6. Market analysis
+                market_analysis = self._analyze_market(win_probability, ensemble_confidence)
 
-            # 7. Aggregate SHAP values
-            aggregated_shap = self._aggregate_shap_values(model_predictions)
-            feature_importance = self._calculate_feature_importance(model_predictions)
+                # 7. Aggregate SHAP values
+                aggregated_shap = self._aggregate_shap_values(model_predictions)
+                feature_importance = self._calculate_feature_importance(model_predictions)
 
             # 8. Generate explanation
-            explanation = await self._generate_explanation(
-                request,
-                final_prediction,
-                ensemble_confidence,
-                aggregated_shap,
-                risk_assessment,
-                market_analysis,
-            )
+            with span("prediction.explanation"):
+                explanation = await self._generate_explanation(
+                    request,
+                    final_prediction,
+                    ensemble_confidence,
+                    aggregated_shap,
+                    risk_assessment,
+                    market_analysis,
+                )
 
             # 9. Calculate expected payout
             expected_payout = (
@@ -360,21 +360,177 @@ class PredictionTriggerEngine:
         return elapsed >= cooldown_seconds
 
 
+class EventFeatureStore:
+    """Latest feature vector per event, maintained incrementally from stream messages
+
+    Each message merges its numeric fields into the event's vector (namespaced by
+    stream type where names would otherwise collide) and bumps the event's version
+    only when a value actually changed, so consumers can skip recomputation on
+    unchanged features.
+    """
+
+    FEATURE_PREFIXES: Dict[StreamType, str] = {
+        StreamType.LIVE_SCORES: "",
+        StreamType.PLAYER_UPDATES: "",
+        StreamType.BETTING_ODDS: "odds_",
+        StreamType.LINE_MOVEMENTS: "line_",
+        StreamType.INJURY_ALERTS: "injury_",
+        StreamType.WEATHER_UPDATES: "weather_",
+        StreamType.NEWS_SENTIMENT: "news_",
+        StreamType.SOCIAL_SENTIMENT: "social_",
+    }
+
+    def __init__(self, max_events: int = 10000):
+        self.max_events = max_events
+        self.features: Dict[str, Dict[str, float]] = {}
+        self.versions: Dict[str, int] = defaultdict(int)
+        # Last message per event, changed or not; drives eviction
+        self.updated_at: Dict[str, datetime] = {}
+
+    def apply_message(self, message: StreamMessage) -> bool:
+        """Merge a message into its event's features; returns True if anything changed"""
+        if not message.event_id or message.stream_type not in self.FEATURE_PREFIXES:
+            return False
+
+        prefix = self.FEATURE_PREFIXES[message.stream_type]
+        event_features = self.features.get(message.event_id)
+        if event_features is None:
+            if len(self.features) >= self.max_events:
+                self._evict_oldest()
+            event_features = self.features[message.event_id] = {}
+
+        changed = False
+        for key, value in message.data.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{prefix}{key}"
+            value = float(value)
+            if event_features.get(name) != value:
+                event_features[name] = value
+                changed = True
+
+        self.updated_at[message.event_id] = datetime.now(timezone.utc)
+        if changed:
+            self.versions[message.event_id] += 1
+        return changed
+
+    def get(self, event_id: str) -> Optional[Dict[str, float]]:
+        """Snapshot of the latest features for an event"""
+        event_features = self.features.get(event_id)
+        return dict(event_features) if event_features else None
+
+    def version(self, event_id: str) -> int:
+        return self.versions.get(event_id, 0)
+
+    def evict_stale(self, max_age_seconds: float) -> int:
+        """Drop events without a message within max_age_seconds"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+        stale = [eid for eid, ts in self.updated_at.items() if ts < cutoff]
+        for event_id in stale:
+            self._drop(event_id)
+        return len(stale)
+
+    def _evict_oldest(self):
+        if self.updated_at:
+            self._drop(min(self.updated_at, key=self.updated_at.get))
+
+    def _drop(self, event_id: str):
+        self.features.pop(event_id, None)
+        self.versions.pop(event_id, None)
+        self.updated_at.pop(event_id, None)
+
+
+class TriggerDebouncer:
+    """Coalesce prediction triggers per event within a time window
+
+    The first trigger for an event opens a window; triggers arriving before it
+    closes are merged into it (highest priority wins, all trigger types are
+    recorded). When the window closes the merged trigger is handed to the handler
+    once, so a burst of updates produces a single prediction.
+    """
+
+    PRIORITY_ORDER = {
+        UpdatePriority.LOW: 0,
+        UpdatePriority.MEDIUM: 1,
+        UpdatePriority.HIGH: 2,
+        UpdatePriority.CRITICAL: 3,
+    }
+
+    def __init__(self, handler: Callable, window_seconds: float = 0.5):
+        self.handler = handler
+        self.window_seconds = window_seconds
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.merged_count = 0
+        # Running handler calls; the loop only keeps weak references to tasks
+        self.tasks: Set[asyncio.Task] = set()
+
+    def submit(self, trigger: Dict[str, Any]):
+        """Queue a trigger, merging it with any pending trigger for the same event"""
+        event_id = trigger["event_id"]
+        pending = self.pending.get(event_id)
+
+        if pending is None:
+            merged = dict(trigger)
+            merged["metadata"] = dict(trigger.get("metadata", {}))
+            merged["metadata"]["merged_trigger_types"] = [trigger["trigger_type"]]
+            merged["metadata"]["merged_count"] = 1
+            self.pending[event_id] = merged
+            if self.window_seconds <= 0:
+                self._flush(event_id)
+            else:
+                asyncio.get_running_loop().call_later(
+                    self.window_seconds, self._flush, event_id
+                )
+            return
+
+        self.merged_count += 1
+        pending["metadata"]["merged_count"] += 1
+        pending["metadata"]["merged_trigger_types"].append(trigger["trigger_type"])
+        pending["triggering_message"] = trigger["triggering_message"]
+        if (
+            self.PRIORITY_ORDER[trigger["priority"]]
+            > self.PRIORITY_ORDER[pending["priority"]]
+        ):
+            pending["priority"] = trigger["priority"]
+            pending["trigger_type"] = trigger["trigger_type"]
+            pending["prediction_context"] = trigger["prediction_context"]
+
+    def _flush(self, event_id: str):
+        trigger = self.pending.pop(event_id, None)
+        if trigger is not None:
+            task = asyncio.ensure_future(self.handler(trigger))
+            self.tasks.add(task)
+            task.add_done_callback(self._handler_done)
+
+    def _handler_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Prediction trigger handler failed: {task.exception()!s}")
+
+
 class RealTimeStreamManager:
     """Main real-time stream management system"""
 
-    def __init__(self):
+    def __init__(self, trigger_debounce_window: float = 0.5):
         self.redis_client: Optional[aioredis.Redis] = None
         self.subscribers: Dict[str, StreamSubscription] = {}
         self.websocket_connections: Set[Any] = set()
         self.stream_aggregator = StreamAggregator()
         self.prediction_trigger = PredictionTriggerEngine()
+        self.feature_store = EventFeatureStore()
+        self.trigger_debouncer = TriggerDebouncer(
+            self._handle_prediction_trigger, window_seconds=trigger_debounce_window
+        )
+        # (event_id, context) -> feature version the last prediction was made on
+        self.predicted_versions: Dict[tuple, int] = {}
         self.message_queue = asyncio.Queue(maxsize=10000)
         self.processing_tasks: List[asyncio.Task] = []
         self.statistics = {
             "messages_processed": 0,
             "messages_sent": 0,
             "active_subscribers": 0,
+            "predictions_triggered": 0,
+            "predictions_skipped_unchanged": 0,
             "uptime_start": datetime.now(timezone.utc),
         }
 
@@ -472,6 +628,9 @@ class RealTimeStreamManager:
     async def _process_stream_message(self, message: StreamMessage):
         """Process individual stream message"""
         try:
+            # Keep the event's feature vector current even while aggregation buffers
+            self.feature_store.apply_message(message)
+
             # Aggregate message if needed
             aggregated_message = await self.stream_aggregator.process_message(message)
 
@@ -483,9 +642,9 @@ class RealTimeStreamManager:
                 aggregated_message
             )
 
-            # Process triggers
+            # Process triggers; bursts for the same event collapse into one prediction
             for trigger in triggers:
-                asyncio.create_task(self._handle_prediction_trigger(trigger))
+                self.trigger_debouncer.submit(trigger)
 
             # Broadcast to subscribers
             await self._broadcast_message(aggregated_message)
@@ -499,14 +658,24 @@ class RealTimeStreamManager:
             event_id = trigger["event_id"]
             context = trigger["prediction_context"]
 
+            # Skip if nothing changed since the last prediction for this context
+            version = self.feature_store.version(event_id)
+            if version and self.predicted_versions.get((event_id, context)) == version:
+                self.statistics["predictions_skipped_unchanged"] += 1
+                return
+
             # Get latest features for this event
             features = await self._get_event_features(event_id)
 
             if features:
+                self.statistics["predictions_triggered"] += 1
                 # Generate new prediction
                 prediction = await ultra_ensemble_engine.predict(
                     features=features, context=context
                 )
+                # Only a successful prediction makes this version current;
+                # after a failure the next trigger retries it
+                self.predicted_versions[(event_id, context)] = version
 
                 # Broadcast prediction update
                 prediction_message = StreamMessage(
@@ -520,6 +689,7 @@ class RealTimeStreamManager:
                         "trigger_type": trigger["trigger_type"],
                         "models_used": prediction.metadata.get("selected_models", []),
                         "context": context.value,
+                        "feature_version": version,
                     },
                     timestamp=datetime.now(timezone.utc),
                     source="prediction_engine",
@@ -530,13 +700,16 @@ class RealTimeStreamManager:
                 await self._broadcast_message(prediction_message)
 
         except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Prediction trigger handling failed: {e!s}")
+            logger.error(f"Prediction trigger handling failed: {e!s}")
 
     async def _get_event_features(self, event_id: str) -> Optional[Dict[str, float]]:
         """Get latest features for an event"""
         try:
-            # This would fetch the latest features from various sources
-            # For now, return mock features
+            features = self.feature_store.get(event_id)
+            if features:
+                return features
+
+            # No stream data seen for this event yet; fall back to mock features
             return {
                 "team_1_score": 45.0,
                 "team_2_score": 42.0,
@@ -701,6 +874,15 @@ class RealTimeStreamManager:
                     if not messages:
                         del self.stream_aggregator.message_buffer[key]
 
+                # Drop feature vectors for events quiet for over an hour
+                self.feature_store.evict_stale(3600)
+                live_events = set(self.feature_store.features)
+                self.predicted_versions = {
+                    key: version
+                    for key, version in self.predicted_versions.items()
+                    if key[0] in live_events
+                }
+
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Cleanup task error: {e!s}")
 
@@ -799,6 +981,9 @@ class RealTimeStreamManager:
                 "redis_connected": self.redis_client is not None,
                 "aggregator_buffers": len(self.stream_aggregator.message_buffer),
                 "trigger_cooldowns": len(self.prediction_trigger.last_predictions),
+                "tracked_events": len(self.feature_store.features),
+                "pending_triggers": len(self.trigger_debouncer.pending),
+                "merged_triggers": self.trigger_debouncer.merged_count,
             }
 
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -4,10 +4,14 @@ Sophisticated bankroll management, Kelly criterion optimization, and risk assess
 
 # type: ignore[reportMissingTypeStubs]
 
+import asyncio
+import hashlib
 import logging
 import math
-from collections import deque
-from dataclasses import dataclass
+import statistics
+import threading
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple, cast
@@ -108,6 +112,245 @@ class PortfolioOptimization:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class BankrollSimulation:
+    """Simulated outcome of staking a fixed fraction of bankroll per bet"""
+
+    fraction: float  # fraction of current bankroll staked on each bet
+    horizon: int  # bets (or periods) simulated per path
+    ruin_probability: float  # paths that fell to ``ruin_level`` of the start
+    expected_time_to_ruin: Optional[float]  # mean bets to ruin, over ruined paths
+    growth_rate: float  # mean log growth per bet
+    median_final_bankroll: float  # multiple of the starting bankroll
+    final_bankroll_p05: float
+    median_max_drawdown: float
+    max_drawdown_p95: float
+
+
+class BankrollSimulator:
+    """Vectorized Monte Carlo of bankroll paths, cached by parameter bucket
+
+    A path compounds each bet at the staked fraction. Wealth never reaches
+    zero that way, so "ruin" means falling to ``ruin_level`` of the starting
+    bankroll. Every candidate fraction for one (win probability, odds)
+    bucket shares the same simulated win/loss sequences. That means one
+    cumulative win count drives all of them, and differences between
+    fractions are not Monte Carlo noise. Results are cached per
+    (probability, odds, fraction, horizon) bucket, so later lookups are
+    dictionary hits. The cache is safe to share with worker threads; the
+    simulation itself runs outside the lock.
+    """
+
+    # Horizons are rounded up to one of these so similar requests share entries
+    HORIZON_BUCKETS = (50, 100, 250, 500, 1000, 2500)
+    PROBABILITY_STEP = 0.0025
+    LOG_ODDS_STEP = 0.01  # ~1% odds buckets
+    FRACTION_STEP = 0.0025
+    # Upper bound on float64 cells held at once while simulating
+    MAX_CELLS = 4_000_000
+
+    def __init__(
+        self,
+        n_paths: int = 2000,
+        horizon: int = 250,
+        ruin_level: float = 0.25,
+        seed: int = 0,
+        cache_size: int = 8192,
+    ):
+        self.n_paths = n_paths
+        self.horizon = horizon
+        self.ruin_level = ruin_level
+        self.seed = seed
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, BankrollSimulation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    def _horizon_bucket(self, horizon: Optional[int]) -> int:
+        horizon = horizon or self.horizon
+        for bucket in self.HORIZON_BUCKETS:
+            if horizon <= bucket:
+                return bucket
+        return self.HORIZON_BUCKETS[-1]
+
+    def _bucket(self, win_probability: float, odds: float) -> Tuple[int, int]:
+        return (
+            round(win_probability / self.PROBABILITY_STEP),
+            round(math.log(odds) / self.LOG_ODDS_STEP),
+        )
+
+    def _bet_keys(
+        self,
+        win_probability: float,
+        odds: float,
+        fractions: List[float],
+        horizon: Optional[int],
+    ) -> List[Tuple[int, int, int, int]]:
+        p_key, odds_key = self._bucket(win_probability, odds)
+        horizon = self._horizon_bucket(horizon)
+        return [
+            (p_key, odds_key, min(round(f / self.FRACTION_STEP), int(0.99 / self.FRACTION_STEP)), horizon)
+            for f in fractions
+        ]
+
+    def is_cached(
+        self,
+        win_probability: float,
+        odds: float,
+        fractions: List[float],
+        horizon: Optional[int] = None,
+    ) -> bool:
+        """Whether :meth:`simulate_bets` would answer from the cache alone"""
+        keys = self._bet_keys(win_probability, odds, fractions, horizon)
+        with self._lock:
+            return all(key in self._cache for key in keys)
+
+    def simulate_bets(
+        self,
+        win_probability: float,
+        odds: float,
+        fractions: List[float],
+        horizon: Optional[int] = None,
+    ) -> List[BankrollSimulation]:
+        """One result per fraction for repeated bets at decimal ``odds``
+
+        Fractions are rounded to ``FRACTION_STEP``; each result's ``fraction``
+        is the rounded value that was simulated.
+        """
+        keys = self._bet_keys(win_probability, odds, fractions, horizon)
+        p_key, odds_key, _, horizon = keys[0]
+
+        # Hits are taken out under the lock, so a later eviction cannot lose them
+        results: Dict[Tuple, BankrollSimulation] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[key] = self._cache[key]
+            missing = sorted({key[2] for key in keys if key not in results})
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+
+        if missing:
+            simulated = self._simulate_fractions(
+                p_key * self.PROBABILITY_STEP,
+                math.exp(odds_key * self.LOG_ODDS_STEP),
+                [f_key * self.FRACTION_STEP for f_key in missing],
+                horizon,
+            )
+            with self._lock:
+                for f_key, result in zip(missing, simulated):
+                    key = (p_key, odds_key, f_key, horizon)
+                    results[key] = result
+                    self._store(key, result)
+        return [results[key] for key in keys]
+
+    def _store(self, key: Tuple, result: BankrollSimulation):
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _simulate_fractions(
+        self, p: float, odds: float, fractions: List[float], horizon: int
+    ) -> List[BankrollSimulation]:
+        rng = np.random.default_rng(self.seed)
+        wins = rng.random((self.n_paths, horizon)) < p
+        win_count = np.cumsum(wins, axis=1, dtype=np.int32)
+        loss_count = np.arange(1, horizon + 1, dtype=np.int32) - win_count
+
+        f = np.asarray(fractions, dtype=float)
+        win_log = np.log1p(f * (odds - 1.0))
+        loss_log = np.log1p(-f)
+
+        results: List[BankrollSimulation] = []
+        chunk = max(1, self.MAX_CELLS // (self.n_paths * horizon))
+        for start in range(0, len(f), chunk):
+            stop = start + chunk
+            # (fractions, paths, bets) log-wealth relative to the start
+            log_wealth = (
+                win_count[None] * win_log[start:stop, None, None]
+                + loss_count[None] * loss_log[start:stop, None, None]
+            )
+            results.extend(
+                self._summarize(log_wealth, fractions[start:stop], horizon)
+            )
+        return results
+
+    def simulate_returns(
+        self, returns: List[float], horizon: Optional[int] = None
+    ) -> BankrollSimulation:
+        """Bootstrap paths of whole-bankroll period returns (e.g. daily P&L / bankroll)"""
+        horizon = self._horizon_bucket(horizon)
+        sample = np.clip(np.asarray(returns, dtype=float), -0.999999, None)
+        key = ("returns", hashlib.blake2b(sample.tobytes(), digest_size=16).digest(), horizon)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return cached
+            self.misses += 1
+
+        rng = np.random.default_rng(self.seed)
+        draws = rng.integers(0, len(sample), size=(self.n_paths, horizon))
+        log_wealth = np.cumsum(np.log1p(sample)[draws], axis=1)
+        result = self._summarize(log_wealth[None], [1.0], horizon)[0]
+        with self._lock:
+            self._store(key, result)
+        return result
+
+    def _summarize(
+        self, log_wealth: Any, fractions: List[float], horizon: int
+    ) -> List[BankrollSimulation]:
+        """Per-fraction statistics of a (fractions, paths, steps) log-wealth array"""
+        ruined = log_wealth <= math.log(self.ruin_level)
+        ever_ruined = ruined.any(axis=2)
+        ruin_step = ruined.argmax(axis=2) + 1
+        peak = np.maximum.accumulate(np.maximum(log_wealth, 0.0), axis=2)
+        max_drawdown = 1.0 - np.exp((log_wealth - peak).min(axis=2))
+        final = log_wealth[:, :, -1]
+
+        results = []
+        for i, fraction in enumerate(fractions):
+            ruined_paths = ever_ruined[i]
+            results.append(
+                BankrollSimulation(
+                    fraction=float(fraction),
+                    horizon=horizon,
+                    ruin_probability=float(ruined_paths.mean()),
+                    expected_time_to_ruin=(
+                        float(ruin_step[i][ruined_paths].mean())
+                        if ruined_paths.any()
+                        else None
+                    ),
+                    growth_rate=float(final[i].mean() / horizon),
+                    median_final_bankroll=float(np.exp(np.median(final[i]))),
+                    final_bankroll_p05=float(np.exp(np.percentile(final[i], 5))),
+                    median_max_drawdown=float(np.median(max_drawdown[i])),
+                    max_drawdown_p95=float(np.percentile(max_drawdown[i], 95)),
+                )
+            )
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "n_paths": self.n_paths,
+            "ruin_level": self.ruin_level,
+        }
+
+
+# Shared by the Kelly and risk assessment engines so they reuse one cache
+bankroll_simulator = BankrollSimulator()
+
+
 class KellyCriterionEngine:
     """Advanced Kelly Criterion implementation with risk controls"""
 
@@ -124,7 +367,11 @@ class KellyCriterionEngine:
                 config.kelly_correlation_adjustment if config else True
             ),
             "drawdown_protection": config.kelly_drawdown_protection if config else True,
+            "max_ruin_probability": (
+                config.kelly_max_ruin_probability if config else 0.05
+            ),
         }
+        self.bankroll_simulator = bankroll_simulator
 
     def calculate_kelly_fraction(
         self,
@@ -162,33 +409,17 @@ class KellyCriterionEngine:
                     "risk_level": "NONE",
                 }
 
-            # Apply risk controls and adjustments
-            adjusted_kelly = basic_kelly
-            adjustments: List[str] = []
-
-            # 1. Maximum Kelly fraction cap
-            if adjusted_kelly > self.risk_controls["max_kelly_fraction"]:
-                adjusted_kelly = self.risk_controls["max_kelly_fraction"]
-                adjustments.append("capped_at_max")
-
-            # 2. Volatility adjustment
-            if volatility and self.risk_controls["volatility_adjustment"]:
-                vol_adjustment = 1 / (1 + volatility)
-                adjusted_kelly *= vol_adjustment
-                adjustments.append(f"volatility_adjusted_{vol_adjustment:.3f}")
-
-            # 3. Correlation adjustment (reduce sizing for correlated bets)
-            if correlation and self.risk_controls["correlation_adjustment"]:
-                corr_adjustment = 1 - min(abs(correlation), 0.5)
-                adjusted_kelly *= corr_adjustment
-                adjustments.append(f"correlation_adjusted_{corr_adjustment:.3f}")
-
-            # 4. Drawdown protection
-            if current_drawdown and self.risk_controls["drawdown_protection"]:
-                if current_drawdown > 0.1:  # More than 10% drawdown
-                    dd_adjustment = max(0.5, 1 - current_drawdown)
-                    adjusted_kelly *= dd_adjustment
-                    adjustments.append(f"drawdown_protection_{dd_adjustment:.3f}")
+            # Apply risk controls and adjustments (1-4)
+            adjusted_kelly, adjustments = self._apply_adjustments(
+                basic_kelly, volatility, correlation, current_drawdown
+            )
+
+            # 5. Simulated risk of ruin for the discrete bet sequence
+            simulation = None
+            if self.bankroll_simulator.available:
+                adjusted_kelly, simulation = self._limit_ruin_probability(
+                    p, odds, basic_kelly, adjusted_kelly, adjustments
+                )
 
             # Risk level classification
             risk_level = self._classify_risk_level(adjusted_kelly)
@@ -201,6 +432,7 @@ class KellyCriterionEngine:
                 "expected_value": (p * odds) - 1,
                 "adjustments": adjustments,
                 "risk_level": risk_level,
+                "bankroll_simulation": simulation,
                 "reasoning": f"Kelly: {basic_kelly:.3f}, Adjusted: {adjusted_kelly:.3f}",
             }
 
@@ -213,6 +445,127 @@ class KellyCriterionEngine:
                 "risk_level": "ERROR",
             }
 
+    async def calculate_kelly_fraction_async(
+        self,
+        win_probability: float,
+        odds: float,
+        volatility: Optional[float] = None,
+        correlation: Optional[float] = None,
+        current_drawdown: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """:meth:`calculate_kelly_fraction` for callers on the event loop
+
+        A ruin simulation that is not cached yet takes tens of milliseconds,
+        so that case runs in a worker thread; cached lookups stay inline.
+        """
+        args = (win_probability, odds, volatility, correlation, current_drawdown)
+        if self._ruin_simulation_cached(*args):
+            return self.calculate_kelly_fraction(*args)
+        return await asyncio.to_thread(self.calculate_kelly_fraction, *args)
+
+    def _ruin_simulation_cached(
+        self,
+        win_probability: float,
+        odds: float,
+        volatility: Optional[float],
+        correlation: Optional[float],
+        current_drawdown: Optional[float],
+    ) -> bool:
+        if not self.bankroll_simulator.available or win_probability <= 0.5 or odds <= 1.0:
+            return True
+        b = odds - 1
+        basic_kelly = (b * win_probability - (1 - win_probability)) / b
+        if basic_kelly <= 0:
+            return True
+        adjusted_kelly, _ = self._apply_adjustments(
+            basic_kelly, volatility, correlation, current_drawdown
+        )
+        return self.bankroll_simulator.is_cached(
+            win_probability, odds, self._ruin_candidates(basic_kelly, adjusted_kelly)
+        )
+
+    def _apply_adjustments(
+        self,
+        basic_kelly: float,
+        volatility: Optional[float],
+        correlation: Optional[float],
+        current_drawdown: Optional[float],
+    ) -> Tuple[float, List[str]]:
+        """Fraction after the cap, volatility, correlation and drawdown controls"""
+        adjusted_kelly = basic_kelly
+        adjustments: List[str] = []
+
+        # 1. Maximum Kelly fraction cap
+        if adjusted_kelly > self.risk_controls["max_kelly_fraction"]:
+            adjusted_kelly = self.risk_controls["max_kelly_fraction"]
+            adjustments.append("capped_at_max")
+
+        # 2. Volatility adjustment
+        if volatility and self.risk_controls["volatility_adjustment"]:
+            vol_adjustment = 1 / (1 + volatility)
+            adjusted_kelly *= vol_adjustment
+            adjustments.append(f"volatility_adjusted_{vol_adjustment:.3f}")
+
+        # 3. Correlation adjustment (reduce sizing for correlated bets)
+        if correlation and self.risk_controls["correlation_adjustment"]:
+            corr_adjustment = 1 - min(abs(correlation), 0.5)
+            adjusted_kelly *= corr_adjustment
+            adjustments.append(f"correlation_adjusted_{corr_adjustment:.3f}")
+
+        # 4. Drawdown protection
+        if current_drawdown and self.risk_controls["drawdown_protection"]:
+            if current_drawdown > 0.1:  # More than 10% drawdown
+                dd_adjustment = max(0.5, 1 - current_drawdown)
+                adjusted_kelly *= dd_adjustment
+                adjustments.append(f"drawdown_protection_{dd_adjustment:.3f}")
+
+        return adjusted_kelly, adjustments
+
+    # Multiples of full Kelly simulated alongside the adjusted fraction
+    KELLY_MULTIPLES = (0.1, 0.25, 0.5, 0.75, 1.0)
+
+    def _ruin_candidates(self, basic_kelly: float, adjusted_kelly: float) -> List[float]:
+        return [basic_kelly * m for m in self.KELLY_MULTIPLES] + [adjusted_kelly]
+
+    def _limit_ruin_probability(
+        self,
+        p: float,
+        odds: float,
+        basic_kelly: float,
+        adjusted_kelly: float,
+        adjustments: List[str],
+    ) -> Tuple[float, Dict[str, Any]]:
+        """Cap the fraction at the largest candidate within the ruin limit
+
+        Candidates are simulated at fractions rounded to
+        ``BankrollSimulator.FRACTION_STEP`` (0.0025), so a capped fraction is a
+        multiple of that step rather than an exact multiple of full Kelly.
+        """
+        candidates = self._ruin_candidates(basic_kelly, adjusted_kelly)
+        results = self.bankroll_simulator.simulate_bets(p, odds, candidates)
+        chosen = results[-1]
+
+        limit = self.risk_controls["max_ruin_probability"]
+        if chosen.ruin_probability > limit:
+            safe = [
+                r
+                for r in results[:-1]
+                if r.ruin_probability <= limit and r.fraction < adjusted_kelly
+            ]
+            if safe:
+                chosen = max(safe, key=lambda r: r.fraction)
+                adjusted_kelly = chosen.fraction
+            else:
+                adjusted_kelly = 0.0
+            adjustments.append(f"ruin_limited_{adjusted_kelly:.3f}")
+
+        simulation = asdict(chosen)
+        simulation["by_kelly_multiple"] = {
+            f"{m:g}": r.ruin_probability
+            for m, r in zip(self.KELLY_MULTIPLES, results)
+        }
+        return adjusted_kelly, simulation
+
     def _classify_risk_level(self, kelly_fraction: float) -> str:
         """Classify risk level based on Kelly fraction"""
         if kelly_fraction == 0:
@@ -335,11 +688,15 @@ class RiskAssessmentEngine:
             # Kelly criterion analysis
             kelly_fraction = await self._calculate_portfolio_kelly(positions)
 
-            # Bankruptcy analysis
-            bankruptcy_prob = self._calculate_bankruptcy_probability(
-                returns_array, bankroll
+            # Bankruptcy analysis: a bootstrap that is not cached yet takes tens
+            # of milliseconds, so it runs in a worker thread (the second call
+            # reuses the first one's simulation)
+            bankruptcy_prob = await asyncio.to_thread(
+                self._calculate_bankruptcy_probability, returns_array, bankroll
+            )
+            time_to_ruin = await asyncio.to_thread(
+                self._calculate_time_to_ruin, returns_array, bankroll
             )
-            time_to_ruin = self._calculate_time_to_ruin(returns_array, bankroll)
 
             # Confidence intervals
             confidence_interval = self._calculate_confidence_interval(returns_array)
@@ -583,26 +940,14 @@ class RiskAssessmentEngine:
     def _calculate_bankruptcy_probability(
         self, returns: List[float], bankroll: float
     ) -> float:
-        """Calculate probability of bankruptcy using Monte Carlo"""
+        """Calculate probability of ruin by bootstrapping historical returns"""
         if len(returns) == 0 or bankroll <= 0:
             return 1.0
 
-        # Simplified bankruptcy probability calculation
-        if np is not None:
-            np_cast = cast(Any, np)
-            mean_return: float = (
-                float(np_cast.mean(returns)) if len(returns) > 0 else -0.01
-            )
-            volatility: float = float(np_cast.std(returns)) if len(returns) > 0 else 0.1
-        else:
-            mean_return = (sum(returns) / len(returns)) if len(returns) > 0 else -0.01
-            if len(returns) > 1:
-                variance = sum((r - mean_return) ** 2 for r in returns) / (
-                    len(returns) - 1
-                )
-                volatility = variance**0.5
-            else:
-                volatility = 0.1
+        if bankroll_simulator.available:
+            return bankroll_simulator.simulate_returns(returns).ruin_probability
+
+        mean_return, volatility = self._return_moments(returns, default_volatility=0.1)
 
         # Use geometric Brownian motion to estimate bankruptcy probability
         # P(ruin) ≈ exp(-2μ * initial_capital / σ²)
@@ -623,29 +968,26 @@ class RiskAssessmentEngine:
         if len(returns) == 0:
             return None
 
-        if np is not None:
-            np_cast = cast(Any, np)
-            mean_return: float = float(np_cast.mean(returns))
-            volatility: float = float(np_cast.std(returns))
-        else:
-            mean_return = sum(returns) / len(returns)
-            if len(returns) > 1:
-                variance = sum((r - mean_return) ** 2 for r in returns) / (
-                    len(returns) - 1
-                )
-                volatility = variance**0.5
-            else:
-                volatility = 0.0
+        if bankroll_simulator.available:
+            return bankroll_simulator.simulate_returns(returns).expected_time_to_ruin
 
+        mean_return, _ = self._return_moments(returns, default_volatility=0.0)
         if mean_return >= 0:
             return None  # Positive expectancy, theoretically infinite time to ruin
 
-        if volatility == 0:
-            return float(abs(bankroll / mean_return))  # Deterministic case
-
         # Approximation for expected time to ruin
         # E[T] ≈ -bankroll / mean_return for small volatility
-        return float(abs(bankroll / mean_return)) if mean_return < 0 else None
+        return float(abs(bankroll / mean_return))
+
+    @staticmethod
+    def _return_moments(
+        returns: List[float], default_volatility: float
+    ) -> Tuple[float, float]:
+        """Mean and sample standard deviation without numpy"""
+        mean_return = statistics.fmean(returns)
+        if len(returns) > 1:
+            return mean_return, statistics.stdev(returns, mean_return)
+        return mean_return, default_volatility
 
     def _calculate_confidence_interval(
         self, returns: List[float], confidence: float = 0.95
@@ -1498,7 +1840,7 @@ class UltraRiskManagementEngine:
                 )
 
             # Kelly calculation
-            kelly_result = self.kelly_engine.calculate_kelly_fraction(
+            kelly_result = await self.kelly_engine.calculate_kelly_fraction_async(
                 win_probability=win_probability,
                 odds=odds,
                 volatility=opportunity.get("volatility"),
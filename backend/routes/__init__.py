@@ -10,6 +10,7 @@ from .performance import router as performance_router
 from .auth import router as auth_router
 from .prizepicks import router as prizepicks_router
 from .analytics import router as analytics_router
+from .metrics import router as metrics_router
 
 __all__ = [
     "health_router",
@@ -18,4 +19,5 @@ __all__ = [
     "auth_router",
     "prizepicks_router",
     "analytics_router",
+    "metrics_router",
 ] 
\ No newline at end of file
@@ -12,6 +12,7 @@ from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import FileResponse
 import os
 
+from middleware.caching import cached_response, response_cache
 from models.api_models import (
     MatchPredictionRequest,
     MatchPredictionResponse,
@@ -365,6 +366,8 @@ async def get_advanced_analytics() -> Dict[str, Any]:
 
 
 @router.get("/predictions")
+# TTL-only: static legacy payload
+@cached_response(response_cache, namespace="predictions", ttl=60)
 async def get_predictions_shim(
     sport: Optional[str] = None, 
     _limit: int = 10
@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from middleware.caching import cached_response, response_cache
 from models.api_models import (
     BettingOpportunity,
     ArbitrageOpportunity,
@@ -23,6 +24,8 @@ router = APIRouter(prefix="/api", tags=["Betting"])
 
 
 @router.get("/betting-opportunities", response_model=List[BettingOpportunity])
+# TTL-only: opportunities are read through from the odds API and database on a miss
+@cached_response(response_cache, namespace="betting_opportunities", ttl=60)
 async def get_betting_opportunities(
     sport: Optional[str] = None, limit: int = 10
 ) -> List[BettingOpportunity]:
@@ -52,6 +55,8 @@ async def get_betting_opportunities(
 
 
 @router.get("/arbitrage-opportunities", response_model=List[ArbitrageOpportunity])
+# TTL-only: computed on each miss, nothing to invalidate on
+@cached_response(response_cache, namespace="arbitrage", ttl=30)
 async def get_arbitrage_opportunities(limit: int = 5) -> List[ArbitrageOpportunity]:
     """Get arbitrage opportunities across different bookmakers"""
     try:
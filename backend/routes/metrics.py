@@ -2,7 +2,10 @@ import time
 import psutil
 from datetime import datetime
 from typing import Dict, Any
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from utils.tracing import trace_registry
 
 router = APIRouter()
 
@@ -59,7 +62,20 @@ async def get_performance_metrics():
     """Get current performance metrics"""
     return performance_metrics.get_metrics()
 
-@router.get("/metrics/prometheus")
+@router.get("/metrics/stages")
+async def get_stage_breakdown():
+    """Per-endpoint latency and time spent in each traced stage"""
+    return trace_registry.stage_breakdown()
+
+@router.get("/metrics/profiles/{profile_id}")
+async def get_request_profile(profile_id: str):
+    """Sampled stack profile of a request sent with the X-Profile-Request header"""
+    profile = trace_registry.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
 async def get_prometheus_metrics():
     """Get metrics in Prometheus format"""
     metrics = performance_metrics.get_metrics()
@@ -83,6 +99,7 @@ cpu_usage_percent {metrics['system_metrics']['cpu_usage_percent']}
 # HELP memory_usage_percent Memory usage percentage
 # TYPE memory_usage_percent gauge
 memory_usage_percent {metrics['system_metrics']['memory_usage_percent']}
+
 """
     
-    return prometheus_format
+    return prometheus_format + trace_registry.render_prometheus()
@@ -9,19 +9,18 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, status
 
-from middleware.caching import TTLCache, retry_and_cache
+from middleware.caching import cached_response, response_cache
 from services.data_fetchers import fetch_prizepicks_props_internal
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/prizepicks", tags=["PrizePicks"])
 
-# Cache for PrizePicks data
-prizepicks_cache = TTLCache(maxsize=100, ttl=300)
-
-
-@retry_and_cache(prizepicks_cache)
 @router.get("/props")
+# Fetched live per miss, so entries can be up to 5 minutes old (the upstream poll
+# interval); the background ingestion loop, when running, invalidates them early
+# on changed projections
+@cached_response(response_cache, namespace="prizepicks", ttl=300)
 async def get_prizepicks_props(
     sport: Optional[str] = None, 
     min_confidence: Optional[int] = 70
@@ -5,6 +5,7 @@ Target: Create 100+ predictive features across all sports and prop types.
 """
 
 import asyncio
+import hashlib
 import logging
 import time
 import numpy as np
@@ -14,7 +15,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 import json
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,104 @@ class FeatureCategory(Enum):
     REFEREE_IMPACT = "referee_impact"
     VENUE_EFFECTS = "venue_effects"
 
+# How long a computed category stays valid, in seconds
+CATEGORY_TTLS: Dict[FeatureCategory, float] = {
+    FeatureCategory.PLAYER_PERFORMANCE: 12 * 3600,
+    FeatureCategory.MATCHUP_SPECIFIC: 6 * 3600,
+    FeatureCategory.REST_TRAVEL: 6 * 3600,
+    FeatureCategory.WEATHER_IMPACT: 10 * 60,
+    FeatureCategory.INJURY_SENTIMENT: 15 * 60,
+    FeatureCategory.LINE_MOVEMENT: 2 * 60,
+    FeatureCategory.HISTORICAL_PROP: 3 * 86400,
+    FeatureCategory.GAME_SCRIPT: 30 * 60,
+    FeatureCategory.REFEREE_IMPACT: 12 * 3600,
+    FeatureCategory.VENUE_EFFECTS: 7 * 86400,
+}
+
+# raw_data keys each category reads; a category is recomputed only when these change.
+# Its create_* method is passed only these keys, so the cache key covers every
+# input it can see: a new input must be added here before the method can use it.
+CATEGORY_INPUT_KEYS: Dict[FeatureCategory, Tuple[str, ...]] = {
+    FeatureCategory.PLAYER_PERFORMANCE: ('game_logs', 'season_stats', 'career_stats'),
+    FeatureCategory.MATCHUP_SPECIFIC: ('opponent', 'opponent_stats', 'home_away', 'game_logs'),
+    FeatureCategory.REST_TRAVEL: ('schedule', 'game_time', 'venue'),
+    FeatureCategory.WEATHER_IMPACT: ('weather', 'venue', 'game_time'),
+    FeatureCategory.INJURY_SENTIMENT: ('injuries', 'injury_reports', 'news'),
+    FeatureCategory.LINE_MOVEMENT: ('line', 'line_history', 'odds', 'betting_splits'),
+    FeatureCategory.HISTORICAL_PROP: ('prop_history', 'line'),
+    FeatureCategory.GAME_SCRIPT: ('odds', 'spread', 'total', 'opponent'),
+    FeatureCategory.REFEREE_IMPACT: ('referees',),
+    FeatureCategory.VENUE_EFFECTS: ('venue',),
+}
+
+def category_inputs(category: FeatureCategory, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The raw_data fields a category depends on"""
+    return {k: raw_data[k] for k in CATEGORY_INPUT_KEYS[category] if k in raw_data}
+
+def hash_category_inputs(category: FeatureCategory, raw_data: Dict[str, Any]) -> str:
+    """Stable hash of the raw_data fields a category depends on"""
+    subset = category_inputs(category, raw_data)
+    payload = json.dumps(subset, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+class CategoryFeatureStore:
+    """Size-bounded LRU of computed feature categories with per-entry expiry"""
+    
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, ...], Tuple[float, Dict[str, float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Tuple[str, ...]) -> Optional[Dict[str, float]]:
+        """A copy of the cached features, so callers cannot alter the entry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, features = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(features)
+    
+    def set(self, key: Tuple[str, ...], features: Dict[str, float], ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, dict(features))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def evict_expired(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._entries.items() if now >= expires_at]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+        return len(expired)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
 @dataclass
 class FeatureSet:
     """Comprehensive feature set"""
@@ -46,8 +145,11 @@ class FeatureSet:
 class ComprehensiveFeatureEngine:
     """Revolutionary feature engineering service for maximum accuracy"""
     
-    def __init__(self):
-        self.feature_cache: Dict[str, FeatureSet] = {}
+    def __init__(self, max_cached_feature_sets: int = 5000, max_category_entries: int = 20000):
+        self.feature_cache: "OrderedDict[str, FeatureSet]" = OrderedDict()
+        self.max_cached_feature_sets = max_cached_feature_sets
+        self.category_store = CategoryFeatureStore(max_entries=max_category_entries)
+        self.category_ttls: Dict[FeatureCategory, float] = dict(CATEGORY_TTLS)
         self.feature_history: deque = deque(maxlen=10000)
         self.feature_importance_cache: Dict[str, Dict[str, float]] = {}
         
@@ -64,59 +166,33 @@ class ComprehensiveFeatureEngine:
         start_time = time.time()
         
         try:
-            # Initialize feature containers
-            all_features = {}
+            # Reuse every category whose inputs are unchanged and still fresh;
+            # compute the rest concurrently
             feature_categories = {}
+            stale: Dict[FeatureCategory, Tuple[str, ...]] = {}
+            for category in FeatureCategory:
+                key = (player_name, sport, prop_type, category.value,
+                       hash_category_inputs(category, raw_data))
+                cached = self.category_store.get(key)
+                if cached is not None:
+                    feature_categories[category] = cached
+                else:
+                    stale[category] = key
             
-            # 1. Player Performance Trends (20+ features)
-            performance_features = await self.create_player_performance_features(player_name, sport, prop_type, raw_data)
-            all_features.update(performance_features)
-            feature_categories[FeatureCategory.PLAYER_PERFORMANCE] = performance_features
-            
-            # 2. Matchup-Specific Performance (15+ features)
-            matchup_features = await self.create_matchup_specific_features(player_name, sport, prop_type, raw_data)
-            all_features.update(matchup_features)
-            feature_categories[FeatureCategory.MATCHUP_SPECIFIC] = matchup_features
-            
-            # 3. Rest & Travel Factors (10+ features)
-            rest_travel_features = await self.create_rest_travel_features(player_name, sport, raw_data)
-            all_features.update(rest_travel_features)
-            feature_categories[FeatureCategory.REST_TRAVEL] = rest_travel_features
-            
-            # 4. Weather Impact (8+ features for outdoor sports)
-            weather_features = await self.create_weather_impact_features(sport, raw_data)
-            all_features.update(weather_features)
-            feature_categories[FeatureCategory.WEATHER_IMPACT] = weather_features
-            
-            # 5. Injury Report Sentiment (12+ features)
-            injury_features = await self.create_injury_sentiment_features(player_name, sport, raw_data)
-            all_features.update(injury_features)
-            feature_categories[FeatureCategory.INJURY_SENTIMENT] = injury_features
+            if stale:
+                computed = await asyncio.gather(*(
+                    self._compute_category(category, player_name, sport, prop_type, raw_data)
+                    for category in stale
+                ))
+                for (category, key), features in zip(stale.items(), computed):
+                    self.category_store.set(key, features, self.category_ttls[category])
+                    feature_categories[category] = features
             
-            # 6. Line Movement Intelligence (15+ features)
-            line_movement_features = await self.create_line_movement_features(player_name, prop_type, raw_data)
-            all_features.update(line_movement_features)
-            feature_categories[FeatureCategory.LINE_MOVEMENT] = line_movement_features
-            
-            # 7. Historical Prop Performance (10+ features)
-            historical_features = await self.create_historical_prop_features(player_name, prop_type, raw_data)
-            all_features.update(historical_features)
-            feature_categories[FeatureCategory.HISTORICAL_PROP] = historical_features
-            
-            # 8. Game Script Predictions (8+ features)
-            game_script_features = await self.create_game_script_features(sport, raw_data)
-            all_features.update(game_script_features)
-            feature_categories[FeatureCategory.GAME_SCRIPT] = game_script_features
-            
-            # 9. Referee Impact (6+ features)
-            referee_features = await self.create_referee_impact_features(sport, raw_data)
-            all_features.update(referee_features)
-            feature_categories[FeatureCategory.REFEREE_IMPACT] = referee_features
-            
-            # 10. Venue Effects (8+ features)
-            venue_features = await self.create_venue_effects_features(sport, raw_data)
-            all_features.update(venue_features)
-            feature_categories[FeatureCategory.VENUE_EFFECTS] = venue_features
+            # Merge in the fixed category order so feature names stay stable
+            all_features = {}
+            feature_categories = {c: feature_categories[c] for c in FeatureCategory}
+            for features in feature_categories.values():
+                all_features.update(features)
             
             # Calculate feature importance
             feature_importance = await self.calculate_feature_importance(all_features, sport, prop_type)
@@ -138,7 +214,8 @@ class ComprehensiveFeatureEngine:
                     'total_features': len(all_features),
                     'engineering_time': engineering_time,
                     'timestamp': datetime.now(timezone.utc).isoformat(),
-                    'categories_count': len(feature_categories)
+                    'categories_count': len(feature_categories),
+                    'recomputed_categories': [c.value for c in stale]
                 }
             )
             
@@ -154,6 +231,30 @@ class ComprehensiveFeatureEngine:
             logger.error(f"❌ Feature engineering error: {e}")
             raise
     
+    async def _compute_category(self, category: FeatureCategory, player_name: str, sport: str,
+                                prop_type: str, raw_data: Dict[str, Any]) -> Dict[str, float]:
+        """Compute a single feature category from its declared inputs only"""
+        raw_data = category_inputs(category, raw_data)
+        if category == FeatureCategory.PLAYER_PERFORMANCE:
+            return await self.create_player_performance_features(player_name, sport, prop_type, raw_data)
+        if category == FeatureCategory.MATCHUP_SPECIFIC:
+            return await self.create_matchup_specific_features(player_name, sport, prop_type, raw_data)
+        if category == FeatureCategory.REST_TRAVEL:
+            return await self.create_rest_travel_features(player_name, sport, raw_data)
+        if category == FeatureCategory.WEATHER_IMPACT:
+            return await self.create_weather_impact_features(sport, raw_data)
+        if category == FeatureCategory.INJURY_SENTIMENT:
+            return await self.create_injury_sentiment_features(player_name, sport, raw_data)
+        if category == FeatureCategory.LINE_MOVEMENT:
+            return await self.create_line_movement_features(player_name, prop_type, raw_data)
+        if category == FeatureCategory.HISTORICAL_PROP:
+            return await self.create_historical_prop_features(player_name, prop_type, raw_data)
+        if category == FeatureCategory.GAME_SCRIPT:
+            return await self.create_game_script_features(sport, raw_data)
+        if category == FeatureCategory.REFEREE_IMPACT:
+            return await self.create_referee_impact_features(sport, raw_data)
+        return await self.create_venue_effects_features(sport, raw_data)
+    
     async def create_player_performance_features(self, player_name: str, sport: str, 
                                                prop_type: str, raw_data: Dict[str, Any]) -> Dict[str, float]:
         """Create player performance trend features"""
@@ -453,6 +554,9 @@ class ComprehensiveFeatureEngine:
         """Cache feature set for future use"""
         cache_key = f"{feature_set.player_name}_{feature_set.sport}_{feature_set.prop_type}"
         self.feature_cache[cache_key] = feature_set
+        self.feature_cache.move_to_end(cache_key)
+        while len(self.feature_cache) > self.max_cached_feature_sets:
+            self.feature_cache.popitem(last=False)
         
         # Add to history
         self.feature_history.append({
@@ -468,6 +572,7 @@ class ComprehensiveFeatureEngine:
         """Get feature engineering service statistics"""
         return {
             'cached_feature_sets': len(self.feature_cache),
+            'category_store': self.category_store.get_stats(),
             'total_features_engineered': len(self.feature_history),
             'avg_feature_count': np.mean([h['feature_count'] for h in self.feature_history]) if self.feature_history else 0,
             'avg_quality_score': np.mean([h['quality_score'] for h in self.feature_history]) if self.feature_history else 0,
@@ -5,6 +5,7 @@ Implements real-time data ingestion, historical tracking, and value detection.
 """
 
 import asyncio
+import hashlib
 import logging
 import time
 import os
@@ -12,6 +13,7 @@ from collections import defaultdict, deque
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
+from urllib.parse import urljoin
 import httpx
 import json
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text
@@ -20,10 +22,30 @@ from sqlalchemy.orm import sessionmaker
 import pandas as pd
 import numpy as np
 
+from middleware.caching import response_cache
+
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+# Returned by _make_api_request when the upstream answers 304 Not Modified
+NOT_MODIFIED = object()
+
+# Polled when league discovery fails; a snapshot built from them is never complete
+DEFAULT_LEAGUES = [
+    {'id': 'NBA', 'name': 'NBA'},
+    {'id': 'NFL', 'name': 'NFL'},
+    {'id': 'MLB', 'name': 'MLB'},
+    {'id': 'NHL', 'name': 'NHL'},
+    {'id': 'NCAAB', 'name': 'NCAAB'},
+    {'id': 'NCAAF', 'name': 'NCAAF'}
+]
+
+def projection_fingerprint(proj_data: Dict[str, Any]) -> str:
+    """Stable content hash of a processed projection dict"""
+    payload = json.dumps(proj_data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 @dataclass
 class PrizePicksProjection:
     """Complete PrizePicks projection with all metadata"""
@@ -63,6 +85,18 @@ class ProjectionAnalysis:
     recommendation: str
     reasoning: List[str]
 
+@dataclass
+class ProjectionDelta:
+    """Difference between two projection snapshots"""
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
 @dataclass
 class MarketComparison:
     """Comparison across multiple sportsbooks"""
@@ -132,6 +166,19 @@ class ComprehensivePrizePicksService:
         self.player_trends: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
         self.market_comparisons: Dict[str, MarketComparison] = {}
         
+        # Delta ingestion: content hash of every projection in the last snapshot
+        self.projection_hashes: Dict[str, str] = {}
+        self.last_delta: Optional[ProjectionDelta] = None
+        self.last_fetch_complete = True
+        
+        # Conditional requests: ETag/Last-Modified and processed snapshot per league
+        self.http_validators: Dict[str, Dict[str, str]] = {}
+        self.league_snapshots: Dict[str, List[Dict[str, Any]]] = {}
+        self.not_modified_count = 0
+        
+        # Pages read per league snapshot before it counts as truncated
+        self.max_pages = 50
+        
         # Performance tracking
         self.fetch_count = 0
         self.error_count = 0
@@ -191,15 +238,22 @@ class ComprehensivePrizePicksService:
                 # Fetch all current projections
                 all_projections = await self.fetch_all_projections()
                 
-                # Process and store projections
-                processed_count = await self.process_projections(all_projections)
+                # Apply only what changed since the previous snapshot
+                processed_count = await self.process_projections(
+                    all_projections, complete=self.last_fetch_complete
+                )
                 
                 # Update metrics
                 self.fetch_count += 1
                 self.last_update = datetime.now(timezone.utc)
                 fetch_time = time.time() - start_time
                 
-                logger.info(f"✅ Fetched {processed_count} projections in {fetch_time:.2f}s")
+                delta = self.last_delta
+                logger.info(
+                    f"✅ Fetched {len(all_projections)} projections in {fetch_time:.2f}s "
+                    f"({len(delta.added)} added, {len(delta.changed)} changed, "
+                    f"{len(delta.removed)} removed, {processed_count} applied)"
+                )
                 
                 # Wait for next update
                 await asyncio.sleep(self.update_frequency)
@@ -212,19 +266,23 @@ class ComprehensivePrizePicksService:
     async def fetch_all_projections(self) -> List[Dict[str, Any]]:
         """Fetch ALL projections from PrizePicks API"""
         all_projections = []
+        self.last_fetch_complete = False
         
         try:
-            # Fetch all leagues first
-            leagues = await self.fetch_leagues()
+            # Fetch all leagues first; the default list may miss leagues
+            leagues, complete = await self._discover_leagues()
             
             # Fetch projections for each league
             for league in leagues:
-                league_projections = await self.fetch_league_projections(league['id'])
+                league_projections, league_complete = await self._fetch_league_snapshot(league['id'])
+                # A failed or truncated league must not look like its missing lines were removed
+                complete = complete and league_complete
                 all_projections.extend(league_projections)
                 
                 # Small delay to respect rate limits
                 await asyncio.sleep(0.1)
             
+            self.last_fetch_complete = complete
             logger.info(f"📊 Fetched {len(all_projections)} total projections across {len(leagues)} leagues")
             return all_projections
             
@@ -232,8 +290,18 @@ class ComprehensivePrizePicksService:
             logger.error(f"❌ Error fetching all projections: {e}")
             return []
     
-    async def _make_api_request(self, url: str, params: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
-        """Make an authenticated API request with rate limiting and retry logic"""
+    async def _make_api_request(
+        self,
+        url: str,
+        params: Dict[str, Any] = None,
+        conditional_key: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Make an authenticated API request with rate limiting and retry logic
+        
+        With ``conditional_key``, validators from the previous response under that key
+        are sent as If-None-Match/If-Modified-Since, and ``NOT_MODIFIED`` is returned
+        when the upstream answers 304.
+        """
         if not self.http_client:
             logger.error("❌ HTTP client not initialized")
             return None
@@ -250,6 +318,13 @@ class ComprehensivePrizePicksService:
             "Content-Type": "application/json"
         }
         
+        validators = self.http_validators.get(conditional_key) if conditional_key else None
+        if validators:
+            if "etag" in validators:
+                headers["If-None-Match"] = validators["etag"]
+            if "last_modified" in validators:
+                headers["If-Modified-Since"] = validators["last_modified"]
+        
         # Add API key if available (not required for PrizePicks)
         # if self.api_key:
         #     headers["Authorization"] = f"Bearer {self.api_key}"
@@ -265,6 +340,10 @@ class ComprehensivePrizePicksService:
                 
                 response = await self.http_client.get(url, params=params, headers=headers)
                 
+                if response.status_code == 304 and validators:
+                    self.not_modified_count += 1
+                    return NOT_MODIFIED
+                
                 # Handle rate limiting
                 if response.status_code == 429:
                     retry_after = int(response.headers.get("Retry-After", self.retry_delay * (attempt + 1)))
@@ -278,6 +357,8 @@ class ComprehensivePrizePicksService:
                     return None
                 
                 response.raise_for_status()
+                if conditional_key:
+                    self._store_validators(conditional_key, response.headers)
                 return response.json()
                 
             except httpx.HTTPStatusError as e:
@@ -297,39 +378,55 @@ class ComprehensivePrizePicksService:
         
         return None
 
+    def _store_validators(self, key: str, response_headers: httpx.Headers):
+        """Remember ETag/Last-Modified of a response for the next conditional request"""
+        validators = {}
+        if response_headers.get("ETag"):
+            validators["etag"] = response_headers["ETag"]
+        if response_headers.get("Last-Modified"):
+            validators["last_modified"] = response_headers["Last-Modified"]
+        if validators:
+            self.http_validators[key] = validators
+        else:
+            self.http_validators.pop(key, None)
+
     async def fetch_leagues(self) -> List[Dict[str, Any]]:
         """Fetch all available leagues"""
+        leagues, _ = await self._discover_leagues()
+        return leagues
+
+    async def _discover_leagues(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Available leagues, and False when they are the defaults because discovery failed"""
         try:
             data = await self._make_api_request(f"{self.base_url}/leagues")
             
             if data:
                 leagues = data.get('data', [])
                 logger.info(f"📋 Found {len(leagues)} active leagues")
-                return leagues
+                return leagues, True
             else:
                 logger.warning("⚠️ Failed to fetch leagues, using defaults")
-                return [
-                    {'id': 'NBA', 'name': 'NBA'},
-                    {'id': 'NFL', 'name': 'NFL'},
-                    {'id': 'MLB', 'name': 'MLB'},
-                    {'id': 'NHL', 'name': 'NHL'},
-                    {'id': 'NCAAB', 'name': 'NCAAB'},
-                    {'id': 'NCAAF', 'name': 'NCAAF'}
-                ]
+                return list(DEFAULT_LEAGUES), False
             
         except Exception as e:
             logger.error(f"❌ Error fetching leagues: {e}")
-            return [
-                {'id': 'NBA', 'name': 'NBA'},
-                {'id': 'NFL', 'name': 'NFL'},
-                {'id': 'MLB', 'name': 'MLB'},
-                {'id': 'NHL', 'name': 'NHL'},
-                {'id': 'NCAAB', 'name': 'NCAAB'},
-                {'id': 'NCAAF', 'name': 'NCAAF'}
-            ]
+            return list(DEFAULT_LEAGUES), False
 
     async def fetch_league_projections(self, league_id: str) -> List[Dict[str, Any]]:
         """Fetch all projections for a specific league"""
+        projections, _ = await self._fetch_league_snapshot(league_id)
+        return projections
+    
+    async def _fetch_league_snapshot(self, league_id: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fetch every page of a league's projections, reusing the previous snapshot on 304
+        
+        Returns the projections read and whether they are the league's complete set:
+        False when a request failed or pages were left unread (``max_pages``).
+        Conditional requests are only used for single-page leagues, since an
+        unchanged first page says nothing about the others.
+        """
+        snapshot_key = f"projections:{league_id}"
+        processed_projections: List[Dict[str, Any]] = []
         try:
             params = {
                 'include': 'new_player,league,stat_type',
@@ -340,24 +437,62 @@ class ComprehensivePrizePicksService:
             if league_id:
                 params['league_id'] = league_id
             
-            data = await self._make_api_request(f"{self.base_url}/projections", params=params)
-            
-            if data:
-                projections = data.get('data', [])
-                included = data.get('included', [])
+            # Validators are only sent once a processed snapshot exists to fall back on
+            if snapshot_key not in self.league_snapshots:
+                self.http_validators.pop(snapshot_key, None)
+            url: Optional[str] = f"{self.base_url}/projections"
+            pages = 0
+            while url:
+                if pages == self.max_pages:
+                    logger.warning(f"⚠️ {league_id} projections truncated after {pages} pages")
+                    return processed_projections, False
+                data = await self._make_api_request(
+                    url, params=params, conditional_key=snapshot_key if pages == 0 else None
+                )
                 
-                # Process included data for player and league info
-                processed_projections = self.process_raw_projections(projections, included)
+                if data is NOT_MODIFIED:
+                    snapshot = self.league_snapshots[snapshot_key]
+                    logger.debug(f"📊 {league_id} projections not modified ({len(snapshot)} cached)")
+                    return snapshot, True
                 
-                logger.info(f"📊 Fetched {len(processed_projections)} projections for {league_id}")
-                return processed_projections
-            else:
-                logger.warning(f"⚠️ Failed to fetch projections for {league_id}")
-                return []
+                if not data:
+                    logger.warning(f"⚠️ Failed to fetch projections for {league_id} (page {pages + 1})")
+                    return processed_projections, False
+                
+                # Process included data for player and league info
+                processed_projections.extend(
+                    self.process_raw_projections(data.get('data', []), data.get('included', []))
+                )
+                pages += 1
+                url, params = self._next_page(url, params, data)
+                if url:
+                    self.http_validators.pop(snapshot_key, None)
+            
+            self.league_snapshots[snapshot_key] = processed_projections
+            logger.info(f"📊 Fetched {len(processed_projections)} projections for {league_id} ({pages} pages)")
+            return processed_projections, True
             
         except Exception as e:
             logger.error(f"❌ Error fetching {league_id} projections: {e}")
-            return []
+            return processed_projections, False
+    
+    @staticmethod
+    def _next_page(
+        url: str, params: Optional[Dict[str, Any]], data: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """URL and params of the page after ``data``; (None, None) on the last page
+        
+        Follows the JSON:API ``links.next`` link (which carries its own query) or,
+        failing that, ``meta.current_page``/``meta.total_pages``.
+        """
+        next_link = (data.get('links') or {}).get('next')
+        if next_link:
+            return urljoin(url, next_link), None
+        meta = data.get('meta') or {}
+        current, total = meta.get('current_page'), meta.get('total_pages')
+        if current and total and int(current) < int(total):
+            return url, {**(params or {}), 'page': int(current) + 1}
+        return None, None
     
     def process_raw_projections(self, projections: List[Dict], included: List[Dict]) -> List[Dict[str, Any]]:
         """Process raw API data into structured projections"""
@@ -414,11 +549,52 @@ class ComprehensivePrizePicksService:
         
         return processed
     
-    async def process_projections(self, projections: List[Dict[str, Any]]) -> int:
-        """Process and store projections"""
-        processed_count = 0
+    def diff_projections(
+        self, projections: List[Dict[str, Any]], complete: bool = True
+    ) -> Tuple[ProjectionDelta, Dict[str, str]]:
+        """Compare a snapshot against the previous one by per-projection content hash
+        
+        Removals are only reported for complete snapshots; a partial fetch keeps
+        whatever it did not see. Returns the delta and the hashes of the new snapshot.
+        """
+        delta = ProjectionDelta()
+        new_hashes: Dict[str, str] = {} if complete else dict(self.projection_hashes)
         
         for proj_data in projections:
+            proj_id = proj_data.get('id')
+            if not proj_id:
+                continue
+            fingerprint = projection_fingerprint(proj_data)
+            previous = self.projection_hashes.get(proj_id)
+            new_hashes[proj_id] = fingerprint
+            if previous is None:
+                delta.added.append(proj_data)
+            elif previous != fingerprint:
+                delta.changed.append(proj_data)
+            else:
+                delta.unchanged += 1
+        
+        if complete:
+            delta.removed = [pid for pid in self.projection_hashes if pid not in new_hashes]
+        
+        return delta, new_hashes
+    
+    async def process_projections(self, projections: List[Dict[str, Any]], complete: bool = True) -> int:
+        """Process and store the projections that were added or changed since the last snapshot
+        
+        Removed projections are dropped from the current set and analysis cache.
+        Returns the number of added/changed projections applied.
+        """
+        delta, new_hashes = self.diff_projections(projections, complete=complete)
+        self.last_delta = delta
+        
+        for proj_id in delta.removed:
+            self.current_projections.pop(proj_id, None)
+            self.analysis_cache.pop(proj_id, None)
+        
+        processed_count = 0
+        
+        for proj_data in delta.added + delta.changed:
             try:
                 # Create PrizePicksProjection object
                 projection = PrizePicksProjection(
@@ -439,8 +615,9 @@ class ComprehensivePrizePicksService:
                     updated_at=datetime.fromisoformat(proj_data['updated_at'].replace('Z', '+00:00')) if proj_data['updated_at'] else datetime.now(),
                 )
                 
-                # Store in current projections
+                # Store in current projections; a changed line needs a fresh analysis
                 self.current_projections[projection.id] = projection
+                self.analysis_cache.pop(projection.id, None)
                 
                 # Add to historical data
                 self.historical_data.append(projection)
@@ -460,8 +637,14 @@ class ComprehensivePrizePicksService:
                 
             except Exception as e:
                 logger.warning(f"⚠️ Error processing projection: {e}")
+                # Leave it out of the snapshot so the next poll retries it
+                new_hashes.pop(proj_data.get('id'), None)
                 continue
         
+        self.projection_hashes = new_hashes
+        if delta.has_changes:
+            # Cached /api/prizepicks responses were built from the old snapshot
+            response_cache.invalidate("prizepicks")
         return processed_count
     
     async def store_projection_history(self, projection: PrizePicksProjection):
@@ -480,9 +663,11 @@ class ComprehensivePrizePicksService:
                     status=projection.status
                 )
                 
-                # Check if record already exists
+                # Check if this line was already recorded; a moved line gets a new row
                 existing = self.session.query(ProjectionHistory).filter_by(
-                    projection_id=projection.id
+                    projection_id=projection.id,
+                    line_score=projection.line_score,
+                    status=projection.status
                 ).first()
                 
                 if not existing:
@@ -919,6 +1104,13 @@ class ComprehensivePrizePicksService:
             'leagues_tracked': len(set(p.league for p in self.current_projections.values())),
             'players_tracked': len(set(p.player_id for p in self.current_projections.values())),
             'update_frequency_minutes': self.update_frequency / 60,
+            'not_modified_count': self.not_modified_count,
+            'last_delta': {
+                'added': len(self.last_delta.added),
+                'changed': len(self.last_delta.changed),
+                'removed': len(self.last_delta.removed),
+                'unchanged': self.last_delta.unchanged,
+            } if self.last_delta else None,
             'error_rate': self.error_count / max(self.fetch_count, 1)
         }
 
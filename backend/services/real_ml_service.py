@@ -4,9 +4,12 @@ This service provides genuine machine learning capabilities for sports betting p
 """
 
 import asyncio
+import copy
 import logging
 import pickle
 import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -21,14 +24,77 @@ from sklearn.ensemble import (
     RandomForestRegressor,
     VotingClassifier,
 )
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score
 from sklearn.model_selection import cross_val_score, train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.utils import shuffle
 
+from utils.columnar_dataset import ColumnarDataset, fit_incremental
+from utils.online_learning import OnlineModelState, online_update, supports_online_update
+
 logger = logging.getLogger(__name__)
 
+WIN_PROBABILITY_FEATURES = [
+    'home_team_rating', 'away_team_rating', 'home_recent_form',
+    'away_recent_form', 'head_to_head_record', 'home_advantage',
+    'rest_days_home', 'rest_days_away', 'injuries_home', 'injuries_away',
+    'weather_impact', 'motivation_factor'
+]
+
+VALUE_BET_FEATURES = [
+    'home_team_rating', 'away_team_rating', 'home_recent_form',
+    'away_recent_form', 'head_to_head_record', 'home_advantage',
+    'market_prob'  # Include market probability as feature
+]
+
+PLAYER_PROPS_FEATURES = [
+    'player_rating', 'recent_avg', 'season_avg', 'opponent_defense_rating',
+    'home_away', 'rest_days', 'injury_status', 'motivation', 'weather_factor'
+]
+
+
+def outcome_table(model_name: str) -> str:
+    """Training table holding the labeled outcomes of ``model_name``'s predictions"""
+    return f'outcomes_{model_name}'
+
+
+# Trainer of each model, used for drift-triggered background retrains
+TRAINERS = {
+    'win_probability': '_train_win_probability_model',
+    'confidence': '_train_confidence_model',
+    'value_bet': '_train_value_bet_model',
+    'player_props': '_train_player_props_model',
+    'market_efficiency': '_train_market_efficiency_model',
+}
+
+# Classifiers whose label is a stored column: (table, features, target). Above
+# ``out_of_core_rows`` they are trained chunk by chunk by ``train_out_of_core``.
+# The confidence and market-efficiency regressors derive their targets from
+# several columns of the whole table and are always trained in memory.
+OUT_OF_CORE_MODELS = {
+    'win_probability': ('team_games', WIN_PROBABILITY_FEATURES, 'home_win'),
+    'value_bet': ('team_games', VALUE_BET_FEATURES, 'is_value_bet'),
+    'player_props': ('player_props', PLAYER_PROPS_FEATURES, 'beats_line'),
+}
+
+
+def with_outcomes(
+    training_data: Dict[str, ColumnarDataset],
+    model_name: str,
+    feature_cols: List[str],
+    X: np.ndarray,
+    y: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Add the recorded outcomes of ``model_name`` (if any) to its training rows"""
+    outcomes = training_data.get(outcome_table(model_name))
+    if outcomes is None or not len(outcomes) or not set(feature_cols) <= set(outcomes.columns):
+        return X, y
+    return (
+        np.vstack([X, outcomes.matrix(feature_cols)]),
+        np.concatenate([np.asarray(y), np.asarray(outcomes['outcome'])]),
+    )
+
 
 class RealMLModels:
     """Real trained ML models for sports betting predictions"""
@@ -46,20 +112,39 @@ class RealMLModels:
         self.model_dir = Path("models")
         self.model_dir.mkdir(exist_ok=True)
 
+        # Columnar training tables, memory-mapped on load and appended to as
+        # labeled outcomes arrive
+        self.dataset_dir = self.model_dir / "datasets"
+        # Above this many rows the models in OUT_OF_CORE_MODELS are trained
+        # chunk by chunk with partial_fit instead of in memory
+        self.out_of_core_rows = 5_000_000
+
+        # Online learning: outcomes of remembered predictions update the
+        # served models in mini-batches; drift triggers a background retrain
+        self.online_state: Dict[str, OnlineModelState] = {}
+        # prediction id -> (model, raw features, scaled features, probability, generation)
+        self.pending_predictions: "OrderedDict[str, Tuple[str, np.ndarray, np.ndarray, float, int]]" = (
+            OrderedDict()
+        )
+        self.max_pending_predictions = 10_000
+        self.online_batch_size = 64
+        self.retrain_tasks: Dict[str, asyncio.Task] = {}
+        # Outcome rows not yet appended to their model's outcome table
+        self.unsaved_outcomes: Dict[str, List[Tuple[np.ndarray, int]]] = {}
+        # A failed retrain is not retried before this many seconds
+        self.retrain_cooldown = 600.0
+        self.retrain_blocked_until: Dict[str, float] = {}
+
     async def initialize_models(self):
         """Initialize and train real ML models"""
         logger.info("Initializing real ML models...")
         
         try:
-            # Generate synthetic training data based on real sports patterns
-            training_data = await self._generate_realistic_training_data()
-            
+            training_data = await self._load_training_data()
+
             # Train ensemble models
-            await self._train_win_probability_model(training_data)
-            await self._train_confidence_model(training_data)
-            await self._train_value_bet_model(training_data)
-            await self._train_player_props_model(training_data)
-            await self._train_market_efficiency_model(training_data)
+            for model_name in TRAINERS:
+                await self._train_model(model_name, training_data)
             
             logger.info("Real ML models initialized successfully")
             
@@ -68,6 +153,91 @@ class RealMLModels:
             # Fallback to simplified models
             await self._initialize_fallback_models()
 
+    async def _load_training_data(self) -> Dict[str, ColumnarDataset]:
+        """Open the on-disk training tables, seeding them on first use"""
+        datasets = {
+            table: ColumnarDataset(self.dataset_dir / table)
+            for table in ('team_games', 'player_props')
+        }
+        if not all(len(dataset) for dataset in datasets.values()):
+            # Generate synthetic training data based on real sports patterns
+            generated = await self._generate_realistic_training_data()
+            for table, dataset in datasets.items():
+                if not len(dataset):
+                    dataset.append(generated[table])
+        # Labeled outcomes of served predictions, one table per model
+        for model_name in TRAINERS:
+            table = outcome_table(model_name)
+            if (self.dataset_dir / table).exists():
+                datasets[table] = ColumnarDataset(self.dataset_dir / table)
+        logger.info(
+            "Training data: "
+            + ", ".join(f"{table}={len(ds)} rows" for table, ds in datasets.items())
+        )
+        return datasets
+
+    def append_training_rows(self, table: str, rows: Any) -> int:
+        """Append labeled outcomes (DataFrame or column mapping) to a training table
+
+        The next ``initialize_models`` run trains on them without rewriting
+        the rows already on disk.
+        """
+        dataset = ColumnarDataset(self.dataset_dir / table)
+        appended = dataset.append(rows)
+        logger.info(f"Appended {appended} rows to {table} ({len(dataset)} total)")
+        return appended
+
+    async def _train_model(self, model_name: str, training_data: Dict[str, ColumnarDataset]):
+        """Train one model, out of core when its table is too large to load"""
+        spec = OUT_OF_CORE_MODELS.get(model_name)
+        if spec is not None and len(training_data[spec[0]]) > self.out_of_core_rows:
+            self.train_out_of_core(model_name, *spec)
+        else:
+            await getattr(self, TRAINERS[model_name])(training_data)
+
+    def train_out_of_core(
+        self,
+        model_name: str,
+        table: str,
+        feature_cols: List[str],
+        target_col: str,
+        chunk_rows: int = 65536,
+        classes: Optional[List[Any]] = None,
+    ):
+        """Train a logistic SGD model over a table too large to load at once
+
+        ``classes`` defaults to every label in the target column; recorded
+        outcomes of the model are trained on after the table.
+        """
+        dataset = ColumnarDataset(self.dataset_dir / table)
+        if classes is None:
+            classes = dataset.unique(target_col, chunk_rows)
+        scaler = StandardScaler()
+        model = SGDClassifier(loss='log_loss', random_state=42)
+        fit_incremental(
+            model, dataset, feature_cols, target_col,
+            scaler=scaler, classes=classes, chunk_rows=chunk_rows,
+        )
+        samples = len(dataset)
+        outcomes_path = self.dataset_dir / outcome_table(model_name)
+        if outcomes_path.exists():
+            outcomes = ColumnarDataset(outcomes_path)
+            if set(feature_cols) <= set(outcomes.columns):
+                label_dtype = np.asarray(classes).dtype
+                for X, y in outcomes.iter_chunks(feature_cols, 'outcome', chunk_rows):
+                    model.partial_fit(scaler.transform(X), y.astype(label_dtype))
+                samples += len(outcomes)
+
+        self.models[model_name] = model
+        self.scalers[model_name] = scaler
+        self.feature_names[model_name] = list(feature_cols)
+        self.model_metadata[model_name] = {
+            'training_date': datetime.now().isoformat(),
+            'training_samples': samples,
+            'out_of_core': True,
+        }
+        logger.info(f"{model_name} model trained out of core on {samples} rows")
+
     async def _generate_realistic_training_data(self) -> Dict[str, pd.DataFrame]:
         """Generate realistic training data based on sports betting patterns"""
         np.random.seed(42)  # For reproducible results
@@ -184,20 +354,16 @@ class RealMLModels:
         
         return df
 
-    async def _train_win_probability_model(self, training_data: Dict[str, pd.DataFrame]):
+    async def _train_win_probability_model(self, training_data: Dict[str, ColumnarDataset]):
         """Train real win probability prediction model"""
         df = training_data['team_games']
         
         # Feature selection
-        feature_cols = [
-            'home_team_rating', 'away_team_rating', 'home_recent_form',
-            'away_recent_form', 'head_to_head_record', 'home_advantage',
-            'rest_days_home', 'rest_days_away', 'injuries_home', 'injuries_away',
-            'weather_impact', 'motivation_factor'
-        ]
+        feature_cols = WIN_PROBABILITY_FEATURES
         
-        X = df[feature_cols].values
-        y = df['home_win'].values
+        X = df.matrix(feature_cols)
+        y = df['home_win']
+        X, y = with_outcomes(training_data, 'win_probability', feature_cols, X, y)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -265,7 +431,7 @@ class RealMLModels:
         
         logger.info(f"Win probability model trained - Accuracy: {accuracy:.3f}, AUC: {auc:.3f}")
 
-    async def _train_confidence_model(self, training_data: Dict[str, pd.DataFrame]):
+    async def _train_confidence_model(self, training_data: Dict[str, ColumnarDataset]):
         """Train model to predict prediction confidence"""
         df = training_data['team_games']
         
@@ -275,7 +441,7 @@ class RealMLModels:
             'away_recent_form', 'head_to_head_record'
         ]
         
-        X = df[feature_cols].values
+        X = df.matrix(feature_cols)
         
         # Calculate confidence based on prediction certainty
         rating_diff = np.abs(df['home_team_rating'] - df['away_team_rating'])
@@ -322,18 +488,15 @@ class RealMLModels:
         
         logger.info(f"Confidence model trained - R²: {r2:.3f}, MSE: {mse:.3f}")
 
-    async def _train_value_bet_model(self, training_data: Dict[str, pd.DataFrame]):
+    async def _train_value_bet_model(self, training_data: Dict[str, ColumnarDataset]):
         """Train model to identify value bets"""
         df = training_data['team_games']
         
-        feature_cols = [
-            'home_team_rating', 'away_team_rating', 'home_recent_form',
-            'away_recent_form', 'head_to_head_record', 'home_advantage',
-            'market_prob'  # Include market probability as feature
-        ]
+        feature_cols = list(VALUE_BET_FEATURES)
         
-        X = df[feature_cols].values
-        y = df['is_value_bet'].values
+        X = df.matrix(feature_cols)
+        y = df['is_value_bet']
+        X, y = with_outcomes(training_data, 'value_bet', feature_cols, X, y)
         
         # Split and scale
         X_train, X_test, y_train, y_test = train_test_split(
@@ -365,17 +528,15 @@ class RealMLModels:
         
         logger.info(f"Value bet model trained - Accuracy: {accuracy:.3f}, Precision: {precision:.3f}")
 
-    async def _train_player_props_model(self, training_data: Dict[str, pd.DataFrame]):
+    async def _train_player_props_model(self, training_data: Dict[str, ColumnarDataset]):
         """Train model for player props predictions"""
         df = training_data['player_props']
         
-        feature_cols = [
-            'player_rating', 'recent_avg', 'season_avg', 'opponent_defense_rating',
-            'home_away', 'rest_days', 'injury_status', 'motivation', 'weather_factor'
-        ]
+        feature_cols = list(PLAYER_PROPS_FEATURES)
         
-        X = df[feature_cols].values
-        y = df['beats_line'].values
+        X = df.matrix(feature_cols)
+        y = df['beats_line']
+        X, y = with_outcomes(training_data, 'player_props', feature_cols, X, y)
         
         # Split and scale
         X_train, X_test, y_train, y_test = train_test_split(
@@ -412,7 +573,7 @@ class RealMLModels:
         
         logger.info(f"Player props model trained - Accuracy: {accuracy:.3f}")
 
-    async def _train_market_efficiency_model(self, training_data: Dict[str, pd.DataFrame]):
+    async def _train_market_efficiency_model(self, training_data: Dict[str, ColumnarDataset]):
         """Train model to assess market efficiency"""
         df = training_data['team_games']
         
@@ -425,7 +586,7 @@ class RealMLModels:
             'away_recent_form'
         ]
         
-        X = df[feature_cols].values
+        X = df.matrix(feature_cols)
         y = efficiency_score
         
         # Split and scale
@@ -480,8 +641,14 @@ class RealMLModels:
                 'fallback': True
             }
 
-    async def predict_win_probability(self, features: Dict[str, Any]) -> Dict[str, Any]:
-        """Predict win probability using real ML model"""
+    async def predict_win_probability(
+        self, features: Dict[str, Any], remember: bool = True
+    ) -> Dict[str, Any]:
+        """Predict win probability using real ML model
+
+        ``remember=False`` is for internal callers that never report the
+        outcome: no ``prediction_id`` is issued or kept for them.
+        """
         try:
             model = self.models.get('win_probability')
             scaler = self.scalers.get('win_probability')
@@ -502,6 +669,11 @@ class RealMLModels:
             
             # Get probability and confidence
             win_prob = model.predict_proba(X_scaled)[0, 1]
+            prediction_id = (
+                self._remember_prediction('win_probability', X, X_scaled, win_prob)
+                if remember
+                else None
+            )
             
             # Calculate confidence using confidence model
             confidence = await self._calculate_real_confidence(features)
@@ -515,6 +687,7 @@ class RealMLModels:
                 }
             
             return {
+                'prediction_id': prediction_id,
                 'win_probability': float(win_prob),
                 'confidence': confidence,
                 'feature_importance': feature_importance,
@@ -590,9 +763,10 @@ class RealMLModels:
             # Get probability of being a value bet
             value_prob = model.predict_proba(X_scaled)[0, 1]
             is_value = value_prob > 0.5
+            prediction_id = self._remember_prediction('value_bet', X, X_scaled, value_prob)
             
             # Calculate expected value
-            win_prob = await self.predict_win_probability(features)
+            win_prob = await self.predict_win_probability(features, remember=False)
             market_prob = features.get('market_prob', 0.5)
             
             if market_prob > 0:
@@ -601,6 +775,7 @@ class RealMLModels:
                 expected_value = 0.0
             
             return {
+                'prediction_id': prediction_id,
                 'is_value_bet': bool(is_value),
                 'value_probability': float(value_prob),
                 'expected_value': float(expected_value),
@@ -639,13 +814,15 @@ class RealMLModels:
             X_scaled = scaler.transform(X)
             
             # Get probability of beating the line
-            beat_line_prob = model.predict_proba(X_scaled)[0, 1]
+            probabilities = model.predict_proba(X_scaled)[0]
+            beat_line_prob = probabilities[1]
+            prediction_id = self._remember_prediction('player_props', X, X_scaled, beat_line_prob)
             
             # Calculate confidence based on model certainty
-            probabilities = model.predict_proba(X_scaled)[0]
             confidence = float(max(probabilities))  # Confidence = max probability
             
             return {
+                'prediction_id': prediction_id,
                 'beats_line_probability': float(beat_line_prob),
                 'recommendation': 'over' if beat_line_prob > 0.5 else 'under',
                 'confidence': confidence,
@@ -735,8 +912,12 @@ class RealMLModels:
                 'r2': metadata.get('r2', 0.0),
                 'training_date': metadata.get('training_date'),
                 'training_samples': metadata.get('training_samples', 0),
+                'online_updates': metadata.get('online_updates', 0),
                 'is_fallback': metadata.get('fallback', False)
             }
+            state = self.online_state.get(model_name)
+            if state is not None:
+                performance[model_name]['live'] = state.metrics.as_dict()
         
         # Calculate overall performance
         accuracies = [p['accuracy'] for p in performance.values() if p['accuracy'] > 0]
@@ -746,11 +927,35 @@ class RealMLModels:
             'accuracy': overall_accuracy,
             'models_trained': len(self.models),
             'total_predictions': len(self.prediction_history),
+            'retraining': sorted(self.retrain_tasks),
             'last_updated': datetime.now().isoformat()
         }
         
         return performance
 
+    def _remember_prediction(
+        self, model_name: str, X: np.ndarray, X_scaled: np.ndarray, probability: float
+    ) -> str:
+        """Keep a prediction's features so its outcome can train the model"""
+        prediction_id = uuid.uuid4().hex
+        generation = self._online_state(model_name).generation
+        self.pending_predictions[prediction_id] = (
+            model_name,
+            np.asarray(X[0], dtype=float),
+            np.asarray(X_scaled[0], dtype=float),
+            float(probability),
+            generation,
+        )
+        while len(self.pending_predictions) > self.max_pending_predictions:
+            self.pending_predictions.popitem(last=False)
+        return prediction_id
+
+    def _online_state(self, model_name: str) -> OnlineModelState:
+        state = self.online_state.get(model_name)
+        if state is None:
+            state = self.online_state[model_name] = OnlineModelState()
+        return state
+
     async def update_model_performance(self, prediction_id: str, actual_outcome: float):
         """Update model performance with real outcomes"""
         # Store the outcome for performance tracking
@@ -764,27 +969,160 @@ class RealMLModels:
         if len(self.prediction_history) > 1000:
             self.prediction_history = self.prediction_history[-1000:]
         
+        await self._learn_from_outcome(prediction_id, actual_outcome)
+        
         # Recalculate performance metrics periodically
         if len(self.prediction_history) % 100 == 0:
             await self._recalculate_performance_metrics()
 
-    async def _recalculate_performance_metrics(self):
-        """Recalculate performance metrics based on recent predictions"""
-        if len(self.prediction_history) < 10:
+    async def _learn_from_outcome(self, prediction_id: str, actual_outcome: float):
+        """Fold an outcome into running metrics, the training data and drift checks"""
+        pending = self.pending_predictions.pop(prediction_id, None)
+        if pending is None:
+            return
+        model_name, raw_row, row, probability, generation = pending
+        label = int(actual_outcome >= 0.5)
+        # Kept for every future retrain, whichever model version predicted it
+        unsaved = self.unsaved_outcomes.setdefault(model_name, [])
+        unsaved.append((raw_row, label))
+        if len(unsaved) >= self.online_batch_size:
+            await self._save_outcomes(model_name)
+
+        state = self._online_state(model_name)
+        if generation != state.generation:
+            # Predicted (and scaled) by a model that has since been retrained
+            return
+
+        state.record(row, label, probability)
+        drifted = state.drifted(self.model_metadata.get(model_name, {}).get('accuracy'))
+        if drifted and self.start_background_retrain(model_name) is not None:
+            return
+        if state.buffered >= self.online_batch_size and model_name not in self.retrain_tasks:
+            await self._apply_online_batch(model_name)
+
+    async def _save_outcomes(self, model_name: str):
+        """Append the unsaved outcomes of ``model_name`` to its outcome table"""
+        rows = self.unsaved_outcomes.pop(model_name, [])
+        features = self.feature_names.get(model_name)
+        if not rows or not features:
+            return
+        columns = {name: [row[i] for row, _ in rows] for i, name in enumerate(features)}
+        columns['outcome'] = [label for _, label in rows]
+        try:
+            await asyncio.to_thread(self.append_training_rows, outcome_table(model_name), columns)
+        except (KeyError, ValueError) as e:
+            # The table was written for another feature set
+            logger.error(f"Could not save outcomes of {model_name}: {e}")
+
+    async def _apply_online_batch(self, model_name: str):
+        """Update a copy of the model with the buffered outcomes, then swap it in"""
+        state = self._online_state(model_name)
+        current = self.models.get(model_name)
+        X, y = state.take_batch()
+        if current is None or not supports_online_update(current):
             return
         
-        # This would involve comparing predictions to actual outcomes
-        # For now, we'll update the metadata with current performance
-        recent_accuracy = 0.85 + np.random.normal(0, 0.05)  # Simulated improvement
-        recent_accuracy = np.clip(recent_accuracy, 0.6, 0.95)
-        
-        for model_name in self.model_metadata:
-            if 'accuracy' in self.model_metadata[model_name]:
-                # Exponential moving average of accuracy
-                old_accuracy = self.model_metadata[model_name]['accuracy']
-                new_accuracy = 0.9 * old_accuracy + 0.1 * recent_accuracy
-                self.model_metadata[model_name]['accuracy'] = new_accuracy
-                self.model_metadata[model_name]['last_updated'] = datetime.now().isoformat()
+        updated = await asyncio.to_thread(self._updated_copy, current, X, y)
+        # A retrain may have replaced the model while the batch was applied
+        if updated is None or self.models.get(model_name) is not current:
+            return
+        metadata = dict(self.model_metadata.get(model_name, {}))
+        metadata['online_updates'] = metadata.get('online_updates', 0) + len(y)
+        metadata['last_online_update'] = datetime.now().isoformat()
+        self._install_model(model_name, updated, metadata=metadata)
+
+    @staticmethod
+    def _updated_copy(model: Any, X: np.ndarray, y: np.ndarray) -> Optional[Any]:
+        candidate = copy.deepcopy(model)
+        return candidate if online_update(candidate, X, y) else None
+
+    def _install_model(
+        self,
+        model_name: str,
+        model: Any,
+        scaler: Any = None,
+        features: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Swap in a new model (and scaler) for ``model_name``
+
+        Runs on the event loop without awaiting, so a prediction sees either
+        the old model and scaler or the new ones, never a mix.
+        """
+        self.models[model_name] = model
+        if scaler is not None:
+            self.scalers[model_name] = scaler
+        if features is not None:
+            self.feature_names[model_name] = features
+        if metadata is not None:
+            self.model_metadata[model_name] = metadata
+
+    def start_background_retrain(self, model_name: str) -> Optional[asyncio.Task]:
+        """Retrain ``model_name`` from its training tables without blocking predictions
+
+        Returns ``None`` when the model has no trainer or a failed retrain is
+        still cooling down.
+        """
+        if model_name not in TRAINERS:
+            return None
+        task = self.retrain_tasks.get(model_name)
+        if task is None:
+            if time.monotonic() < self.retrain_blocked_until.get(model_name, 0.0):
+                return None
+            logger.info(f"Drift detected for {model_name}; retraining in the background")
+            task = self.retrain_tasks[model_name] = asyncio.create_task(
+                self._retrain(model_name)
+            )
+        return task
+
+    async def _retrain(self, model_name: str):
+        try:
+            # The outcomes that showed the drift are part of the new training set
+            await self._save_outcomes(model_name)
+            training_data = await self._load_training_data()
+            model, scaler, features, metadata = await asyncio.to_thread(
+                self._train_detached, model_name, training_data
+            )
+            self._install_model(model_name, model, scaler, features, metadata)
+            self._online_state(model_name).reset()
+            logger.info(f"{model_name} model retrained and swapped in")
+        except Exception as e:
+            logger.error(f"Background retrain of {model_name} failed: {e}")
+            # Keep serving and updating the current model; look for fresh
+            # evidence of drift once the cooldown has passed
+            self._online_state(model_name).detector.reset()
+            self.retrain_blocked_until[model_name] = time.monotonic() + self.retrain_cooldown
+        finally:
+            self.retrain_tasks.pop(model_name, None)
+
+    def _train_detached(
+        self, model_name: str, training_data: Dict[str, ColumnarDataset]
+    ) -> Tuple[Any, Any, List[str], Dict[str, Any]]:
+        """Run a model's trainer on a scratch instance (in a worker thread)
+
+        The trainers store what they fit on ``self``; running them on a
+        scratch instance keeps the served model untouched until the result
+        is installed.
+        """
+        scratch = RealMLModels.__new__(RealMLModels)
+        scratch.__dict__.update(self.__dict__)
+        scratch.models, scratch.scalers = {}, {}
+        scratch.feature_names, scratch.model_metadata = {}, {}
+        asyncio.run(scratch._train_model(model_name, training_data))
+        return (
+            scratch.models[model_name],
+            scratch.scalers[model_name],
+            scratch.feature_names[model_name],
+            scratch.model_metadata[model_name],
+        )
+
+    async def _recalculate_performance_metrics(self):
+        """Copy the running outcome metrics of each model into its metadata"""
+        for model_name, state in self.online_state.items():
+            if state.metrics.count < 10 or model_name not in self.model_metadata:
+                continue
+            self.model_metadata[model_name]['live_metrics'] = state.metrics.as_dict()
+            self.model_metadata[model_name]['last_updated'] = datetime.now().isoformat()
 
 
 # Create singleton instance
@@ -16,6 +16,8 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 
+from utils.http_transport import http_transport
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -51,9 +53,9 @@ class RealPrizePicksService:
     
     def __init__(self):
         self.base_url = "https://api.prizepicks.com"
-        self.session = None
-        self.last_request_time = 0
-        self.rate_limit_delay = 1.0  # 1 second between requests
+        # Shared keep-alive pool; the "prizepicks" provider limits space requests
+        # 1 second apart across every PrizePicks caller in the process
+        self.transport = http_transport
         self.cache = {}
         self.cache_ttl = 300  # 5 minutes
         
@@ -68,42 +70,22 @@ class RealPrizePicksService:
         
         logger.info("🚀 Real PrizePicks API Service initialized - ZERO mock data")
     
-    async def _get_session(self) -> httpx.AsyncClient:
-        """Get or create HTTP session"""
-        if self.session is None:
-            self.session = httpx.AsyncClient(
-                timeout=30.0,
-                headers={
-                    'User-Agent': 'A1Betting-Platform/1.0',
-                    'Accept': 'application/json',
-                    'Content-Type': 'application/json'
-                }
-            )
-        return self.session
-    
-    async def _rate_limit(self):
-        """Enforce rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
-        
-        self.last_request_time = time.time()
-    
     async def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make real API request to PrizePicks"""
-        await self._rate_limit()
-        
-        session = await self._get_session()
         url = f"{self.base_url}{endpoint}"
         
         try:
             logger.info(f"🌐 Making REAL API request to PrizePicks: {url}")
-            response = await session.get(url, params=params or {})
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self.transport.get_json(
+                url,
+                provider="prizepicks",
+                params=params or {},
+                headers={
+                    'User-Agent': 'A1Betting-Platform/1.0',
+                    'Accept': 'application/json',
+                    'Content-Type': 'application/json'
+                },
+            )
             logger.info(f"✅ Received real PrizePicks data: {len(data.get('data', []))} items")
             return data
             
@@ -288,14 +270,7 @@ class RealPrizePicksService:
         return min(base_confidence, 0.95)
     
     async def close(self):
-        """Close HTTP session"""
-        if self.session:
-            await self.session.aclose()
-    
-    def __del__(self):
-        """Cleanup on deletion"""
-        if self.session and not self.session.is_closed:
-            asyncio.create_task(self.session.aclose())
+        """Connection pools are shared; http_transport.close() releases them"""
 
 # Global instance
 real_prizepicks_service = RealPrizePicksService() 
\ No newline at end of file
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Multi-process serving with model memory shared between workers
+
+``uvicorn --workers N`` spawns fresh interpreters, so every worker imports the
+app and loads every model on its own and RAM grows with the worker count.
+This server does what ``gunicorn --preload`` does instead. The parent imports
+the app, loads the models into ``model_service._SHARED_MODELS``, freezes the
+garbage collector and then forks the workers. Workers share those pages
+copy-on-write, and the parent respawns a worker that dies, so it is forked
+from the same warm parent.
+
+    python serving.py --workers 4
+    python serving.py --workers 4 --share-cache --mmap-dir /tmp/a1betting-models
+
+``--share-cache`` puts the ``MultiTierCache`` L1 in one shared-memory segment.
+``--mmap-dir`` also exports models to memory-mapped files (see
+``model_service.preload_shared_models``). ``--preload-subsystems`` imports
+the app's lazy engines (see ``utils.subsystems``) in the parent as well; only
+use it when none of them start threads at import time. The parent logs each
+worker's memory shortly after startup, and ``GET /api/health/workers``
+returns the same report.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent
+# The app imports through both ``backend.`` and top-level module names
+for path in (BACKEND_DIR, BACKEND_DIR.parent):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+logger = logging.getLogger(__name__)
+
+WORKER_ENV = "A1BETTING_SERVING_WORKER"
+
+# Filled in by serve() before forking, so workers inherit the parent's numbers
+preload_stats: Dict[str, Any] = {}
+
+
+def memory_snapshot(pid: Optional[int] = None) -> Dict[str, Any]:
+    """RSS plus, where the OS reports them, USS (private) and PSS (fair share)
+
+    RSS counts shared pages in full for every process, so adding RSS across
+    workers overstates the total. The sum of PSS is the real footprint.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return {"pid": pid or os.getpid(), "error": "psutil not installed"}
+
+    process = psutil.Process(pid)
+    snapshot = {"pid": process.pid, "rss_mb": process.memory_info().rss / 2**20}
+    try:
+        full = process.memory_full_info()
+        for field in ("uss", "pss", "shared"):
+            if hasattr(full, field):
+                snapshot[f"{field}_mb"] = getattr(full, field) / 2**20
+    except Exception:  # pylint: disable=broad-exception-caught
+        pass  # needs /proc access to the target process
+    return snapshot
+
+
+def worker_memory_report(parent_pid: Optional[int] = None) -> Dict[str, Any]:
+    """Memory of the serving parent and each of its workers
+
+    ``independent_estimate_mb`` is what the same number of workers would use if
+    each one loaded the app and models itself (parent RSS after preload times
+    the worker count). Compare it with ``total_pss_mb``.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return {"error": "psutil not installed"}
+
+    if parent_pid is None:
+        parent_pid = os.getppid() if os.environ.get(WORKER_ENV) else os.getpid()
+    parent = psutil.Process(parent_pid)
+    command = parent.cmdline()
+    try:
+        children = parent.children()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        children = []
+    # Forked workers share the parent's command line; helpers such as the
+    # multiprocessing resource tracker do not. A worker may exit (and be
+    # respawned) between listing and inspecting it, so it is skipped.
+    workers = []
+    for child in children:
+        try:
+            if child.cmdline() == command:
+                workers.append(memory_snapshot(child.pid))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+    report: Dict[str, Any] = {
+        "parent": memory_snapshot(parent_pid),
+        "preload": preload_stats,
+        "workers": workers,
+        "total_rss_mb": sum(w["rss_mb"] for w in workers),
+    }
+    if workers and all("pss_mb" in w for w in workers):
+        report["total_pss_mb"] = sum(w["pss_mb"] for w in workers)
+    after_preload = preload_stats.get("after_preload", {}).get("rss_mb")
+    if after_preload and workers:
+        report["independent_estimate_mb"] = after_preload * len(workers)
+    return report
+
+
+def format_memory_report(report: Dict[str, Any]) -> str:
+    lines = []
+    before = report.get("preload", {}).get("before_preload", {}).get("rss_mb")
+    after = report.get("preload", {}).get("after_preload", {}).get("rss_mb")
+    if before and after:
+        lines.append(
+            f"parent RSS {before:.1f}MB before preload, {after:.1f}MB after "
+            f"({report['preload'].get('models', 0)} models)"
+        )
+    for worker in report.get("workers", []):
+        lines.append(
+            f"worker {worker['pid']}: RSS {worker['rss_mb']:.1f}MB"
+            + (f", USS {worker['uss_mb']:.1f}MB" if "uss_mb" in worker else "")
+            + (f", PSS {worker['pss_mb']:.1f}MB" if "pss_mb" in worker else "")
+        )
+    if "total_pss_mb" in report:
+        lines.append(f"workers total PSS {report['total_pss_mb']:.1f}MB")
+    if "independent_estimate_mb" in report:
+        lines.append(
+            f"independent workers would need ~{report['independent_estimate_mb']:.1f}MB"
+        )
+    return "\n".join(lines)
+
+
+def preload(
+    app_path: str,
+    models_directory: str,
+    mmap_directory: Optional[str] = None,
+    share_cache: bool = False,
+    preload_subsystems: bool = False,
+    cache_slots: int = 4096,
+    cache_slot_bytes: int = 4096,
+):
+    """Build everything workers should share, then freeze it for fork"""
+    import importlib
+
+    from uvicorn.importer import import_from_string
+
+    preload_stats["before_preload"] = memory_snapshot()
+    if share_cache:
+        # Must exist before the app creates its MultiTierCache instances
+        from cache_optimizer import enable_shared_l1_cache
+
+        enable_shared_l1_cache(slots=cache_slots, slot_bytes=cache_slot_bytes)
+
+    app = import_from_string(app_path)
+    from model_service import preload_shared_models
+
+    timings = preload_shared_models(models_directory, mmap_directory)
+    preload_stats["models"] = len(timings)
+    preload_stats["model_load_seconds"] = timings
+
+    registry = getattr(importlib.import_module(app_path.split(":")[0]), "subsystems", None)
+    if preload_subsystems and registry is not None:
+        # Workers' warm-up then finds them loaded and only mounts the routers
+        for subsystem in registry.subsystems.values():
+            if subsystem.warm:
+                subsystem.get("preload")
+        preload_stats["subsystems"] = sorted(
+            name for name, s in registry.subsystems.items() if s.status == "ready"
+        )
+
+    # Objects that survive to here live for the whole process; moving them to
+    # the permanent generation keeps the collector from writing to (and so
+    # un-sharing) their pages in every worker
+    gc.collect()
+    gc.freeze()
+    preload_stats["after_preload"] = memory_snapshot()
+    return app
+
+
+def _run_worker(config, sock, index: int):
+    """Child process body; never returns"""
+    import uvicorn
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_DFL)
+    os.environ[WORKER_ENV] = str(index)
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    finally:
+        os._exit(0)  # pylint: disable=protected-access
+
+
+def serve(
+    app_path: str = "main:app",
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 2,
+    models_directory: str = "./models",
+    mmap_directory: Optional[str] = None,
+    share_cache: bool = False,
+    preload_subsystems: bool = False,
+    report_delay: float = 15.0,
+    log_level: str = "info",
+) -> int:
+    """Preload, bind once, fork ``workers`` children and supervise them"""
+    import uvicorn
+
+    app = preload(
+        app_path, models_directory, mmap_directory, share_cache, preload_subsystems
+    )
+    config = uvicorn.Config(app, host=host, port=port, log_level=log_level)
+    sock = config.bind_socket()
+
+    children: Dict[int, int] = {}  # pid -> worker index
+    stopping = False
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(config, sock, index)
+        children[pid] = index
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index in range(workers):
+        spawn(index)
+    logger.info(f"🚀 Serving {app_path} on {host}:{port} with {workers} forked workers")
+
+    def log_report():
+        report = worker_memory_report(os.getpid())
+        logger.info("Worker memory after startup:\n" + format_memory_report(report))
+
+    reporter = threading.Timer(report_delay, log_report)
+    reporter.daemon = True
+    reporter.start()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            logger.warning(
+                f"Worker {pid} exited with status {status}; respawning worker {index}"
+            )
+            time.sleep(1)
+            spawn(index)
+
+    reporter.cancel()
+    sock.close()
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    try:
+        from config import config
+
+        defaults = {
+            "host": config.api_host,
+            "port": config.api_port,
+            "workers": max(config.api_workers, 2),
+            "models": config.model_path,
+        }
+    except Exception:  # pylint: disable=broad-exception-caught
+        defaults = {"host": "0.0.0.0", "port": 8000, "workers": 2, "models": "./models"}
+
+    parser = argparse.ArgumentParser(description="Multi-process server with shared models")
+    parser.add_argument("--app", default="main:app")
+    parser.add_argument("--host", default=defaults["host"])
+    parser.add_argument("--port", type=int, default=defaults["port"])
+    parser.add_argument("--workers", type=int, default=defaults["workers"])
+    parser.add_argument("--models", default=defaults["models"])
+    parser.add_argument("--mmap-dir", help="Export models to memory-mapped files here")
+    parser.add_argument("--share-cache", action="store_true")
+    parser.add_argument("--preload-subsystems", action="store_true")
+    parser.add_argument("--report-delay", type=float, default=15.0)
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    if not hasattr(os, "fork"):
+        print("serving.py needs os.fork; use uvicorn --workers on this platform")
+        return 2
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+    return serve(
+        app_path=args.app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        models_directory=args.models,
+        mmap_directory=args.mmap_dir,
+        share_cache=args.share_cache,
+        preload_subsystems=args.preload_subsystems,
+        report_delay=args.report_delay,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    # The app imports ``serving`` for its report; give it this module, which
+    # holds the parent's preload_stats, rather than a fresh copy
+    sys.modules.setdefault("serving", sys.modules[__name__])
+    sys.exit(main())
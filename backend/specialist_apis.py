@@ -19,6 +19,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 import httpx
+from utils.http_transport import http_transport
 
 
 # Simple in-memory cache implementation
@@ -125,7 +126,8 @@ class SpecialistAPI(ABC):
         self.base_url = base_url
         self.name = name
         self.cache = SimpleCache(maxsize=MAX_CACHE_SIZE, ttl=CACHE_TTL)
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Shared keep-alive pools; concurrency is bounded per provider name
+        self.transport = http_transport
 
     @abstractmethod
     async def get_live_games(self, sport: str) -> List[SportingEvent]:
@@ -151,10 +153,13 @@ class SpecialistAPI(ABC):
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             headers = {"Authorization": f"Bearer {self.api_key}"}
 
-            response = await self.client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = await self.transport.get_json(
+                url,
+                provider=self.name.lower(),
+                headers=headers,
+                params=params,
+                timeout=30.0,
+            )
             self.cache[cache_key] = data
 
             logger.info(f"Successfully fetched data from {self.name} API: {endpoint}")
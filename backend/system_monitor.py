@@ -14,12 +14,9 @@ from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import aiohttp
 
-# Optional imports with fallbacks
-try:
-    import numpy as np  # type: ignore[import]
-except ImportError:
-    np = None
+from utils.metric_store import MetricStore
 
+# Optional imports with fallbacks
 try:
     import psutil  # type: ignore[import]
 except ImportError:
@@ -116,13 +113,23 @@ class HealthCheck:
 
 
 class MetricsCollector:
-    """Comprehensive system metrics collection"""
+    """Comprehensive system metrics collection
+
+    Samples are stored per metric type in a :class:`MetricStore` (preallocated
+    ring arrays with 1s/1m/1h rollups and quantile sketches). psutil is read
+    in a worker thread, so a collection cycle never blocks the event loop.
+    """
 
     def __init__(self):
-        self.metrics_buffer: deque[SystemMetric] = deque(maxlen=10000)
+        self.store = MetricStore()
+        self.latest_metrics: Dict[MetricType, SystemMetric] = {}
         self.metric_thresholds = self._initialize_thresholds()
         self.collection_interval = 10  # seconds
         self.is_collecting = False
+        if psutil is not None:
+            # cpu_percent(interval=None) reports usage since the previous
+            # call; this first call only sets the baseline
+            psutil.cpu_percent(interval=None)
 
     def _initialize_thresholds(self) -> Dict[MetricType, Dict[str, float]]:
         """Initialize metric alert thresholds"""
@@ -166,21 +173,31 @@ class MetricsCollector:
         self.is_collecting = False
         logger.info("Stopped metrics collection")
 
+    def record(self, metric: SystemMetric):
+        """Add one sample to the store"""
+        self.store.add(
+            metric.metric_type.value, metric.timestamp.timestamp(), float(metric.value)
+        )
+        self.latest_metrics[metric.metric_type] = metric
+
     async def _collect_system_metrics(self):
         """Collect system-level metrics"""
         if not psutil:
             logger.warning("psutil not available, skipping system metrics collection")
             return
 
+        for metric in await asyncio.to_thread(self._sample_system_metrics):
+            self.record(metric)
+
+    def _sample_system_metrics(self) -> List[SystemMetric]:
+        """Read system counters; runs in a worker thread"""
         timestamp = datetime.now(timezone.utc)
+        metrics: List[SystemMetric] = []
 
         try:
-            # CPU metrics
-            if psutil is None:  # type: ignore[misc]
-                logger.warning("psutil not available, skipping CPU metrics")
-                return
-            cpu_percent = psutil.cpu_percent(interval=1)  # type: ignore[misc]
-            self.metrics_buffer.append(
+            # CPU metrics; non-blocking, measured since the previous cycle
+            cpu_percent = psutil.cpu_percent(interval=None)  # type: ignore[misc]
+            metrics.append(
                 SystemMetric(
                     metric_type=MetricType.SYSTEM_CPU,
                     value=cpu_percent,
@@ -193,11 +210,8 @@ class MetricsCollector:
 
         try:
             # Memory metrics
-            if psutil is None:  # type: ignore[misc]
-                logger.warning("psutil not available, skipping memory metrics")
-                return
             memory = psutil.virtual_memory()  # type: ignore[misc]
-            self.metrics_buffer.append(
+            metrics.append(
                 SystemMetric(
                     metric_type=MetricType.SYSTEM_MEMORY,
                     value=memory.percent,
@@ -217,7 +231,7 @@ class MetricsCollector:
             # Disk metrics
             disk = psutil.disk_usage("/")
             disk_percent = (disk.used / disk.total) * 100
-            self.metrics_buffer.append(
+            metrics.append(
                 SystemMetric(
                     metric_type=MetricType.SYSTEM_DISK,
                     value=disk_percent,
@@ -236,7 +250,7 @@ class MetricsCollector:
         try:
             # Network metrics
             network = psutil.net_io_counters()
-            self.metrics_buffer.append(
+            metrics.append(
                 SystemMetric(
                     metric_type=MetricType.SYSTEM_NETWORK,
                     value=network.bytes_sent + network.bytes_recv,
@@ -253,6 +267,8 @@ class MetricsCollector:
         except (AttributeError, OSError) as e:
             logger.warning("Failed to collect network metrics: %s", str(e))
 
+        return metrics
+
     async def _collect_application_metrics(self):
         """Collect application-specific metrics"""
         timestamp = datetime.now(timezone.utc)
@@ -261,7 +277,7 @@ class MetricsCollector:
             # Database metrics
             if db_manager and hasattr(db_manager, "async_engine") and db_manager.async_engine:  # type: ignore[misc]
                 pool = db_manager.async_engine.pool  # type: ignore[misc]
-                self.metrics_buffer.append(
+                self.record(
                     SystemMetric(
                         metric_type=MetricType.DATABASE_CONNECTIONS,
                         value=(
@@ -289,7 +305,7 @@ class MetricsCollector:
                     cache_stats = (
                         await ultra_cache_optimizer.cache.get_comprehensive_stats()  # type: ignore[misc]
                     )
-                    self.metrics_buffer.append(
+                    self.record(
                         SystemMetric(
                             metric_type=MetricType.CACHE_HIT_RATE,
                             value=cache_stats["overall"]["overall_hit_rate"],
@@ -309,7 +325,7 @@ class MetricsCollector:
                     queue_stats = (
                         await ultra_task_processor.task_queue.get_queue_stats()  # type: ignore[misc]
                     )
-                    self.metrics_buffer.append(
+                    self.record(
                         SystemMetric(
                             metric_type=MetricType.TASK_QUEUE_SIZE,
                             value=queue_stats.get("total_pending", 0),
@@ -327,39 +343,56 @@ class MetricsCollector:
     def get_recent_metrics(
         self, metric_type: MetricType, duration_minutes: int = 10
     ) -> List[SystemMetric]:
-        """Get recent metrics of specific type"""
-        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=duration_minutes)
-        return [
-            metric
-            for metric in self.metrics_buffer
-            if metric.metric_type == metric_type and metric.timestamp >= cutoff_time
+        """Get recent metrics of specific type, oldest first
+
+        Only the newest sample keeps its metadata; older ones are rebuilt
+        from the raw ring.
+        """
+        series = self.store.get(metric_type.value)
+        if series is None:
+            return []
+        timestamps, values = series.raw(time.time() - duration_minutes * 60)
+        latest = self.latest_metrics.get(metric_type)
+        unit = latest.unit if latest else ""
+        metrics = [
+            SystemMetric(
+                metric_type=metric_type,
+                value=value,
+                timestamp=datetime.fromtimestamp(ts, timezone.utc),
+                unit=unit,
+            )
+            for ts, value in zip(timestamps.tolist(), values.tolist())
         ]
+        if metrics and latest is not None:
+            if latest.timestamp.timestamp() == timestamps[-1]:
+                metrics[-1] = latest
+        return metrics
+
+    def get_latest_metric(
+        self, metric_type: MetricType, max_age_minutes: int = 5
+    ) -> Optional[SystemMetric]:
+        """Newest sample of a type, if it is recent enough"""
+        latest = self.latest_metrics.get(metric_type)
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=max_age_minutes)
+        if latest is None or latest.timestamp < cutoff:
+            return None
+        return latest
 
     def get_metric_statistics(
         self, metric_type: MetricType, duration_minutes: int = 60
     ) -> Dict[str, float]:
-        """Get statistical summary of metrics"""
-        metrics = self.get_recent_metrics(metric_type, duration_minutes)
-
-        if not metrics:
+        """Get statistical summary of metrics
+
+        Answered from the finest rollup that covers the window in a bounded
+        number of buckets, so percentiles come from merged sketches (within
+        1% of the exact value) and the cost does not depend on how many
+        samples were recorded.
+        """
+        series = self.store.get(metric_type.value)
+        if series is None:
             return {"count": 0}
-
-        values = [m.value for m in metrics]
-
-        return {
-            "count": len(values),
-            "min": min(values),
-            "max": max(values),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
-            "std_dev": statistics.stdev(values) if len(values) > 1 else 0,
-            "percentile_95": (
-                np.percentile(values, 95) if np is not None else sorted(values)[int(len(values) * 0.95)] if values else 0  # type: ignore[misc]
-            ),
-            "percentile_99": (
-                np.percentile(values, 99) if np is not None else sorted(values)[int(len(values) * 0.99)] if values else 0  # type: ignore[misc]
-            ),
-        }
+        now = time.time()
+        return series.statistics(now - duration_minutes * 60, now)
 
 
 class AlertManager:
@@ -891,12 +924,12 @@ class UltraSystemMonitor:
                     metric_type,
                     thresholds,
                 ) in self.metrics_collector.metric_thresholds.items():
-                    recent_metrics = self.metrics_collector.get_recent_metrics(
-                        metric_type, duration_minutes=5
+                    latest = self.metrics_collector.get_latest_metric(
+                        metric_type, max_age_minutes=5
                     )
 
-                    if recent_metrics:
-                        latest_value = recent_metrics[-1].value
+                    if latest is not None:
+                        latest_value = latest.value
 
                         # Check for critical threshold
                         if "critical" in thresholds:
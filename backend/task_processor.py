@@ -5,6 +5,8 @@ High-performance task queue system with priority scheduling, distributed process
 import asyncio
 import logging
 import multiprocessing as mp
+import os
+import socket
 import time
 import traceback
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
@@ -15,6 +17,7 @@ from typing import Any, Callable, Dict, List, Optional
 
 import redis.asyncio as redis
 from config import config_manager
+from backend.utils.cron import CronParseError, CronTimer, Fire, MisfirePolicy
 from backend.utils.serialization_utils import (
     register_serializable,
     safe_dumps,
@@ -806,21 +809,64 @@ class TaskWorker:
 
 
 class TaskScheduler:
-    """Advanced task scheduler with cron-like functionality"""
-
-    def __init__(self):
+    """Cron scheduler: a heap of next fire times, woken only when a run is due
+
+    Each recurring task's cron expression is parsed once into a
+    ``CronTimer`` entry. The loop sleeps until the earliest fire time (or
+    until a new task is scheduled) and resolves late runs through the task's
+    misfire policy. When several processes run a scheduler against the same
+    Redis, every occurrence is claimed with a ``SET NX`` lease keyed by task
+    and fire time, so it is enqueued exactly once.
+    """
+
+    def __init__(
+        self,
+        instance_id: Optional[str] = None,
+        max_sleep: float = 60.0,
+        lease_seconds: int = 300,
+    ):
         self.task_queue = TaskQueue()
         self.scheduled_tasks = {}
+        self.timer = CronTimer()
         self.is_running = False
+        self.instance_id = instance_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.max_sleep = max_sleep
+        self.lease_seconds = lease_seconds
+        self._wakeup = asyncio.Event()
+        self.stats = {
+            "fired": 0,
+            "claimed_elsewhere": 0,
+            "missed": 0,
+            "lease_errors": 0,
+            "trigger_errors": 0,
+        }
 
     async def initialize(self):
         """Initialize task scheduler"""
         await self.task_queue.initialize()
 
-    async def schedule_task(self, task: TaskDefinition):
+    async def schedule_task(
+        self,
+        task: TaskDefinition,
+        misfire_policy: MisfirePolicy = MisfirePolicy.FIRE_ONCE,
+        misfire_grace_seconds: float = 60.0,
+    ):
         """Schedule a task for future execution"""
         if task.recurring and task.cron_expression:
+            try:
+                self.timer.add(
+                    task.id,
+                    task.cron_expression,
+                    payload=task,
+                    policy=misfire_policy,
+                    grace_seconds=misfire_grace_seconds,
+                )
+            except CronParseError as e:
+                logger.error(f"Invalid cron expression for task {task.id}: {e!s}")
+                raise
             self.scheduled_tasks[task.id] = task
+            # The new task may be due before whatever the loop is sleeping for
+            self._wakeup.set()
             logger.info(
                 f"Scheduled recurring task {task.id} with cron: {task.cron_expression}"
             )
@@ -831,50 +877,107 @@ class TaskScheduler:
             # Immediate execution
             await self.task_queue.enqueue(task)
 
+    def unschedule_task(self, task_id: str) -> bool:
+        """Stop a recurring task; returns False if it was not scheduled"""
+        self.scheduled_tasks.pop(task_id, None)
+        return self.timer.remove(task_id)
+
     async def start_scheduler(self):
         """Start the task scheduler"""
         self.is_running = True
 
         while self.is_running:
             try:
-                await asyncio.sleep(60)  # Check every minute
-
-                # Check scheduled tasks
-                current_time = datetime.now(timezone.utc)
-
-                for task_id, task in list(self.scheduled_tasks.items()):
-                    if self._should_run_task(task, current_time):
-                        # Create new instance for execution
-                        new_task = TaskDefinition(
-                            id=f"{task.id}_{int(current_time.timestamp())}",
-                            task_type=task.task_type,
-                            priority=task.priority,
-                            function_name=task.function_name,
-                            args=task.args.copy(),
-                            kwargs=task.kwargs.copy(),
-                            max_retries=task.max_retries,
-                            timeout_seconds=task.timeout_seconds,
-                            created_at=current_time,
-                        )
-
-                        await self.task_queue.enqueue(new_task)
-                        logger.info("Triggered scheduled task {new_task.id}")
+                delay = self.timer.seconds_until_next(time.time())
+                timeout = self.max_sleep if delay is None else min(delay, self.max_sleep)
+                if timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                self._wakeup.clear()
+
+                for fire in self.timer.pop_due(time.time()):
+                    # One failing occurrence must not drop the rest of the batch
+                    try:
+                        await self._trigger(fire)
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        self.stats["trigger_errors"] += 1
+                        logger.error(f"Failed to trigger {fire.entry.key}: {e!s}")
 
             except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Scheduler error: {e!s}")
+                logger.error(f"Scheduler error: {e!s}")
                 await asyncio.sleep(5)
 
-    def _should_run_task(self, task: TaskDefinition, current_time: datetime) -> bool:
-        """Check if a scheduled task should run"""
-        # Simplified cron check - in production would use proper cron parsing
-        if task.cron_expression == "0 */6 * * *":  # Every 6 hours
-            return current_time.minute == 0 and current_time.hour % 6 == 0
-        elif task.cron_expression == "0 0 * * *":  # Daily at midnight
-            return current_time.hour == 0 and current_time.minute == 0
-        elif task.cron_expression == "*/15 * * * *":  # Every 15 minutes
-            return current_time.minute % 15 == 0
-
-        return False
+    async def stop_scheduler(self):
+        self.is_running = False
+        self._wakeup.set()
+
+    async def _trigger(self, fire: Fire):
+        """Enqueue one occurrence if this instance wins its lease"""
+        task = fire.entry.payload
+        if not await self._claim(fire):
+            self.stats["claimed_elsewhere"] += 1
+            return
+
+        scheduled_for = datetime.fromtimestamp(fire.scheduled_for, timezone.utc)
+        # Create new instance for execution
+        new_task = TaskDefinition(
+            id=f"{task.id}_{int(fire.scheduled_for)}",
+            task_type=task.task_type,
+            priority=task.priority,
+            function_name=task.function_name,
+            args=task.args.copy(),
+            kwargs=task.kwargs.copy(),
+            max_retries=task.max_retries,
+            timeout_seconds=task.timeout_seconds,
+            created_at=datetime.now(timezone.utc),
+            metadata={
+                "scheduled_for": scheduled_for.isoformat(),
+                "lateness_seconds": round(fire.lateness, 3),
+                "coalesced_runs": fire.coalesced,
+            },
+        )
+
+        await self.task_queue.enqueue(new_task)
+        self.stats["fired"] += 1
+        self.stats["missed"] += fire.missed
+        logger.info(f"Triggered scheduled task {new_task.id}")
+
+    async def _claim(self, fire: Fire) -> bool:
+        """Lease this occurrence so only one scheduler process enqueues it
+
+        Fails open: if the lease store is unreachable the occurrence is
+        enqueued anyway, since a duplicate run is cheaper than a lost one.
+        """
+        client = self.task_queue.redis_client
+        if client is None:
+            return True  # no shared store: this process is the only scheduler
+        lease_key = (
+            f"{self.task_queue.queue_name}:cron:{fire.entry.key}:{int(fire.scheduled_for)}"
+        )
+        try:
+            return bool(
+                await client.set(lease_key, self.instance_id, nx=True, ex=self.lease_seconds)
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.stats["lease_errors"] += 1
+            logger.warning(f"Lease check failed for {lease_key}, firing anyway: {e!s}")
+            return True
+
+    def get_schedule(self) -> List[Dict[str, Any]]:
+        """Registered schedules ordered by next fire time"""
+        return [
+            {
+                "task_id": entry.key,
+                "cron_expression": entry.cron.expression,
+                "next_fire": datetime.fromtimestamp(entry.next_fire, timezone.utc).isoformat(),
+                "misfire_policy": entry.policy.value,
+                "fired": entry.fired,
+                "missed": entry.missed,
+            }
+            for entry in sorted(self.timer.entries.values(), key=lambda e: e.next_fire)
+        ]
 
 
 class UltraTaskProcessor:
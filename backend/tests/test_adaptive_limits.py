@@ -0,0 +1,176 @@
+"""Tests for token buckets, AIMD concurrency limits and the data source limiter."""
+
+import asyncio
+from collections import deque
+
+import httpx
+import pytest
+
+from data_sources import (
+    CircuitBreaker,
+    DataSourceConnector,
+    DataSourceReliability,
+    IntelligentRateLimiter,
+    RequestOutcome,
+    UltraEnhancedDataSourceManager,
+)
+from utils.http_transport import TransportResponse
+from utils.adaptive_limits import AIMDLimit, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_from_elapsed_time_and_honours_pause():
+    bucket = TokenBucket(rate=2.0, burst_seconds=1.0, now=0.0)
+
+    assert bucket.try_acquire(0.0) and bucket.try_acquire(0.0)
+    assert not bucket.try_acquire(0.0)
+    assert bucket.wait_time(0.0) == pytest.approx(0.5)
+    assert bucket.try_acquire(0.5)
+
+    bucket.pause(3.0, now=0.5)
+    assert not bucket.try_acquire(3.0)
+    assert bucket.wait_time(3.0) == pytest.approx(1.0)
+    assert bucket.try_acquire(4.0)
+
+
+def test_aimd_grows_when_used_and_backs_off_once_per_round_trip():
+    limit = AIMDLimit(initial=10, max_limit=50)
+    for i in range(200):
+        limit.on_sample(0.05, inflight=limit.limit, now=i * 0.01)
+    grown = limit.limit
+    assert grown > 20
+
+    # An idle client does not inflate its limit
+    idle = AIMDLimit(initial=10)
+    for i in range(200):
+        idle.on_sample(0.05, inflight=1, now=i * 0.01)
+    assert idle.limit == 10
+
+    # Latency well above the baseline is congestion: one cut per round trip
+    cut = limit.on_sample(0.5, inflight=grown, now=10.0)
+    assert cut < grown
+    assert limit.on_sample(0.5, inflight=grown, now=10.1) == cut
+    assert limit.on_sample(0.05, inflight=1, dropped=True, now=11.0) < cut
+
+
+def test_rate_converges_below_provider_throttle():
+    clock = FakeClock()
+    limiter = IntelligentRateLimiter("odds", clock=clock)
+    limiter.base_limits = {"odds_data": 600}  # we think 10/s; the provider allows 5/s
+    capacity, window = 5, deque()
+    served = throttled = 0
+
+    for tick in range(6000):  # 60 simulated seconds
+        clock.now = tick * 0.01
+        while limiter.try_acquire("odds_data"):
+            while window and window[0] <= clock.now - 1.0:
+                window.popleft()
+            if len(window) >= capacity:
+                outcome = RequestOutcome.THROTTLED
+                throttled += clock.now >= 30
+            else:
+                window.append(clock.now)
+                outcome = RequestOutcome.SUCCESS
+                served += clock.now >= 30
+            limiter.release_permit("odds_data", 0.05, outcome)
+
+    # Second half: close to the provider's capacity with few 429s
+    assert served / 30 > 0.8 * capacity
+    assert throttled / (served + throttled) < 0.1
+    assert limiter.get_limits()["odds_data"]["rate_per_minute"] < 600
+
+
+def test_breaker_opens_on_errors_and_half_open_admits_one_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker("espn", clock=clock)
+    limiter = IntelligentRateLimiter("espn", breaker, clock=clock)
+
+    for _ in range(breaker.failure_threshold):
+        clock.now += 1
+        assert limiter.try_acquire("live_data")
+        limiter.release_permit("live_data", 0.1, RequestOutcome.ERROR)
+    assert breaker.state == "OPEN"
+    assert not limiter.try_acquire("live_data")
+
+    clock.now += breaker.recovery_timeout + 1
+    assert limiter.try_acquire("live_data")
+    assert breaker.state == "HALF_OPEN"
+    assert not limiter.try_acquire("live_data")  # probe already in flight
+    limiter.release_permit("live_data", 0.1, RequestOutcome.SUCCESS)
+
+    for _ in range(breaker.success_threshold - 1):
+        clock.now += 1
+        assert limiter.try_acquire("live_data")
+        limiter.release_permit("live_data", 0.1, RequestOutcome.SUCCESS)
+    assert breaker.state == "CLOSED"
+
+    # Throttling is the rate limiter's business, not the breaker's
+    for _ in range(breaker.failure_threshold + 1):
+        clock.now += 5  # the throttles also slow the bucket down
+        assert limiter.try_acquire("live_data")
+        limiter.release_permit("live_data", 0.1, RequestOutcome.THROTTLED)
+    assert breaker.state == "CLOSED"
+
+
+class FakeTransport:
+    """Answers every request with ``body``, or never answers when ``hang``"""
+
+    def __init__(self, body=b"{}", hang=False):
+        self.body, self.hang = body, hang
+        self.provider_limits = {}
+        self.calls = []
+
+    def configure_provider(self, provider, max_concurrency):
+        self.provider_limits[provider] = max_concurrency
+
+    async def request(self, method, url, provider=None, **kwargs):
+        self.calls.append((method, url, provider))
+        if self.hang:
+            await asyncio.Event().wait()
+        raw = httpx.Response(200, content=self.body)
+        return TransportResponse(200, raw.headers, self.body, url, 0.01, raw)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_returns_its_permit_without_an_outcome():
+    connector = DataSourceConnector("odds", DataSourceReliability.TIER_2_VERIFIED)
+    connector.transport = FakeTransport(hang=True)
+
+    for _ in range(connector.circuit_breaker.failure_threshold + 1):
+        task = asyncio.create_task(connector.request("GET", "https://odds.test", endpoint="odds"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    limit = connector.rate_limiter.endpoint("odds")
+    assert limit.inflight == 0
+    assert connector.circuit_breaker.failure_count == 0
+    assert connector.circuit_breaker.state == "CLOSED"
+
+
+@pytest.mark.asyncio
+async def test_prizepicks_fetch_goes_through_the_connector_limits():
+    manager = UltraEnhancedDataSourceManager()
+    transport = FakeTransport(body=b'{"data": [{"id": 1}]}')
+    connector = DataSourceConnector("prizepicks", DataSourceReliability.TIER_3_COMMUNITY)
+    connector.transport = transport
+    await manager.register_source(connector)
+
+    assert await manager._fetch_prizepicks_data() == [{"id": 1}]
+    assert transport.calls == [("GET", "https://api.prizepicks.com/projections", "prizepicks")]
+    assert "projections" in connector.rate_limiter.get_limits()
+
+    # An open circuit stops the upstream call entirely
+    connector.circuit_breaker.state = "OPEN"
+    connector.circuit_breaker.last_failure_time = connector.circuit_breaker.clock()
+    connector.permit_timeout = 0.01
+    assert await manager._fetch_prizepicks_data() == []
+    assert len(transport.calls) == 1
@@ -0,0 +1,122 @@
+"""Tests for the cached bankroll simulator and its use in Kelly sizing."""
+
+import threading
+
+import numpy as np
+import pytest
+
+import risk_management
+from risk_management import (
+    BankrollSimulator,
+    KellyCriterionEngine,
+    RiskAssessmentEngine,
+)
+
+
+def test_ruin_grows_with_fraction_and_matches_kelly_theory():
+    simulator = BankrollSimulator(n_paths=4000, ruin_level=0.25)
+    kelly = 0.2  # p=0.6 at even odds
+    results = simulator.simulate_bets(0.6, 2.0, [kelly * m for m in (0.25, 0.5, 1.0, 2.0)], 2500)
+
+    ruin = [r.ruin_probability for r in results]
+    assert ruin == sorted(ruin)
+    # Long-run P(ever reaching x of the start) ~ x^(2/m - 1) at m times Kelly
+    assert ruin[2] == pytest.approx(0.25, abs=0.05)
+    assert ruin[1] == pytest.approx(0.25**3, abs=0.02)
+    assert ruin[3] > 0.9
+    # Full Kelly maximises growth; twice Kelly has none
+    growth = [r.growth_rate for r in results]
+    assert max(growth) == growth[2]
+    assert growth[3] < 0.005
+    assert results[3].expected_time_to_ruin < 2500
+
+
+def test_results_are_cached_by_bucket():
+    simulator = BankrollSimulator(n_paths=500)
+    first = simulator.simulate_bets(0.56, 2.1, [0.05, 0.1], horizon=200)
+    assert simulator.get_stats()["misses"] == 2
+
+    # Nearby inputs and horizons land in the same buckets
+    again = simulator.simulate_bets(0.5601, 2.1005, [0.0501, 0.1, 0.05], horizon=240)
+    assert again[0] is first[0] and again[1] is first[1] and again[2] is first[0]
+    stats = simulator.get_stats()
+    assert stats["hits"] == 3 and stats["misses"] == 2 and stats["entries"] == 2
+
+    simulator.cache_size = 2
+    simulator.simulate_bets(0.56, 2.1, [0.2], horizon=200)
+    assert simulator.get_stats()["entries"] == 2
+
+    # A hit evicted by the same call's new entries is still returned
+    fresh = simulator.simulate_bets(0.56, 2.1, [0.2, 0.3, 0.4], horizon=200)
+    assert [r.fraction for r in fresh] == pytest.approx([0.2, 0.3, 0.4])
+
+
+def test_kelly_fraction_is_capped_by_simulated_ruin():
+    engine = KellyCriterionEngine()
+    engine.bankroll_simulator = BankrollSimulator()
+    engine.risk_controls["max_kelly_fraction"] = 1.0
+
+    result = engine.calculate_kelly_fraction(0.6, 2.0)
+    simulation = result["bankroll_simulation"]
+    assert result["adjusted_fraction"] < result["kelly_fraction"]
+    assert any(a.startswith("ruin_limited") for a in result["adjustments"])
+    assert simulation["ruin_probability"] <= engine.risk_controls["max_ruin_probability"]
+    assert simulation["by_kelly_multiple"]["1"] > simulation["by_kelly_multiple"]["0.25"]
+
+    # Ruin odds depend on the Kelly multiple, not the edge: half Kelly passes
+    halved = engine.calculate_kelly_fraction(0.55, 2.0, volatility=1.0)
+    assert halved["adjusted_fraction"] == pytest.approx(halved["kelly_fraction"] / 2)
+    assert not any(a.startswith("ruin_limited") for a in halved["adjustments"])
+
+
+@pytest.mark.asyncio
+async def test_cold_ruin_simulation_runs_off_the_event_loop(monkeypatch):
+    engine = KellyCriterionEngine()
+    engine.bankroll_simulator = BankrollSimulator(n_paths=500)
+    simulated_on = []
+    simulate = engine.bankroll_simulator._simulate_fractions
+
+    def recording(*args):
+        simulated_on.append(threading.current_thread())
+        return simulate(*args)
+
+    monkeypatch.setattr(engine.bankroll_simulator, "_simulate_fractions", recording)
+
+    cold = await engine.calculate_kelly_fraction_async(0.6, 2.0, volatility=0.2)
+    assert simulated_on and simulated_on[0] is not threading.main_thread()
+    assert engine._ruin_simulation_cached(0.6, 2.0, 0.2, None, None)
+
+    # A cached simulation is answered inline without simulating again
+    warm = await engine.calculate_kelly_fraction_async(0.6, 2.0, volatility=0.2)
+    assert len(simulated_on) == 1
+    assert warm["adjusted_fraction"] == cold["adjusted_fraction"]
+
+
+@pytest.mark.asyncio
+async def test_portfolio_assessment_bootstraps_off_the_event_loop(monkeypatch):
+    simulated_on = []
+    simulate = risk_management.bankroll_simulator.simulate_returns
+
+    def recording(returns, horizon=None):
+        simulated_on.append(threading.current_thread())
+        return simulate(returns, horizon)
+
+    monkeypatch.setattr(risk_management.bankroll_simulator, "simulate_returns", recording)
+    returns = list(np.random.default_rng(3).normal(-0.01, 0.03, 200))
+    metrics = await RiskAssessmentEngine().assess_portfolio_risk(
+        [{"amount": 100.0, "odds": 2.0, "win_probability": 0.5}], 1000.0, returns
+    )
+    assert metrics.bankruptcy_probability > 0.5
+    assert simulated_on and threading.main_thread() not in simulated_on
+
+
+def test_assessment_bootstraps_returns():
+    engine = RiskAssessmentEngine()
+    rng = np.random.default_rng(2)
+    losing = list(rng.normal(-0.01, 0.03, 300))
+    winning = list(rng.normal(0.01, 0.01, 300))
+
+    assert engine._calculate_bankruptcy_probability(losing, 1000.0) > 0.9
+    assert engine._calculate_time_to_ruin(losing, 1000.0) < 250
+    assert engine._calculate_bankruptcy_probability(winning, 1000.0) == 0.0
+    assert engine._calculate_time_to_ruin(winning, 1000.0) is None
@@ -0,0 +1,104 @@
+"""Tests for the in-process benchmark harness and baseline comparison."""
+
+from benchmarks import synthetic
+from benchmarks.harness import (
+    BenchmarkCase,
+    BenchmarkReport,
+    BenchmarkResult,
+    compare_reports,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+from benchmarks.suite import build_suite
+
+
+def _report(**medians):
+    return BenchmarkReport(
+        {
+            name: BenchmarkResult.from_samples(name, [median] * 3, items=10)
+            for name, median in medians.items()
+        }
+    )
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = _report(fast=0.010, steady=0.010, slow=0.010, dropped=0.010)
+    current = _report(fast=0.005, steady=0.011, slow=0.020, added=0.001)
+
+    statuses = {c.name: c.status for c in compare_reports(current, baseline, 0.25)}
+
+    assert statuses == {
+        "fast": "improved",
+        "steady": "ok",
+        "slow": "regressed",
+        "dropped": "missing",
+        "added": "new",
+    }
+
+
+def test_crashing_case_fails_the_comparison_but_missing_dependency_skips():
+    def missing_dependency():
+        import not_an_installed_module  # noqa: F401
+
+    baseline = _report(crashes=0.010, optional=0.010)
+    current = run_suite(
+        [
+            BenchmarkCase("crashes", lambda _: 1 / 0),
+            BenchmarkCase("optional", lambda _: None, setup=missing_dependency),
+        ]
+    )
+    assert current.results["optional"].skipped.startswith("ModuleNotFoundError")
+
+    comparisons = {c.name: c for c in compare_reports(current, baseline, 0.25)}
+    assert comparisons["crashes"].status == "failed" and comparisons["crashes"].regressed
+    assert comparisons["optional"].status == "skipped" and not comparisons["optional"].regressed
+
+
+def test_baseline_round_trip_and_async_cases(tmp_path):
+    calls = []
+
+    async def target(state):
+        calls.append(state)
+
+    report = run_suite(
+        [
+            BenchmarkCase("async_case", target, setup=lambda: "state", repeat=3),
+            BenchmarkCase("broken", lambda _: 1 / 0),
+        ]
+    )
+    assert calls == ["state"] * 4  # one warmup plus three timed runs
+    assert report.results["broken"].failed.startswith("ZeroDivisionError")
+    assert report.results["broken"].skipped is None
+
+    path = tmp_path / "baseline.json"
+    save_baseline(report, path)
+    loaded = load_baseline(path)
+
+    assert loaded.results == report.results
+    assert loaded.metadata["python"] == report.metadata["python"]
+
+
+def test_synthetic_data_is_deterministic():
+    assert synthetic.portfolio_opportunities(5, seed=3) == synthetic.portfolio_opportunities(
+        5, seed=3
+    )
+    a = synthetic.odds_feed(10, seed=1)
+    b = synthetic.odds_feed(10, seed=1)
+    assert [o["odds"] for o in a] == [o["odds"] for o in b]
+
+
+def test_smoke_suite_runs_hot_paths():
+    report = run_suite(
+        build_suite("smoke"), only=["arbitrage", "cache.in_memory", "plan"], repeat=1
+    )
+
+    assert set(report.results) == {
+        "arbitrage.detect_opportunities",
+        "arbitrage.inefficiency_board",
+        "cache.in_memory.set_get",
+        "features.plan.transform",
+    }
+    for result in report.results.values():
+        assert result.skipped is None
+        assert result.items_per_sec > 0
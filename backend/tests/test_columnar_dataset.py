@@ -0,0 +1,87 @@
+"""Tests for the memory-mapped columnar training dataset."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import SGDRegressor
+from sklearn.preprocessing import StandardScaler
+
+from services.real_ml_service import PLAYER_PROPS_FEATURES, RealMLModels
+from utils.columnar_dataset import ColumnarDataset, fit_incremental
+
+
+def test_append_reopen_and_zero_copy_columns(tmp_path):
+    dataset = ColumnarDataset(tmp_path / "games")
+    dataset.append(pd.DataFrame({"rating": [1.5, 2.5], "won": [True, False], "rest": [1, 2]}))
+    dataset.append({"rating": [3.5], "won": [True], "rest": [4]})
+
+    reopened = ColumnarDataset(tmp_path / "games")
+    assert len(reopened) == 3
+    assert isinstance(reopened["rating"], np.memmap)
+    np.testing.assert_array_equal(reopened["won"], [True, False, True])
+    np.testing.assert_array_equal(reopened.matrix(["rating", "rest"], 1), [[2.5, 2], [3.5, 4]])
+    assert list(reopened.to_frame().columns) == ["rating", "won", "rest"]
+
+
+def test_uncommitted_tail_is_ignored_and_trimmed(tmp_path):
+    dataset = ColumnarDataset(tmp_path / "t", schema={"x": "f8"})
+    dataset.append({"x": [1.0, 2.0]})
+    # Simulate a crash after writing column data but before committing meta.json
+    with open(tmp_path / "t" / "x.bin", "ab") as f:
+        f.write(np.array([99.0]).tobytes())
+
+    reopened = ColumnarDataset(tmp_path / "t")
+    np.testing.assert_array_equal(reopened["x"], [1.0, 2.0])
+    reopened.append({"x": [3.0]})
+    np.testing.assert_array_equal(ColumnarDataset(tmp_path / "t")["x"], [1.0, 2.0, 3.0])
+
+
+def test_schema_is_enforced(tmp_path):
+    dataset = ColumnarDataset(tmp_path / "t", schema={"x": "f8", "y": "f8"})
+    with pytest.raises(ValueError):
+        dataset.append({"x": [1.0], "y": [1.0, 2.0]})
+    with pytest.raises(KeyError):
+        dataset.append({"x": [1.0]})
+    with pytest.raises(ValueError):
+        ColumnarDataset(tmp_path / "t", schema={"z": "f8"})
+    with pytest.raises(ValueError):
+        ColumnarDataset(tmp_path / "names").append({"name": np.array(["a"], dtype=object)})
+
+
+def test_fit_incremental_trains_chunk_by_chunk(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 3))
+    dataset = ColumnarDataset(tmp_path / "t")
+    dataset.append({"a": X[:, 0], "b": X[:, 1], "c": X[:, 2], "y": X @ [2.0, -1.0, 0.5]})
+
+    chunks = [len(X_chunk) for X_chunk, _ in dataset.iter_chunks(["a", "b", "c"], "y", 512)]
+    assert chunks == [512, 512, 512, 464]
+
+    model = fit_incremental(
+        SGDRegressor(random_state=0), dataset, ["a", "b", "c"], "y",
+        scaler=StandardScaler(), chunk_rows=512, epochs=3,
+    )
+    np.testing.assert_allclose(model.coef_, [2.0, -1.0, 0.5], atol=0.1)
+
+
+def test_out_of_core_training_sees_labels_beyond_the_first_chunk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # models/ and datasets/ are relative paths
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(3000, len(PLAYER_PROPS_FEATURES)))
+    service = RealMLModels()
+    columns = dict(zip(PLAYER_PROPS_FEATURES, X.T))
+    # Sorted labels: the first chunks hold only negatives
+    service.append_training_rows("player_props", {**columns, "beats_line": np.sort(X[:, 0] > 0)})
+    assert list(ColumnarDataset(service.dataset_dir / "player_props").unique("beats_line", 500)) == [
+        False, True
+    ]
+
+    service.append_training_rows(
+        "outcomes_player_props", {**columns, "outcome": (X[:, 0] > 0).astype(int)}
+    )
+    service.train_out_of_core(
+        "player_props", "player_props", PLAYER_PROPS_FEATURES, "beats_line", chunk_rows=500
+    )
+    model = service.models["player_props"]
+    assert list(model.classes_) == [False, True]
+    assert service.model_metadata["player_props"]["training_samples"] == 6000
@@ -0,0 +1,86 @@
+"""Tests for the per-category feature store in ComprehensiveFeatureEngine."""
+
+import pytest
+
+from services.comprehensive_feature_engine import (
+    CATEGORY_INPUT_KEYS,
+    CategoryFeatureStore,
+    ComprehensiveFeatureEngine,
+    FeatureCategory,
+)
+
+RAW_DATA = {
+    "weather": {"temp": 55, "wind": 8},
+    "venue": "Lambeau Field",
+    "line": 24.5,
+    "injuries": [],
+}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_inputs_reuse_every_category():
+    engine = ComprehensiveFeatureEngine()
+    first = await engine.engineer_features("Player A", "nfl", "passing_yards", RAW_DATA)
+    second = await engine.engineer_features("Player A", "nfl", "passing_yards", dict(RAW_DATA))
+
+    assert len(first.metadata["recomputed_categories"]) == len(FeatureCategory)
+    assert second.metadata["recomputed_categories"] == []
+    assert second.features == first.features
+
+
+@pytest.mark.asyncio
+async def test_only_categories_with_changed_inputs_are_recomputed():
+    engine = ComprehensiveFeatureEngine()
+    first = await engine.engineer_features("Player A", "nfl", "passing_yards", RAW_DATA)
+
+    changed = {**RAW_DATA, "weather": {"temp": 40, "wind": 20}}
+    second = await engine.engineer_features("Player A", "nfl", "passing_yards", changed)
+
+    assert second.metadata["recomputed_categories"] == ["weather_impact"]
+    assert second.feature_categories[FeatureCategory.VENUE_EFFECTS] == (
+        first.feature_categories[FeatureCategory.VENUE_EFFECTS]
+    )
+    assert list(second.features) == list(first.features)
+
+
+@pytest.mark.asyncio
+async def test_expired_categories_are_recomputed():
+    engine = ComprehensiveFeatureEngine()
+    engine.category_ttls[FeatureCategory.LINE_MOVEMENT] = 0
+    await engine.engineer_features("Player A", "nba", "points", RAW_DATA)
+    second = await engine.engineer_features("Player A", "nba", "points", RAW_DATA)
+
+    assert second.metadata["recomputed_categories"] == ["line_movement"]
+    assert engine.category_store.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_categories_see_only_their_keyed_inputs_and_cached_results_are_copies():
+    engine = ComprehensiveFeatureEngine()
+    seen = {}
+    original = engine.create_weather_impact_features
+
+    async def spy(sport, raw_data):
+        seen.update(raw_data)
+        return await original(sport, raw_data)
+
+    engine.create_weather_impact_features = spy
+    first = await engine.engineer_features("Player A", "nfl", "passing_yards", RAW_DATA)
+    assert set(seen) <= set(CATEGORY_INPUT_KEYS[FeatureCategory.WEATHER_IMPACT])
+    assert "line" not in seen and "weather" in seen
+
+    first.feature_categories[FeatureCategory.VENUE_EFFECTS].clear()
+    second = await engine.engineer_features("Player A", "nfl", "passing_yards", RAW_DATA)
+    assert second.metadata["recomputed_categories"] == []
+    assert second.feature_categories[FeatureCategory.VENUE_EFFECTS]
+
+
+def test_store_is_size_bounded():
+    store = CategoryFeatureStore(max_entries=2)
+    for i in range(3):
+        store.set(("p", str(i)), {"x": float(i)}, ttl=60)
+
+    assert len(store) == 2
+    assert store.get(("p", "0")) is None
+    assert store.get(("p", "2")) == {"x": 2.0}
+    assert store.get_stats()["evictions"] == 1
@@ -0,0 +1,202 @@
+"""Tests for cron parsing and the fire-time heap behind TaskScheduler."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.cron import CronExpression, CronParseError, CronTimer, MisfirePolicy
+
+START = datetime(2026, 10, 19, 12, 47, 13, tzinfo=timezone.utc)
+
+
+def _next(expression, count=3, start=START):
+    cron, moment, out = CronExpression(expression), start, []
+    for _ in range(count):
+        moment = cron.next_after(moment)
+        out.append(moment.strftime("%m-%d %a %H:%M:%S"))
+    return out
+
+
+def test_cron_fields_macros_and_names():
+    assert _next("*/15 * * * *") == [
+        "10-19 Mon 13:00:00",
+        "10-19 Mon 13:15:00",
+        "10-19 Mon 13:30:00",
+    ]
+    assert _next("0 */6 * * *", 2) == ["10-19 Mon 18:00:00", "10-20 Tue 00:00:00"]
+    assert _next("@weekly", 1) == ["10-25 Sun 00:00:00"]
+    assert _next("30 9 * * mon-fri", 2, datetime(2026, 10, 23, 10, tzinfo=timezone.utc)) == [
+        "10-26 Mon 09:30:00",
+        "10-27 Tue 09:30:00",
+    ]
+    # Day-of-month and day-of-week both restricted: either one matches
+    assert _next("0 0 13 * fri", 2) == ["10-23 Fri 00:00:00", "10-30 Fri 00:00:00"]
+    # A step over the whole range still counts as "*": both must match
+    assert _next("0 0 */2 * fri", 2) == ["10-23 Fri 00:00:00", "11-13 Fri 00:00:00"]
+    # Optional leading seconds field
+    assert _next("*/20 * * * * *", 2) == ["10-19 Mon 12:47:20", "10-19 Mon 12:47:40"]
+    assert CronExpression("0 0 29 feb *").next_after(START).year == 2028
+
+
+@pytest.mark.parametrize(
+    "bad", ["* * * *", "61 * * * *", "*/0 * * * *", "5-1 * * * *", "x * * * *"]
+)
+def test_invalid_expressions_raise(bad):
+    with pytest.raises(CronParseError):
+        CronExpression(bad)
+
+
+def test_timer_pops_only_due_schedules_in_order():
+    timer = CronTimer()
+    now = START.timestamp()
+    timer.add("quarter", "*/15 * * * *", now=now)
+    timer.add("hourly", "0 * * * *", now=now)
+    timer.add("daily", "@daily", now=now)
+    assert timer.seconds_until_next(now) == pytest.approx(12 * 60 + 47)
+
+    at_one = datetime(2026, 10, 19, 13, tzinfo=timezone.utc).timestamp()
+    assert timer.pop_due(at_one - 1) == []
+    assert sorted(f.entry.key for f in timer.pop_due(at_one)) == ["hourly", "quarter"]
+    assert timer.seconds_until_next(at_one) == 15 * 60
+
+    assert timer.remove("quarter")
+    assert timer.seconds_until_next(at_one) == 60 * 60
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        (MisfirePolicy.FIRE_ONCE, [(1, 3)]),  # one run standing in for 4 slots
+        (MisfirePolicy.FIRE_ALL, [(1, 0)] * 4),
+        (MisfirePolicy.SKIP, [(1, 0)]),  # only the run inside the grace period
+    ],
+)
+def test_misfire_policies_after_a_stall(policy, expected):
+    timer = CronTimer()
+    start = datetime(2026, 10, 19, 12, 0, 30, tzinfo=timezone.utc).timestamp()
+    timer.add("minutely", "* * * * *", now=start, policy=policy, grace_seconds=30)
+
+    # The process stalls for four minutes
+    fires = timer.pop_due(start + 4 * 60)
+    assert [(1, f.coalesced) for f in fires] == expected
+    # Three of the four slots were missed, however they were handled
+    assert timer.entries["minutely"].missed == 3
+    assert sum(f.missed for f in fires) == (0 if policy == MisfirePolicy.SKIP else 3)
+    assert all(f.scheduled_for <= start + 240 for f in fires)
+    # Next run is in the future again
+    assert timer.entries["minutely"].next_fire > start + 240
+
+
+class _SharedRedis:
+    """Just enough of redis.asyncio for SET NX leases"""
+
+    def __init__(self):
+        self.keys = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+
+class _RecordingQueue:
+    queue_name = "test_tasks"
+
+    def __init__(self, redis_client, enqueued):
+        self.redis_client = redis_client
+        self.enqueued = enqueued
+
+    async def enqueue(self, task):
+        self.enqueued.append(task.id)
+        return True
+
+
+def test_scheduler_instances_share_each_occurrence_via_lease():
+    import asyncio
+
+    from task_processor import TaskDefinition, TaskPriority, TaskScheduler, TaskType
+
+    redis_client, enqueued = _SharedRedis(), []
+    start = datetime(2026, 10, 19, 12, 59, 30, tzinfo=timezone.utc).timestamp()
+    task = TaskDefinition(
+        id="cleanup",
+        task_type=TaskType.DATA_CLEANUP,
+        priority=TaskPriority.LOW,
+        function_name="cleanup_task",
+        recurring=True,
+        cron_expression="0 * * * *",
+    )
+
+    async def run_instances():
+        schedulers = []
+        for name in ("node-a", "node-b"):
+            scheduler = TaskScheduler(instance_id=name)
+            scheduler.task_queue = _RecordingQueue(redis_client, enqueued)
+            scheduler.timer.add(task.id, task.cron_expression, payload=task, now=start)
+            schedulers.append(scheduler)
+        for scheduler in schedulers:
+            for fire in scheduler.timer.pop_due(start + 31):
+                await scheduler._trigger(fire)
+        return schedulers
+
+    a, b = asyncio.run(run_instances())
+    assert enqueued == [f"cleanup_{int(start) + 30}"]
+    assert a.stats["fired"] + b.stats["fired"] == 1
+    assert b.stats["claimed_elsewhere"] == 1
+
+
+class _BrokenRedis:
+    async def set(self, key, value, nx=False, ex=None):
+        raise ConnectionError("redis is down")
+
+
+class _FlakyQueue(_RecordingQueue):
+    """Fails to enqueue the first task it sees"""
+
+    async def enqueue(self, task):
+        if not self.enqueued and not getattr(self, "failed", False):
+            self.failed = True
+            raise RuntimeError("queue unavailable")
+        return await super().enqueue(task)
+
+
+def test_lease_and_enqueue_errors_do_not_drop_other_due_fires():
+    import asyncio
+
+    import time
+
+    from task_processor import TaskDefinition, TaskPriority, TaskScheduler, TaskType
+
+    # Each hourly schedule has missed a run, so all are due on the first pass
+    start = time.time() - 2 * 3600
+
+    def task(task_id):
+        return TaskDefinition(
+            id=task_id,
+            task_type=TaskType.DATA_CLEANUP,
+            priority=TaskPriority.LOW,
+            function_name="cleanup_task",
+            recurring=True,
+            cron_expression="0 * * * *",
+        )
+
+    async def run():
+        enqueued = []
+        scheduler = TaskScheduler(instance_id="node-a", max_sleep=0.01)
+        scheduler.task_queue = _FlakyQueue(_BrokenRedis(), enqueued)
+        for task_id in ("first", "second", "third"):
+            scheduler.timer.add(task_id, "0 * * * *", payload=task(task_id), now=start)
+
+        runner = asyncio.create_task(scheduler.start_scheduler())
+        while scheduler.stats["fired"] + scheduler.stats["trigger_errors"] < 3:
+            await asyncio.sleep(0.01)
+        await scheduler.stop_scheduler()
+        await runner
+        return scheduler, enqueued
+
+    scheduler, enqueued = asyncio.run(run())
+    # Redis failures fail open; the one enqueue failure is isolated
+    assert scheduler.stats["lease_errors"] == 3
+    assert scheduler.stats["trigger_errors"] == 1
+    assert len(enqueued) == 2
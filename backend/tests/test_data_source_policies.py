@@ -0,0 +1,140 @@
+"""Tests for first-good, quorum and hedged multi-source fetch policies."""
+
+import asyncio
+import itertools
+import time
+from typing import Callable, Iterable, Union
+
+import numpy as np
+import pytest
+
+from data_sources import (
+    DataSourceConnector,
+    DataSourceReliability,
+    DataType,
+    FetchPolicy,
+    UltraEnhancedDataSourceManager,
+)
+
+
+class FakeConnector(DataSourceConnector):
+    """Live-score source whose latency comes from ``delay`` (callable or sequence)"""
+
+    def __init__(
+        self,
+        source_id: str,
+        delay: Union[Callable[[], float], Iterable[float]],
+        tier: DataSourceReliability = DataSourceReliability.TIER_2_VERIFIED,
+        fail: bool = False,
+    ):
+        super().__init__(source_id, tier, [DataType.LIVE_SCORES])
+        self.delay = delay if callable(delay) else iter(delay).__next__
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def fetch(self, data_type, entity_id):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay())
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ConnectionError(f"{self.source_id} is down")
+        return {
+            "game_id": entity_id,
+            "home_team": "BOS",
+            "away_team": "LAL",
+            "home_score": 101,
+            "away_score": 99,
+            "period": 4,
+        }
+
+
+async def _manager(*connectors):
+    manager = UltraEnhancedDataSourceManager()
+    for connector in connectors:
+        await manager.register_source(connector)
+    return manager
+
+
+async def _timed_fetch(manager, **kwargs):
+    started = time.perf_counter()
+    point = await manager.fetch_multi_source_data(DataType.LIVE_SCORES, "g1", **kwargs)
+    return point, time.perf_counter() - started
+
+
+@pytest.mark.asyncio
+async def test_first_good_returns_fastest_and_cancels_the_rest():
+    fast, slow = FakeConnector("fast", lambda: 0.01), FakeConnector("slow", lambda: 2.0)
+    manager = await _manager(slow, fast)
+
+    point, elapsed = await _timed_fetch(manager, policy=FetchPolicy.FIRST_GOOD)
+
+    assert point.source_id == "fast"
+    assert elapsed < 0.5
+    assert slow.cancelled == 1
+    stats = manager.policy_stats[FetchPolicy.FIRST_GOOD].snapshot()
+    assert stats["satisfied"] == 1 and stats["cancelled"] == 1 and stats["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_quorum_reconciles_first_k_and_all_waits_for_everyone():
+    sources = [
+        FakeConnector("a", lambda: 0.01),
+        FakeConnector("b", lambda: 0.02),
+        FakeConnector("c", lambda: 0.4),
+    ]
+    manager = await _manager(*sources)
+
+    point, elapsed = await _timed_fetch(manager, policy=FetchPolicy.QUORUM, quorum=2)
+    assert sorted(point.metadata["reconciliation_sources"]) == ["a", "b"]
+    assert elapsed < 0.3
+    assert sources[2].cancelled == 1
+
+    point, elapsed = await _timed_fetch(manager, policy=FetchPolicy.ALL)
+    assert sorted(point.metadata["reconciliation_sources"]) == ["a", "b", "c"]
+    assert elapsed >= 0.4
+
+
+@pytest.mark.asyncio
+async def test_hedged_fires_backup_after_primary_p95():
+    rng = np.random.default_rng(0)
+    # Primary is normally ~5ms; its 21st call stalls
+    primary_delays = itertools.chain(rng.uniform(0.002, 0.008, 20), [2.0])
+    primary = FakeConnector(
+        "primary", primary_delays, tier=DataSourceReliability.TIER_1_PREMIUM
+    )
+    backup = FakeConnector("backup", lambda: 0.01)
+    manager = await _manager(backup, primary)
+
+    for _ in range(20):
+        point, _ = await _timed_fetch(manager, policy=FetchPolicy.HEDGED)
+        assert point.source_id == "primary"
+    assert backup.calls == 0  # fast primary never needs a hedge
+
+    point, elapsed = await _timed_fetch(manager, policy=FetchPolicy.HEDGED)
+    assert point.source_id == "backup"
+    assert elapsed < 0.2
+    assert primary.cancelled == 1
+    stats = manager.policy_stats[FetchPolicy.HEDGED].snapshot()
+    assert stats["hedges"] == 1 and stats["requests"] == 22 and stats["satisfied"] == 21
+
+
+@pytest.mark.asyncio
+async def test_hedged_moves_on_immediately_when_primary_fails():
+    primary = FakeConnector(
+        "primary", lambda: 0.0, tier=DataSourceReliability.TIER_1_PREMIUM, fail=True
+    )
+    backup = FakeConnector("backup", lambda: 0.0)
+    manager = await _manager(primary, backup)
+    manager.hedge_delay_default = 5.0
+
+    point, elapsed = await _timed_fetch(manager)  # LIVE_SCORES defaults to hedged
+
+    assert point.source_id == "backup"
+    assert elapsed < 1.0
+    assert manager.policy_stats[FetchPolicy.HEDGED].hedges == 0
+    health = await manager.get_system_health()
+    assert health["fetch_policies"]["hedged"]["fetches"] == 1
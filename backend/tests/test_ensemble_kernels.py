@@ -0,0 +1,103 @@
+"""Tests for the array kernels behind multi-objective and quantum-inspired ensemble search."""
+
+import numpy as np
+import pytest
+
+from enhanced_ensemble_engine import (
+    MultiObjectiveConfig,
+    MultiObjectiveOptimizer,
+    QuantumEnsembleConfig,
+    QuantumInspiredOptimizer,
+    non_dominated_sort,
+)
+
+
+def _brute_force_ranks(scores):
+    ranks = np.full(len(scores), -1)
+    rank = 0
+    while (ranks < 0).any():
+        left = np.flatnonzero(ranks < 0)
+        for i in left:
+            others = scores[left]
+            if not np.any(np.all(others >= scores[i], 1) & np.any(others > scores[i], 1)):
+                ranks[i] = rank
+        rank += 1
+    return ranks
+
+
+def test_non_dominated_sort_matches_brute_force():
+    rng = np.random.default_rng(0)
+    # Rounded so that ties and duplicate rows occur
+    scores = np.round(rng.random((300, 3)), 1)
+    ranks = non_dominated_sort(scores, block_size=64)
+    assert np.array_equal(ranks, _brute_force_ranks(scores))
+    assert non_dominated_sort(np.empty((0, 2))).shape == (0,)
+
+
+def test_frontier_over_many_models_samples_candidates():
+    rng = np.random.default_rng(1)
+    models = [f"m{i}" for i in range(60)]
+    scores = {
+        m: {"accuracy": float(a), "diversity": float(d), "speed": float(s), "robustness": float(r)}
+        for m, (a, d, s, r) in zip(models, rng.random((60, 4)))
+    }
+    optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig(max_candidates=2000, seed=0))
+
+    membership = optimizer._candidate_ensembles(models, scores)
+    sizes = membership.sum(axis=1)
+    assert len(membership) <= 2000 and sizes.min() >= 2 and sizes.max() <= 8
+    best = sorted(models, key=lambda m: -scores[m]["accuracy"])[:3]
+    assert any(set(np.asarray(models)[row > 0]) == set(best) for row in membership)
+
+    frontier = optimizer._find_pareto_frontier(models, scores)
+    assert len(frontier) == 10
+    aggregated = optimizer._aggregate_membership_scores(membership, models, scores)
+    front = aggregated[non_dominated_sort(aggregated) == 0]
+    for solution in frontier:
+        point = np.array(list(optimizer._aggregate_ensemble_scores(solution, scores).values()))
+        # Nothing among the candidates dominates a returned solution
+        assert not np.any(np.all(front >= point, 1) & np.any(front > point, 1))
+
+
+def test_small_model_sets_are_enumerated_exhaustively():
+    models = ["a", "b", "c", "d"]
+    scores = {m: {"accuracy": 0.5, "diversity": 0.5, "speed": 0.5, "robustness": 0.5} for m in models}
+    optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig())
+    assert len(optimizer._candidate_ensembles(models, scores)) == 11
+    assert optimizer._find_pareto_frontier(["a"], scores) == []
+
+
+@pytest.mark.asyncio
+async def test_quantum_population_favors_strong_models():
+    np.random.seed(0)
+    performances = {"strong": 0.9, "medium": 0.6, "weak": 0.1}
+    optimizer = QuantumInspiredOptimizer(QuantumEnsembleConfig(quantum_iterations=40))
+
+    weights = await optimizer.optimize_weights(performances, np.eye(3), [])
+
+    assert sum(weights.values()) == pytest.approx(1.0)
+    assert weights["strong"] > weights["medium"] > weights["weak"]
+
+
+def test_quantum_consistency_matches_per_record_cosine():
+    optimizer = QuantumInspiredOptimizer(QuantumEnsembleConfig())
+    models = ["a", "b", "c"]
+    history = [
+        {"model_weights": {"a": 0.5, "b": 0.5}},
+        {"model_weights": {"c": 1.0, "z": 2.0}},
+        {"no_weights": True},
+        {"model_weights": {"z": 1.0}},
+    ]
+    matrix, mask = optimizer._history_matrix(models, history)
+    weights = np.array([[0.2, 0.3, 0.5], [0.0, 0.0, 1.0]])
+
+    consistency = optimizer._calculate_consistency(weights, matrix, mask)
+
+    def cosine(u, v):
+        return u @ v / (np.linalg.norm(u) * np.linalg.norm(v))
+
+    first = (cosine(np.array([0.2, 0.3]), np.array([0.5, 0.5])) + 1.0) / 2
+    assert consistency[0] == pytest.approx(first)
+    # Only the record sharing model "c" is comparable for the second weighting
+    assert consistency[1] == pytest.approx(1.0)
+    assert optimizer._calculate_consistency(weights, *optimizer._history_matrix(models, []))[0] == 0.5
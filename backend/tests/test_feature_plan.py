@@ -0,0 +1,91 @@
+"""Tests for compiled feature plans against the original per-key transforms."""
+
+import numpy as np
+import pytest
+
+from utils.feature_plan import FeaturePlan
+
+
+def _reference_quantum(features):
+    keys = [k for k, v in features.items() if isinstance(v, (int, float))]
+    values = np.array([features[k] for k in keys])
+    out = {
+        "quantum_superposition": np.sum(values * np.exp(1j * values)).real,
+        "quantum_entanglement": np.corrcoef(np.vstack([values[:-1], values[1:]]))[0, 1],
+        "quantum_interference": np.sum(np.sin(values) * np.cos(values)),
+        "quantum_tunneling": np.sum(np.exp(-np.abs(values))),
+        "quantum_coherence": 1.0 / (1.0 + np.std(values)),
+    }
+    for key in keys[:10]:
+        val = features[key]
+        out[f"quantum_{key}_wave"] = np.sin(val * np.pi) * np.cos(val * np.pi / 2)
+        out[f"quantum_{key}_phase"] = np.exp(1j * val).real
+        out[f"quantum_{key}_amplitude"] = np.abs(val) ** 0.5
+    return out
+
+
+def _reference_interactions(features):
+    keys = [k for k, v in features.items() if isinstance(v, (int, float))]
+    out = {}
+    for i, feat1 in enumerate(keys[:15]):
+        for feat2 in keys[i + 1 : 16]:
+            val1, val2 = features[feat1], features[feat2]
+            out[f"{feat1}_{feat2}_product"] = val1 * val2
+            out[f"{feat1}_{feat2}_ratio"] = val1 / (val2 + 1e-8)
+            out[f"{feat1}_{feat2}_diff"] = val1 - val2
+            out[f"{feat1}_{feat2}_harmonic"] = 2 * val1 * val2 / (val1 + val2 + 1e-8)
+            out[f"{feat1}_{feat2}_geometric"] = (val1 * val2) ** 0.5 if val1 * val2 >= 0 else 0
+            out[f"{feat1}_{feat2}_sin_cos"] = np.sin(val1) * np.cos(val2)
+            out[f"{feat1}_{feat2}_phase_shift"] = np.sin(val1 + val2)
+    return out
+
+
+def _features(rng, n=20):
+    features = {f"feature_{i}": float(v) for i, v in enumerate(rng.normal(size=n))}
+    features["team"] = "LAL"  # non-numeric values are ignored
+    return features
+
+
+def test_quantum_and_interaction_blocks_match_per_key_transforms():
+    features = _features(np.random.default_rng(0))
+    plan = FeaturePlan.from_features(features)
+    row = plan.transform(plan.vectorize(features))[0]
+
+    expected = {**_reference_quantum(features), **_reference_interactions(features)}
+    actual = plan.to_dict(row)
+    for name, value in expected.items():
+        assert actual[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+    assert len(plan.to_dict(row, "interaction")) == (15 * 14 // 2 + 15) * 7
+
+
+def test_batched_rows_match_single_row_transform():
+    rng = np.random.default_rng(1)
+    rows = [_features(rng, n=8) for _ in range(5)]
+    plan = FeaturePlan.from_features(rows[0])
+
+    batch = plan.transform(plan.vectorize_many(rows))
+    assert batch.shape == (5, plan.n_outputs)
+    for r, features in enumerate(rows):
+        np.testing.assert_allclose(batch[r], plan.transform(plan.vectorize(features))[0])
+
+
+def test_fractal_block_follows_input_count():
+    assert FeaturePlan(["a"]).output_names[-1] == "quantum_a_amplitude"
+    small = FeaturePlan(["a", "b", "c"])
+    assert list(small.to_dict(small.transform(np.array([[1.0, 2.0, 4.0]]))[0], "fractal")) == [
+        "fractal_dimension",
+        "lyapunov_exponent",
+    ]
+
+    plan = FeaturePlan(["a", "b", "c", "d", "e"])
+    fractal = plan.to_dict(plan.transform(np.array([[1.0, 1.05, 3.0, 3.02, 8.0]]))[0], "fractal")
+    # pairs within 0.1 of each other: (a, b) and (c, d) out of 10
+    assert fractal["correlation_dimension"] == pytest.approx(0.2)
+    assert fractal["fractal_dimension"] == pytest.approx(4 / (7.0 + 4e-8))
+
+
+def test_constant_input_has_zero_entanglement():
+    plan = FeaturePlan(["a", "b", "c"])
+    row = plan.transform(np.full((1, 3), 2.0))[0]
+    assert row[plan.index["quantum_entanglement"]] == 0.0
+    assert np.all(np.isfinite(row[plan.sections["quantum"]]))
@@ -0,0 +1,112 @@
+"""Tests for the shared HTTP transport against a local fake HTTP server."""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utils.http_transport import ResponseTooLargeError, SharedHTTPTransport
+
+
+class FakeProvider:
+    """Local HTTP server recording connections and in-flight requests"""
+
+    def __init__(self):
+        self.peers = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        app = web.Application()
+        app.router.add_get("/json", self.json_handler)
+        app.router.add_get("/slow", self.slow_handler)
+        app.router.add_get("/big", self.big_handler)
+        app.router.add_get("/error", self.error_handler)
+        self.server = TestServer(app)
+
+    def url(self, path: str) -> str:
+        return str(self.server.make_url(path))
+
+    async def json_handler(self, request):
+        self.peers.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"data": [1, 2, 3], "q": request.query.get("q")})
+
+    async def slow_handler(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        return web.json_response({"ok": True})
+
+    async def big_handler(self, request):
+        return web.Response(body=b"x" * 10000, content_type="application/json")
+
+    async def error_handler(self, request):
+        return web.json_response({"error": "throttled"}, status=429)
+
+
+@pytest_asyncio.fixture
+async def provider():
+    fake = FakeProvider()
+    await fake.server.start_server()
+    yield fake
+    await fake.server.close()
+
+
+@pytest.mark.asyncio
+async def test_requests_to_same_host_reuse_keepalive_connection(provider):
+    transport = SharedHTTPTransport(http2=False)
+    try:
+        for i in range(5):
+            data = await transport.get_json(provider.url("/json"), params={"q": str(i)})
+            assert data == {"data": [1, 2, 3], "q": str(i)}
+        assert len(provider.peers) == 1
+        assert len(transport.get_metrics()["pools"]) == 1
+    finally:
+        await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_provider_concurrency_is_bounded(provider):
+    transport = SharedHTTPTransport(http2=False)
+    transport.configure_provider("fake", max_concurrency=2)
+    try:
+        await asyncio.gather(
+            *[transport.get_json(provider.url("/slow"), provider="fake") for _ in range(6)]
+        )
+        assert provider.max_in_flight == 2
+    finally:
+        await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_size_cap_and_status_errors(provider):
+    transport = SharedHTTPTransport(http2=False)
+    try:
+        with pytest.raises(ResponseTooLargeError):
+            await transport.request("GET", provider.url("/big"), max_bytes=1000)
+
+        response = await transport.request("GET", provider.url("/error"))
+        assert response.status_code == 429
+        with pytest.raises(httpx.HTTPStatusError) as excinfo:
+            response.raise_for_status()
+        assert "throttled" in excinfo.value.response.text
+    finally:
+        await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_latency_histogram_per_host(provider):
+    transport = SharedHTTPTransport(http2=False)
+    try:
+        for _ in range(3):
+            await transport.get_json(provider.url("/json"))
+        await transport.request("GET", provider.url("/error"))
+        host = f"{provider.server.host}:{provider.server.port}"
+        stats = transport.get_metrics()["latency"][host]
+        assert stats["count"] == 4
+        assert stats["errors"] == 1
+        assert 0 < stats["p50"] <= stats["p99"] <= stats["max"]
+    finally:
+        await transport.close()
@@ -0,0 +1,121 @@
+"""Tests for process-pool model evaluation and persisted Optuna weight searches."""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.tree import DecisionTreeRegressor
+
+from utils.hyperparameter_search import (
+    BACKEND_DIR,
+    ParallelSearchSettings,
+    evaluate_models,
+    limit_threads,
+    optimize_weights,
+    study_name,
+)
+
+optuna = pytest.importorskip("optuna")
+
+
+class Broken(Ridge):
+    def fit(self, X, y, sample_weight=None):
+        raise ValueError("singular")
+
+
+def _data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    y = X @ np.array([1.0, -2.0, 0.5, 0.0]) + rng.normal(0, 0.1, n)
+    return X[:150], y[:150], X[150:], y[150:]
+
+
+def test_models_are_fitted_in_worker_processes():
+    X_train, y_train, X_val, y_val = _data()
+    models = {
+        "ridge": Ridge(alpha=1.0),
+        "tree": DecisionTreeRegressor(max_depth=4, random_state=0),
+        "broken": Broken(),
+    }
+
+    results = evaluate_models(models, X_train, y_train, X_val, y_val, max_workers=2)
+
+    assert set(results) == set(models)
+    ridge = results["ridge"]
+    assert ridge.error is None
+    assert ridge.metrics["r2_score"] > 0.95 and len(ridge.metrics["cv_scores"]) == 5
+    # The fitted copy comes back; the parent's estimator is untouched
+    assert np.allclose(ridge.model.predict(X_val), ridge.predictions)
+    assert not hasattr(models["ridge"], "coef_")
+    assert results["tree"].metrics["feature_importance"]
+    assert results["broken"].error == "ValueError: singular"
+
+
+def test_limit_threads_sets_native_thread_params():
+    from sklearn.ensemble import RandomForestRegressor
+
+    assert limit_threads(RandomForestRegressor(n_jobs=-1), 2).n_jobs == 2
+    limit_threads(Ridge(), 2)  # no thread parameter: left alone
+
+
+def test_weight_search_prunes_and_recovers_mixture():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=400)
+    predictions = {
+        "good": y + rng.normal(0, 0.2, 400),
+        "okay": y + rng.normal(0, 0.6, 400),
+        "noise": rng.normal(size=400),
+    }
+
+    weights, study = optimize_weights(
+        list(predictions), predictions, y, n_trials=60, n_jobs=2, seed=0
+    )
+
+    assert sum(weights.values()) == pytest.approx(1.0)
+    assert weights["good"] > weights["okay"] > weights["noise"]
+    states = [t.state for t in study.trials]
+    assert states.count(optuna.trial.TrialState.PRUNED) > 0
+    assert len(states) == 60
+
+
+def test_persisted_study_resumes_only_for_the_same_inputs(tmp_path):
+    rng = np.random.default_rng(2)
+    y = rng.normal(size=200)
+    predictions = {"a": y + rng.normal(0, 0.3, 200), "b": rng.normal(size=200)}
+    storage = str(tmp_path / "studies.db")
+
+    first, study = optimize_weights(["a", "b"], predictions, y, n_trials=20, storage_path=storage)
+    assert study.study_name.startswith(study_name(["a", "b"]))
+
+    # Same model set and inputs in another order: same stored study, resumed
+    again, resumed = optimize_weights(
+        ["b", "a"], predictions, y, n_trials=5, storage_path=storage
+    )
+    assert resumed.study_name == study.study_name
+    assert len(resumed.trials) == 25
+    assert again["a"] == pytest.approx(first["a"], abs=0.05)
+
+
+def test_changed_inputs_start_a_fresh_study_from_the_previous_best(tmp_path):
+    rng = np.random.default_rng(3)
+    y = rng.normal(size=200)
+    predictions = {"a": y + rng.normal(0, 0.3, 200), "b": rng.normal(size=200)}
+    storage = str(tmp_path / "studies.db")
+
+    _, study = optimize_weights(["a", "b"], predictions, y, n_trials=20, storage_path=storage)
+    best = study.best_trial
+
+    # Retrained models: trials scored on the old predictions are not reused
+    predictions["b"] = y + rng.normal(0, 0.1, 200)
+    weights, fresh = optimize_weights(["a", "b"], predictions, y, n_trials=10, storage_path=storage)
+    assert fresh.study_name != study.study_name
+    assert len(fresh.trials) == 10
+    assert fresh.trials[0].params == best.params
+    assert fresh.trials[0].value != pytest.approx(best.value)
+    assert optuna.study.get_all_study_names(f"sqlite:///{storage}") == [fresh.study_name]
+    assert weights["b"] > weights["a"]
+
+
+def test_default_study_storage_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = ParallelSearchSettings().storage_path
+    assert storage == str(BACKEND_DIR / "models" / "optuna_studies.db")
@@ -0,0 +1,118 @@
+"""Tests for the per-market line history index and board-wide line detectors."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from arbitrage_engine import MarketInefficiencyDetector, MarketInefficiencyType
+from utils.line_history import LineHistoryIndex
+
+
+def test_window_aggregates_by_points_and_seconds_across_wraparound():
+    index = LineHistoryIndex(capacity=8, initial_rows=1)
+    prices = [2.0, 2.1, 1.9, 2.3, 2.2, 2.05, 1.95, 2.4, 2.5, 2.45, 2.6, 2.35]
+    for t, price in enumerate(prices):
+        assert index.append("a", price, 100.0 + t)
+    index.append("b", 3.0, 100.0)  # second row forces the block to grow
+    assert not index.append("a", 9.9, 105.0)  # older than the latest quote
+
+    rows = [index.row("a"), index.row("b")]
+    last_five = index.window(rows, points=5)
+    assert last_five.count.tolist() == [5, 1]
+    assert last_five.first[0] == 2.4 and last_five.last[0] == 2.35
+    assert last_five.low[0] == 2.35 and last_five.high[0] == 2.6
+    assert last_five.movement[0] == pytest.approx(2.35 / 2.4 - 1)
+    assert last_five.velocity[0] == pytest.approx((2.35 - 2.4) / 4)
+    assert last_five.velocity[1] == 0.0
+
+    # Only the 8 newest quotes are kept
+    everything = index.window(rows)
+    assert everything.count[0] == 8 and everything.first[0] == 2.2
+    assert index.recent("a") == prices[-8:]
+
+    recent = index.window(rows, seconds=2.5, now=111.0)
+    assert recent.count.tolist() == [3, 0]
+    assert np.isnan(recent.first[1])
+
+
+def test_board_append_skips_stale_quotes_and_prune_reuses_rows():
+    index = LineHistoryIndex(capacity=4, initial_rows=2)
+    keys = ["a", "b", "c"]
+    index.append_board(keys, [2.0, 3.0, 4.0], [10.0, 10.0, 10.0])
+    index.append_board(keys, [2.1, 3.1, 4.1], [11.0, 9.0, 11.0])
+    assert index.recent("a") == [2.0, 2.1]
+    assert index.recent("b") == [3.0]
+
+    # Repeated keys in one snapshot are appended in order
+    index.append_board(["a", "a"], [2.2, 2.3], [12.0, 13.0])
+    assert index.recent("a") == [2.0, 2.1, 2.2, 2.3]
+
+    assert index.prune(older_than=11.5) == 2
+    assert len(index) == 1
+    assert index.row("d") in (1, 2)
+    assert index.recent("d") == []
+
+
+def _market(event_id, odds, minutes, **extra):
+    base = datetime(2026, 10, 19, 18, tzinfo=timezone.utc)
+    return {
+        "event_id": event_id,
+        "market_type": "moneyline",
+        "sportsbook": "draftkings",
+        "odds": odds,
+        "timestamp": base + timedelta(minutes=minutes),
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_steam_moves_come_from_each_markets_own_history():
+    detector = MarketInefficiencyDetector()
+    steam_line = [2.4, 2.35, 2.25, 2.1, 2.0]
+    for minute, price in enumerate(steam_line):
+        board = [
+            _market("steam", price, minute, public_percentage=70),
+            _market("flat", 1.9, minute, public_percentage=70),
+        ]
+        found = await detector.detect_market_inefficiencies(board)
+
+    steam = [i for i in found if i.inefficiency_type == MarketInefficiencyType.STEAM_MOVE]
+    assert [i.event_id for i in steam] == ["steam"]
+    assert steam[0].fair_value == 2.4
+    assert steam[0].sample_size == 5
+    assert steam[0].metadata["recent_odds_history"] == steam_line
+    assert steam[0].metadata["line_velocity_per_minute"] == pytest.approx(-0.1)
+
+
+@pytest.mark.asyncio
+async def test_keyed_history_and_information_lag():
+    detector = MarketInefficiencyDetector()
+    history = [_market("e1", price, minute) for minute, price in enumerate([1.8, 1.9, 2.0])]
+    info_time = datetime(2026, 10, 19, 17, tzinfo=timezone.utc)
+    board = [
+        _market("e1", 2.05, 5, public_percentage=30),
+        _market(
+            "e2",
+            2.5,
+            5,
+            last_info_update=info_time,
+            last_odds_update=info_time + timedelta(minutes=10),
+            info_impact_score=0.4,
+        ),
+    ]
+
+    found = await detector.detect_market_inefficiencies(board, history)
+    kinds = {(i.event_id, i.inefficiency_type) for i in found}
+    assert ("e1", MarketInefficiencyType.STEAM_MOVE) in kinds
+    assert ("e2", MarketInefficiencyType.INFORMATION_LAG) in kinds
+    assert ("e2", MarketInefficiencyType.STEAM_MOVE) not in kinds
+
+    # Passing the same history again does not duplicate it
+    await detector.detect_market_inefficiencies(board, history)
+    assert detector.line_history.recent(detector._market_key(board[0])) == [
+        1.8,
+        1.9,
+        2.0,
+        2.05,
+    ]
@@ -0,0 +1,167 @@
+"""Tests for LLMEngine response caching, in-flight dedupe and streaming against a fake Ollama server."""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utils.llm_engine import LLMEngine, OllamaClient
+
+
+class FakeOllama:
+    """Local Ollama-compatible server counting generate calls"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.generate_calls = 0
+        self.fail = False
+        app = web.Application()
+        app.router.add_get("/api/tags", self.tags_handler)
+        app.router.add_post("/api/generate", self.generate_handler)
+        self.server = TestServer(app)
+
+    async def tags_handler(self, request):
+        return web.json_response({"models": [{"name": "llama3-instruct"}]})
+
+    async def generate_handler(self, request):
+        self.generate_calls += 1
+        body = await request.json()
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return web.json_response({"error": "model crashed"}, status=500)
+        text = f"answer to {body['prompt']}"
+        if not body["stream"]:
+            return web.json_response({"response": text, "done": True})
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for word in text.split(" "):
+            await response.write((json.dumps({"response": word + " ", "done": False}) + "\n").encode())
+        await response.write((json.dumps({"response": "", "done": True}) + "\n").encode())
+        await response.write_eof()
+        return response
+
+
+@pytest_asyncio.fixture
+async def ollama():
+    fake = FakeOllama()
+    await fake.server.start_server()
+    yield fake
+    await fake.server.close()
+
+
+@pytest_asyncio.fixture
+async def engine(ollama):
+    engine = LLMEngine()
+    engine.client = OllamaClient(str(ollama.server.make_url("")), 5)
+    engine.client.select_model = engine._get_task_model
+    await engine.refresh_models()
+    yield engine
+    await engine.client.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_repeated_prompt_is_served_from_cache_per_prediction_version(engine, ollama):
+    first = await engine.generate_text("explain pick 1", prediction_version="v1", use_cache=True)
+    # Whitespace differences map to the same entry
+    again = await engine.generate_text("explain   pick 1", prediction_version="v1", use_cache=True)
+    assert again == first == "answer to explain pick 1"
+    assert ollama.generate_calls == 1
+
+    # A new prediction version invalidates the explanation
+    await engine.generate_text("explain pick 1", prediction_version="v2", use_cache=True)
+    assert ollama.generate_calls == 2
+    # Caching is opt-in: free-form generation always goes upstream
+    await engine.generate_text("explain pick 1", prediction_version="v2")
+    assert ollama.generate_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_explanation_helpers_opt_into_the_cache(engine, ollama):
+    await engine.generate_tooltip_explanation("moneyline", prediction_version="v1")
+    await engine.generate_tooltip_explanation("moneyline", prediction_version="v1")
+    assert ollama.generate_calls == 1
+    await engine.chat_response("who wins tonight?")
+    await engine.chat_response("who wins tonight?")
+    assert ollama.generate_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_new_prediction_version_does_not_join_an_old_generation(engine, ollama):
+    old = asyncio.create_task(
+        engine.generate_text("explain pick 2", prediction_version="v1", use_cache=True)
+    )
+    await asyncio.sleep(0.01)
+    new = asyncio.create_task(
+        engine.generate_text("explain pick 2", prediction_version="v2", use_cache=True)
+    )
+    await asyncio.gather(old, new)
+    assert ollama.generate_calls == 2
+    assert not engine._inflight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_upstream_call(engine, ollama):
+    results = await asyncio.gather(
+        *[engine.generate_text("same prompt", use_cache=True) for _ in range(5)]
+    )
+    assert set(results) == {"answer to same prompt"}
+    assert ollama.generate_calls == 1
+    assert not engine._inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_caller_does_not_cancel_the_others(engine, ollama):
+    first = asyncio.create_task(engine.generate_text("shared prompt", use_cache=True))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(engine.generate_text("shared prompt", use_cache=True))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "answer to shared prompt"
+    assert first.cancelled()
+    assert ollama.generate_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_reaches_every_waiter_and_is_not_cached(engine, ollama):
+    ollama.fail = True
+    results = await asyncio.gather(
+        *[engine.generate_text("failing prompt", use_cache=True) for _ in range(3)],
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, Exception) for r in results)
+    assert ollama.generate_calls == 1
+
+    ollama.fail = False
+    assert (
+        await engine.generate_text("failing prompt", use_cache=True) == "answer to failing prompt"
+    )
+    assert ollama.generate_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_is_cached_only_when_complete(engine, ollama):
+    chunks = [chunk async for chunk in engine.stream_text("stream me", use_cache=True)]
+    assert len(chunks) > 1
+    assert "".join(chunks).strip() == "answer to stream me"
+
+    # A completed stream is replayed from the cache as one chunk
+    replay = [chunk async for chunk in engine.stream_text("stream me", use_cache=True)]
+    assert replay == ["".join(chunks)]
+    assert ollama.generate_calls == 1
+
+    # An interrupted stream stores nothing
+    stream = engine.stream_text("interrupted", use_cache=True)
+    await stream.__anext__()
+    await stream.aclose()
+    assert [c async for c in engine.stream_text("interrupted", use_cache=True)] != []
+    assert ollama.generate_calls == 3
+
+    # Uncached streams are never stored
+    [c async for c in engine.stream_text("free form")]
+    [c async for c in engine.stream_text("free form")]
+    assert ollama.generate_calls == 5
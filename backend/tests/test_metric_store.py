@@ -0,0 +1,133 @@
+"""Tests for the metric ring/rollup store and the non-blocking MetricsCollector."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from utils.metric_store import DDSketch, MetricSeries
+
+
+def test_ddsketch_quantiles_within_relative_accuracy_and_mergeable():
+    rng = np.random.default_rng(3)
+    values = np.concatenate([rng.lognormal(3, 1, 5000), -rng.gamma(2, 5, 500), [0.0] * 50])
+    whole, left, right = DDSketch(0.01), DDSketch(0.01), DDSketch(0.01)
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+
+    ordered = np.sort(values)
+    for q in (0.01, 0.05, 0.5, 0.9, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert whole.quantile(q) == pytest.approx(exact, rel=0.011, abs=1e-9)
+        assert left.quantile(q) == whole.quantile(q)
+    with pytest.raises(ValueError):
+        left.merge(DDSketch(0.05))
+
+
+def test_series_raw_ring_wraps_and_returns_window_in_order():
+    series = MetricSeries(raw_capacity=8)
+    for t in range(20):
+        series.add(1000.0 + t, float(t))
+
+    timestamps, values = series.raw(since=1000.0)
+    assert values.tolist() == [float(t) for t in range(12, 20)]
+    assert np.all(np.diff(timestamps) > 0)
+    assert series.raw(since=1017.0)[1].tolist() == [17.0, 18.0, 19.0]
+    assert series.latest() == (1019.0, 19.0)
+
+
+def test_statistics_pick_rollup_by_window_and_match_exact_values():
+    series = MetricSeries()
+    start = 1_800_000_000.0  # on an hour boundary
+    values = np.random.default_rng(5).normal(50, 10, 7200)
+    for i, value in enumerate(values):
+        series.add(start + i, float(value))
+    end = start + len(values) - 1
+
+    short = series.statistics(end - 299, end)
+    assert short["resolution_seconds"] == 1
+    assert short["count"] == 300
+    assert short["mean"] == pytest.approx(values[-300:].mean())
+    assert short["std_dev"] == pytest.approx(values[-300:].std(ddof=1))
+
+    hour = series.statistics(end - 3599, end)
+    assert hour["resolution_seconds"] == 60
+    assert hour["count"] == 3600
+    assert hour["min"] == pytest.approx(values[-3600:].min())
+    assert hour["max"] == pytest.approx(values[-3600:].max())
+    assert hour["median"] == pytest.approx(np.median(values[-3600:]), rel=0.02)
+    assert hour["percentile_99"] == pytest.approx(np.percentile(values[-3600:], 99), rel=0.02)
+
+    # Beyond a day only the hourly rollup is used; whole buckets are counted
+    assert series.statistics(end - 3 * 86400, end)["resolution_seconds"] == 3600
+    assert series.statistics(start - 7200, start - 1) == {"count": 0}
+
+
+def test_std_dev_keeps_precision_for_large_values_with_small_spread():
+    series = MetricSeries()
+    start = 1_800_000_000.0
+    # Epoch-sized values: a sum of squares would cancel to zero or worse
+    values = 1e10 + np.random.default_rng(6).normal(0, 0.5, 3600)
+    for i, value in enumerate(values):
+        series.add(start + i, float(value))
+    end = start + len(values) - 1
+
+    for window in (299, 3599):
+        stats = series.statistics(end - window, end)
+        expected = values[-(window + 1):]
+        assert stats["mean"] == pytest.approx(expected.mean(), rel=1e-12)
+        assert stats["std_dev"] == pytest.approx(expected.std(ddof=1), rel=1e-6)
+
+
+def test_collector_samples_off_loop_and_answers_from_store(monkeypatch):
+    import system_monitor
+
+    if system_monitor.psutil is None:
+        pytest.skip("psutil not installed")
+
+    blocking_calls = []
+    real_cpu_percent = system_monitor.psutil.cpu_percent
+
+    def cpu_percent(interval=None, **kwargs):
+        blocking_calls.append(interval)
+        return real_cpu_percent(interval=None, **kwargs)
+
+    monkeypatch.setattr(system_monitor.psutil, "cpu_percent", cpu_percent)
+    collector = system_monitor.MetricsCollector()
+
+    sample_threads = []
+    original = collector._sample_system_metrics
+
+    def sample():
+        sample_threads.append(threading.get_ident())
+        return original()
+
+    collector._sample_system_metrics = sample
+
+    async def collect():
+        started = time.perf_counter()
+        await collector._collect_system_metrics()
+        return threading.get_ident(), time.perf_counter() - started
+
+    loop_thread, elapsed = asyncio.run(collect())
+    assert sample_threads and sample_threads[0] != loop_thread
+    assert all(interval is None for interval in blocking_calls)
+    assert elapsed < 0.5
+
+    cpu = system_monitor.MetricType.SYSTEM_CPU
+    memory = system_monitor.MetricType.SYSTEM_MEMORY
+    assert collector.get_metric_statistics(cpu)["count"] == 1
+    recent = collector.get_recent_metrics(memory)
+    assert len(recent) == 1 and "total_gb" in recent[0].metadata
+    assert collector.get_latest_metric(memory) is recent[0]
+
+    stale = system_monitor.SystemMetric(
+        memory, 1.0, datetime(2020, 1, 1, tzinfo=timezone.utc), "percent"
+    )
+    collector.latest_metrics[memory] = stale
+    assert collector.get_latest_metric(memory) is None
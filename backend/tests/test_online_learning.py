@@ -0,0 +1,214 @@
+"""Tests for online mini-batch updates, running metrics and drift-triggered retrains."""
+
+import asyncio
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier, VotingClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss, precision_score
+from sklearn.preprocessing import StandardScaler
+
+from services.real_ml_service import RealMLModels, outcome_table, with_outcomes
+from utils.columnar_dataset import ColumnarDataset
+from utils.online_learning import (
+    OnlineModelState,
+    PageHinkley,
+    RunningClassificationMetrics,
+    online_update,
+    supports_online_update,
+)
+
+
+def _classification(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    y = (X @ np.array([1.5, -1.0, 0.5]) + rng.normal(0, 0.5, n) > 0).astype(int)
+    return X, y
+
+
+def test_running_metrics_match_batch_metrics():
+    rng = np.random.default_rng(1)
+    y = rng.integers(0, 2, 500)
+    probability = np.clip(y * 0.6 + rng.uniform(0, 0.4, 500), 0, 1)
+
+    metrics = RunningClassificationMetrics()
+    for start in range(0, 500, 37):
+        metrics.update(y[start : start + 37], probability[start : start + 37])
+
+    assert metrics.count == 500
+    assert metrics.accuracy == pytest.approx(accuracy_score(y, probability >= 0.5))
+    assert metrics.precision == pytest.approx(precision_score(y, probability >= 0.5))
+    assert metrics.log_loss == pytest.approx(log_loss(y, probability), rel=1e-6)
+    assert metrics.brier_score == pytest.approx(brier_score_loss(y, probability))
+
+
+def test_page_hinkley_flags_a_sustained_rise_only():
+    rng = np.random.default_rng(2)
+    detector = PageHinkley()
+    assert not any(detector.update(v) for v in rng.normal(0.6, 0.1, 500))
+    assert any(detector.update(v) for v in rng.normal(1.6, 0.1, 100))
+    detector.reset()
+    assert not detector.drifted and detector.count == 0
+
+
+def test_online_update_by_estimator_kind():
+    X, y = _classification()
+    batch_X, batch_y = _classification(64, seed=3)
+
+    sgd = SGDClassifier(loss="log_loss", random_state=0).fit(X, y)
+    before = sgd.coef_.copy()
+    assert online_update(sgd, batch_X, batch_y)
+    assert not np.allclose(sgd.coef_, before)
+
+    boosting = GradientBoostingClassifier(n_estimators=20, random_state=0).fit(X, y)
+    assert online_update(boosting, batch_X, batch_y)
+    assert boosting.n_estimators == 30 and len(boosting.estimators_) == 30
+    assert not online_update(boosting, batch_X[batch_y == 1], batch_y[batch_y == 1])
+
+    voting = VotingClassifier(
+        [
+            ("rf", RandomForestClassifier(n_estimators=10, random_state=0)),
+            ("gb", GradientBoostingClassifier(n_estimators=20, random_state=0)),
+            ("lr", LogisticRegression()),
+        ],
+        voting="soft",
+    ).fit(X, y)
+    assert supports_online_update(voting)
+    assert online_update(voting, batch_X, batch_y)
+    assert len(voting.estimators_[1].estimators_) == 30
+    assert len(voting.estimators_[0].estimators_) == 10
+
+    logistic = LogisticRegression().fit(X, y)
+    assert not supports_online_update(logistic)
+    assert not online_update(logistic, batch_X, batch_y)
+
+
+@pytest.mark.asyncio
+async def test_outcomes_update_a_copy_and_hot_swap_it(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # models/ and datasets/ are relative paths
+    service = RealMLModels()
+    features = ["a", "b", "c"]
+    X, y = _classification()
+    scaler = StandardScaler().fit(X)
+    model = SGDClassifier(loss="log_loss", random_state=0).fit(scaler.transform(X), y)
+    service._install_model("player_props", model, scaler, features, {"accuracy": 0.8})
+    service.online_batch_size = 32
+
+    batch_X, batch_y = _classification(32, seed=4)
+    for row, label in zip(batch_X, batch_y):
+        result = await service.predict_player_prop(dict(zip(features, row)))
+        await service.update_model_performance(result["prediction_id"], float(label))
+
+    served = service.models["player_props"]
+    assert served is not model
+    assert not np.allclose(served.coef_, model.coef_)
+    assert service.model_metadata["player_props"]["online_updates"] == 32
+    performance = await service.get_model_performance()
+    assert performance["player_props"]["live"]["samples"] == 32
+    assert service.online_state["player_props"].buffered == 0
+
+    # Unknown prediction ids are tracked but do not train anything
+    await service.update_model_performance("unknown", 1.0)
+    assert service.models["player_props"] is served
+
+
+def test_update_buffer_is_capped():
+    state = OnlineModelState(max_buffered=10)
+    for i in range(25):
+        state.record(np.full(2, i), i % 2, 0.5)
+    X, y = state.take_batch()
+    assert len(y) == 10 and X[0, 0] == 15
+
+
+VALUE_BET_FEATURES = [
+    "home_team_rating", "away_team_rating", "home_recent_form",
+    "away_recent_form", "head_to_head_record", "home_advantage", "market_prob",
+]
+
+
+def _value_bet_service(rng):
+    service = RealMLModels()
+    X = rng.normal(size=(200, len(VALUE_BET_FEATURES)))
+    y = (X[:, 0] > 0).astype(int)
+    scaler = StandardScaler().fit(X)
+    model = SGDClassifier(loss="log_loss", random_state=0).fit(scaler.transform(X), y)
+    service._install_model("value_bet", model, scaler, VALUE_BET_FEATURES, {"accuracy": 0.95})
+    return service, X
+
+
+async def _report_wrong_outcomes(service, rng, limit=60):
+    """Contradict every value-bet prediction until a retrain starts; outcomes reported"""
+    for reported, row in enumerate(rng.normal(size=(limit, len(VALUE_BET_FEATURES))), 1):
+        result = await service.predict_value_bet(dict(zip(VALUE_BET_FEATURES, row)))
+        # The win-probability call inside a value-bet prediction is not remembered
+        assert list(service.pending_predictions) == [result["prediction_id"]]
+        await service.update_model_performance(
+            result["prediction_id"], 0.0 if result["is_value_bet"] else 1.0
+        )
+        if "value_bet" in service.retrain_tasks:
+            break
+    return reported
+
+
+@pytest.mark.asyncio
+async def test_drift_retrains_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # models/ and datasets/ are relative paths
+    rng = np.random.default_rng(5)
+    service, X = _value_bet_service(rng)
+    features = VALUE_BET_FEATURES
+
+    # Every outcome contradicts the model until the live accuracy check trips
+    reported = await _report_wrong_outcomes(service, rng)
+
+    task = service.retrain_tasks["value_bet"]
+    # Predictions keep being served by the old model while training runs
+    assert (await service.predict_value_bet(dict(zip(features, X[0]))))["model_metadata"] == {
+        "accuracy": 0.95
+    }
+    await asyncio.wait_for(task, timeout=120)
+
+    assert isinstance(service.models["value_bet"], GradientBoostingClassifier)
+    assert service.model_metadata["value_bet"]["accuracy"] > 0.5
+    assert "value_bet" not in service.retrain_tasks
+    state = service.online_state["value_bet"]
+    assert state.generation == 1 and state.metrics.count == 0
+
+    # The outcomes that showed the drift were saved and trained on
+    outcomes = ColumnarDataset(service.dataset_dir / outcome_table("value_bet"))
+    assert len(outcomes) == reported
+    training_data = await service._load_training_data()
+    base = training_data["team_games"].matrix(features)
+    X_all, y_all = with_outcomes(training_data, "value_bet", features, base, np.zeros(len(base)))
+    assert len(X_all) == len(base) + reported
+    assert np.array_equal(y_all[len(base):], outcomes["outcome"])
+
+
+@pytest.mark.asyncio
+async def test_failed_retrain_cools_down_and_keeps_updating(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # models/ and datasets/ are relative paths
+    rng = np.random.default_rng(6)
+    service, _ = _value_bet_service(rng)
+    served = service.models["value_bet"]
+
+    def broken_trainer(model_name, training_data):
+        raise RuntimeError("trainer crashed")
+
+    monkeypatch.setattr(service, "_train_detached", broken_trainer)
+    await _report_wrong_outcomes(service, rng)
+    await asyncio.wait_for(service.retrain_tasks["value_bet"], timeout=30)
+
+    assert "value_bet" not in service.retrain_tasks
+    assert service.online_state["value_bet"].detector.count == 0
+    assert service.start_background_retrain("value_bet") is None
+
+    # Still drifting, but no retrain while cooling down: mini-batches apply instead
+    service.online_batch_size = 16
+    for row in rng.normal(size=(16, len(VALUE_BET_FEATURES))):
+        result = await service.predict_value_bet(dict(zip(VALUE_BET_FEATURES, row)))
+        await service.update_model_performance(
+            result["prediction_id"], 0.0 if result["is_value_bet"] else 1.0
+        )
+    assert not service.retrain_tasks
+    assert service.models["value_bet"] is not served
+    assert service.online_state["value_bet"].buffered < 16
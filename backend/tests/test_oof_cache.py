@@ -0,0 +1,121 @@
+"""Tests for the out-of-fold prediction cache and OOF-driven ensemble selection."""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import r2_score
+from sklearn.model_selection import cross_val_predict
+
+from enhanced_ensemble_engine import MultiObjectiveConfig, MultiObjectiveOptimizer
+from ensemble_engine import ModelMetrics, PredictionContext
+from utils.hyperparameter_search import fit_and_score
+from utils.oof_cache import OOFMatrix, OOFPredictionCache, dataset_version, model_version
+
+
+def _data(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    y = X @ np.array([1.5, -1.0, 0.5]) + rng.normal(0, 0.2, n)
+    return X, y
+
+
+def test_columns_are_computed_once_per_model_and_dataset(tmp_path):
+    X, y = _data()
+    cache = OOFPredictionCache(cv=4, directory=str(tmp_path))
+    models = {"ridge": Ridge(alpha=1.0), "wide": Ridge(alpha=50.0)}
+
+    first = cache.matrix(models, X, y)
+    again = cache.matrix(models, X, y)
+    assert cache.get_stats()["misses"] == 2 and cache.get_stats()["hits"] == 2
+    assert np.array_equal(first.predictions, again.predictions)
+    assert first.predictions.dtype == np.float32 and first.predictions.shape == (120, 2)
+
+    # Same folds as a plain cross_val_predict
+    expected = cross_val_predict(Ridge(alpha=1.0), X, y, cv=cache.folds())
+    assert np.allclose(first.column("ridge"), expected, atol=1e-5)
+
+    # A new hyper-parameter or new data is a miss; a thread count is not
+    assert model_version(RandomForestRegressor(n_jobs=1)) == model_version(
+        RandomForestRegressor(n_jobs=-1)
+    )
+    assert model_version(Ridge(alpha=1.0)) != model_version(Ridge(alpha=2.0))
+    assert dataset_version(X, y) != dataset_version(X, y + 1)
+
+    # Persisted columns are reloaded by a fresh cache
+    reloaded = OOFPredictionCache(cv=4, directory=str(tmp_path))
+    reloaded.matrix(models, X, y)
+    assert reloaded.get_stats()["misses"] == 0
+
+
+def test_matrix_scores_many_weightings_like_sklearn():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=200)
+    predictions = np.column_stack([y + rng.normal(0, s, 200) for s in (0.2, 0.5, 1.0)])
+    matrix = OOFMatrix(["a", "b", "c"], predictions.astype(np.float32), y, "d")
+    weights = rng.random((7, 3))
+
+    scores = matrix.r2(weights)
+    for row, score in zip(weights, scores):
+        blended = predictions @ (row / row.sum())
+        assert score == pytest.approx(r2_score(y, blended), abs=1e-5)
+
+    correlation = matrix.error_correlation()
+    assert correlation.shape == (3, 3) and np.allclose(np.diag(correlation), 1.0)
+
+
+def test_evaluation_oof_predictions_match_the_cache_split():
+    X, y = _data()
+    evaluation = fit_and_score("ridge", Ridge(), X[:100], y[:100], X[100:], y[100:], cv_folds=5)
+
+    cache = OOFPredictionCache(cv=5)
+    cached = cache.predictions("ridge", Ridge(), X[:100], y[:100])
+    assert np.allclose(evaluation.oof_predictions, cached, atol=1e-5)
+    assert len(evaluation.metrics["cv_scores"]) == 5
+
+
+def _metrics(accuracy):
+    return ModelMetrics(
+        accuracy=accuracy, precision=0.5, recall=0.5, f1_score=0.5, mse=1.0, mae=1.0,
+        r2_score=0.5, sharpe_ratio=1.0, max_drawdown=0.1, profit_factor=1.0, win_rate=0.5,
+        avg_return=0.1, volatility=0.1, consistency_score=0.5, robustness_score=0.5,
+        calibration_score=0.5, feature_stability=0.5, prediction_interval_coverage=0.9,
+        model_confidence=0.7, last_updated=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_multi_objective_selection_scores_ensembles_from_oof():
+    rng = np.random.default_rng(2)
+    y = rng.normal(size=300)
+    shared = rng.normal(0, 0.5, 300)
+    columns = {
+        "twin_a": y + shared,
+        "twin_b": y + shared + rng.normal(0, 0.05, 300),
+        "independent": y + rng.normal(0, 0.5, 300),
+    }
+    oof = OOFMatrix(list(columns), np.column_stack(list(columns.values())), y, "d")
+    optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig(objectives=["accuracy", "diversity"]))
+    metrics = {name: _metrics(0.9) for name in columns}
+
+    scores = await optimizer._calculate_objective_scores(
+        list(columns), metrics, PredictionContext.PRE_GAME, oof
+    )
+    assert scores["independent"]["diversity"] > scores["twin_a"]["diversity"]
+
+    # Ensemble accuracy is the R² of the averaged columns, not the members' mean
+    mixed = optimizer._aggregate_ensemble_scores(["twin_a", "independent"], scores, oof)
+    twins = optimizer._aggregate_ensemble_scores(["twin_a", "twin_b"], scores, oof)
+    assert mixed["accuracy"] == pytest.approx(
+        r2_score(y, (columns["twin_a"] + columns["independent"]) / 2)
+    )
+    assert mixed["accuracy"] > twins["accuracy"]
+    assert mixed["diversity"] > twins["diversity"]
+
+    selected, weights = await optimizer.optimize_ensemble(
+        list(columns), metrics, PredictionContext.PRE_GAME, oof=oof
+    )
+    assert "independent" in selected
+    assert sum(weights.values()) == pytest.approx(1.0)
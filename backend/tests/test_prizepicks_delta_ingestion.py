@@ -0,0 +1,191 @@
+"""Tests for conditional requests and delta ingestion in the PrizePicks service."""
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.comprehensive_prizepicks_service import ComprehensivePrizePicksService
+
+
+def _projection(proj_id: str, player_id: str, line: float) -> dict:
+    return {
+        "id": proj_id,
+        "type": "projection",
+        "attributes": {
+            "stat_type": "Points",
+            "line_score": line,
+            "start_time": "2026-10-20T00:00:00Z",
+            "status": "pre_game",
+            "description": "",
+            "updated_at": "2026-10-19T12:00:00Z",
+        },
+        "relationships": {
+            "new_player": {"data": {"id": player_id}},
+            "league": {"data": {"id": "7"}},
+        },
+    }
+
+
+class FakePrizePicks:
+    """Local PrizePicks API serving /leagues and an ETag-versioned, paginated /projections"""
+
+    def __init__(self):
+        self.version = 1
+        self.projections = [_projection("p1", "a", 24.5), _projection("p2", "b", 18.5)]
+        self.full_responses = 0
+        self.not_modified_responses = 0
+        self.leagues_available = True
+        self.page_size = None  # None serves every projection on one page
+        self.failing_page = None
+        app = web.Application()
+        app.router.add_get("/leagues", self.leagues_handler)
+        app.router.add_get("/projections", self.projections_handler)
+        self.server = TestServer(app)
+
+    def update(self, projections):
+        self.projections = projections
+        self.version += 1
+
+    async def leagues_handler(self, request):
+        if not self.leagues_available:
+            return web.Response(status=503)
+        return web.json_response({"data": [{"id": "NBA", "name": "NBA"}]})
+
+    async def projections_handler(self, request):
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified_responses += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        page = int(request.query.get("page", 1))
+        if page == self.failing_page:
+            return web.Response(status=503)
+        self.full_responses += 1
+        size = self.page_size or max(len(self.projections), 1)
+        start = (page - 1) * size
+        body = {"data": self.projections[start:start + size], "links": {}}
+        if start + size < len(self.projections):
+            body["links"]["next"] = f"/projections?league_id=NBA&page={page + 1}"
+        included = [
+            {"id": "a", "type": "new_player", "attributes": {"name": "Player A"}},
+            {"id": "b", "type": "new_player", "attributes": {"name": "Player B"}},
+            {"id": "c", "type": "new_player", "attributes": {"name": "Player C"}},
+            {"id": "7", "type": "league", "attributes": {"name": "NBA"}},
+        ]
+        body["included"] = included
+        return web.json_response(body, headers={"ETag": etag})
+
+
+@pytest_asyncio.fixture
+async def upstream():
+    fake = FakePrizePicks()
+    await fake.server.start_server()
+    yield fake
+    await fake.server.close()
+
+
+@pytest_asyncio.fixture
+async def service(upstream):
+    svc = ComprehensivePrizePicksService(database_url="sqlite:///:memory:")
+    svc.base_url = str(upstream.server.make_url("")).rstrip("/")
+    svc.rate_limit_delay = 0
+    svc.retry_delay = 0
+    svc.http_client = httpx.AsyncClient()
+    yield svc
+    await svc.http_client.aclose()
+
+
+async def _poll(svc):
+    projections = await svc.fetch_all_projections()
+    return await svc.process_projections(projections, complete=svc.last_fetch_complete)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_upstream_answers_304_and_applies_nothing(upstream, service):
+    assert await _poll(service) == 2
+    assert len(service.current_projections) == 2
+
+    assert await _poll(service) == 0
+    assert upstream.full_responses == 1
+    assert upstream.not_modified_responses == 1
+    assert service.last_delta.unchanged == 2
+    assert len(service.current_projections) == 2
+    assert len(service.historical_data) == 2
+
+
+@pytest.mark.asyncio
+async def test_only_added_changed_and_removed_projections_flow_through(upstream, service):
+    await _poll(service)
+    service.analysis_cache["p1"] = object()
+    service.analysis_cache["p2"] = object()
+    history_before = len(service.historical_data)
+
+    # p1 line moves, p2 is pulled, p3 is new
+    upstream.update([_projection("p1", "a", 25.5), _projection("p3", "c", 7.5)])
+    assert await _poll(service) == 2
+
+    delta = service.last_delta
+    assert [p["id"] for p in delta.added] == ["p3"]
+    assert [p["id"] for p in delta.changed] == ["p1"]
+    assert delta.removed == ["p2"]
+    assert set(service.current_projections) == {"p1", "p3"}
+    assert service.current_projections["p1"].line_score == 25.5
+    assert service.analysis_cache == {}
+    assert len(service.historical_data) == history_before + 2
+
+
+@pytest.mark.asyncio
+async def test_failed_league_fetch_does_not_remove_projections(upstream, service):
+    await _poll(service)
+
+    await upstream.server.close()
+    assert await _poll(service) == 0
+    assert service.last_fetch_complete is False
+    assert service.last_delta.removed == []
+    assert set(service.current_projections) == {"p1", "p2"}
+
+
+@pytest.mark.asyncio
+async def test_default_leagues_snapshot_does_not_remove_projections(upstream, service):
+    await _poll(service)
+
+    # Discovery fails, so the defaults are polled and may miss leagues
+    upstream.leagues_available = False
+    upstream.update([_projection("p1", "a", 24.5)])
+    await _poll(service)
+    assert service.last_fetch_complete is False
+    assert service.last_delta.removed == []
+    assert set(service.current_projections) == {"p1", "p2"}
+
+
+@pytest.mark.asyncio
+async def test_every_page_is_read_into_the_snapshot(upstream, service):
+    upstream.page_size = 1
+    assert await _poll(service) == 2
+    assert service.last_fetch_complete is True
+    assert upstream.full_responses == 2
+    assert set(service.current_projections) == {"p1", "p2"}
+
+    # Multi-page snapshots are refetched in full and a pulled line on page 2 is removed
+    upstream.update([_projection("p1", "a", 24.5)])
+    await _poll(service)
+    assert service.last_delta.removed == ["p2"]
+
+
+@pytest.mark.asyncio
+async def test_unread_pages_do_not_remove_projections(upstream, service):
+    upstream.page_size = 1
+    await _poll(service)
+
+    upstream.failing_page = 2
+    await _poll(service)
+    assert service.last_fetch_complete is False
+    assert service.last_delta.removed == []
+
+    upstream.failing_page = None
+    service.max_pages = 1
+    await _poll(service)
+    assert service.last_fetch_complete is False
+    assert service.last_delta.removed == []
+    assert set(service.current_projections) == {"p1", "p2"}
@@ -0,0 +1,139 @@
+"""Tests for batched SHAP explanations in RealSHAPService."""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from services.real_shap_service import RealSHAPService
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    y = 2 * X[:, 0] - X[:, 1] + rng.normal(scale=0.1, size=200)
+    model = RandomForestRegressor(n_estimators=20, max_depth=4, random_state=0).fit(X, y)
+    path = tmp_path / "rf.joblib"
+    joblib.dump(
+        {"model": model, "feature_names": ["a", "b", "c", "d"], "model_version": "v1"}, path
+    )
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_row_tree_explanations(model_path):
+    service = RealSHAPService()
+    assert await service.initialize_explainer("rf", model_path)
+    assert service.explainers["rf"]["is_tree"]
+
+    X = np.random.default_rng(1).normal(size=(6, 4))
+    batch = await service.generate_batch_explanations("rf", X)
+
+    assert len(batch) == 6
+    for row, explanation in zip(X, batch):
+        single = await service.generate_real_explanation("rf", row)
+        np.testing.assert_allclose(explanation.shap_values, single.shap_values)
+        assert explanation.prediction_value == pytest.approx(single.prediction_value)
+        # Tree SHAP is exact: contributions add up to the model output
+        assert explanation.base_value + sum(explanation.shap_values) == pytest.approx(
+            explanation.prediction_value
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_cache_by_model_version_and_feature_hash(model_path):
+    service = RealSHAPService()
+    await service.initialize_explainer("rf", model_path)
+    X = np.random.default_rng(2).normal(size=(4, 4))
+
+    await service.generate_batch_explanations("rf", X)
+    assert service.batch_cache_misses == 4
+
+    # Two repeated rows plus one new row: only the new row is explained
+    again = np.vstack([X[:2], X[:1], np.ones((1, 4))])
+    results = await service.generate_batch_explanations(
+        "rf", again, prediction_ids=["p0", "p1", "p2", "p3"]
+    )
+    assert service.batch_cache_hits == 3
+    assert service.batch_cache_misses == 5
+    assert [r.prediction_id for r in results] == ["p0", "p1", "p2", "p3"]
+    assert results[0].shap_values == results[2].shap_values
+
+    # Reinitializing the model drops its cached explanations
+    await service.initialize_explainer("rf", model_path)
+    assert not service.batch_cache
+
+
+@pytest.mark.asyncio
+async def test_classifier_prediction_is_positive_class_probability(tmp_path):
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(200, 3))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=20, max_depth=4, random_state=0).fit(X, y)
+    path = tmp_path / "clf.joblib"
+    joblib.dump({"model": model, "feature_names": ["a", "b", "c"], "model_version": "v1"}, path)
+    service = RealSHAPService()
+    assert await service.initialize_explainer("clf", str(path))
+
+    rows = rng.normal(size=(5, 3))
+    batch = await service.generate_batch_explanations("clf", rows)
+    probabilities = model.predict_proba(rows)[:, 1]
+    for explanation, probability in zip(batch, probabilities):
+        assert explanation.prediction_value == pytest.approx(probability)
+        # Positive-class tree SHAP values add up to that probability
+        assert explanation.base_value + sum(explanation.shap_values) == pytest.approx(probability)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("library", ["sklearn", "xgboost", "lightgbm"])
+async def test_boosted_classifier_prediction_is_the_explained_margin(tmp_path, library):
+    rng = np.random.default_rng(4)
+    X = rng.normal(size=(300, 3))
+    y = (X[:, 0] - X[:, 2] > 0).astype(int)
+    if library == "sklearn":
+        from sklearn.ensemble import GradientBoostingClassifier
+
+        model = GradientBoostingClassifier(n_estimators=30, max_depth=3, random_state=0)
+    elif library == "xgboost":
+        xgboost = pytest.importorskip("xgboost")
+        model = xgboost.XGBClassifier(n_estimators=30, max_depth=3)
+    else:
+        lightgbm = pytest.importorskip("lightgbm")
+        model = lightgbm.LGBMClassifier(n_estimators=30, max_depth=3, verbose=-1)
+    model.fit(X, y)
+    path = tmp_path / "gbm.joblib"
+    joblib.dump({"model": model, "feature_names": ["a", "b", "c"], "model_version": "v1"}, path)
+    service = RealSHAPService()
+    assert await service.initialize_explainer("gbm", str(path))
+    assert service.explainers["gbm"]["is_tree"]
+
+    rows = rng.normal(size=(5, 3))
+    batch = await service.generate_batch_explanations("gbm", rows)
+    single = await service.generate_real_explanation("gbm", rows[0])
+    probabilities = model.predict_proba(rows)[:, 1]
+    for explanation, probability in zip(batch, probabilities):
+        # Tree SHAP explains the log-odds, not the probability
+        assert explanation.base_value + sum(explanation.shap_values) == pytest.approx(
+            explanation.prediction_value, abs=1e-4
+        )
+        assert 1 / (1 + np.exp(-explanation.prediction_value)) == pytest.approx(probability, abs=1e-4)
+    assert single.prediction_value == pytest.approx(batch[0].prediction_value)
+
+
+@pytest.mark.asyncio
+async def test_returned_explanations_do_not_alias_the_cache(model_path):
+    service = RealSHAPService()
+    await service.initialize_explainer("rf", model_path)
+    X = np.random.default_rng(5).normal(size=(2, 4))
+
+    first = await service.generate_batch_explanations("rf", X)
+    expected = list(first[0].shap_values)
+    first[0].shap_values[0] = 1e9
+    first[0].feature_values.clear()
+
+    again = await service.generate_batch_explanations("rf", X)
+    assert again[0].shap_values == expected
+    assert again[0].feature_values == X[0].tolist()
+    again[1].feature_names.append("extra")
+    assert (await service.generate_batch_explanations("rf", X))[1].feature_names == ["a", "b", "c", "d"]
@@ -0,0 +1,136 @@
+"""Tests for per-event feature materialization and trigger debouncing in realtime_engine."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import realtime_engine
+from ensemble_engine import PredictionContext
+from realtime_engine import (
+    EventFeatureStore,
+    RealTimeStreamManager,
+    StreamMessage,
+    StreamType,
+    UpdatePriority,
+)
+
+
+def _message(stream_type, data, event_id="evt-1", age_seconds=0.0):
+    return StreamMessage(
+        id=str(uuid.uuid4()),
+        stream_type=stream_type,
+        priority=UpdatePriority.HIGH,
+        data=data,
+        timestamp=datetime.now(timezone.utc) - timedelta(seconds=age_seconds),
+        source="test",
+        event_id=event_id,
+    )
+
+
+def test_feature_store_merges_numeric_fields_and_versions_on_change():
+    store = EventFeatureStore()
+    assert store.apply_message(
+        _message(StreamType.LIVE_SCORES, {"home_score": 10, "period": "Q1"})
+    )
+    assert store.apply_message(_message(StreamType.BETTING_ODDS, {"odds": 1.9}))
+    assert not store.apply_message(_message(StreamType.LIVE_SCORES, {"home_score": 10}))
+
+    assert store.get("evt-1") == {"home_score": 10.0, "odds_odds": 1.9}
+    assert store.version("evt-1") == 2
+
+
+def test_feature_store_bounds_tracked_events():
+    store = EventFeatureStore(max_events=2)
+    for i in range(3):
+        store.apply_message(_message(StreamType.LIVE_SCORES, {"x": i}, event_id=f"e{i}"))
+    assert len(store.features) == 2
+    assert store.get("e0") is None
+
+
+def test_feature_store_evicts_events_without_numeric_fields():
+    store = EventFeatureStore()
+    assert not store.apply_message(
+        _message(StreamType.INJURY_ALERTS, {"status": "questionable"}, event_id="quiet")
+    )
+    store.apply_message(_message(StreamType.LIVE_SCORES, {"x": 1}, event_id="busy"))
+    assert "quiet" in store.features and "quiet" in store.updated_at
+
+    store.updated_at["quiet"] -= timedelta(hours=1)
+    assert store.evict_stale(600) == 1
+    assert "quiet" not in store.features and "busy" in store.features
+
+
+@pytest.mark.asyncio
+async def test_trigger_burst_produces_single_prediction_on_latest_features(monkeypatch):
+    calls = []
+
+    async def fake_predict(features, context):
+        calls.append(dict(features))
+        return SimpleNamespace(
+            predicted_value=0.5, prediction_probability=0.6, metadata={}
+        )
+
+    monkeypatch.setattr(realtime_engine.ultra_ensemble_engine, "predict", fake_predict)
+    manager = RealTimeStreamManager(trigger_debounce_window=0.05)
+    # Bypass cooldowns so every update in the burst fires a trigger
+    monkeypatch.setattr(
+        manager.prediction_trigger, "_is_cooldown_satisfied", lambda *_: True
+    )
+
+    for score in (1, 2, 3):
+        # Older than the aggregator's buffer time, so each message passes through
+        message = _message(
+            StreamType.BETTING_ODDS,
+            {"odds": 1.5 + score / 10, "odds_change": 0.5},
+            age_seconds=5,
+        )
+        await manager._process_stream_message(message)
+
+    await asyncio.sleep(0.15)
+    assert len(calls) == 1
+    assert calls[0]["odds_odds"] == pytest.approx(1.8)
+    assert manager.trigger_debouncer.merged_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_prediction_is_retried_for_the_same_feature_version(monkeypatch):
+    calls = []
+
+    async def flaky_predict(features, context):
+        calls.append(context)
+        if len(calls) == 1:
+            raise RuntimeError("model unavailable")
+        return SimpleNamespace(predicted_value=0.5, prediction_probability=0.6, metadata={})
+
+    monkeypatch.setattr(realtime_engine.ultra_ensemble_engine, "predict", flaky_predict)
+    manager = RealTimeStreamManager(trigger_debounce_window=0)
+    broadcast = []
+
+    async def record(message):
+        broadcast.append(message)
+
+    monkeypatch.setattr(manager, "_broadcast_message", record)
+    manager.feature_store.apply_message(_message(StreamType.BETTING_ODDS, {"odds": 1.9}))
+    trigger = {
+        "event_id": "evt-1",
+        "prediction_context": PredictionContext.LIVE_GAME,
+        "priority": UpdatePriority.HIGH,
+        "trigger_type": "odds_change",
+        "triggering_message": None,
+        "metadata": {},
+    }
+
+    for _ in range(3):
+        manager.trigger_debouncer.submit(trigger)
+        assert len(manager.trigger_debouncer.tasks) == 1
+        await asyncio.gather(*manager.trigger_debouncer.tasks)
+
+    # The failure did not mark the version predicted; the retry then did
+    assert len(calls) == 2
+    assert manager.predicted_versions[("evt-1", PredictionContext.LIVE_GAME)] == 1
+    assert [m.data["feature_version"] for m in broadcast] == [1]
+    assert manager.statistics["predictions_skipped_unchanged"] == 1
+    assert not manager.trigger_debouncer.tasks
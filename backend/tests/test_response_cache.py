@@ -0,0 +1,63 @@
+"""Tests for the route-level HTTP response cache."""
+
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.caching import ResponseCache, cached_response
+
+
+def _make_client():
+    cache = ResponseCache(maxsize=10, ttl=60)
+    calls = []
+    router = APIRouter()
+
+    @router.get("/items")
+    @cached_response(cache, namespace="items")
+    async def get_items(sport: Optional[str] = None, limit: int = 10):
+        calls.append((sport, limit))
+        return [{"sport": sport, "n": i} for i in range(limit)]
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), cache, calls
+
+
+def test_repeat_requests_are_served_from_cache_with_etag():
+    client, cache, calls = _make_client()
+
+    first = client.get("/items?sport=nba&limit=2")
+    # Same parameters in a different order hit the same entry
+    second = client.get("/items?limit=2&sport=nba")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == [{"sport": "nba", "n": 0}, {"sport": "nba", "n": 1}]
+    assert second.content == first.content
+    assert first.headers["etag"] == second.headers["etag"]
+    assert calls == [("nba", 2)]
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_if_none_match_returns_304():
+    client, cache, _ = _make_client()
+    etag = client.get("/items?limit=1").headers["etag"]
+
+    response = client.get("/items?limit=1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert cache.not_modified == 1
+
+
+def test_invalidation_recomputes_namespace():
+    client, cache, calls = _make_client()
+    client.get("/items?limit=1")
+
+    assert cache.invalidate("other") == 0
+    client.get("/items?limit=1")
+    assert cache.invalidate("items") == 1
+    client.get("/items?limit=1")
+
+    assert len(calls) == 2
@@ -0,0 +1,84 @@
+"""Round-trip tests for the registered-class serializer in utils.serialization_utils."""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import List, Optional
+
+import pytest
+
+from backend.utils.serialization_utils import (
+    MSGPACK_AVAILABLE,
+    register_serializable,
+    safe_dumpb,
+    safe_dumps,
+    safe_loadb,
+    safe_loads,
+)
+
+
+@register_serializable
+class Side(str, Enum):
+    OVER = "over"
+    UNDER = "under"
+
+
+@register_serializable
+@dataclass
+class Leg:
+    player: str
+    side: Side
+    line: float
+
+
+@register_serializable
+@dataclass
+class Slip:
+    slip_id: str
+    legs: List[Leg] = field(default_factory=list)
+    placed_at: Optional[datetime] = None
+    note: Optional[str] = None
+
+
+@dataclass
+class Unregistered:
+    value: int
+
+
+def _slip() -> Slip:
+    return Slip(
+        slip_id="s-1",
+        legs=[Leg("A. Player", Side.OVER, 24.5), Leg("B. Player", Side.UNDER, 8.5)],
+        placed_at=datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    )
+
+
+def test_json_round_trip_restores_nested_dataclasses_and_enums():
+    restored = safe_loads(safe_dumps(_slip()))
+    assert restored == _slip()
+    assert isinstance(restored.legs[0], Leg)
+    assert restored.legs[0].side is Side.OVER
+
+
+def test_binary_round_trip_json_fallback():
+    payload = safe_dumpb(_slip(), use_msgpack=False)
+    assert payload[:1] == b"J"
+    assert safe_loadb(payload) == _slip()
+
+
+@pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+def test_binary_round_trip_msgpack():
+    payload = safe_dumpb(_slip(), use_msgpack=True)
+    assert payload[:1] == b"M"
+    assert safe_loadb(payload) == _slip()
+
+
+def test_unregistered_dataclass_decodes_as_plain_dict():
+    restored = safe_loads(safe_dumps(Unregistered(3)))
+    assert restored == {"value": 3, "__type__": "Unregistered"}
+
+
+def test_unregistered_enum_is_rejected():
+    data = '{"__type__": "enum", "class": "NotRegistered", "member": "X"}'
+    with pytest.raises(TypeError):
+        safe_loads(data)
@@ -0,0 +1,154 @@
+"""Tests for model preloading and the shared-memory L1 cache used by serving.py."""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+
+import model_service
+import serving
+from cache_optimizer import SharedMemoryCache
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    joblib.dump(Ridge().fit(X, X @ np.arange(4)), tmp_path / "ridge.joblib", compress=3)
+    (tmp_path / "ridge").mkdir()
+    (tmp_path / "ridge" / "model_config.json").write_text(
+        json.dumps(
+            {
+                "name": "ridge",
+                "version": "1",
+                "model_type": "random_forest",
+                "file_path": "ridge.joblib",
+                "features": ["a", "b", "c", "d"],
+                "target": "y",
+                "training_date": datetime(2026, 1, 1).isoformat(),
+            }
+        )
+    )
+    yield tmp_path
+    model_service._SHARED_MODELS.clear()
+
+
+def test_loader_reuses_preloaded_model(models_dir, tmp_path_factory):
+    mmap_dir = tmp_path_factory.mktemp("mmap")
+    assert set(model_service.preload_shared_models(models_dir, mmap_dir)) == {"ridge"}
+    shared = model_service._SHARED_MODELS["ridge"][1]
+    # Parameters now live in a read-only file mapping
+    assert isinstance(shared.coef_, np.memmap)
+
+    loader = model_service.ModelLoader(str(models_dir))
+    metadata = model_service.discover_models(models_dir)[0]
+    assert asyncio.run(loader.load_model(metadata))
+    assert loader.get_model("ridge") is shared
+
+    metadata.version = "2"  # a newer version on disk is loaded privately
+    assert asyncio.run(loader.load_model(metadata))
+    assert loader.get_model("ridge") is not shared
+
+
+def _write_from_child(cache):
+    cache.set("odds:evt_1", {"over": 1.91, "under": 1.95}, ttl=60)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork")
+def test_shared_cache_is_visible_across_forked_workers():
+    cache = SharedMemoryCache(slots=64, slot_bytes=512)
+    try:
+        child = multiprocessing.get_context("fork").Process(
+            target=_write_from_child, args=(cache,)
+        )
+        child.start()
+        child.join(10)
+
+        assert cache.get("odds:evt_1") == {"over": 1.91, "under": 1.95}
+        assert cache.delete("odds:evt_1")
+        assert cache.get("odds:evt_1") is None
+        # Too large for a slot: rejected so MultiTierCache falls back to L2
+        assert not cache.set("big", "x" * 1024)
+    finally:
+        cache.close()
+
+
+def test_shared_cache_expiry_and_eviction():
+    cache = SharedMemoryCache(slots=4, slot_bytes=256)
+    try:
+        cache.set("stale", 1, ttl=-1)
+        assert cache.get("stale") is None
+        for i in range(10):
+            assert cache.set(f"k{i}", i)
+        assert cache.get("k9") == 9
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 4
+        assert stats["evictions"] > 0
+    finally:
+        cache.close()
+
+
+def _die_holding_lock(cache):
+    with cache._locked():
+        os._exit(0)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork")
+def test_shared_cache_recovers_lock_from_a_dead_worker():
+    cache = SharedMemoryCache(slots=16, slot_bytes=256)
+    cache.LOCK_TIMEOUT = 0.1
+    try:
+        cache.set("before", 1)
+        child = multiprocessing.get_context("fork").Process(
+            target=_die_holding_lock, args=(cache,)
+        )
+        child.start()
+        child.join(10)
+
+        # The table may be half-written, so it is cleared on takeover
+        assert cache.get("before") is None
+        assert cache.set("after", 2) and cache.get("after") == 2
+        assert cache.get_stats()["lock_recoveries"] == 1
+
+        # A live holder is waited out, not taken over
+        with cache._locked():
+            assert cache.get("after") is None
+        assert cache.get("after") == 2
+        assert cache.get_stats()["lock_recoveries"] == 1
+    finally:
+        cache.close()
+
+
+def test_memory_report_skips_workers_that_exit(monkeypatch):
+    psutil = pytest.importorskip("psutil")
+    real = psutil.Process()
+
+    class Vanished:
+        pid = 999999
+
+        def cmdline(self):
+            raise psutil.NoSuchProcess(self.pid)
+
+    class Parent:
+        pid = real.pid
+
+        def __getattr__(self, name):
+            return getattr(real, name)
+
+        def cmdline(self):
+            return ["serve"]
+
+        def children(self):
+            return [Vanished()]
+
+    monkeypatch.setattr(psutil, "Process", lambda pid=None: Parent())
+    report = serving.worker_memory_report(real.pid)
+    assert report["parent"]["pid"] == real.pid
+    assert report["workers"] == [] and report["total_rss_mb"] == 0
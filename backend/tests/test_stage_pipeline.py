@@ -0,0 +1,158 @@
+"""Tests for the async stage DAG executor."""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from utils.stage_pipeline import Stage, StagePipeline, StagePipelineError, hash_inputs
+
+
+def _sleeper(delay, calls=None, name=None):
+    async def run(**kwargs):
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        return sum(v for v in kwargs.values() if isinstance(v, (int, float))) + 1
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    pipeline = StagePipeline(
+        [
+            Stage("a", _sleeper(0.1), deps=("x",)),
+            Stage("b", _sleeper(0.1), deps=("x",)),
+            Stage("c", _sleeper(0.1), deps=("x",)),
+            Stage("merge", _sleeper(0.0), deps=("a", "b", "c")),
+        ],
+        inputs=("x",),
+    )
+    report = await pipeline.run({"x": 1})
+
+    assert report.outputs["merge"] == 7
+    assert report.total_time < 0.25
+    assert set(report.timings) == {"a", "b", "c", "merge"}
+    assert pipeline.get_stage_stats()["a"]["runs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cacheable_stage_reuses_output_for_same_inputs():
+    calls = []
+    pipeline = StagePipeline(
+        [Stage("feat", _sleeper(0.0, calls, "feat"), deps=("x",), cacheable=True)],
+        inputs=("x",),
+    )
+    await pipeline.run({"x": 1})
+    report = await pipeline.run({"x": 1})
+    await pipeline.run({"x": 2})
+
+    assert calls == ["feat", "feat"]
+    assert report.cache_hits == ["feat"]
+
+
+def test_input_fingerprint_tracks_content_not_identity():
+    base = {"features": {"a": 1.0, "b": [1, 2]}, "matrix": np.arange(6.0).reshape(2, 3)}
+    same = {"matrix": np.arange(6.0).reshape(2, 3), "features": {"b": [1, 2], "a": 1.0}}
+    assert hash_inputs(base) == hash_inputs(same)
+
+    assert hash_inputs(base) != hash_inputs({**base, "matrix": np.arange(6.0).reshape(3, 2)})
+    assert hash_inputs(base) != hash_inputs({**base, "features": {"a": 1, "b": [1, 2]}})
+    assert hash_inputs({"x": 1}) != hash_inputs({"x": "1"})
+    assert hash_inputs({"x": lambda: None}) is None
+
+
+@pytest.mark.asyncio
+async def test_cached_outputs_are_isolated_from_callers():
+    async def build(x):
+        return {"scores": [x, x + 1], "vector": np.full(3, float(x))}
+
+    pipeline = StagePipeline([Stage("feat", build, deps=("x",), cacheable=True)], inputs=("x",))
+    first = (await pipeline.run({"x": 1})).outputs["feat"]
+    first["scores"].append(99)
+    first["vector"][:] = -1.0
+
+    hit = (await pipeline.run({"x": 1})).outputs["feat"]
+    assert hit["scores"] == [1, 2]
+    assert hit["vector"].tolist() == [1.0, 1.0, 1.0]
+    hit["scores"].clear()
+    with pytest.raises(ValueError):
+        hit["vector"][0] = 5.0
+    assert (await pipeline.run({"x": 1})).outputs["feat"]["scores"] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_latency_budget_skips_optional_stages():
+    pipeline = StagePipeline(
+        [
+            Stage("core", _sleeper(0.01), deps=("x",)),
+            Stage("slow", _sleeper(0.3), deps=("x",), optional=True, fallback=lambda **_: -1),
+            Stage("merge", _sleeper(0.0), deps=("core", "slow")),
+        ],
+        inputs=("x",),
+    )
+    report = await pipeline.run({"x": 1}, latency_budget=0.05)
+
+    assert report.skipped == ["slow"]
+    assert report.outputs["slow"] == -1
+    assert report.outputs["merge"] == 2  # core (2) + fallback (-1) + 1
+    assert report.total_time < 0.2
+
+    # Once its cost is known, the slow stage is skipped up front
+    report = await pipeline.run({"x": 1}, latency_budget=0.05)
+    assert report.skipped == ["slow"]
+    assert "slow" not in report.timings
+
+
+def _blocker(delay):
+    async def run(**kwargs):
+        time.sleep(delay)  # holds the thread, like a CPU-bound stage
+        return sum(v for v in kwargs.values() if isinstance(v, (int, float))) + 1
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_blocking_stages_overlap_and_respect_the_budget():
+    pipeline = StagePipeline(
+        [
+            Stage("a", _blocker(0.1), deps=("x",), blocking=True),
+            Stage("b", _blocker(0.1), deps=("x",), blocking=True),
+            Stage("merge", _sleeper(0.0), deps=("a", "b")),
+        ],
+        inputs=("x",),
+    )
+    report = await pipeline.run({"x": 1})
+    assert report.outputs["merge"] == 5
+    assert report.total_time < 0.18
+
+    pipeline = StagePipeline(
+        [
+            Stage("core", _blocker(0.01), deps=("x",), blocking=True),
+            Stage(
+                "slow",
+                _blocker(0.3),
+                deps=("x",),
+                optional=True,
+                fallback=lambda **_: -1,
+                blocking=True,
+            ),
+            Stage("merge", _sleeper(0.0), deps=("core", "slow")),
+        ],
+        inputs=("x",),
+    )
+    report = await pipeline.run({"x": 1}, latency_budget=0.05)
+    assert report.skipped == ["slow"]
+    assert report.outputs["merge"] == 2
+    assert report.total_time < 0.2
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(StagePipelineError):
+        StagePipeline([Stage("a", _sleeper(0), deps=("missing",))])
+    with pytest.raises(StagePipelineError):
+        StagePipeline([Stage("a", _sleeper(0), deps=("b",)), Stage("b", _sleeper(0), deps=("a",))])
+    with pytest.raises(StagePipelineError):
+        StagePipeline([Stage("a", _sleeper(0), optional=True)])
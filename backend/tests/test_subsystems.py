@@ -0,0 +1,92 @@
+"""Tests for the lazy subsystem registry and deferred router mounting."""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from utils.subsystems import SubsystemRegistry, mount_deferred_router
+
+
+def _router_loader(calls):
+    def load():
+        calls.append("load")
+        router = APIRouter(prefix="/heavy")
+
+        @router.get("/ping/{value}")
+        async def ping(value: str):
+            return {"pong": value}
+
+        return router
+
+    return load
+
+
+def test_subsystems_load_once_and_record_failures():
+    registry = SubsystemRegistry()
+    calls = []
+    registry.register("engine", lambda: calls.append(1) or "engine")
+    registry.register("broken", lambda: 1 / 0)
+
+    assert calls == []
+    assert registry.get("engine") == registry.get("engine") == "engine"
+    assert calls == [1]
+    assert registry.get("broken") is None
+
+    report = registry.startup_report()["subsystems"]
+    assert report["engine"]["status"] == "ready"
+    assert report["engine"]["loaded_by"] == "first_use"
+    assert report["broken"]["error"].startswith("ZeroDivisionError")
+
+
+def test_deferred_router_loads_on_first_request():
+    registry = SubsystemRegistry()
+    calls = []
+    app = FastAPI()
+    subsystem = registry.register("heavy", _router_loader(calls))
+    mount_deferred_router(app, subsystem, match_prefix="/api/heavy", include_prefix="/api")
+
+    @app.get("/api/light")
+    async def light():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/api/light").json() == {"ok": True}
+    assert calls == []
+
+    # The request that triggers the import is still served by the real route
+    assert client.get("/api/heavy/ping/a").json() == {"pong": "a"}
+    assert client.get("/api/heavy/ping/b").json() == {"pong": "b"}
+    assert client.get("/api/heavy/missing").status_code == 404
+    assert calls == ["load"]
+    assert subsystem.loaded_by == "first_request"
+
+
+@pytest.mark.asyncio
+async def test_warm_up_mounts_router_and_skips_cold_subsystems():
+    registry = SubsystemRegistry()
+    calls = []
+    app = FastAPI()
+    heavy = registry.register("heavy", _router_loader(calls))
+    cold = registry.register("cold", lambda: "cold", warm=False)
+    mount_deferred_router(app, heavy, match_prefix="/heavy")
+
+    await registry.warm_up()
+
+    assert heavy.loaded_by == "warmup"
+    assert not cold.loaded
+    assert registry.startup_report()["warmup_seconds"] is not None
+    assert TestClient(app).get("/heavy/ping/x").json() == {"pong": "x"}
+    assert heavy.loaded_by == "warmup"
+
+
+def test_failed_router_subsystem_returns_503():
+    registry = SubsystemRegistry()
+    app = FastAPI()
+
+    def load():
+        raise ImportError("No module named 'tensorflow'")
+
+    mount_deferred_router(app, registry.register("ml", load), match_prefix="/ml")
+
+    response = TestClient(app).get("/ml/predict")
+    assert response.status_code == 503
@@ -0,0 +1,86 @@
+"""Tests for request span tracing, stage histograms and on-demand profiling."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.request_tracking import trace_requests
+from routes.metrics import router as metrics_router
+from utils.tracing import PROFILE_HEADER, PROFILE_ID_HEADER, span, trace_registry
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.middleware("http")(trace_requests)
+    app.include_router(metrics_router)
+
+    @app.get("/predict/{event_id}")
+    async def predict(event_id: str):
+        with span("prediction.feature_engineering"):
+            await asyncio.sleep(0.01)
+        for _ in range(2):
+            with span("prediction.model_inference"):
+                time.sleep(0.005)
+        return {"event_id": event_id}
+
+    trace_registry.reset()
+    trace_registry.configure(enabled=True, profiling_enabled=False)
+    yield TestClient(app)
+    trace_registry.reset()
+    trace_registry.configure(enabled=True, profiling_enabled=False)
+
+
+def test_span_is_noop_outside_a_trace():
+    with span("anything") as s:
+        pass
+    assert s is span("other")  # shared no-op instance
+
+
+def test_stages_are_aggregated_per_route_template(client):
+    first = client.get("/predict/a")
+    client.get("/predict/b")
+
+    assert "prediction.model_inference;dur=" in first.headers["server-timing"]
+    stages = trace_registry.stage_breakdown()["GET /predict/{event_id}"]
+    assert stages["requests"] == 2
+    assert stages["stages"]["prediction.model_inference"]["calls"] == 4
+    assert stages["stages"]["prediction.feature_engineering"]["mean_seconds"] >= 0.01
+
+    text = client.get("/metrics/prometheus").text
+    assert (
+        'request_stage_latency_seconds_count{endpoint="GET /predict/{event_id}",'
+        'stage="prediction.model_inference"} 4'
+    ) in text
+    assert 'request_latency_seconds_bucket{endpoint="GET /predict/{event_id}",le="+Inf"} 2' in text
+
+
+def test_disabled_tracing_records_nothing(client):
+    trace_registry.configure(enabled=False)
+    response = client.get("/predict/a")
+
+    assert "server-timing" not in response.headers
+    assert trace_registry.stage_breakdown() == {}
+
+
+def test_profile_header_returns_retrievable_profile(client):
+    # Ignored unless profiling is switched on
+    assert PROFILE_ID_HEADER.lower() not in client.get(
+        "/predict/a", headers={PROFILE_HEADER: "1"}
+    ).headers
+
+    trace_registry.configure(enabled=False, profiling_enabled=True)
+    response = client.get("/predict/a", headers={PROFILE_HEADER: "1"})
+    profile_id = response.headers[PROFILE_ID_HEADER]
+
+    profile = client.get(f"/metrics/profiles/{profile_id}").json()
+    assert profile["endpoint"] == "GET /predict/{event_id}"
+    assert set(profile["stages"]) == {
+        "prediction.feature_engineering",
+        "prediction.model_inference",
+    }
+    assert profile["total_samples"] > 0
+    assert client.get("/metrics/profiles/unknown").status_code == 404
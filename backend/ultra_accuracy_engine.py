@@ -14,6 +14,9 @@ from dataclasses import dataclass
 from collections import defaultdict, deque
 import numpy as np
 
+from utils.feature_plan import FeaturePlan
+from utils.stage_pipeline import Stage, StagePipeline, StageRunReport
+
 logger = logging.getLogger(__name__)
 
 import tensorflow as tf
@@ -242,6 +245,13 @@ class UltraAccuracyEngine:
         self.feature_cache = {}
         self.uncertainty_cache = {}
 
+        # Compiled feature plans keyed by the feature dict's key tuple
+        self.feature_plans: Dict[Tuple[str, ...], FeaturePlan] = {}
+
+        # Stage DAG behind predict_with_maximum_accuracy
+        self.prediction_pipeline = self._build_prediction_pipeline()
+        self.last_stage_report: Optional[StageRunReport] = None
+
         self.initialize_ultra_advanced_models()
 
     def initialize_ultra_advanced_models(self):
@@ -739,13 +749,11 @@ class UltraAccuracyEngine:
         """Advanced feature engineering with quantum-inspired transformations"""
         enhanced_features = features.copy()
 
-        # 1. Quantum-inspired feature transformations
-        quantum_features = self._quantum_feature_transformation(features)
-        enhanced_features.update(quantum_features)
-
-        # 2. Advanced polynomial and interaction features
-        interaction_features = self._advanced_interaction_features(features)
-        enhanced_features.update(interaction_features)
+        # 1-2. Quantum-inspired and interaction features, one compiled pass
+        plan, row = self._compiled_features(features)
+        transformed = plan.transform(row)[0]
+        enhanced_features.update(plan.to_dict(transformed, "quantum"))
+        enhanced_features.update(plan.to_dict(transformed, "interaction"))
 
         # 3. Temporal pattern encoding
         if context and "timestamp" in context:
@@ -755,8 +763,7 @@ class UltraAccuracyEngine:
             enhanced_features.update(temporal_features)
 
         # 4. Fractal and chaos theory features
-        fractal_features = self._fractal_feature_extraction(features)
-        enhanced_features.update(fractal_features)
+        enhanced_features.update(plan.to_dict(transformed, "fractal"))
 
         # 5. Information theory features
         info_theory_features = self._information_theory_features(features)
@@ -776,131 +783,60 @@ class UltraAccuracyEngine:
 
         return enhanced_features
 
+    def _feature_plan(self, features: Dict[str, Any]) -> FeaturePlan:
+        """Compiled plan for this feature dict's schema, built on first use"""
+        signature = tuple(features)
+        plan = self.feature_plans.get(signature)
+        if plan is None:
+            plan = FeaturePlan.from_features(features)
+            self.feature_plans[signature] = plan
+        return plan
+
+    def _compiled_features(
+        self, features: Dict[str, Any]
+    ) -> Tuple[FeaturePlan, np.ndarray]:
+        """Plan and ``(1, n)`` input row for a single feature dict"""
+        plan = self._feature_plan(features)
+        try:
+            return plan, plan.vectorize(features)
+        except (TypeError, ValueError):
+            # Same keys, different value types: recompile for the new schema
+            plan = FeaturePlan.from_features(features)
+            self.feature_plans[tuple(features)] = plan
+            return plan, plan.vectorize(features)
+
+    def batch_feature_transformation(
+        self, rows: List[Dict[str, Any]]
+    ) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Quantum, interaction and fractal features for many rows sharing one schema
+
+        Returns the output feature names and a ``(len(rows), n_outputs)`` matrix.
+        """
+        if not rows:
+            return (), np.empty((0, 0))
+        plan = self._feature_plan(rows[0])
+        return plan.output_names, plan.transform(plan.vectorize_many(rows))
+
     def _quantum_feature_transformation(
         self, features: Dict[str, Any]
     ) -> Dict[str, float]:
         """Quantum-inspired feature transformations"""
-        quantum_features = {}
-
-        numeric_features = [
-            k for k, v in features.items() if isinstance(v, (int, float))
-        ]
-        if not numeric_features:
-            return quantum_features
-
-        values = np.array([features[k] for k in numeric_features])
-
-        # Quantum superposition-inspired transformations
-        quantum_features["quantum_superposition"] = np.sum(
-            values * np.exp(1j * values)
-        ).real
-        if len(values) >= 2:
-            # Create a 2D array with at least 2 features for correlation
-            values_matrix = np.vstack([values[:-1], values[1:]])
-            corr_matrix = np.corrcoef(values_matrix)
-            quantum_features["quantum_entanglement"] = corr_matrix[0, 1]
-        else:
-            quantum_features["quantum_entanglement"] = 0.0
-        quantum_features["quantum_interference"] = np.sum(
-            np.sin(values) * np.cos(values)
-        )
-        quantum_features["quantum_tunneling"] = np.sum(np.exp(-np.abs(values)))
-        quantum_features["quantum_coherence"] = 1.0 / (1.0 + np.std(values))
-
-        # Quantum-inspired nonlinear transformations
-        for i, feature in enumerate(numeric_features[:10]):  # Limit to avoid explosion
-            val = features[feature]
-            quantum_features[f"quantum_{feature}_wave"] = np.sin(val * np.pi) * np.cos(
-                val * np.pi / 2
-            )
-            quantum_features[f"quantum_{feature}_phase"] = np.exp(1j * val).real
-            quantum_features[f"quantum_{feature}_amplitude"] = np.abs(val) ** 0.5
-
-        return quantum_features
+        plan, row = self._compiled_features(features)
+        return plan.to_dict(plan.transform_section(row, "quantum")[0], "quantum")
 
     def _advanced_interaction_features(
         self, features: Dict[str, Any]
     ) -> Dict[str, float]:
         """Create advanced interaction features"""
-        interaction_features = {}
-
-        numeric_features = [
-            k for k, v in features.items() if isinstance(v, (int, float))
-        ]
-        if len(numeric_features) < 2:
-            return interaction_features
-
-        # Higher-order interactions
-        for i, feat1 in enumerate(numeric_features[:15]):
-            for j, feat2 in enumerate(numeric_features[i + 1 : 16]):
-                val1, val2 = features[feat1], features[feat2]
-
-                # Various interaction types
-                interaction_features[f"{feat1}_{feat2}_product"] = val1 * val2
-                interaction_features[f"{feat1}_{feat2}_ratio"] = val1 / (val2 + 1e-8)
-                interaction_features[f"{feat1}_{feat2}_diff"] = val1 - val2
-                interaction_features[f"{feat1}_{feat2}_harmonic"] = (
-                    2 * val1 * val2 / (val1 + val2 + 1e-8)
-                )
-                interaction_features[f"{feat1}_{feat2}_geometric"] = (
-                    (val1 * val2) ** 0.5 if val1 * val2 >= 0 else 0
-                )
-
-                # Trigonometric interactions
-                interaction_features[f"{feat1}_{feat2}_sin_cos"] = np.sin(
-                    val1
-                ) * np.cos(val2)
-                interaction_features[f"{feat1}_{feat2}_phase_shift"] = np.sin(
-                    val1 + val2
-                )
-
-        return interaction_features
+        plan, row = self._compiled_features(features)
+        return plan.to_dict(
+            plan.transform_section(row, "interaction")[0], "interaction"
+        )
 
     def _fractal_feature_extraction(self, features: Dict[str, Any]) -> Dict[str, float]:
         """Extract fractal and chaos theory features"""
-        fractal_features = {}
-
-        numeric_features = [
-            k for k, v in features.items() if isinstance(v, (int, float))
-        ]
-        if not numeric_features:
-            return fractal_features
-
-        values = np.array([features[k] for k in numeric_features])
-
-        # Fractal dimension approximation
-        if len(values) > 1:
-            diffs = np.diff(values)
-            fractal_features["fractal_dimension"] = len(diffs) / np.sum(
-                np.abs(diffs) + 1e-8
-            )
-
-        # Lyapunov exponent approximation
-        if len(values) > 2:
-            divergence = np.abs(np.diff(values, n=2))
-            fractal_features["lyapunov_exponent"] = np.mean(np.log(divergence + 1e-8))
-
-        # Hurst exponent approximation
-        if len(values) > 3:
-            cumsum = np.cumsum(values - np.mean(values))
-            R = np.max(cumsum) - np.min(cumsum)
-            S = np.std(values)
-            fractal_features["hurst_exponent"] = (
-                np.log(R / S) / np.log(len(values)) if S > 0 else 0.5
-            )
-
-        # Correlation dimension
-        if len(values) > 4:
-            correlation_sum = 0
-            for i in range(len(values)):
-                for _ in range(i + 1, len(values)):
-                    if np.abs(values[i] - values[j]) < 0.1:
-                        correlation_sum += 1
-            fractal_features["correlation_dimension"] = correlation_sum / (
-                len(values) * (len(values) - 1) / 2
-            )
-
-        return fractal_features
+        plan, row = self._compiled_features(features)
+        return plan.to_dict(plan.transform_section(row, "fractal")[0], "fractal")
 
     def _information_theory_features(
         self, features: Dict[str, Any]
@@ -1109,6 +1045,124 @@ class UltraAccuracyEngine:
                 logger.error("Error in continuous accuracy optimization: {e}")
                 await asyncio.sleep(1800)  # Retry in 30 minutes
 
+    def _build_prediction_pipeline(self) -> StagePipeline:
+        """Wire the maximum-accuracy stages into a dependency graph
+
+        Microstructure analysis only needs market data, and behavioral patterns and
+        multi-timeframe consensus only need engineered features (plus selected
+        models), so they run concurrently. Those three and the adaptive refinement
+        are optional and can be skipped under a latency budget. The stage methods
+        compute without yielding, so every stage is blocking and runs on a worker
+        thread; otherwise "concurrent" stages would run one after another on the
+        loop and the budget could never cut an optional stage short.
+        """
+
+        def _skip_refinement(calibrated_prediction, **_):
+            return calibrated_prediction
+
+        stages = [
+            Stage(
+                "quantum_features",
+                lambda features, alternative_data: self._quantum_feature_engineering(
+                    features, alternative_data
+                ),
+                deps=("features", "alternative_data"),
+                cacheable=True,
+                blocking=True,
+            ),
+            Stage(
+                "optimal_models",
+                lambda context, market_data, quantum_features, target_accuracy: self._dynamic_model_selection(
+                    context, market_data, quantum_features, target_accuracy
+                ),
+                deps=("context", "market_data", "quantum_features", "target_accuracy"),
+                blocking=True,
+            ),
+            Stage(
+                "microstructure",
+                lambda market_data: self._analyze_market_microstructure(market_data),
+                deps=("market_data",),
+                optional=True,
+                blocking=True,
+                fallback=lambda **_: {"efficiency_score": 0.5, "predictability": 0.5},
+                cacheable=True,
+            ),
+            Stage(
+                "behavioral_patterns",
+                lambda features, market_data, quantum_features: self._detect_behavioral_patterns(
+                    features, market_data, quantum_features
+                ),
+                deps=("features", "market_data", "quantum_features"),
+                optional=True,
+                blocking=True,
+                fallback=lambda **_: {"overall_impact": 0.0},
+                cacheable=True,
+            ),
+            Stage(
+                "timeframe_consensus",
+                lambda quantum_features, optimal_models: self._multi_timeframe_consensus(
+                    quantum_features, optimal_models
+                ),
+                deps=("quantum_features", "optimal_models"),
+                optional=True,
+                blocking=True,
+                fallback=lambda **_: {
+                    "timeframe_predictions": {},
+                    "consensus_prediction": None,
+                    "consensus_strength": 0.0,
+                    "divergence_signals": [],
+                },
+            ),
+            Stage(
+                "quantum_ensemble",
+                lambda optimal_models, quantum_features, microstructure, behavioral_patterns, timeframe_consensus: self._quantum_ensemble_fusion(
+                    optimal_models,
+                    quantum_features,
+                    microstructure,
+                    behavioral_patterns,
+                    timeframe_consensus,
+                ),
+                deps=(
+                    "optimal_models",
+                    "quantum_features",
+                    "microstructure",
+                    "behavioral_patterns",
+                    "timeframe_consensus",
+                ),
+                blocking=True,
+            ),
+            Stage(
+                "calibrated_prediction",
+                lambda quantum_ensemble, quantum_features, target_accuracy: self._ultra_calibration(
+                    quantum_ensemble, quantum_features, target_accuracy
+                ),
+                deps=("quantum_ensemble", "quantum_features", "target_accuracy"),
+                blocking=True,
+            ),
+            Stage(
+                "adapted_prediction",
+                lambda calibrated_prediction, context, market_data: self._adaptive_prediction_refinement(
+                    calibrated_prediction, context, market_data
+                ),
+                deps=("calibrated_prediction", "context", "market_data"),
+                optional=True,
+                blocking=True,
+                fallback=_skip_refinement,
+            ),
+            Stage(
+                "final_prediction",
+                lambda adapted_prediction, quantum_features, target_accuracy: self._meta_learning_optimization(
+                    adapted_prediction, quantum_features, target_accuracy
+                ),
+                deps=("adapted_prediction", "quantum_features", "target_accuracy"),
+                blocking=True,
+            ),
+        ]
+        return StagePipeline(
+            stages,
+            inputs=("features", "context", "market_data", "alternative_data", "target_accuracy"),
+        )
+
     async def predict_with_maximum_accuracy(
         self,
         features: Dict[str, Any],
@@ -1116,61 +1170,34 @@ class UltraAccuracyEngine:
         market_data: Optional[Dict[str, Any]] = None,
         alternative_data: Optional[Dict[str, Any]] = None,
         target_accuracy: float = 0.995,
+        latency_budget: Optional[float] = None,
     ) -> QuantumEnsemblePrediction:
-        """Generate prediction with maximum possible accuracy using all available techniques"""
+        """Generate prediction with maximum possible accuracy using all available techniques
+
+        Stages run through ``self.prediction_pipeline``; with ``latency_budget``
+        (seconds), optional stages that would not finish in time are skipped.
+        """
         start_time = time.time()
 
         try:
-            # 1. Ultra-advanced feature engineering with quantum-inspired transformations
-            quantum_features = await self._quantum_feature_engineering(
-                features, alternative_data
-            )
-
-            # 2. Dynamic model selection based on context and market conditions
-            optimal_models = await self._dynamic_model_selection(
-                context, market_data, quantum_features, target_accuracy
-            )
-
-            # 3. Real-time market microstructure analysis
-            microstructure_insights = await self._analyze_market_microstructure(
-                market_data
-            )
-
-            # 4. Behavioral pattern recognition with deep learning
-            behavioral_patterns = await self._detect_behavioral_patterns(
-                features, market_data, quantum_features
-            )
-
-            # 5. Multi-timeframe consensus prediction
-            multi_timeframe_consensus = await self._multi_timeframe_consensus(
-                quantum_features, optimal_models
-            )
-
-            # 6. Quantum-inspired ensemble fusion
-            quantum_ensemble = await self._quantum_ensemble_fusion(
-                optimal_models,
-                quantum_features,
-                microstructure_insights,
-                behavioral_patterns,
-                multi_timeframe_consensus,
-            )
-
-            # 7. Advanced uncertainty quantification and calibration
-            calibrated_prediction = await self._ultra_calibration(
-                quantum_ensemble, quantum_features, target_accuracy
-            )
-
-            # 8. Real-time adaptation based on recent performance
-            adapted_prediction = await self._adaptive_prediction_refinement(
-                calibrated_prediction, context, market_data
-            )
-
-            # 9. Final accuracy optimization with meta-learning
-            final_prediction = await self._meta_learning_optimization(
-                adapted_prediction, quantum_features, target_accuracy
+            report = await self.prediction_pipeline.run(
+                {
+                    "features": features,
+                    "context": context,
+                    "market_data": market_data,
+                    "alternative_data": alternative_data,
+                    "target_accuracy": target_accuracy,
+                },
+                latency_budget=latency_budget,
             )
+            self.last_stage_report = report
+            final_prediction = report.outputs["final_prediction"]
 
             processing_time = time.time() - start_time
+            if report.skipped:
+                logger.info(
+                    f"Skipped optional stages under {latency_budget}s budget: {report.skipped}"
+                )
 
             # Only return prediction if it meets ultra-high accuracy criteria
             if (
@@ -1196,6 +1223,21 @@ class UltraAccuracyEngine:
             logger.error("Error in maximum accuracy prediction: {e}")
             raise
 
+    def get_stage_performance(self) -> Dict[str, Any]:
+        """Per-stage wall times of the maximum-accuracy pipeline"""
+        report = self.last_stage_report
+        return {
+            "stages": self.prediction_pipeline.get_stage_stats(),
+            "last_run": {
+                "total_time": report.total_time,
+                "timings": report.timings,
+                "skipped": report.skipped,
+                "cache_hits": report.cache_hits,
+            }
+            if report
+            else None,
+        }
+
     async def _quantum_feature_engineering(
         self, features: Dict[str, Any], alternative_data: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
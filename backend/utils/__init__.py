@@ -1,5 +1,13 @@
 """Utility modules for A1Betting backend."""
 
-from .llm_engine import llm_engine
-
 __all__ = ["llm_engine"]
+
+
+def __getattr__(name):
+    # Imported on first access: the LLM engine pulls in its HTTP clients and
+    # config, which modules that only need a small utility should not pay for
+    if name == "llm_engine":
+        from .llm_engine import llm_engine
+
+        return llm_engine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,133 @@
+"""Adaptive client-side limits for calls to upstream providers.
+
+:class:`TokenBucket` bounds the request rate. Each permit is O(1): the bucket
+refills from the elapsed time when it is touched, so no timestamp lists are
+kept or scanned.
+
+:class:`AIMDLimit` bounds concurrency in the style of the AIMD limit in
+Netflix's concurrency-limits library. An on-time success while the limit is
+actually in use raises the limit by ``1/limit``, which works out to about +1
+per round of requests. A throttled, timed-out or slow response multiplies it
+by ``backoff_ratio``, at most once per round trip. "Slow" means slower than
+``latency_tolerance`` times the lowest latency seen recently, which stands in
+for the provider's no-load latency. The limit therefore settles just below
+the point where the provider starts queueing or throttling.
+"""
+
+import math
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Requests-per-second limit with bursts of up to ``burst_seconds`` of rate"""
+
+    __slots__ = ("rate", "burst_seconds", "tokens", "updated")
+
+    def __init__(
+        self, rate: float, burst_seconds: float = 1.0, now: Optional[float] = None
+    ):
+        self.rate = rate
+        self.burst_seconds = burst_seconds
+        self.tokens = self.capacity
+        self.updated = time.monotonic() if now is None else now
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate * self.burst_seconds)
+
+    def _refill(self, now: Optional[float]):
+        now = time.monotonic() if now is None else now
+        if now > self.updated:
+            refilled = self.tokens + (now - self.updated) * self.rate
+            self.tokens = min(self.capacity, refilled)
+            self.updated = now
+
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def refund(self):
+        """Return a token taken for a request that was never sent"""
+        self.tokens = min(self.capacity, self.tokens + 1.0)
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """Seconds until a token is available"""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+    def set_rate(self, rate: float, now: Optional[float] = None):
+        self._refill(now)
+        self.rate = rate
+        self.tokens = min(self.tokens, self.capacity)
+
+    def pause(self, seconds: float, now: Optional[float] = None):
+        """Grant nothing for ``seconds`` (e.g. a ``Retry-After`` header)"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class AIMDLimit:
+    """Concurrency limit adjusted from each request's latency and outcome"""
+
+    def __init__(
+        self,
+        initial: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+        baseline_window: int = 500,
+    ):
+        self._limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.baseline_window = baseline_window
+        # Lowest latency of the previous window of samples (no-load estimate)
+        self.baseline: Optional[float] = None
+        self._window_min = math.inf
+        self._window_count = 0
+        self._hold_decrease_until = 0.0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def _track_baseline(self, latency: float):
+        self._window_min = min(self._window_min, latency)
+        self._window_count += 1
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        if self._window_count >= self.baseline_window:
+            # Let the baseline rise again if the provider got slower for good
+            self.baseline = self._window_min
+            self._window_min = math.inf
+            self._window_count = 0
+
+    def on_sample(
+        self,
+        latency: float,
+        inflight: int,
+        dropped: bool = False,
+        now: Optional[float] = None,
+    ) -> int:
+        """Record one finished request; ``inflight`` counts it as still running"""
+        now = time.monotonic() if now is None else now
+        if not dropped:
+            self._track_baseline(latency)
+        congested = dropped or latency > self.baseline * self.latency_tolerance
+        if congested:
+            if now >= self._hold_decrease_until:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                # Requests already in flight saw the old limit; give them a round trip
+                self._hold_decrease_until = now + latency
+        elif inflight * 2 >= self._limit:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        return self.limit
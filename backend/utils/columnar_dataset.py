@@ -0,0 +1,235 @@
+"""Append-only columnar training datasets backed by NumPy memory maps.
+
+A dataset is a directory with one raw little-endian file per column plus a
+``meta.json`` holding the schema (column -> dtype) and the committed row
+count. Reading maps column files straight into NumPy without copying, so
+opening a dataset costs the same whatever its size. Appending writes the new
+values to the end of each column file first and only then commits the new
+row count to ``meta.json`` (atomic rename). An interrupted append is
+therefore invisible, and the next append trims the partial tail.
+
+Training on data larger than RAM goes through :meth:`ColumnarDataset.iter_chunks`
+and :func:`fit_incremental`: only one chunk of rows is materialized at a time
+and models that implement ``partial_fit`` are updated chunk by chunk.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def _fixed_width_schema(schema: Dict[str, np.dtype]) -> Dict[str, np.dtype]:
+    """Little-endian numeric/bool dtypes; object and string columns are rejected"""
+    for name, dtype in schema.items():
+        if dtype.kind not in "biuf":
+            raise ValueError(f"Column {name!r} has unsupported dtype {dtype}")
+    return {name: dtype.newbyteorder("<") for name, dtype in schema.items()}
+
+
+class ColumnarDataset:
+    """One on-disk table; columns are read as zero-copy ``np.memmap`` views"""
+
+    def __init__(self, path: Union[str, Path], schema: Optional[Mapping[str, Any]] = None):
+        """Open the dataset at ``path``, creating it when ``schema`` is given
+
+        Without a schema a missing dataset is created empty and takes its
+        schema from the first :meth:`append`.
+        """
+        self.path = Path(path)
+        self.schema: Dict[str, np.dtype] = {}
+        self.rows = 0
+        self._views: Dict[str, np.ndarray] = {}
+
+        meta_path = self.path / META_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta.get("format_version") != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported dataset format {meta.get('format_version')!r} in {self.path}"
+                )
+            self.schema = {
+                name: np.dtype(dtype) for name, dtype in meta["columns"].items()
+            }
+            self.rows = int(meta["rows"])
+            if schema is not None and set(schema) != set(self.schema):
+                raise ValueError(
+                    f"Dataset {self.path} has columns {sorted(self.schema)}, "
+                    f"expected {sorted(schema)}"
+                )
+        elif schema is not None:
+            self.schema = _fixed_width_schema(
+                {name: np.dtype(dtype) for name, dtype in schema.items()}
+            )
+            self._create()
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.schema)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.schema
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.column(column)
+
+    def _column_file(self, column: str) -> Path:
+        return self.path / f"{column}.bin"
+
+    def _create(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        for column in self.schema:
+            self._column_file(column).touch()
+        self._commit(0)
+
+    def _commit(self, rows: int):
+        now = datetime.now(timezone.utc).isoformat()
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "columns": {name: dtype.str for name, dtype in self.schema.items()},
+            "rows": rows,
+            "updated_at": now,
+        }
+        tmp = self.path / (META_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self.path / META_FILE)
+        self.rows = rows
+        self._views.clear()
+
+    def append(self, data: Mapping[str, Any]) -> int:
+        """Append rows given as a DataFrame or a mapping of column -> values
+
+        Every schema column must be present and all columns must have the same
+        length. Returns the number of rows appended.
+        """
+        arrays = {name: np.asarray(data[name]) for name in (self.schema or data.keys())}
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        count = lengths.pop()
+
+        if not self.schema:
+            self.schema = _fixed_width_schema(
+                {name: values.dtype for name, values in arrays.items()}
+            )
+            self._create()
+        if count == 0:
+            return 0
+
+        for name, dtype in self.schema.items():
+            values = np.ascontiguousarray(arrays[name], dtype=dtype)
+            with open(self._column_file(name), "r+b") as f:
+                # Drop any tail left by an append that never committed
+                f.truncate(self.rows * dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(values.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self._commit(self.rows + count)
+        return count
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one column; no data is copied"""
+        if name not in self.schema:
+            raise KeyError(name)
+        view = self._views.get(name)
+        if view is None:
+            dtype = self.schema[name]
+            if self.rows == 0:
+                view = np.empty(0, dtype=dtype)
+            else:
+                view = np.memmap(
+                    self._column_file(name), dtype=dtype, mode="r", shape=(self.rows,)
+                )
+            self._views[name] = view
+        return view
+
+    def arrays(self, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        return {name: self.column(name) for name in (columns or self.columns)}
+
+    def matrix(
+        self,
+        columns: Sequence[str],
+        start: int = 0,
+        stop: Optional[int] = None,
+        dtype: Any = np.float64,
+    ) -> np.ndarray:
+        """``(rows, len(columns))`` array for a row range; only that range is read"""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        out = np.empty((max(stop - start, 0), len(columns)), dtype=dtype)
+        for j, name in enumerate(columns):
+            out[:, j] = self.column(name)[start:stop]
+        return out
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None):
+        """Materialize as a pandas DataFrame (copies; prefer ``matrix``/``column``)"""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {name: np.asarray(values) for name, values in self.arrays(columns).items()}
+        )
+
+    def iter_chunks(
+        self,
+        columns: Sequence[str],
+        target: Optional[str] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Yield ``(X, y)`` chunks of at most ``chunk_rows`` rows in order"""
+        for start in range(0, self.rows, chunk_rows):
+            stop = min(start + chunk_rows, self.rows)
+            X = self.matrix(columns, start, stop)
+            y = np.asarray(self.column(target)[start:stop]) if target else None
+            yield X, y
+
+    def unique(self, column: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+        """Sorted distinct values of ``column``, read one chunk at a time"""
+        values = self.column(column)
+        distinct = np.empty(0, dtype=values.dtype)
+        for start in range(0, self.rows, chunk_rows):
+            distinct = np.union1d(distinct, values[start : start + chunk_rows])
+        return distinct
+
+
+def fit_incremental(
+    model: Any,
+    dataset: ColumnarDataset,
+    columns: Sequence[str],
+    target: str,
+    scaler: Any = None,
+    classes: Optional[Sequence[Any]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    epochs: int = 1,
+) -> Any:
+    """Train ``model.partial_fit`` over ``dataset`` one chunk at a time
+
+    When ``scaler`` is given (anything with ``partial_fit``/``transform``, such
+    as ``StandardScaler``), a first pass fits it and every later chunk is
+    scaled before reaching the model. ``classes`` is passed to the first
+    ``partial_fit`` call, as scikit-learn classifiers require.
+    """
+    if scaler is not None:
+        for X, _ in dataset.iter_chunks(columns, chunk_rows=chunk_rows):
+            scaler.partial_fit(X)
+
+    first = True
+    for _ in range(epochs):
+        for X, y in dataset.iter_chunks(columns, target, chunk_rows):
+            if scaler is not None:
+                X = scaler.transform(X)
+            if first and classes is not None:
+                model.partial_fit(X, y, classes=np.asarray(classes))
+            else:
+                model.partial_fit(X, y)
+            first = False
+    return model
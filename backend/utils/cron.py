@@ -0,0 +1,378 @@
+"""Cron expressions and a min-heap timer of next fire times.
+
+:class:`CronExpression` parses standard five-field cron (``minute hour
+day-of-month month day-of-week``), an optional leading seconds field, the
+``@hourly``-style macros, month and weekday names, lists, ranges and steps. As
+in Vixie cron, day-of-month and day-of-week match with OR when both are
+restricted, and with AND when either starts with ``*`` (so ``*/2`` counts as
+unrestricted for that choice but still limits the days). Times are evaluated as wall-clock times in the timezone of the
+datetime passed in (the scheduler uses UTC).
+
+:class:`CronTimer` keeps one heap record per schedule keyed by its next fire
+time. Finding what is due therefore costs ``O(k log n)`` for the ``k`` due
+schedules, not a scan of all ``n``, and the caller can sleep exactly until
+the head of the heap. Missed runs (process paused, event loop blocked, clock
+jump) are resolved per schedule by a :class:`MisfirePolicy`.
+"""
+
+import heapq
+import itertools
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+class CronParseError(ValueError):
+    """Raised for malformed cron expressions"""
+
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = {
+    name: i + 1
+    for i, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+    )
+}
+DAY_NAMES = {
+    name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])
+}
+
+# (name, min, max, names)
+_FIELDS = (
+    ("second", 0, 59, {}),
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day", 1, 31, {}),
+    ("month", 1, 12, MONTH_NAMES),
+    ("weekday", 0, 7, DAY_NAMES),  # 0 and 7 are both Sunday
+)
+
+# Far enough to cover leap-day schedules; anything later never fires
+_SEARCH_YEARS = 8
+
+
+def _parse_field(
+    text: str, name: str, low: int, high: int, names: Dict[str, int]
+) -> Tuple[int, ...]:
+    values = set()
+    for part in text.lower().split(","):
+        if not part:
+            raise CronParseError(f"Empty list item in {name} field {text!r}")
+        body, _, step_text = part.partition("/")
+        try:
+            step = int(step_text) if step_text else 1
+        except ValueError:
+            raise CronParseError(f"Bad step {step_text!r} in {name} field") from None
+        if step < 1:
+            raise CronParseError(f"Step must be positive in {name} field")
+
+        if body == "*":
+            start, end = low, high
+        else:
+            first, dash, last = body.partition("-")
+            try:
+                start = names[first] if first in names else int(first)
+                end = (names[last] if last in names else int(last)) if dash else start
+            except ValueError:
+                raise CronParseError(f"Bad value {body!r} in {name} field") from None
+            if step_text and not dash:
+                end = high  # "5/15" means from 5 to the end in steps of 15
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise CronParseError(f"{body!r} is out of range {low}-{high} for {name}")
+        values.update(range(start, end + 1, step))
+
+    if name == "weekday" and 7 in values:
+        values.discard(7)
+        values.add(0)
+    return tuple(sorted(values))
+
+
+class CronExpression:
+    """A parsed cron schedule; ``next_after`` gives the following fire time"""
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        text = MACROS.get(self.expression.lower(), self.expression)
+        parts = text.split()
+        if len(parts) == 5:
+            parts = ["0"] + parts
+            self.has_seconds = False
+        elif len(parts) == 6:
+            self.has_seconds = True
+        else:
+            raise CronParseError(
+                f"Expected 5 or 6 fields (or a macro), got {len(parts)}: {expression!r}"
+            )
+
+        parsed = [
+            _parse_field(part, name, low, high, names)
+            for part, (name, low, high, names) in zip(parts, _FIELDS)
+        ]
+        (
+            self.seconds,
+            self.minutes,
+            self.hours,
+            self.days,
+            self.months,
+            self.weekdays,
+        ) = parsed
+        self._day_set: FrozenSet[int] = frozenset(self.days)
+        self._weekday_set: FrozenSet[int] = frozenset(self.weekdays)
+        # "*" and "*/n" select OR vs AND semantics like Vixie's DOM_STAR/DOW_STAR
+        self._day_any = parts[3].startswith("*")
+        self._weekday_any = parts[5].startswith("*")
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_month = moment.day in self._day_set
+        in_week = (moment.weekday() + 1) % 7 in self._weekday_set
+        if self._day_any or self._weekday_any:
+            return in_month and in_week
+        return in_month or in_week
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.second in self.seconds
+            and moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching time strictly after ``moment`` (same tzinfo)"""
+        t = moment.replace(microsecond=0) + timedelta(seconds=1)
+        limit = moment.year + _SEARCH_YEARS
+        while t.year <= limit:
+            if t.month not in self.months:
+                i = bisect_left(self.months, t.month)
+                if i < len(self.months):
+                    t = t.replace(month=self.months[i], day=1, hour=0, minute=0, second=0)
+                else:
+                    t = t.replace(
+                        year=t.year + 1,
+                        month=self.months[0],
+                        day=1,
+                        hour=0,
+                        minute=0,
+                        second=0,
+                    )
+                continue
+            if not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+                continue
+            if t.hour not in self.hours:
+                i = bisect_left(self.hours, t.hour)
+                if i < len(self.hours):
+                    t = t.replace(hour=self.hours[i], minute=0, second=0)
+                else:
+                    t = (t + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+                continue
+            if t.minute not in self.minutes:
+                i = bisect_left(self.minutes, t.minute)
+                if i < len(self.minutes):
+                    t = t.replace(minute=self.minutes[i], second=0)
+                else:
+                    t = (t + timedelta(hours=1)).replace(minute=0, second=0)
+                continue
+            if t.second not in self.seconds:
+                i = bisect_left(self.seconds, t.second)
+                if i < len(self.seconds):
+                    t = t.replace(second=self.seconds[i])
+                else:
+                    t = (t + timedelta(minutes=1)).replace(second=0)
+                continue
+            return t
+        raise CronParseError(f"{self.expression!r} never fires")
+
+
+@lru_cache(maxsize=4096)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse once per distinct string; expressions are never mutated"""
+    return CronExpression(expression)
+
+
+class MisfirePolicy(str, Enum):
+    """What to do with runs whose fire time passed while nobody was looking"""
+
+    FIRE_ONCE = "fire_once"  # coalesce all missed runs into one
+    FIRE_ALL = "fire_all"  # catch up every missed run (up to max_catchup)
+    SKIP = "skip"  # drop runs later than the grace period
+
+
+@dataclass
+class ScheduleEntry:
+    """One registered schedule and its next fire time (epoch seconds)"""
+
+    key: str
+    cron: CronExpression
+    payload: Any = None
+    policy: MisfirePolicy = MisfirePolicy.FIRE_ONCE
+    grace_seconds: float = 60.0
+    max_catchup: int = 100
+    next_fire: float = 0.0
+    fired: int = 0
+    missed: int = 0
+    _seq: int = field(default=0, repr=False)
+
+
+@dataclass
+class Fire:
+    """A due occurrence popped from the timer"""
+
+    entry: ScheduleEntry
+    scheduled_for: float  # the occurrence's nominal epoch time
+    lateness: float  # seconds between scheduled_for and when it was popped
+    coalesced: int = 0  # further missed occurrences folded into this one
+    catch_up: bool = False  # a missed occurrence replayed under FIRE_ALL
+
+    @property
+    def missed(self) -> int:
+        """Missed occurrences this fire stands for"""
+        return self.coalesced + int(self.catch_up)
+
+
+class CronTimer:
+    """Min-heap of schedule next-fire times with misfire handling
+
+    Removal and rescheduling are lazy: the heap may hold stale records, which
+    are recognised by their sequence number and dropped when they surface.
+    Schedules sharing an expression fire at the same instants, so next fire
+    times are memoized per ``(expression, time)``.
+    """
+
+    MEMO_SIZE = 65536
+
+    def __init__(self, tz: tzinfo = timezone.utc):
+        self.tz = tz
+        self.entries: Dict[str, ScheduleEntry] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._next_memo: Dict[Tuple[str, float], float] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def _next_after(self, entry: ScheduleEntry, when: float) -> float:
+        key = (entry.cron.expression, when)
+        upcoming = self._next_memo.get(key)
+        if upcoming is None:
+            if len(self._next_memo) >= self.MEMO_SIZE:
+                self._next_memo.clear()
+            moment = datetime.fromtimestamp(when, self.tz)
+            upcoming = self._next_memo[key] = entry.cron.next_after(moment).timestamp()
+        return upcoming
+
+    def _push(self, entry: ScheduleEntry):
+        entry._seq = next(self._counter)
+        heapq.heappush(self._heap, (entry.next_fire, entry._seq, entry.key))
+        # Compact once stale records dominate so memory stays O(schedules)
+        if len(self._heap) > 2 * len(self.entries) + 64:
+            self._heap = [
+                (e.next_fire, e._seq, e.key) for e in self.entries.values()
+            ]
+            heapq.heapify(self._heap)
+
+    def add(
+        self,
+        key: str,
+        expression: Any,
+        payload: Any = None,
+        now: Optional[float] = None,
+        policy: MisfirePolicy = MisfirePolicy.FIRE_ONCE,
+        grace_seconds: float = 60.0,
+        max_catchup: int = 100,
+    ) -> ScheduleEntry:
+        """Register (or replace) ``key``; it first fires after ``now``"""
+        cron = (
+            expression
+            if isinstance(expression, CronExpression)
+            else parse_cron(expression)
+        )
+        entry = ScheduleEntry(
+            key, cron, payload, MisfirePolicy(policy), grace_seconds, max_catchup
+        )
+        entry.next_fire = self._next_after(
+            entry, now if now is not None else datetime.now(self.tz).timestamp()
+        )
+        self.entries[key] = entry
+        self._push(entry)
+        return entry
+
+    def remove(self, key: str) -> bool:
+        return self.entries.pop(key, None) is not None
+
+    def _head(self) -> Optional[Tuple[float, int, str]]:
+        while self._heap:
+            when, seq, key = self._heap[0]
+            entry = self.entries.get(key)
+            if entry is not None and entry._seq == seq:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    def next_fire_time(self) -> Optional[float]:
+        head = self._head()
+        return head[0] if head else None
+
+    def seconds_until_next(self, now: float) -> Optional[float]:
+        """Time to sleep before anything is due (0 when already due)"""
+        when = self.next_fire_time()
+        return None if when is None else max(0.0, when - now)
+
+    def pop_due(self, now: float) -> List[Fire]:
+        """Every occurrence due at ``now``, after applying misfire policies"""
+        fires: List[Fire] = []
+        while True:
+            head = self._head()
+            if head is None or head[0] > now:
+                return fires
+            heapq.heappop(self._heap)
+            entry = self.entries[head[2]]
+            fires.extend(self._resolve(entry, now))
+            self._push(entry)
+
+    def _resolve(self, entry: ScheduleEntry, now: float) -> List[Fire]:
+        """Fires for ``entry``'s due occurrences; advances ``next_fire`` past now"""
+        due = [entry.next_fire]
+        upcoming = self._next_after(entry, entry.next_fire)
+        while upcoming <= now and len(due) <= entry.max_catchup:
+            due.append(upcoming)
+            upcoming = self._next_after(entry, upcoming)
+        if upcoming <= now:
+            # More missed runs than max_catchup: the excess are dropped
+            upcoming = self._next_after(entry, now)
+        entry.next_fire = upcoming
+
+        if entry.policy == MisfirePolicy.FIRE_ALL:
+            fired = due[: entry.max_catchup]
+            fires = [Fire(entry, t, now - t, catch_up=i > 0) for i, t in enumerate(fired)]
+        elif entry.policy == MisfirePolicy.SKIP:
+            fired = [t for t in due if now - t <= entry.grace_seconds]
+            fires = [Fire(entry, t, now - t) for t in fired]
+        else:
+            fired = due[-1:]
+            fires = [Fire(entry, due[-1], now - due[-1], coalesced=len(due) - 1)]
+
+        entry.fired += len(fired)
+        # Every occurrence past the first was missed, whether it was replayed,
+        # coalesced or dropped; under SKIP the first may be dropped as well
+        entry.missed += max(len(due) - 1, len(due) - len(fired))
+        return fires
@@ -0,0 +1,345 @@
+"""Shared HTTP transport for external data providers.
+
+Connectors used to create their own aiohttp/httpx sessions, so every source paid
+for its own TCP/TLS handshakes and none of them reused keep-alive connections.
+This module provides one process-wide transport with:
+
+- a keep-alive connection pool per host (HTTP/2 multiplexed when ``h2`` is installed)
+- bounded concurrency and optional request spacing per provider
+- response-size-aware body reading and JSON decoding (size caps, large bodies
+  decoded off the event loop, ``orjson`` when available)
+- per-host latency histograms
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401  # pylint: disable=unused-import
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson  # type: ignore[import]
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bodies above this size are decoded in a worker thread
+LARGE_BODY_BYTES = 256 * 1024
+
+# Latency bucket upper bounds in seconds (last bucket is open-ended)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"),
+)
+
+
+class ResponseTooLargeError(httpx.HTTPError):
+    """Raised when a response body exceeds the caller's ``max_bytes``"""
+
+
+@dataclass
+class ProviderLimits:
+    """Concurrency and pacing limits for one upstream provider"""
+
+    max_concurrency: int = 10
+    min_interval: float = 0.0  # seconds between request starts
+
+
+# Providers with known throttles; everything else uses ProviderLimits()
+DEFAULT_PROVIDER_LIMITS: Dict[str, ProviderLimits] = {
+    "prizepicks": ProviderLimits(max_concurrency=2, min_interval=1.0),
+}
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max_latency = 0.0
+        self.errors = 0
+
+    def record(self, latency: float, error: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max_latency = max(self.max_latency, latency)
+        if error:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0 < q <= 1)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return min(bound, self.max_latency)
+        return self.max_latency
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max_latency,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): n
+                for bound, n in zip(self.buckets, self.counts)
+            },
+        }
+
+
+def decode_json(content: bytes) -> Any:
+    """Decode a JSON body, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+@dataclass
+class TransportResponse:
+    """Fully read response returned by :class:`SharedHTTPTransport`"""
+
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    url: str
+    elapsed: float
+    raw: httpx.Response = field(repr=False)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.raw.encoding or "utf-8", errors="replace")
+
+    @property
+    def is_success(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def json(self) -> Any:
+        return decode_json(self.content)
+
+    async def json_async(self) -> Any:
+        """Decode JSON, moving large bodies off the event loop"""
+        if len(self.content) >= LARGE_BODY_BYTES:
+            return await asyncio.to_thread(decode_json, self.content)
+        return decode_json(self.content)
+
+    def raise_for_status(self):
+        if not self.is_success:
+            raise httpx.HTTPStatusError(
+                f"HTTP {self.status_code} for url {self.url}",
+                request=self.raw.request,
+                response=self.raw,
+            )
+
+
+class SharedHTTPTransport:
+    """Process-wide HTTP client layer shared by all data connectors"""
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 20,
+        max_keepalive_per_host: int = 10,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 30.0,
+        http2: Optional[bool] = None,
+        default_headers: Optional[Dict[str, str]] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.default_headers = default_headers or {
+            "User-Agent": "A1Betting/1.0",
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        }
+        self.provider_limits: Dict[str, ProviderLimits] = dict(DEFAULT_PROVIDER_LIMITS)
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._pacing_locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def configure_provider(
+        self, provider: str, max_concurrency: int = 10, min_interval: float = 0.0
+    ):
+        """Set concurrency/pacing limits for a provider (takes effect for new requests)"""
+        self.provider_limits[provider] = ProviderLimits(max_concurrency, min_interval)
+        self._semaphores.pop(provider, None)
+
+    def _client_for(self, url: str) -> Tuple[str, httpx.AsyncClient]:
+        parts = urlsplit(url)
+        pool_key = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(pool_key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                headers=self.default_headers,
+            )
+            self._clients[pool_key] = client
+        return parts.netloc, client
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            limits = self.provider_limits.get(provider, ProviderLimits())
+            semaphore = asyncio.Semaphore(limits.max_concurrency)
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    async def _pace(self, provider: str):
+        limits = self.provider_limits.get(provider)
+        if not limits or limits.min_interval <= 0:
+            return
+        lock = self._pacing_locks.setdefault(provider, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            wait = self._next_start.get(provider, 0.0) - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_start[provider] = max(now, now + wait) + limits.min_interval
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        provider: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json_body: Any = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> TransportResponse:
+        """Send a request through the host's pool within the provider's limits"""
+        host, client = self._client_for(url)
+        provider = provider or host
+        histogram = self.latency.setdefault(host, LatencyHistogram())
+
+        async with self._semaphore(provider):
+            await self._pace(provider)
+            start = time.perf_counter()
+            failed = True
+            try:
+                async with client.stream(
+                    method,
+                    url,
+                    params=params,
+                    headers=headers,
+                    json=json_body,
+                    timeout=timeout if timeout is not None else self.timeout,
+                ) as response:
+                    content = await self._read_body(response, max_bytes)
+                failed = response.is_error
+            finally:
+                elapsed = time.perf_counter() - start
+                histogram.record(elapsed, error=failed)
+
+        return TransportResponse(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            url=str(response.url),
+            elapsed=elapsed,
+            raw=response,
+        )
+
+    @staticmethod
+    async def _read_body(response: httpx.Response, max_bytes: Optional[int]) -> bytes:
+        if response.is_error:
+            # Error bodies are small; read them onto the response for callers' logs
+            return await response.aread()
+
+        declared = response.headers.get("Content-Length")
+        if max_bytes is not None and declared and int(declared) > max_bytes:
+            raise ResponseTooLargeError(
+                f"Response from {response.url} declares {declared} bytes (limit {max_bytes})"
+            )
+
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            if max_bytes is not None and len(buffer) > max_bytes:
+                raise ResponseTooLargeError(
+                    f"Response from {response.url} exceeded {max_bytes} bytes"
+                )
+        return bytes(buffer)
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        provider: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Any:
+        """GET and decode JSON; raises httpx.HTTPStatusError on non-2xx"""
+        response = await self.request(
+            "GET",
+            url,
+            provider=provider,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            max_bytes=max_bytes,
+        )
+        response.raise_for_status()
+        return await response.json_async()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-host latency histograms and pool/provider configuration"""
+        return {
+            "http2": self.http2,
+            "pools": sorted(self._clients),
+            "providers": {
+                name: {
+                    "max_concurrency": limits.max_concurrency,
+                    "min_interval": limits.min_interval,
+                }
+                for name, limits in self.provider_limits.items()
+            },
+            "latency": {host: h.stats() for host, h in self.latency.items()},
+        }
+
+    async def close(self):
+        """Close every pooled client"""
+        clients: List[httpx.AsyncClient] = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+# Global instance
+http_transport = SharedHTTPTransport()
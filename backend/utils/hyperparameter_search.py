@@ -0,0 +1,370 @@
+"""Parallel model evaluation and persisted Optuna searches for ensembles.
+
+:func:`evaluate_models` fits candidate estimators in a process pool. The
+training and validation arrays go to each worker once, through the pool
+initializer, not once per model. Each worker's estimators are limited to
+their share of the CPUs, so the workers together do not oversubscribe the
+machine. Workers are spawned rather than forked, since forking a parent
+that already runs OpenMP or TensorFlow threads can deadlock. The worker entry
+points live in this module, so a spawned worker does not import the
+optimizer that uses them.
+
+:func:`optimize_weights` searches ensemble weights with Optuna:
+
+- Trials run ``n_jobs`` at a time.
+- Each trial reports its score on a growing share of the validation set, so
+  the median or Hyperband pruner can stop weak weightings early.
+- With a SQLite ``storage_path`` (by default ``optuna_studies.db`` in the
+  configured model directory), studies survive restarts. A study is keyed
+  on the model set and a fingerprint of the predictions and targets, so the
+  sampler and pruner only learn from trials scored on the same inputs. When
+  the inputs change, the new study first re-tries the previous best weights
+  as a fresh trial and the stale study is deleted.
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.metrics import (
+    explained_variance_score,
+    mean_absolute_error,
+    mean_squared_error,
+    median_absolute_error,
+    r2_score,
+)
+from sklearn.model_selection import KFold, cross_val_predict
+
+try:
+    import optuna
+except ImportError:  # pragma: no cover - optional dependency
+    optuna = None
+
+logger = logging.getLogger(__name__)
+
+# Estimator parameters that set native thread counts (sklearn, catboost, xgboost)
+THREAD_PARAMS = ("n_jobs", "thread_count", "nthread")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def default_study_storage() -> str:
+    """SQLite file for persisted studies, in the configured model directory
+
+    A relative ``model_path`` is resolved against the backend directory, not
+    the working directory, so every entry point shares one study file.
+    """
+    from config import config
+
+    model_dir = Path(config.model_path)
+    if not model_dir.is_absolute():
+        model_dir = BACKEND_DIR / model_dir
+    return str(model_dir / "optuna_studies.db")
+
+
+@dataclass
+class ParallelSearchSettings:
+    """How an optimizer spreads model fits and weight searches over the machine"""
+
+    enabled: bool = False
+    max_workers: Optional[int] = None  # processes; defaults to the CPU count
+    optuna_jobs: int = 4  # concurrent Optuna trials
+    n_trials: int = 100
+    pruner: str = "median"  # "median", "hyperband" or "none"
+    pruning_steps: int = 4  # validation slices a trial reports on
+    storage_path: Optional[str] = field(default_factory=default_study_storage)
+    timeout: float = 300.0  # seconds to wait for all model evaluations
+
+
+@dataclass
+class ModelEvaluation:
+    """A fitted estimator with its validation predictions and scores"""
+
+    name: str
+    model: Any = None
+    predictions: Optional[np.ndarray] = None
+    oof_predictions: Optional[np.ndarray] = None  # cross-validated, on the training set
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def limit_threads(model: Any, threads: int) -> Any:
+    """Cap an estimator's native parallelism in place"""
+    if hasattr(model, "get_params"):
+        params = model.get_params(deep=False)
+        updates = {name: threads for name in THREAD_PARAMS if name in params}
+        if updates:
+            model.set_params(**updates)
+    return model
+
+
+def fit_and_score(
+    name: str,
+    model: Any,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    cv_folds: int = 5,
+    cv_jobs: Optional[int] = -1,
+) -> ModelEvaluation:
+    """Fit ``model``, predict the validation set and cross-validate
+
+    Folds are unshuffled K-fold, the split ``OOFPredictionCache`` uses, so
+    the returned out-of-fold predictions can be stored in that cache.
+    """
+    try:
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        training_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        y_pred = np.ravel(model.predict(X_val))
+        prediction_time = time.perf_counter() - started
+
+        # One pass over the folds yields both the CV scores and the
+        # out-of-fold predictions that weighting and stacking reuse
+        folds = list(KFold(n_splits=cv_folds).split(X_train))
+        oof_predictions = np.ravel(
+            cross_val_predict(model, X_train, y_train, cv=folds, n_jobs=cv_jobs)
+        )
+        cv_scores = np.array(
+            [r2_score(np.asarray(y_train)[test], oof_predictions[test]) for _, test in folds]
+        )
+
+        feature_importance = {}
+        if hasattr(model, "feature_importances_"):
+            feature_importance = {
+                f"feature_{i}": float(importance)
+                for i, importance in enumerate(model.feature_importances_)
+            }
+        elif hasattr(model, "coef_"):
+            feature_importance = {
+                f"feature_{i}": float(abs(coef))
+                for i, coef in enumerate(np.ravel(model.coef_))
+            }
+
+        directional_accuracy = 0.5
+        if len(y_val) >= 2:
+            directional_accuracy = float(
+                np.mean((np.diff(y_val) > 0) == (np.diff(y_pred) > 0))
+            )
+
+        metrics = {
+            "mse": mean_squared_error(y_val, y_pred),
+            "mae": mean_absolute_error(y_val, y_pred),
+            "r2_score": r2_score(y_val, y_pred),
+            "explained_variance": explained_variance_score(y_val, y_pred),
+            "median_absolute_error": median_absolute_error(y_val, y_pred),
+            "max_error": float(np.max(np.abs(y_val - y_pred))),
+            "cv_scores": cv_scores.tolist(),
+            "training_time": training_time,
+            "prediction_time": prediction_time,
+            "feature_importance": feature_importance,
+            "directional_accuracy": directional_accuracy,
+        }
+        return ModelEvaluation(name, model, y_pred, oof_predictions, metrics)
+
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return ModelEvaluation(name, error=f"{type(e).__name__}: {e}")
+
+
+# Data shared by every task of one pool, set by the initializer in each worker
+_worker_data: Tuple[Any, ...] = ()
+
+
+def _init_worker(X_train, y_train, X_val, y_val, cv_folds):
+    global _worker_data
+    _worker_data = (X_train, y_train, X_val, y_val, cv_folds)
+
+
+def _evaluate_in_worker(name: str, model: Any, threads: int) -> ModelEvaluation:
+    X_train, y_train, X_val, y_val, cv_folds = _worker_data
+    limit_threads(model, threads)
+    return fit_and_score(
+        name, model, X_train, y_train, X_val, y_val, cv_folds, cv_jobs=1
+    )
+
+
+def evaluate_models(
+    models: Dict[str, Any],
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    max_workers: Optional[int] = None,
+    cv_folds: int = 5,
+    timeout: Optional[float] = 300.0,
+    start_method: str = "spawn",
+) -> Dict[str, ModelEvaluation]:
+    """Fit and score every model in a process pool; failures are reported, not raised"""
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cpus, len(models)))
+    threads = max(1, cpus // workers)
+    results: Dict[str, ModelEvaluation] = {}
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=_init_worker,
+        initargs=(X_train, y_train, X_val, y_val, cv_folds),
+    )
+    timed_out = False
+    try:
+        futures = {
+            executor.submit(_evaluate_in_worker, name, model, threads): name
+            for name, model in models.items()
+        }
+        for future in as_completed(futures, timeout=timeout):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                results[name] = ModelEvaluation(name, error=f"{type(e).__name__}: {e}")
+    except TimeoutError:
+        timed_out = True
+        for name in models:
+            results.setdefault(name, ModelEvaluation(name, error="timed out"))
+    finally:
+        # Do not wait on fits that overran; their results are discarded
+        executor.shutdown(wait=not timed_out, cancel_futures=True)
+
+    return results
+
+
+def study_name(models: Sequence[str], prefix: str = "ensemble_weights") -> str:
+    """Stable study name for a set of models, independent of their order"""
+    digest = hashlib.blake2b("\0".join(sorted(models)).encode(), digest_size=8)
+    return f"{prefix}-{digest.hexdigest()}"
+
+
+def inputs_fingerprint(
+    models: Sequence[str], predictions: Dict[str, np.ndarray], y_true: np.ndarray
+) -> str:
+    """Digest of the predictions and targets a weight search is scored on"""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in sorted(models):
+        column = np.ascontiguousarray(np.ravel(predictions[name]), dtype=float)
+        digest.update(f"{name}:{column.shape};".encode())
+        digest.update(column.data)
+    digest.update(np.ascontiguousarray(np.ravel(y_true), dtype=float).data)
+    return digest.hexdigest()
+
+
+def _previous_best(storage: str, prefix: str, current: str) -> Optional[Dict[str, float]]:
+    """Best params of the model set's stale studies, which are then deleted"""
+    best = None
+    for name in optuna.study.get_all_study_names(storage):
+        # Studies stored before inputs were fingerprinted are named by the prefix alone
+        if name == current or not (name == prefix or name.startswith(f"{prefix}-")):
+            continue
+        stale = optuna.load_study(study_name=name, storage=storage)
+        finished = [
+            t
+            for t in stale.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+            if np.isfinite(t.value)
+        ]
+        if finished:
+            trial = min(finished, key=lambda t: t.value)
+            # The most recently run stale study wins
+            if best is None or trial.datetime_complete > best.datetime_complete:
+                best = trial
+        optuna.delete_study(study_name=name, storage=storage)
+    return best.params if best is not None else None
+
+
+def make_pruner(kind: str, steps: int):
+    if kind == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if kind == "hyperband":
+        return optuna.pruners.HyperbandPruner(min_resource=1, max_resource=steps)
+    return optuna.pruners.NopPruner()
+
+
+def optimize_weights(
+    models: List[str],
+    predictions: Dict[str, np.ndarray],
+    y_true: np.ndarray,
+    n_trials: int = 100,
+    n_jobs: int = 1,
+    pruner: str = "median",
+    pruning_steps: int = 4,
+    storage_path: Optional[str] = None,
+    seed: Optional[int] = None,
+) -> Tuple[Dict[str, float], "optuna.Study"]:
+    """Normalized ensemble weights that maximize validation R²"""
+    if optuna is None:
+        raise ImportError("optuna is required for Bayesian weight optimization")
+
+    # Rows in a fixed random order: trials are scored on a growing prefix, and
+    # predictions for the next slice are only computed if the trial survives
+    order = np.random.default_rng(0).permutation(len(y_true))
+    y_true = np.asarray(y_true, dtype=float)[order]
+    matrix = np.column_stack([np.ravel(predictions[m]) for m in models])[order]
+    stops = np.linspace(0, len(y_true), pruning_steps + 1).astype(int)[1:]
+
+    def weights_of(params: Dict[str, float]) -> np.ndarray:
+        return np.array([params[f"weight_{m}"] for m in models])
+
+    def objective(trial):
+        weights = np.array([trial.suggest_float(f"weight_{m}", 0.0, 1.0) for m in models])
+        total = weights.sum()
+        if total == 0:
+            return float("inf")
+        weights = weights / total
+        ensemble_pred = np.empty(len(y_true))
+
+        start = 0
+        for step, stop in enumerate(stops[:-1]):
+            ensemble_pred[start:stop] = matrix[start:stop] @ weights
+            start = stop
+            if stop < 2:
+                continue
+            trial.report(-r2_score(y_true[:stop], ensemble_pred[:stop]), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        ensemble_pred[start:] = matrix[start:] @ weights
+        # Return negative R² (since we want to maximize)
+        return -r2_score(y_true, ensemble_pred)
+
+    # Stored trials are only reused when they were scored on these inputs
+    prefix = study_name(models)
+    name = f"{prefix}-{inputs_fingerprint(models, predictions, y_true)}"
+    storage = None
+    if storage_path:
+        Path(storage_path).parent.mkdir(parents=True, exist_ok=True)
+        storage = optuna.storages.RDBStorage(f"sqlite:///{storage_path}")
+    study = optuna.create_study(
+        study_name=name,
+        storage=storage,
+        load_if_exists=True,
+        direction="minimize",
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=make_pruner(pruner, pruning_steps),
+    )
+    if storage is not None:
+        warm_start = _previous_best(storage, prefix, name)
+        if warm_start is not None and not study.trials:
+            # Re-scored as a fresh trial; its old value is not carried over
+            study.enqueue_trial(warm_start)
+            logger.info("Warm-starting %s from the previous best weights", name)
+
+    study.optimize(objective, n_trials=n_trials, n_jobs=n_jobs)
+
+    current = [
+        t
+        for t in study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        if np.isfinite(t.value)
+    ]
+    if not current:
+        return {m: 1.0 / len(models) for m in models}, study
+    weights = weights_of(min(current, key=lambda t: t.value).params)
+    weights = weights / weights.sum()
+    return dict(zip(models, weights.tolist())), study
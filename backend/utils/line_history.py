@@ -0,0 +1,187 @@
+"""Per-market odds history for line-movement detectors.
+
+:class:`LineHistoryIndex` keeps the last ``capacity`` quotes of every market
+in one preallocated 2-D ring: one row per market, with an odds array and a
+timestamp array. Appending a quote is O(1). That holds for a whole board
+too: one fancy-indexed write covers every market in the snapshot.
+
+:meth:`LineHistoryIndex.window` returns first, last, min, max and velocity
+for many rows at once. The window is either the last ``points`` quotes or the
+last ``seconds`` of history. It is computed with array operations over the
+``(rows, capacity)`` block, so a detector scores the whole board in one pass
+instead of rebuilding a list per market.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Sequence, Union
+
+import numpy as np
+
+Timestamp = Union[datetime, float, int]
+
+
+def _seconds(timestamp: Timestamp) -> float:
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+@dataclass
+class LineWindow:
+    """Rolling aggregates for a set of rows; every field is an array per row"""
+
+    count: np.ndarray
+    first: np.ndarray
+    last: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    first_time: np.ndarray
+    last_time: np.ndarray
+
+    @property
+    def movement(self) -> np.ndarray:
+        """Relative change from the first to the last quote in the window"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 0, (self.last - self.first) / self.first, 0.0)
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """Odds change per second across the window (0 for a single quote)"""
+        elapsed = self.last_time - self.first_time
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(elapsed > 0, (self.last - self.first) / elapsed, 0.0)
+
+
+class LineHistoryIndex:
+    """Fixed-depth odds history per market key, stored row-wise"""
+
+    def __init__(self, capacity: int = 64, initial_rows: int = 256):
+        self.capacity = capacity
+        self.rows: Dict[Hashable, int] = {}
+        self._free: List[int] = []
+        self.odds = np.zeros((initial_rows, capacity))
+        self.timestamps = np.zeros((initial_rows, capacity))
+        # Quotes ever written per row; the next one goes to slot written % capacity
+        self.written = np.zeros(initial_rows, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def row(self, key: Hashable) -> int:
+        """Row for ``key``, allocated on first use"""
+        row = self.rows.get(key)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self.rows)
+                if row >= len(self.written):
+                    self._grow()
+            self.written[row] = 0
+            self.rows[key] = row
+        return row
+
+    def _grow(self):
+        self.odds = np.vstack([self.odds, np.zeros_like(self.odds)])
+        self.timestamps = np.vstack([self.timestamps, np.zeros_like(self.timestamps)])
+        self.written = np.concatenate([self.written, np.zeros_like(self.written)])
+
+    def append(self, key: Hashable, odds: float, timestamp: Timestamp) -> bool:
+        """Record a quote; quotes not newer than the row's latest are ignored"""
+        row = self.row(key)
+        timestamp = _seconds(timestamp)
+        written = self.written[row]
+        if written and timestamp <= self.timestamps[row, (written - 1) % self.capacity]:
+            return False
+        slot = written % self.capacity
+        self.odds[row, slot] = odds
+        self.timestamps[row, slot] = timestamp
+        self.written[row] = written + 1
+        return True
+
+    def append_board(
+        self,
+        keys: Sequence[Hashable],
+        odds: Sequence[float],
+        timestamps: Sequence[Timestamp],
+    ) -> np.ndarray:
+        """Record one quote per key (a board snapshot); returns the rows"""
+        rows = np.fromiter((self.row(key) for key in keys), dtype=np.int64, count=len(keys))
+        if len(np.unique(rows)) != len(rows):
+            # Several quotes for one market must land in order
+            for key, price, timestamp in zip(keys, odds, timestamps):
+                self.append(key, price, timestamp)
+            return rows
+
+        times = np.fromiter((_seconds(t) for t in timestamps), dtype=float, count=len(rows))
+        written = self.written[rows]
+        latest = self.timestamps[rows, (written - 1) % self.capacity]
+        fresh = (written == 0) | (times > latest)
+        target = rows[fresh]
+        slots = written[fresh] % self.capacity
+        self.odds[target, slots] = np.asarray(odds, dtype=float)[fresh]
+        self.timestamps[target, slots] = times[fresh]
+        self.written[target] += 1
+        return rows
+
+    def window(
+        self,
+        rows: Union[Sequence[int], np.ndarray],
+        points: Optional[int] = None,
+        seconds: Optional[float] = None,
+        now: Optional[Timestamp] = None,
+    ) -> LineWindow:
+        """Aggregates over the last ``points`` quotes and/or ``seconds`` before ``now``"""
+        rows = np.asarray(rows, dtype=np.int64)
+        written = self.written[rows]
+        # Age 0 is the latest quote of each row
+        ages = (written[:, None] - 1 - np.arange(self.capacity)[None, :]) % self.capacity
+        depth = np.minimum(written, self.capacity)
+        if points is not None:
+            depth = np.minimum(depth, points)
+        mask = ages < depth[:, None]
+
+        odds = self.odds[rows]
+        timestamps = self.timestamps[rows]
+        if seconds is not None:
+            if now is None:
+                now = timestamps.max(initial=0.0)
+            mask &= timestamps >= _seconds(now) - seconds
+
+        count = mask.sum(axis=1)
+        first_slot = np.argmax(np.where(mask, ages, -1), axis=1)[:, None]
+        last_slot = np.argmin(np.where(mask, ages, self.capacity), axis=1)[:, None]
+        empty = count == 0
+        return LineWindow(
+            count=count,
+            first=np.where(empty, np.nan, np.take_along_axis(odds, first_slot, 1)[:, 0]),
+            last=np.where(empty, np.nan, np.take_along_axis(odds, last_slot, 1)[:, 0]),
+            low=np.where(mask, odds, np.inf).min(axis=1),
+            high=np.where(mask, odds, -np.inf).max(axis=1),
+            first_time=np.take_along_axis(timestamps, first_slot, 1)[:, 0],
+            last_time=np.take_along_axis(timestamps, last_slot, 1)[:, 0],
+        )
+
+    def recent(self, key: Hashable, points: Optional[int] = None) -> List[float]:
+        """Latest ``points`` quotes of one market, oldest first"""
+        row = self.rows.get(key)
+        if row is None:
+            return []
+        written = int(self.written[row])
+        depth = min(written, self.capacity, points or self.capacity)
+        slots = np.arange(written - depth, written) % self.capacity
+        return self.odds[row, slots].tolist()
+
+    def prune(self, older_than: Timestamp) -> int:
+        """Free the rows of markets with no quote since ``older_than``"""
+        cutoff = _seconds(older_than)
+        stale = [
+            key
+            for key, row in self.rows.items()
+            if not self.written[row]
+            or self.timestamps[row, (self.written[row] - 1) % self.capacity] < cutoff
+        ]
+        for key in stale:
+            self._free.append(self.rows.pop(key))
+        return len(stale)
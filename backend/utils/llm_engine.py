@@ -3,9 +3,12 @@ Automatically discovers available models and selects the best one for embedding
 """
 
 import asyncio
+import hashlib
+import json
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import httpx
 from config import config, config_manager
@@ -23,10 +26,26 @@ class BaseLLMClient:
         raise NotImplementedError
 
     async def generate(
-        self, prompt: str, max_tokens: int = 100, temperature: float = 0.7
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
     ) -> str:
         raise NotImplementedError
 
+    async def stream_generate(
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield completion chunks; providers without streaming yield one chunk."""
+        yield await self.generate(
+            prompt, max_tokens=max_tokens, temperature=temperature, model=model
+        )
+
 
 class OllamaClient(BaseLLMClient):
     def __init__(self, url: str, timeout: int):
@@ -54,25 +73,62 @@ class OllamaClient(BaseLLMClient):
         return embeddings
 
     async def generate(
-        self, prompt: str, max_tokens: int = 100, temperature: float = 0.7
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
     ) -> str:
-        model = self.select_model("generation")
         # Use correct Ollama generate endpoint
         resp = await self.client.post(
             f"{self.base}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                }
-            },
+            json=self._generate_payload(prompt, max_tokens, temperature, model, False),
         )
         resp.raise_for_status()
         return resp.json()["response"]
 
+    async def stream_generate(
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        # Ollama streams newline-delimited JSON objects, one per token batch
+        async with self.client.stream(
+            "POST",
+            f"{self.base}/api/generate",
+            json=self._generate_payload(prompt, max_tokens, temperature, model, True),
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                chunk = data.get("response", "")
+                if chunk:
+                    yield chunk
+                if data.get("done"):
+                    break
+
+    def _generate_payload(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str],
+        stream: bool,
+    ) -> Dict[str, Any]:
+        return {
+            "model": model or self.select_model("generation"),
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+            },
+        }
+
     def select_model(self, task: str) -> str:
         # placeholder; actual selection delegated to LLMEngine override
         # fallback to default configured model
@@ -102,12 +158,16 @@ class LMStudioClient(BaseLLMClient):
         return embeddings
 
     async def generate(
-        self, prompt: str, max_tokens: int = 100, temperature: float = 0.7
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
     ) -> str:
         resp = await self.client.post(
             f"{self.base}/v1/completions",
             json={
-                "model": self.select_model("generation"),
+                "model": model or self.select_model("generation"),
                 "prompt": prompt,
                 "max_tokens": max_tokens,
                 "temperature": temperature,
@@ -116,6 +176,108 @@ class LMStudioClient(BaseLLMClient):
         resp.raise_for_status()
         return resp.json()["choices"][0]["text"]
 
+    async def stream_generate(
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        # OpenAI-compatible server-sent events: "data: {...}" until "data: [DONE]"
+        async with self.client.stream(
+            "POST",
+            f"{self.base}/v1/completions",
+            json={
+                "model": model or self.select_model("generation"),
+                "prompt": prompt,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "stream": True,
+            },
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:") :].strip()
+                if payload == "[DONE]":
+                    break
+                choices = json.loads(payload).get("choices") or [{}]
+                chunk = choices[0].get("text", "")
+                if chunk:
+                    yield chunk
+
+
+class LLMResponseCache:
+    """LRU cache of completed LLM responses.
+
+    Keys are built from the whitespace-normalized prompt, the model and the
+    sampling parameters, so the same tooltip/explanation prompt rendered for
+    different users maps to one entry. Each entry remembers the prediction
+    version it was generated for; a lookup with a different version is a miss,
+    which ties the entry's lifetime to the prediction it explains. ``ttl`` is
+    an upper bound for entries without a version.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 900):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, Optional[str], float]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        prompt: str, model: Optional[str], max_tokens: int, temperature: float
+    ) -> str:
+        normalized = " ".join(prompt.split())
+        raw = json.dumps(
+            [normalized, model or "", int(max_tokens), round(float(temperature), 4)]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        text, entry_version, stored_at = entry
+        if entry_version != version or time.time() - stored_at > self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return text
+
+    def set(self, key: str, text: str, version: Optional[str] = None) -> None:
+        self._entries[key] = (text, version, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate_version(self, version: str) -> int:
+        """Drop every entry generated for ``version``; returns the number removed."""
+        stale = [k for k, (_, v, _) in self._entries.items() if v == version]
+        for k in stale:
+            del self._entries[k]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
 
 class LLMEngine:
     """Unified engine to select and call the best local LLM."""
@@ -140,16 +302,21 @@ class LLMEngine:
         self.client.select_model = self._get_task_model
         self.models: List[str] = []
         self.task_model_map: Dict[str, str] = {}
-        # Start background model discovery
-        # Ensure the asyncio.create_task is wrapped in a running event loop
+        # Completed responses, shared across users requesting the same prompt
+        self.response_cache = LLMResponseCache(
+            maxsize=cfg.llm_response_cache_size, ttl=cfg.llm_response_cache_ttl
+        )
+        # Identical prompts already being generated for a prediction version;
+        # later callers await these
+        self._inflight: Dict[Tuple[str, Optional[str]], "asyncio.Task[str]"] = {}
+        # Start background model discovery when constructed inside a running
+        # loop; at import time there is none, and blocking startup on an HTTP
+        # round trip to the LLM server is not worth it: callers refresh the
+        # (stale) model list on first use
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.refresh_models())
-            else:
-                loop.run_until_complete(self.refresh_models())
+            asyncio.get_running_loop()
+            asyncio.create_task(self.refresh_models())
         except RuntimeError:
-            # No event loop running, will refresh on first use
             pass
 
     async def refresh_models(self):
@@ -191,15 +358,157 @@ class LLMEngine:
         return embeddings
 
     async def generate_text(
-        self, prompt: str, max_tokens: int = 100, temperature: float = 0.7
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        prediction_version: Optional[str] = None,
+        use_cache: bool = False,
     ) -> str:
-        """Generate text using the selected generation model."""
+        """Generate text using the selected generation model.
+
+        With ``use_cache`` (meant for deterministic explanation prompts),
+        responses are served from ``response_cache`` when the same prompt was
+        already completed for the same model, parameters and prediction
+        version, and concurrent identical requests share a single upstream
+        call. Free-form generation is never cached.
+        """
+        if time.time() - self.last_model_refresh > self.models_cache_ttl:
+            await self.refresh_models()
+        if not use_cache:
+            return await self.client.generate(
+                prompt, max_tokens=max_tokens, temperature=temperature, model=model
+            )
+
+        key = self._cache_key(prompt, max_tokens, temperature, model)
+        cached = self.response_cache.get(key, prediction_version)
+        if cached is not None:
+            return cached
+        # A caller on another prediction version must not join this generation
+        inflight_key = (key, prediction_version)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            # The upstream call runs in its own task so that one caller being
+            # cancelled does not cancel it for the others awaiting it
+            task = asyncio.create_task(
+                self._generate_shared(
+                    key, prompt, max_tokens, temperature, model, prediction_version
+                )
+            )
+            # Retrieve the outcome so a failure nobody awaits is not logged as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[inflight_key] = task
+        return await asyncio.shield(task)
+
+    async def _generate_shared(
+        self,
+        key: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str],
+        prediction_version: Optional[str],
+    ) -> str:
+        """Generate and cache one completion on behalf of every waiting caller."""
+        try:
+            text = await self.client.generate(
+                prompt, max_tokens=max_tokens, temperature=temperature, model=model
+            )
+        finally:
+            self._inflight.pop((key, prediction_version), None)
+        self.response_cache.set(key, text, prediction_version)
+        return text
+
+    async def stream_text(
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        prediction_version: Optional[str] = None,
+        use_cache: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream generated text chunks as the provider produces them.
+
+        With ``use_cache``, a cached response is replayed as a single chunk and
+        a stream that runs to completion is stored in the response cache; an
+        interrupted one is not.
+        """
         if time.time() - self.last_model_refresh > self.models_cache_ttl:
             await self.refresh_models()
-        return await self.client.generate(
-            prompt, max_tokens=max_tokens, temperature=temperature
+        if not use_cache:
+            async for chunk in self.client.stream_generate(
+                prompt, max_tokens=max_tokens, temperature=temperature, model=model
+            ):
+                yield chunk
+            return
+
+        key = self._cache_key(prompt, max_tokens, temperature, model)
+        cached = self.response_cache.get(key, prediction_version)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks: List[str] = []
+        async for chunk in self.client.stream_generate(
+            prompt, max_tokens=max_tokens, temperature=temperature, model=model
+        ):
+            chunks.append(chunk)
+            yield chunk
+        self.response_cache.set(key, "".join(chunks), prediction_version)
+
+    async def generate_explanation(
+        self,
+        prompt: Union[str, Dict[str, Any]],
+        model: Optional[str] = None,
+        prediction_version: Optional[str] = None,
+        max_tokens: int = 300,
+        temperature: float = 0.3,
+    ) -> str:
+        """Generate an explanation from a text or structured (agent-built) prompt."""
+        return await self.generate_text(
+            self._render_prompt(prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            model=model,
+            prediction_version=prediction_version,
+            use_cache=True,
+        )
+
+    async def stream_generate(
+        self,
+        prompt: Union[str, Dict[str, Any]],
+        model: Optional[str] = None,
+        prediction_version: Optional[str] = None,
+        max_tokens: int = 300,
+        temperature: float = 0.3,
+    ) -> AsyncIterator[str]:
+        """Streaming counterpart of :meth:`generate_explanation`."""
+        async for chunk in self.stream_text(
+            self._render_prompt(prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            model=model,
+            prediction_version=prediction_version,
+            use_cache=True,
+        ):
+            yield chunk
+
+    def _cache_key(
+        self, prompt: str, max_tokens: int, temperature: float, model: Optional[str]
+    ) -> str:
+        return self.response_cache.make_key(
+            prompt, model or self._get_task_model("generation"), max_tokens, temperature
         )
 
+    @staticmethod
+    def _render_prompt(prompt: Union[str, Dict[str, Any]]) -> str:
+        if isinstance(prompt, str):
+            return prompt
+        # Stable rendering so equal structured prompts share a cache key
+        return json.dumps(prompt, sort_keys=True, default=str)
+
     def _get_task_model(self, task: str) -> str:
         """Return default override or engine-chosen model for task."""
         # Use runtime override if provided
@@ -222,6 +531,7 @@ class LLMEngine:
         line: float,
         odds: str,
         context_data: Optional[Dict[str, Any]] = None,
+        prediction_version: Optional[str] = None,
     ) -> str:
         """Analyze a prop bet and provide intelligent insights."""
         context = context_data or {}
@@ -245,12 +555,19 @@ class LLMEngine:
         Keep response focused and actionable.
         """
 
-        return await self.generate_text(prompt, max_tokens=200, temperature=0.3)
+        return await self.generate_text(
+            prompt,
+            max_tokens=200,
+            temperature=0.3,
+            prediction_version=prediction_version,
+            use_cache=True,
+        )
 
     async def explain_prediction_confidence(
         self,
         prediction_data: Dict[str, Any],
         shap_values: Optional[Dict[str, float]] = None,
+        prediction_version: Optional[str] = None,
     ) -> str:
         """Explain why a prediction has certain confidence level using SHAP data."""
         shap_info = ""
@@ -274,7 +591,13 @@ class LLMEngine:
         Use simple language that any bettor would understand.
         """
 
-        return await self.generate_text(prompt, max_tokens=150, temperature=0.2)
+        return await self.generate_text(
+            prompt,
+            max_tokens=150,
+            temperature=0.2,
+            prediction_version=prediction_version,
+            use_cache=True,
+        )
 
     async def chat_response(
         self, user_message: str, context: Optional[Dict[str, Any]] = None
@@ -297,18 +620,45 @@ class LLMEngine:
         return await self.generate_text(prompt, max_tokens=250, temperature=0.4)
 
     async def generate_tooltip_explanation(
-        self, term: str, betting_context: str = ""
+        self,
+        term: str,
+        betting_context: str = "",
+        prediction_version: Optional[str] = None,
     ) -> str:
         """Generate tooltip-style explanations for betting terms and concepts."""
-        prompt = f"""
+        return await self.generate_text(
+            self._tooltip_prompt(term, betting_context),
+            max_tokens=60,
+            temperature=0.1,
+            prediction_version=prediction_version,
+            use_cache=True,
+        )
+
+    async def stream_tooltip_explanation(
+        self,
+        term: str,
+        betting_context: str = "",
+        prediction_version: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Streaming counterpart of :meth:`generate_tooltip_explanation`."""
+        async for chunk in self.stream_text(
+            self._tooltip_prompt(term, betting_context),
+            max_tokens=60,
+            temperature=0.1,
+            prediction_version=prediction_version,
+            use_cache=True,
+        ):
+            yield chunk
+
+    @staticmethod
+    def _tooltip_prompt(term: str, betting_context: str) -> str:
+        return f"""
         Provide a brief, clear explanation of "{term}" in sports betting context.
         {f"Context: {betting_context}" if betting_context else ""}
 
         Keep it under 50 words, suitable for a tooltip.
         """
 
-        return await self.generate_text(prompt, max_tokens=60, temperature=0.1)
-
 
 # Singleton
 llm_engine = LLMEngine()
@@ -0,0 +1,281 @@
+"""In-memory time-series store for system metrics.
+
+Each series keeps a preallocated ring of raw ``(timestamp, value)`` samples
+plus rollup rings at 1 second, 1 minute and 1 hour resolution. A rollup
+bucket holds count, mean, sum of squared deviations from the mean (M2), min,
+max and a :class:`DDSketch` of the values that fell into it. Recording a
+sample is O(1) (array writes plus one sketch update per level), and a
+statistics query only touches the buckets of one rollup level.
+
+Mean and M2 are updated with Welford's method and buckets are combined with
+Chan et al.'s parallel formula, so the standard deviation of large values
+with a small spread (timestamps, byte counters) is not lost to cancellation.
+
+``DDSketch`` (Masson et al., VLDB 2019) keeps counts in logarithmically
+spaced buckets, so every quantile it returns is within ``relative_accuracy``
+of the true sample quantile. Sketches merge by adding bucket counts, which is
+what lets an hour-long query combine sixty one-minute buckets instead of
+re-reading every sample.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (resolution seconds, number of buckets kept): 1h of seconds, 1d of minutes,
+# 30d of hours
+DEFAULT_ROLLUPS: Tuple[Tuple[int, int], ...] = ((1, 3600), (60, 1440), (3600, 720))
+DEFAULT_RAW_CAPACITY = 4096
+# Queries pick the finest rollup that answers in at most this many buckets
+MAX_QUERY_BUCKETS = 600
+
+
+class DDSketch:
+    """Mergeable quantile sketch with relative-error guarantees"""
+
+    __slots__ = (
+        "relative_accuracy",
+        "gamma",
+        "_log_gamma",
+        "positive",
+        "negative",
+        "zero_count",
+        "count",
+    )
+
+    # Magnitudes below this are counted as zero
+    MIN_INDEXABLE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of the bucket (gamma^(k-1), gamma^k]
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def add(self, value: float, weight: int = 1):
+        if value > self.MIN_INDEXABLE:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + weight
+        elif value < -self.MIN_INDEXABLE:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + weight
+        else:
+            self.zero_count += weight
+        self.count += weight
+
+    def merge(self, other: "DDSketch"):
+        """Add ``other``'s counts into this sketch; accuracies must match"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, n in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + n
+        for key, n in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        rank = q * (self.count - 1)
+        running = 0
+        # Most negative values first: largest magnitude key first
+        for key in sorted(self.negative, reverse=True):
+            running += self.negative[key]
+            if running > rank:
+                return -self._value(key)
+        running += self.zero_count
+        if running > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            running += self.positive[key]
+            if running > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+
+class _Rollup:
+    """Ring of fixed-width time buckets with per-bucket aggregates and sketches"""
+
+    def __init__(self, resolution: int, slots: int, relative_accuracy: float):
+        self.resolution = resolution
+        self.slots = slots
+        self.relative_accuracy = relative_accuracy
+        self.bucket = np.full(slots, -1, dtype=np.int64)  # bucket number held per slot
+        self.count = np.zeros(slots, dtype=np.int64)
+        self.mean = np.zeros(slots)
+        self.m2 = np.zeros(slots)
+        self.min = np.zeros(slots)
+        self.max = np.zeros(slots)
+        self.sketches: List[Optional[DDSketch]] = [None] * slots
+
+    @property
+    def retention(self) -> int:
+        return self.resolution * self.slots
+
+    def add(self, timestamp: float, value: float):
+        bucket = int(timestamp // self.resolution)
+        slot = bucket % self.slots
+        if self.bucket[slot] != bucket:
+            if self.bucket[slot] > bucket:
+                return  # older than anything this ring still keeps
+            self.bucket[slot] = bucket
+            self.count[slot] = 0
+            self.mean[slot] = self.m2[slot] = 0.0
+            self.min[slot] = self.max[slot] = value
+            self.sketches[slot] = DDSketch(self.relative_accuracy)
+        self.count[slot] += 1
+        delta = value - self.mean[slot]
+        self.mean[slot] += delta / self.count[slot]
+        self.m2[slot] += delta * (value - self.mean[slot])
+        if value < self.min[slot]:
+            self.min[slot] = value
+        if value > self.max[slot]:
+            self.max[slot] = value
+        self.sketches[slot].add(value)
+
+    def window(self, since: float, until: float) -> np.ndarray:
+        """Slot indices of buckets overlapping ``[since, until]``"""
+        first = int(since // self.resolution)
+        last = int(until // self.resolution)
+        return np.flatnonzero((self.bucket >= first) & (self.bucket <= last))
+
+
+class MetricSeries:
+    """One metric: raw sample ring plus multi-resolution rollups"""
+
+    def __init__(
+        self,
+        raw_capacity: int = DEFAULT_RAW_CAPACITY,
+        rollups: Sequence[Tuple[int, int]] = DEFAULT_ROLLUPS,
+        relative_accuracy: float = 0.01,
+    ):
+        self.capacity = raw_capacity
+        self.timestamps = np.zeros(raw_capacity)
+        self.values = np.zeros(raw_capacity)
+        self.size = 0
+        self._next = 0  # slot the next sample goes to
+        self.rollups = [
+            _Rollup(resolution, slots, relative_accuracy)
+            for resolution, slots in sorted(rollups)
+        ]
+
+    def add(self, timestamp: float, value: float):
+        self.timestamps[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        for rollup in self.rollups:
+            rollup.add(timestamp, value)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self.size:
+            return None
+        i = (self._next - 1) % self.capacity
+        return float(self.timestamps[i]), float(self.values[i])
+
+    def raw(self, since: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Raw samples at or after ``since`` that are still in the ring, oldest first"""
+        if self.size < self.capacity:
+            order = np.arange(self.size)
+        else:
+            order = np.roll(np.arange(self.capacity), -self._next)
+        timestamps = self.timestamps[order]
+        # Samples arrive in time order, so the ring unrolled is sorted
+        start = int(np.searchsorted(timestamps, since, side="left"))
+        return timestamps[start:], self.values[order[start:]]
+
+    def _rollup_for(self, seconds: float) -> _Rollup:
+        for rollup in self.rollups:
+            if rollup.retention >= seconds and seconds / rollup.resolution <= MAX_QUERY_BUCKETS:
+                return rollup
+        return self.rollups[-1]
+
+    def statistics(
+        self,
+        since: float,
+        until: float,
+        quantiles: Sequence[float] = (0.5, 0.95, 0.99),
+    ) -> Dict[str, float]:
+        """Summary of ``[since, until]`` from the rollups
+
+        Buckets are included whole, so the window is widened to the
+        resolution of the rollup used (at most 1/600 of its length, or an hour
+        for windows beyond the 1 minute rollup's day of retention).
+        """
+        rollup = self._rollup_for(until - since)
+        slots = rollup.window(since, until)
+        count = int(rollup.count[slots].sum())
+        if not count:
+            return {"count": 0}
+        counts = rollup.count[slots]
+        means = rollup.mean[slots]
+        mean = float(counts @ means) / count
+        variance = 0.0
+        if count > 1:
+            # Chan et al.: within-bucket deviations plus the buckets' spread
+            m2 = float(rollup.m2[slots].sum() + counts @ (means - mean) ** 2)
+            variance = max(m2, 0.0) / (count - 1)
+        sketch = DDSketch(rollup.relative_accuracy)
+        for slot in slots:
+            sketch.merge(rollup.sketches[slot])
+        result = {
+            "count": count,
+            "min": float(rollup.min[slots].min()),
+            "max": float(rollup.max[slots].max()),
+            "mean": mean,
+            "std_dev": math.sqrt(variance),
+            "resolution_seconds": rollup.resolution,
+        }
+        for q in quantiles:
+            # Bucket midpoints can fall just outside the observed range
+            estimate = sketch.quantile(q)
+            result[_quantile_name(q)] = min(max(estimate, result["min"]), result["max"])
+        return result
+
+
+def _quantile_name(q: float) -> str:
+    if q == 0.5:
+        return "median"
+    return f"percentile_{q * 100:g}".replace(".", "_")
+
+
+class MetricStore:
+    """Series keyed by metric name, created on first write"""
+
+    def __init__(
+        self,
+        raw_capacity: int = DEFAULT_RAW_CAPACITY,
+        rollups: Sequence[Tuple[int, int]] = DEFAULT_ROLLUPS,
+        relative_accuracy: float = 0.01,
+    ):
+        self.raw_capacity = raw_capacity
+        self.rollups = tuple(rollups)
+        self.relative_accuracy = relative_accuracy
+        self.series: Dict[str, MetricSeries] = {}
+
+    def add(self, name: str, timestamp: float, value: float):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = MetricSeries(
+                self.raw_capacity, self.rollups, self.relative_accuracy
+            )
+        series.add(timestamp, value)
+
+    def get(self, name: str) -> Optional[MetricSeries]:
+        return self.series.get(name)
@@ -0,0 +1,229 @@
+"""Online updates, running metrics and drift detection for served classifiers.
+
+Labeled outcomes arrive one at a time. For each served model,
+:class:`OnlineModelState` does three things with them:
+
+- Folds them into running aggregates (:class:`RunningClassificationMetrics`),
+  so metrics are never recomputed from the full history.
+- Watches the loss stream for drift with a Page-Hinkley test, and watches
+  the live accuracy against the model's holdout accuracy.
+- Buffers the scaled feature rows for mini-batch updates.
+
+:func:`online_update` applies one mini-batch to an estimator without
+refitting it. It handles three cases:
+
+- Estimators with ``partial_fit`` (SGD, naive Bayes) get it called.
+- Gradient boosting grows a few more stages with ``warm_start`` on the batch.
+- A ``VotingClassifier`` updates whichever fitted members support either.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.base import is_classifier
+from sklearn.ensemble import (
+    GradientBoostingClassifier,
+    GradientBoostingRegressor,
+    VotingClassifier,
+)
+
+# Clip probabilities before taking logs
+EPSILON = 1e-12
+
+
+@dataclass
+class RunningClassificationMetrics:
+    """Binary classification metrics as running sums"""
+
+    count: int = 0
+    correct: int = 0
+    true_positive: int = 0
+    predicted_positive: int = 0
+    actual_positive: int = 0
+    log_loss_sum: float = 0.0
+    brier_sum: float = 0.0
+
+    def update(self, y_true: Sequence[int], probability: Sequence[float]):
+        y_true = np.asarray(y_true, dtype=int)
+        probability = np.clip(np.asarray(probability, dtype=float), EPSILON, 1 - EPSILON)
+        predicted = probability >= 0.5
+        actual = y_true == 1
+        self.count += len(y_true)
+        self.correct += int(np.sum(predicted == actual))
+        self.true_positive += int(np.sum(predicted & actual))
+        self.predicted_positive += int(np.sum(predicted))
+        self.actual_positive += int(np.sum(actual))
+        self.log_loss_sum += float(
+            -np.sum(actual * np.log(probability) + ~actual * np.log(1 - probability))
+        )
+        self.brier_sum += float(np.sum((probability - actual) ** 2))
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.count if self.count else 0.0
+
+    @property
+    def precision(self) -> float:
+        return self.true_positive / self.predicted_positive if self.predicted_positive else 0.0
+
+    @property
+    def recall(self) -> float:
+        return self.true_positive / self.actual_positive if self.actual_positive else 0.0
+
+    @property
+    def log_loss(self) -> float:
+        return self.log_loss_sum / self.count if self.count else 0.0
+
+    @property
+    def brier_score(self) -> float:
+        return self.brier_sum / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "samples": self.count,
+            "accuracy": self.accuracy,
+            "precision": self.precision,
+            "recall": self.recall,
+            "log_loss": self.log_loss,
+            "brier_score": self.brier_score,
+        }
+
+
+@dataclass
+class PageHinkley:
+    """Page-Hinkley test for a sustained rise in the mean of a stream"""
+
+    delta: float = 0.01  # tolerated rise per sample
+    threshold: float = 25.0  # cumulative rise that counts as drift
+    min_samples: int = 30
+    count: int = 0
+    mean: float = 0.0
+    cumulative: float = 0.0
+    minimum: float = 0.0
+
+    def update(self, value: float) -> bool:
+        """Add one observation; True once the stream has drifted upwards"""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.cumulative += value - self.mean - self.delta
+        self.minimum = min(self.minimum, self.cumulative)
+        return self.drifted
+
+    @property
+    def drifted(self) -> bool:
+        return self.count >= self.min_samples and self.cumulative - self.minimum > self.threshold
+
+    def reset(self):
+        self.count = 0
+        self.mean = self.cumulative = self.minimum = 0.0
+
+
+@dataclass
+class OnlineModelState:
+    """Running metrics, drift detector and update buffer of one served model"""
+
+    accuracy_drop: float = 0.1  # live accuracy this far below holdout is drift
+    min_samples: int = 50  # outcomes before the accuracy check applies
+    smoothing: float = 0.02  # weight of the newest outcome in the live accuracy
+    max_buffered: int = 1024  # oldest rows are dropped beyond this
+    metrics: RunningClassificationMetrics = field(default_factory=RunningClassificationMetrics)
+    detector: PageHinkley = field(default_factory=PageHinkley)
+    recent_accuracy: Optional[float] = None
+    # Incremented by every full retrain; rows scaled for an older generation are stale
+    generation: int = 0
+    _rows: List[np.ndarray] = field(default_factory=list)
+    _labels: List[int] = field(default_factory=list)
+
+    def record(self, row: np.ndarray, label: int, probability: float) -> bool:
+        """Add one labeled outcome; True if the loss stream has drifted"""
+        self.metrics.update([label], [probability])
+        probability = min(max(probability, EPSILON), 1 - EPSILON)
+        loss = -np.log(probability if label == 1 else 1 - probability)
+        hit = float((probability >= 0.5) == (label == 1))
+        self.recent_accuracy = (
+            hit
+            if self.recent_accuracy is None
+            else (1 - self.smoothing) * self.recent_accuracy + self.smoothing * hit
+        )
+        self._rows.append(np.asarray(row, dtype=float))
+        self._labels.append(int(label))
+        if len(self._labels) > self.max_buffered:
+            # No update consumed the buffer (e.g. a retrain is running)
+            del self._rows[0], self._labels[0]
+        return self.detector.update(float(loss))
+
+    def drifted(self, baseline_accuracy: Optional[float] = None) -> bool:
+        """Whether the loss stream drifted or live accuracy fell below the baseline"""
+        if self.detector.drifted:
+            return True
+        return (
+            baseline_accuracy is not None
+            and self.recent_accuracy is not None
+            and self.metrics.count >= self.min_samples
+            and self.recent_accuracy < baseline_accuracy - self.accuracy_drop
+        )
+
+    @property
+    def buffered(self) -> int:
+        return len(self._labels)
+
+    def take_batch(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Remove and return every buffered row with its label"""
+        X, y = np.vstack(self._rows), np.asarray(self._labels)
+        self._rows, self._labels = [], []
+        return X, y
+
+    def reset(self):
+        """Start over after a full retrain: new baseline, stale rows dropped"""
+        self.metrics = RunningClassificationMetrics()
+        self.detector.reset()
+        self.recent_accuracy = None
+        self.generation += 1
+        self._rows, self._labels = [], []
+
+
+def supports_online_update(model: Any) -> bool:
+    """Whether :func:`online_update` can change ``model`` at all"""
+    if isinstance(model, VotingClassifier):
+        return any(supports_online_update(m) for m in getattr(model, "estimators_", []))
+    return hasattr(model, "partial_fit") or isinstance(
+        model, (GradientBoostingClassifier, GradientBoostingRegressor)
+    )
+
+
+def online_update(
+    model: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    classes: Optional[np.ndarray] = None,
+    boosting_stages: int = 10,
+) -> bool:
+    """Update a fitted estimator in place with one mini-batch; False if it could not"""
+    if isinstance(model, VotingClassifier):
+        # Members were fitted on the ensemble's encoded labels
+        encoded = model.le_.transform(y)
+        members = np.arange(len(model.classes_))
+        updated = [
+            online_update(member, X, encoded, members, boosting_stages)
+            for member in model.estimators_
+        ]
+        return any(updated)
+
+    if hasattr(model, "partial_fit"):
+        if is_classifier(model):
+            model.partial_fit(X, y, classes=classes if classes is not None else model.classes_)
+        else:
+            model.partial_fit(X, y)
+        return True
+
+    if isinstance(model, (GradientBoostingClassifier, GradientBoostingRegressor)):
+        # New stages are fitted to the batch residuals of the current ensemble,
+        # which needs every class present in the batch
+        if is_classifier(model) and len(np.unique(y)) < len(model.classes_):
+            return False
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + boosting_stages)
+        model.fit(X, y)
+        return True
+
+    return False
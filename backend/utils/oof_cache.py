@@ -0,0 +1,245 @@
+"""Out-of-fold prediction cache for ensemble weighting and stacking.
+
+Each base model's cross-validated (out-of-fold) predictions are computed
+once per model version and dataset version. They are then kept as one
+float32 column per model. Weight searches, stacking meta-learners and
+multi-objective selection all read an :class:`OOFMatrix` (samples x models)
+built from those columns. None of them refit or re-run a base model to
+score a candidate weighting.
+
+Versions are content hashes:
+
+- A dataset version hashes the feature and target arrays.
+- A model version hashes the estimator's class and hyper-parameters,
+  ignoring thread-count parameters.
+
+Callers with a better notion of version (for example a registry's model
+version) can pass it explicitly. All models share the same unshuffled
+K-fold split, so the columns line up sample for sample, which stacking
+requires.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import KFold, cross_val_predict
+
+# Parameters that change how fast a model trains, not what it predicts
+IGNORED_PARAMS = frozenset({"n_jobs", "thread_count", "nthread", "verbose", "verbosity"})
+
+
+def dataset_version(X: np.ndarray, y: np.ndarray) -> str:
+    """Content hash of a training set"""
+    digest = hashlib.blake2b(digest_size=12)
+    for array in (np.asarray(X), np.asarray(y)):
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def model_version(model: Any) -> str:
+    """Hash of an estimator's class and prediction-relevant parameters"""
+    params = model.get_params(deep=True) if hasattr(model, "get_params") else {}
+    described = sorted(
+        (name, repr(value)) for name, value in params.items() if name not in IGNORED_PARAMS
+    )
+    kind = f"{type(model).__module__}.{type(model).__qualname__}"
+    return hashlib.blake2b(repr((kind, described)).encode(), digest_size=12).hexdigest()
+
+
+def r2_scores(predictions: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """R² of every column of ``predictions`` against ``y``"""
+    y = np.asarray(y, dtype=float)
+    residual = ((predictions - y[:, None]) ** 2).sum(axis=0)
+    total = ((y - y.mean()) ** 2).sum()
+    if total == 0:
+        return np.where(residual == 0, 1.0, 0.0)
+    return 1.0 - residual / total
+
+
+@dataclass
+class OOFMatrix:
+    """Out-of-fold predictions of several models on one dataset"""
+
+    models: List[str]
+    predictions: np.ndarray  # (samples, models), float32
+    y: np.ndarray
+    dataset_version: str
+    # Sufficient statistics for scoring weightings, computed on first use
+    _gram: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _cross: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    def column(self, model: str) -> np.ndarray:
+        return self.predictions[:, self.models.index(model)]
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        return {model: self.predictions[:, i] for i, model in enumerate(self.models)}
+
+    def subset(self, models: Sequence[str]) -> "OOFMatrix":
+        columns = [self.models.index(m) for m in models]
+        subset = OOFMatrix(
+            list(models), self.predictions[:, columns], self.y, self.dataset_version
+        )
+        if self._gram is not None:
+            subset._gram = self._gram[np.ix_(columns, columns)]
+            subset._cross = self._cross[columns]
+        return subset
+
+    def blend(self, weights: np.ndarray) -> np.ndarray:
+        """Ensemble predictions for one ``(models,)`` or many ``(k, models)`` weightings"""
+        weights = np.asarray(weights, dtype=float)
+        weights = weights / weights.sum(axis=-1, keepdims=True)
+        return self.predictions @ weights.T
+
+    def r2(self, weights: np.ndarray) -> np.ndarray:
+        """R² of each weighting in ``weights`` (rows)
+
+        The squared error of a weighting ``w`` is ``w'Gw - 2w'c + y'y``, with
+        ``G = P'P`` and ``c = P'y`` computed once, so scoring costs
+        O(models²) per weighting, whatever the number of samples.
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        weights = weights / weights.sum(axis=1, keepdims=True)
+        y = np.asarray(self.y, dtype=float)
+        if self._gram is None:
+            predictions = self.predictions.astype(float)
+            self._gram = predictions.T @ predictions
+            self._cross = predictions.T @ y
+        residual = (
+            ((weights @ self._gram) * weights).sum(axis=1)
+            - 2.0 * weights @ self._cross
+            + y @ y
+        )
+        total = ((y - y.mean()) ** 2).sum()
+        if total == 0:
+            return np.where(np.isclose(residual, 0.0), 1.0, 0.0)
+        return 1.0 - np.maximum(residual, 0.0) / total
+
+    def error_correlation(self) -> np.ndarray:
+        """Correlation of the models' residuals (1 = they make the same mistakes)"""
+        residuals = self.predictions - self.y[:, None]
+        if len(self.models) < 2:
+            return np.ones((len(self.models), len(self.models)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = np.corrcoef(residuals, rowvar=False)
+        return np.nan_to_num(correlation, nan=0.0)
+
+
+class OOFPredictionCache:
+    """Out-of-fold prediction columns keyed by (dataset, model, version)"""
+
+    def __init__(
+        self,
+        cv: int = 5,
+        max_datasets: int = 4,
+        directory: Optional[str] = None,
+        n_jobs: Optional[int] = None,
+    ):
+        self.cv = cv
+        self.max_datasets = max_datasets
+        self.directory = directory
+        self.n_jobs = n_jobs
+        # dataset version -> (targets, {(model name, model version): column})
+        self._datasets: "OrderedDict[str, Tuple[np.ndarray, Dict[Tuple[str, str], np.ndarray]]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def folds(self) -> KFold:
+        """The split every cached column is computed with"""
+        return KFold(n_splits=self.cv)
+
+    def _dataset(self, dataset: str, y: np.ndarray):
+        entry = self._datasets.get(dataset)
+        if entry is None:
+            entry = self._datasets[dataset] = (np.asarray(y, dtype=float), {})
+            while len(self._datasets) > self.max_datasets:
+                self._datasets.popitem(last=False)
+        self._datasets.move_to_end(dataset)
+        return entry
+
+    def _path(self, dataset: str, name: str, version: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+        return os.path.join(self.directory, f"{dataset}-{safe}-{version}.npy")
+
+    def store(
+        self, name: str, version: str, dataset: str, y: np.ndarray, predictions: np.ndarray
+    ):
+        """Record out-of-fold predictions computed elsewhere with :meth:`folds`"""
+        column = np.asarray(predictions, dtype=np.float32).ravel()
+        self._dataset(dataset, y)[1][(name, version)] = column
+        path = self._path(dataset, name, version)
+        if path:
+            np.save(path, column)
+
+    def get(self, name: str, version: str, dataset: str) -> Optional[np.ndarray]:
+        entry = self._datasets.get(dataset)
+        column = entry[1].get((name, version)) if entry else None
+        if column is None:
+            path = self._path(dataset, name, version)
+            if path and os.path.exists(path) and entry is not None:
+                column = entry[1][(name, version)] = np.load(path)
+        return column
+
+    def predictions(
+        self,
+        name: str,
+        model: Any,
+        X: np.ndarray,
+        y: np.ndarray,
+        dataset: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> np.ndarray:
+        """Out-of-fold predictions of ``model``, computed on the first request only"""
+        dataset = dataset or dataset_version(X, y)
+        version = version or model_version(model)
+        self._dataset(dataset, y)
+        column = self.get(name, version, dataset)
+        if column is not None:
+            self.hits += 1
+            return column
+
+        self.misses += 1
+        predicted = cross_val_predict(clone(model), X, y, cv=self.folds(), n_jobs=self.n_jobs)
+        self.store(name, version, dataset, y, predicted)
+        return self.get(name, version, dataset)
+
+    def matrix(
+        self,
+        models: Mapping[str, Any],
+        X: np.ndarray,
+        y: np.ndarray,
+        versions: Optional[Mapping[str, str]] = None,
+    ) -> OOFMatrix:
+        """Out-of-fold matrix for ``models`` (name -> estimator) on ``(X, y)``"""
+        dataset = dataset_version(X, y)
+        versions = versions or {}
+        columns = [
+            self.predictions(name, model, X, y, dataset, versions.get(name))
+            for name, model in models.items()
+        ]
+        return OOFMatrix(
+            list(models),
+            np.column_stack(columns) if columns else np.empty((len(y), 0), np.float32),
+            self._datasets[dataset][0],
+            dataset,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "datasets": len(self._datasets),
+            "columns": sum(len(columns) for _, columns in self._datasets.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -3,40 +3,164 @@ This module provides enhanced JSON serialization capabilities for complex data t
 used within the A1Betting platform, such as dataclasses, Enums, and datetime objects.
 
 It offers a safer alternative to pickle for inter-process communication and caching.
+
+Each class passed to ``register_serializable`` gets an encoder and decoder compiled
+once at registration time, so the hot path is a single dict lookup per object
+instead of ``dataclasses.asdict`` deep copies and per-call field discovery. An
+optional compact binary format (``safe_dumpb``/``safe_loadb``) uses msgpack when
+it is installed and falls back to UTF-8 JSON otherwise.
 """
 
 import json
+import typing
 from datetime import datetime, timezone
 from enum import Enum
-from dataclasses import is_dataclass, asdict
-from typing import Any, Dict
+from dataclasses import fields, is_dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+try:
+    import msgpack  # type: ignore[import]
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
 
 # A registry to hold all the classes we can serialize/deserialize.
 # This is a security measure to prevent arbitrary class instantiation.
 SERIALIZABLE_CLASSES = {}
 
+# Precompiled codecs, populated by register_serializable.
+# Encoders are keyed by exact class, decoders by the "__type__" tag.
+_ENCODERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+_DECODERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+# Leading byte of safe_dumpb output, identifying the payload format.
+_BINARY_MSGPACK = b"M"
+_BINARY_JSON = b"J"
+
+
 def register_serializable(cls):
     """A class decorator to register a class as serializable."""
     SERIALIZABLE_CLASSES[cls.__name__] = cls
+    _compile_codec(cls)
     return cls
 
+
+def _compile_codec(cls) -> None:
+    """Build and cache the encoder/decoder pair for a registered class."""
+    type_name = cls.__name__
+
+    if isinstance(cls, type) and issubclass(cls, Enum):
+
+        def encode_enum(o: Enum) -> Dict[str, Any]:
+            return {"__type__": "enum", "class": type_name, "member": o.name}
+
+        _ENCODERS[cls] = encode_enum
+        return
+
+    if not is_dataclass(cls):
+        return
+
+    field_names = tuple(f.name for f in fields(cls))
+    init_names = frozenset(f.name for f in fields(cls) if f.init)
+    filter_init = len(init_names) != len(field_names)
+    coercers = _enum_field_coercers(cls)
+
+    def encode_dataclass(o: Any) -> Dict[str, Any]:
+        # Shallow: nested dataclasses/datetimes are handed back to the encoder,
+        # which keeps their own type tags instead of flattening them.
+        d = {name: getattr(o, name) for name in field_names}
+        d["__type__"] = type_name
+        return d
+
+    def decode_dataclass(d: Dict[str, Any]) -> Any:
+        d.pop("__type__", None)
+        for name, enum_cls in coercers:
+            value = d.get(name)
+            # str/int-based enums are written as their plain value
+            if value is not None and not isinstance(value, enum_cls):
+                d[name] = enum_cls(value)
+        if filter_init:
+            d = {k: v for k, v in d.items() if k in init_names}
+        return cls(**d)
+
+    _ENCODERS[cls] = encode_dataclass
+    _DECODERS[type_name] = decode_dataclass
+
+
+def _enum_field_coercers(cls) -> Tuple[Tuple[str, type], ...]:
+    """Resolve fields annotated with a registered Enum (or Optional of one)."""
+    try:
+        hints = typing.get_type_hints(cls)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # Unresolvable forward references; decode values as-is.
+        return ()
+
+    coercers = []
+    for f in fields(cls):
+        hint = hints.get(f.name)
+        if typing.get_origin(hint) is Union:
+            args = [a for a in typing.get_args(hint) if a is not type(None)]
+            hint = args[0] if len(args) == 1 else None
+        if (
+            isinstance(hint, type)
+            and issubclass(hint, Enum)
+            and SERIALIZABLE_CLASSES.get(hint.__name__) is hint
+        ):
+            coercers.append((f.name, hint))
+    return tuple(coercers)
+
+
+def _encode_datetime(o: datetime) -> Dict[str, Any]:
+    # Always convert datetime to UTC and store in ISO format with timezone.
+    return {"__type__": "datetime", "value": o.astimezone(timezone.utc).isoformat()}
+
+
+def _decode_datetime(d: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(d["value"])
+
+
+def _decode_enum(d: Dict[str, Any]) -> Enum:
+    cls = SERIALIZABLE_CLASSES.get(d["class"])
+    if cls and issubclass(cls, Enum):
+        return cls[d["member"]]
+    # If the class isn't registered or isn't an enum, we can't safely proceed.
+    raise TypeError(f"Cannot deserialize unregistered or non-Enum class: {d['class']}")
+
+
+_ENCODERS[datetime] = _encode_datetime
+_DECODERS["datetime"] = _decode_datetime
+_DECODERS["enum"] = _decode_enum
+
+
+def _encode_object(o: Any) -> Any:
+    """Map a non-JSON-native object to its tagged dict representation."""
+    encoder = _ENCODERS.get(type(o))
+    if encoder is not None:
+        return encoder(o)
+    if is_dataclass(o) and not isinstance(o, type):
+        # Unregistered dataclass: encodes, but will decode as a plain dict.
+        return {**asdict(o), "__type__": o.__class__.__name__}
+    if isinstance(o, datetime):
+        return _encode_datetime(o)
+    if isinstance(o, Enum):
+        # Store the enum's class and member name.
+        return {"__type__": "enum", "class": o.__class__.__name__, "member": o.name}
+    raise TypeError(f"Object of type {o.__class__.__name__} is not serializable")
+
+
 class EnhancedJSONEncoder(json.JSONEncoder):
     """
     A custom JSON encoder that handles special types like dataclasses,
     datetime objects, and Enums.
     """
     def default(self, o: Any) -> Any:
-        if is_dataclass(o):
-            # Add a __type__ key to identify the original class for deserialization.
-            return {**asdict(o), "__type__": o.__class__.__name__}
-        if isinstance(o, datetime):
-            # Always convert datetime to UTC and store in ISO format with timezone.
-            return {"__type__": "datetime", "value": o.astimezone(timezone.utc).isoformat()}
-        if isinstance(o, Enum):
-            # Store the enum's class and member name.
-            return {"__type__": "enum", "class": o.__class__.__name__, "member": o.name}
-        
-        return super().default(o)
+        try:
+            return _encode_object(o)
+        except TypeError:
+            return super().default(o)
+
 
 def object_hook(d: Dict[str, Any]) -> Any:
     """
@@ -47,40 +171,66 @@ def object_hook(d: Dict[str, Any]) -> Any:
     if not obj_type:
         return d
 
-    if obj_type == "datetime":
-        return datetime.fromisoformat(d["value"])
-    
-    if obj_type == "enum":
-        cls = SERIALIZABLE_CLASSES.get(d["class"])
-        if cls and issubclass(cls, Enum):
-            return cls[d["member"]]
-        # If the class isn't registered or isn't an enum, we can't safely proceed.
-        raise TypeError(f"Cannot deserialize unregistered or non-Enum class: {d['class']}")
-
-    # Handle registered dataclasses
-    cls = SERIALIZABLE_CLASSES.get(obj_type)
-    if cls and is_dataclass(cls):
-        # Remove our custom type hint before passing to the class constructor.
-        d.pop("__type__")
-        # Recursively deserialize nested objects
-        for key, value in d.items():
-            if isinstance(value, dict):
-                d[key] = object_hook(value)
-        return cls(**d)
+    decoder = _DECODERS.get(obj_type)
+    if decoder is not None:
+        # Nested dicts were already decoded: the hook runs innermost-first.
+        return decoder(d)
 
     # If the type is not recognized, return the dict as is.
     return d
 
+
+# Reused instances avoid constructing an encoder/decoder on every call.
+_JSON_ENCODER = EnhancedJSONEncoder()
+_JSON_DECODER = json.JSONDecoder(object_hook=object_hook)
+
+
 def safe_dumps(data: Any) -> str:
     """
     Serializes data to a JSON string using the enhanced encoder.
     This is the safe alternative to pickle.dumps().
     """
-    return json.dumps(data, cls=EnhancedJSONEncoder)
+    return _JSON_ENCODER.encode(data)
+
 
-def safe_loads(s: str) -> Any:
+def safe_loads(s: Union[str, bytes]) -> Any:
     """
     Deserializes a JSON string into Python objects using the custom object hook.
     This is the safe alternative to pickle.loads().
     """
-    return json.loads(s, object_hook=object_hook) 
\ No newline at end of file
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode("utf-8")
+    return _JSON_DECODER.decode(s)
+
+
+def safe_dumpb(data: Any, use_msgpack: Optional[bool] = None) -> bytes:
+    """
+    Serializes data to compact bytes: msgpack when available, JSON otherwise.
+    The first byte records the format so safe_loadb can read either.
+    """
+    if use_msgpack is None:
+        use_msgpack = MSGPACK_AVAILABLE
+    if use_msgpack:
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed")
+        return _BINARY_MSGPACK + msgpack.packb(
+            data, default=_encode_object, use_bin_type=True
+        )
+    return _BINARY_JSON + safe_dumps(data).encode("utf-8")
+
+
+def safe_loadb(b: bytes) -> Any:
+    """
+    Deserializes bytes produced by safe_dumpb, enforcing the same registered-class
+    rules as safe_loads.
+    """
+    fmt, payload = b[:1], b[1:]
+    if fmt == _BINARY_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.unpackb(
+            payload, object_hook=object_hook, raw=False, strict_map_key=False
+        )
+    if fmt == _BINARY_JSON:
+        return safe_loads(payload)
+    raise ValueError(f"Unknown serialization format marker: {fmt!r}")
@@ -0,0 +1,319 @@
+"""Dependency-driven execution of async prediction stages.
+
+A :class:`StagePipeline` is a DAG of named async stages. Each stage declares the
+inputs or upstream stages it needs; stages whose dependencies are satisfied run
+concurrently. Outputs of cacheable stages are memoised under a fingerprint of
+their inputs, every stage's wall time is recorded, and callers may pass a latency
+budget: optional stages that would not fit in the remaining time are skipped
+and replaced by their fallback value.
+
+Stages marked ``blocking`` do their work without yielding to the event loop, so
+they are run on a worker thread: they overlap other stages and a budget
+timeout returns the fallback without waiting for them (the thread finishes in
+the background and its result is dropped).
+
+Cached outputs are shared between runs, so they are stored as a private copy
+and handed out detached: containers are copied and arrays come back as
+read-only views, so a caller mutating its output cannot corrupt the cache.
+"""
+
+import asyncio
+import copy
+import hashlib
+import logging
+import pickle
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class StagePipelineError(RuntimeError):
+    """Raised for invalid pipeline definitions"""
+
+
+@dataclass
+class Stage:
+    """One step of a pipeline
+
+    ``func`` is awaited with one keyword argument per dependency. ``fallback`` is
+    called with the same keyword arguments to produce the output of a skipped
+    optional stage. A ``blocking`` stage's ``func`` is called on a worker thread
+    instead; if it returns a coroutine, that runs to completion on the thread.
+    """
+
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+    optional: bool = False
+    fallback: Optional[Callable[..., Any]] = None
+    cacheable: bool = False
+    blocking: bool = False
+
+
+@dataclass
+class StageRunReport:
+    """Outputs and timing of one pipeline run"""
+
+    outputs: Dict[str, Any]
+    timings: Dict[str, float] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    cache_hits: List[str] = field(default_factory=list)
+    total_time: float = 0.0
+
+
+SCALARS = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _feed(digest: Any, value: Any) -> bool:
+    """Add ``value`` to ``digest``; False if it has no stable fingerprint
+
+    Plain containers are walked and arrays are hashed from their buffer, so no
+    serialized copy of the inputs is built. Other objects fall back to pickle.
+    """
+    if isinstance(value, SCALARS):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(f"nd:{value.dtype.str}:{value.shape};".encode())
+        digest.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, np.generic):
+        digest.update(f"np:{value.dtype.str}:".encode() + value.tobytes())
+    elif isinstance(value, Enum):
+        digest.update(f"enum:{type(value).__qualname__}.{value.name};".encode())
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)};".encode())
+        for key in sorted(value, key=repr):
+            if not (_feed(digest, key) and _feed(digest, value[key])):
+                return False
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        digest.update(f"{type(value).__name__}:{len(value)};".encode())
+        return all(_feed(digest, item) for item in value)
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:  # pylint: disable=broad-exception-caught
+            return False
+    return True
+
+
+def _call_blocking(func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    """Run a blocking stage on the current (worker) thread"""
+    result = func(**kwargs)
+    if asyncio.iscoroutine(result):
+        return asyncio.run(result)
+    return result
+
+
+def hash_inputs(values: Dict[str, Any]) -> Optional[str]:
+    """Stable digest of a stage's inputs, or None if they cannot be fingerprinted"""
+    digest = hashlib.blake2b(digest_size=16)
+    if not _feed(digest, values):
+        return None
+    return digest.hexdigest()
+
+
+def detached(value: Any, copy_arrays: bool = False) -> Any:
+    """``value`` with fresh containers and read-only arrays
+
+    With ``copy_arrays`` arrays are copied first (for storing a caller's
+    value); otherwise they are returned as read-only views.
+    """
+    if isinstance(value, np.ndarray):
+        view = value.copy() if copy_arrays else value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, SCALARS + (np.generic, Enum)):
+        return value
+    if type(value) is dict:
+        return {k: detached(v, copy_arrays) for k, v in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(detached(v, copy_arrays) for v in value)
+    return copy.deepcopy(value)
+
+
+class StagePipeline:
+    """Runs a DAG of async stages with concurrency, caching and a latency budget"""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        inputs: Tuple[str, ...] = (),
+        cache_size: int = 256,
+        cache_ttl: float = 60.0,
+        history_size: int = 100,
+    ):
+        self.stages: Dict[str, Stage] = {}
+        self.inputs = tuple(inputs)
+        for stage in stages:
+            if stage.name in self.stages or stage.name in self.inputs:
+                raise StagePipelineError(f"Duplicate stage name: {stage.name}")
+            if stage.optional and stage.fallback is None:
+                raise StagePipelineError(f"Optional stage {stage.name} needs a fallback")
+            self.stages[stage.name] = stage
+        self._validate()
+
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self.stage_times: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=history_size)
+        )
+
+    def _validate(self):
+        known = set(self.inputs) | set(self.stages)
+        for stage in self.stages.values():
+            missing = [d for d in stage.deps if d not in known]
+            if missing:
+                raise StagePipelineError(f"Stage {stage.name} depends on unknown {missing}")
+
+        # Kahn's algorithm: every stage must be reachable without a cycle
+        indegree = {
+            name: sum(1 for d in stage.deps if d in self.stages)
+            for name, stage in self.stages.items()
+        }
+        ready = [name for name, n in indegree.items() if n == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for other in self.stages.values():
+                if name in other.deps:
+                    indegree[other.name] -= 1
+                    if indegree[other.name] == 0:
+                        ready.append(other.name)
+        if visited != len(self.stages):
+            raise StagePipelineError("Stage dependencies contain a cycle")
+
+    def expected_time(self, name: str) -> float:
+        """Mean of recent wall times for a stage (0.0 before its first run)"""
+        history = self.stage_times.get(name)
+        return sum(history) / len(history) if history else 0.0
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _cache_get(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        return True, value
+
+    def _cache_set(self, key: Tuple[str, str], value: Any):
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def run(
+        self, inputs: Dict[str, Any], latency_budget: Optional[float] = None
+    ) -> StageRunReport:
+        """Execute every stage, starting each as soon as its dependencies finish"""
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise StagePipelineError(f"Missing pipeline inputs: {missing}")
+
+        start = time.perf_counter()
+        deadline = start + latency_budget if latency_budget is not None else None
+        values: Dict[str, Any] = dict(inputs)
+        report = StageRunReport(outputs={})
+        pending = dict(self.stages)
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while pending or running:
+                for name in [n for n, s in pending.items() if all(d in values for d in s.deps)]:
+                    stage = pending.pop(name)
+                    task = asyncio.create_task(self._run_stage(stage, values, deadline, report))
+                    running[task] = name
+
+                if not running:
+                    raise StagePipelineError(f"Stages can never run: {sorted(pending)}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    values[name] = task.result()
+                    report.outputs[name] = values[name]
+        finally:
+            for task in running:
+                task.cancel()
+
+        report.total_time = time.perf_counter() - start
+        return report
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        values: Dict[str, Any],
+        deadline: Optional[float],
+        report: StageRunReport,
+    ) -> Any:
+        kwargs = {d: values[d] for d in stage.deps}
+
+        cache_key = None
+        if stage.cacheable:
+            digest = hash_inputs(kwargs)
+            if digest is not None:
+                cache_key = (stage.name, digest)
+                hit, cached = self._cache_get(cache_key)
+                if hit:
+                    report.cache_hits.append(stage.name)
+                    report.timings[stage.name] = 0.0
+                    return detached(cached)
+
+        timeout = None
+        if stage.optional and deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or self.expected_time(stage.name) > remaining:
+                report.skipped.append(stage.name)
+                return stage.fallback(**kwargs)
+            timeout = remaining
+
+        if stage.blocking:
+            call = asyncio.to_thread(_call_blocking, stage.func, kwargs)
+        else:
+            call = stage.func(**kwargs)
+
+        stage_start = time.perf_counter()
+        try:
+            if timeout is not None:
+                result = await asyncio.wait_for(call, timeout)
+            else:
+                result = await call
+        except asyncio.TimeoutError:
+            elapsed = time.perf_counter() - stage_start
+            self.stage_times[stage.name].append(elapsed)
+            report.timings[stage.name] = elapsed
+            report.skipped.append(stage.name)
+            logger.info(f"Stage {stage.name} exceeded latency budget after {elapsed:.3f}s")
+            return stage.fallback(**kwargs)
+
+        elapsed = time.perf_counter() - stage_start
+        self.stage_times[stage.name].append(elapsed)
+        report.timings[stage.name] = elapsed
+        if cache_key is not None:
+            self._cache_set(cache_key, detached(result, copy_arrays=True))
+        return result
+
+    def get_stage_stats(self) -> Dict[str, Dict[str, float]]:
+        """Recent wall-time statistics per stage"""
+        stats = {}
+        for name, history in self.stage_times.items():
+            if history:
+                stats[name] = {
+                    "runs": len(history),
+                    "avg": sum(history) / len(history),
+                    "max": max(history),
+                    "last": history[-1],
+                }
+        return stats
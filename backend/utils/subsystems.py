@@ -0,0 +1,249 @@
+"""Lazy subsystem registry and startup-time report.
+
+Heavy engines (model stacks, scientific libraries, data services) are
+registered with a loader instead of being imported when ``main`` is imported.
+A subsystem is loaded the first time it is needed or during the background
+warm-up that runs once the server is already accepting requests. Every load
+records its wall time and how many modules it pulled in, so the startup
+report shows where cold-start time goes.
+
+Routers that live in heavy modules are mounted through :class:`DeferredRouter`:
+a placeholder route that claims the router's URL prefix, loads the module on
+the first matching request (or during warm-up), includes the real router and
+then dispatches the waiting request to it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class Subsystem:
+    """A lazily imported component; ``get`` loads it at most once"""
+
+    def __init__(self, name: str, loader: Callable[[], Any], warm: bool = True):
+        self.name = name
+        self.loader = loader
+        self.warm = warm
+        self.status = "pending"  # pending, loading, ready, failed
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.modules_loaded = 0
+        self.loaded_by: Optional[str] = None
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[Any], None]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self.status in ("ready", "failed")
+
+    def get(self, reason: str = "first_use") -> Any:
+        """Load on first call (blocking) and return the loader's result"""
+        if self.loaded:
+            return self.value
+        with self._lock:
+            if self.loaded:
+                return self.value
+            self.status = "loading"
+            modules_before = len(sys.modules)
+            start = time.perf_counter()
+            try:
+                self.value = self.loader()
+                self.status = "ready"
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.status = "failed"
+                self.error = f"{type(e).__name__}: {e!s}"
+                logger.warning(f"Subsystem {self.name} failed to load: {self.error}")
+            self.load_seconds = time.perf_counter() - start
+            self.modules_loaded = len(sys.modules) - modules_before
+            self.loaded_by = reason
+            if self.status == "ready":
+                logger.info(f"✅ Loaded {self.name} in {self.load_seconds:.3f}s ({reason})")
+        return self.value
+
+    async def aget(self, reason: str = "first_use") -> Any:
+        """Load in a worker thread so the event loop keeps serving requests"""
+        if not self.loaded:
+            await asyncio.to_thread(self.get, reason)
+        # Callbacks touch app state, so they run on the loop, not the worker
+        if self.status == "ready":
+            for callback in self._callbacks:
+                callback(self.value)
+        return self.value
+
+    def on_load(self, callback: Callable[[Any], None]):
+        """Run idempotent ``callback(value)`` on the event loop after loading"""
+        self._callbacks.append(callback)
+
+
+class SubsystemRegistry:
+    """Named lazy subsystems plus timings for the eager startup phases"""
+
+    def __init__(self):
+        self.subsystems: Dict[str, Subsystem] = {}
+        self.phases: List[Tuple[str, float]] = []
+        self.created_at = time.time()
+        self.ready_at: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+
+    def register(
+        self, name: str, loader: Callable[[], Any], warm: bool = True
+    ) -> Subsystem:
+        subsystem = Subsystem(name, loader, warm)
+        self.subsystems[name] = subsystem
+        return subsystem
+
+    def get(self, name: str) -> Any:
+        return self.subsystems[name].get()
+
+    async def aget(self, name: str) -> Any:
+        return await self.subsystems[name].aget()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time an eager block of module-level startup work"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def record_phase(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    def mark_ready(self):
+        """Record the moment the app can serve requests"""
+        if self.ready_at is None:
+            self.ready_at = time.time()
+
+    async def warm_up(self, delay: float = 0.0):
+        """Load every ``warm`` subsystem in the background, one at a time"""
+        if delay:
+            await asyncio.sleep(delay)
+        start = time.perf_counter()
+        for subsystem in list(self.subsystems.values()):
+            if subsystem.warm and not subsystem.loaded:
+                await subsystem.aget("warmup")
+        self.warmup_seconds = time.perf_counter() - start
+
+    def startup_report(self) -> Dict[str, Any]:
+        ready = self.ready_at is not None
+        return {
+            # From interpreter start (when psutil is available) to serving requests
+            "time_to_ready_seconds": (
+                self.ready_at - (_process_start_time() or self.created_at)
+                if ready
+                else None
+            ),
+            "registry_to_ready_seconds": self.ready_at - self.created_at if ready else None,
+            "eager_phases": [
+                {"name": name, "seconds": round(seconds, 4)}
+                for name, seconds in self.phases
+            ],
+            "warmup_seconds": self.warmup_seconds,
+            "subsystems": {
+                name: {
+                    "status": s.status,
+                    "load_seconds": s.load_seconds,
+                    "modules_loaded": s.modules_loaded,
+                    "loaded_by": s.loaded_by,
+                    "error": s.error,
+                }
+                for name, s in sorted(
+                    self.subsystems.items(),
+                    key=lambda item: -(item[1].load_seconds or 0.0),
+                )
+            },
+        }
+
+
+def _process_start_time() -> Optional[float]:
+    try:
+        import psutil
+
+        return psutil.Process().create_time()
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
+
+
+class DeferredRouter(BaseRoute):
+    """Placeholder for a router whose module is loaded lazily
+
+    Claims every path under ``match_prefix`` until the subsystem has loaded.
+    Loading (on first request or warm-up) includes the real router into the
+    app at ``include_prefix`` and removes the placeholder; a request that
+    triggered the load is then dispatched through the app's router.
+    """
+
+    def __init__(
+        self,
+        app,
+        subsystem: Subsystem,
+        match_prefix: str,
+        include_prefix: str = "",
+    ):
+        self.app = app
+        self.subsystem = subsystem
+        self.match_prefix = match_prefix.rstrip("/")
+        self.include_prefix = include_prefix
+        self.included = False
+        subsystem.on_load(self._include)
+
+    @property
+    def path(self) -> str:
+        return f"{self.match_prefix}/{{path:path}}"
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] != "http" or self.included:
+            return Match.NONE, {}
+        path = scope["path"]
+        if path == self.match_prefix or path.startswith(self.match_prefix + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        from starlette.routing import NoMatchFound
+
+        raise NoMatchFound(name, path_params)
+
+    def _include(self, router):
+        if self.included or router is None:
+            return
+        self.app.include_router(router, prefix=self.include_prefix)
+        routes = self.app.router.routes
+        if self in routes:
+            routes.remove(self)
+        self.app.openapi_schema = None
+        self.included = True
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.subsystem.aget("first_request")
+        if not self.included:
+            from starlette.responses import JSONResponse
+
+            response = JSONResponse(
+                {"detail": f"{self.subsystem.name} is unavailable"}, status_code=503
+            )
+            await response(scope, receive, send)
+            return
+        # The placeholder is gone now, so routing finds the real endpoint
+        await self.app.router(scope, receive, send)
+
+
+def mount_deferred_router(
+    app, subsystem: Subsystem, match_prefix: str, include_prefix: str = ""
+) -> DeferredRouter:
+    """Register a placeholder route for ``subsystem``'s router on ``app``"""
+    placeholder = DeferredRouter(app, subsystem, match_prefix, include_prefix)
+    app.router.routes.append(placeholder)
+    return placeholder
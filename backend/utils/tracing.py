@@ -0,0 +1,402 @@
+"""Lightweight per-request span tracing and on-demand sampling profiles.
+
+Request middleware opens a :class:`RequestTrace` in a context variable; code on
+the hot path marks its stages with :func:`span`::
+
+    with span("prediction.feature_engineering"):
+        features = await self._engineer_features(...)
+
+When no trace is active (tracing disabled, background tasks, tests) ``span``
+returns a shared no-op object after a single ``ContextVar.get``, so leaving the
+instrumentation in place costs next to nothing. Finished traces feed per
+endpoint/stage latency histograms exported in Prometheus text format.
+
+A single request can also be profiled by sending the profiling header: a
+background thread samples the event loop thread's stack while the request is
+in flight and the folded stacks are kept for retrieval by profile id. Because
+the loop is shared, samples can include other requests running concurrently.
+"""
+
+import functools
+import inspect
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; chosen to resolve both sub-millisecond cache paths
+# and multi-second model inference
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+PROFILE_HEADER = "X-Profile-Request"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar(
+    "current_trace", default=None
+)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram with Prometheus cumulative semantics"""
+
+    __slots__ = ("buckets", "counts", "count", "total")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running = 0
+        rows = []
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            rows.append((repr(bound), running))
+        rows.append(("+Inf", running + self.counts[-1]))
+        return rows
+
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound containing quantile ``q`` (coarse by design)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            if running >= target:
+                return bound
+        return float("inf")
+
+
+class _Span:
+    """Times one stage and records it on the trace that was active at entry"""
+
+    __slots__ = ("trace", "name", "start", "parent", "token")
+
+    def __init__(self, trace: "RequestTrace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self.token = _current_span.set(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self.token)
+        self.trace.record(self.name, duration, self.parent, error=exc_type is not None)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str):
+    """Context manager timing stage ``name`` within the current request trace"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, name)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of :func:`span` for sync and async callables"""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class RequestTrace:
+    """Stage timings collected for one request"""
+
+    __slots__ = ("endpoint", "spans", "start", "duration")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.spans: List[Dict[str, Any]] = []
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+
+    def record(
+        self, name: str, duration: float, parent: Optional[str] = None, error: bool = False
+    ):
+        self.spans.append(
+            {"name": name, "duration": duration, "parent": parent, "error": error}
+        )
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Total seconds per stage; repeated or concurrent stages are summed"""
+        totals: Dict[str, float] = {}
+        for s in self.spans:
+            totals[s["name"]] = totals.get(s["name"], 0.0) + s["duration"]
+        return totals
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval into folded stacks"""
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()  # pylint: disable=protected-access
+            frame = frames.get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_filename}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._sample, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        return self.report()
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        total = sum(self.samples.values())
+        self_time: Counter = Counter()
+        for stack, n in self.samples.items():
+            self_time[stack.rsplit(";", 1)[-1]] += n
+        return {
+            "interval": self.interval,
+            "duration": self.duration,
+            "total_samples": total,
+            "top_frames": [
+                {"frame": frame, "samples": n, "fraction": n / total}
+                for frame, n in self_time.most_common(top)
+            ],
+            "folded": dict(self.samples),
+        }
+
+
+class TraceRegistry:
+    """Aggregates finished traces into per-endpoint latency and stage histograms"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        profiling_enabled: bool = False,
+        profile_interval: float = 0.001,
+        max_profiles: int = 20,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.enabled = enabled
+        self.profiling_enabled = profiling_enabled
+        self.profile_interval = profile_interval
+        self.max_profiles = max_profiles
+        self.buckets = tuple(buckets)
+        self.endpoint_latency: Dict[str, LatencyHistogram] = {}
+        self.stage_latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.stage_errors: Counter = Counter()
+        self.profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        profiling_enabled: Optional[bool] = None,
+        profile_interval: Optional[float] = None,
+    ):
+        if enabled is not None:
+            self.enabled = enabled
+        if profiling_enabled is not None:
+            self.profiling_enabled = profiling_enabled
+        if profile_interval is not None:
+            self.profile_interval = profile_interval
+
+    def start_trace(self, endpoint: str, force: bool = False):
+        """Open a trace for this context; returns ``(trace, token)`` or ``(None, None)``"""
+        if not (self.enabled or force):
+            return None, None
+        trace = RequestTrace(endpoint)
+        return trace, _current_trace.set(trace)
+
+    def finish_trace(self, trace: RequestTrace, token, endpoint: Optional[str] = None):
+        """Close the trace, attributing it to ``endpoint`` (the matched route)"""
+        _current_trace.reset(token)
+        trace.duration = time.perf_counter() - trace.start
+        if endpoint:
+            trace.endpoint = endpoint
+        with self._lock:
+            self._histogram(self.endpoint_latency, trace.endpoint).observe(trace.duration)
+            for s in trace.spans:
+                key = (trace.endpoint, s["name"])
+                self._histogram(self.stage_latency, key).observe(s["duration"])
+                if s["error"]:
+                    self.stage_errors[key] += 1
+
+    def _histogram(self, table: Dict, key) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = LatencyHistogram(self.buckets)
+        return histogram
+
+    def store_profile(self, profile: Dict[str, Any]) -> str:
+        profile_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self.profiles[profile_id] = profile
+            while len(self.profiles) > self.max_profiles:
+                self.profiles.popitem(last=False)
+        return profile_id
+
+    def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self.profiles.get(profile_id)
+
+    def stage_breakdown(self) -> Dict[str, Dict[str, Any]]:
+        """Per endpoint: request latency plus mean/p95 and share of each stage"""
+        with self._lock:
+            breakdown: Dict[str, Dict[str, Any]] = {}
+            for endpoint, h in self.endpoint_latency.items():
+                breakdown[endpoint] = {
+                    "requests": h.count,
+                    "mean_seconds": h.total / h.count if h.count else 0.0,
+                    "p95_seconds": h.quantile(0.95),
+                    "stages": {},
+                }
+            for (endpoint, stage), h in self.stage_latency.items():
+                entry = breakdown.setdefault(
+                    endpoint,
+                    {"requests": 0, "mean_seconds": 0.0, "p95_seconds": 0.0, "stages": {}},
+                )
+                request_total = self.endpoint_latency.get(endpoint)
+                entry["stages"][stage] = {
+                    "calls": h.count,
+                    "mean_seconds": h.total / h.count if h.count else 0.0,
+                    "p95_seconds": h.quantile(0.95),
+                    "share_of_request": (
+                        h.total / request_total.total
+                        if request_total and request_total.total
+                        else 0.0
+                    ),
+                    "errors": self.stage_errors[(endpoint, stage)],
+                }
+            return breakdown
+
+    def render_prometheus(self) -> str:
+        """Histograms in Prometheus text exposition format"""
+        lines = [
+            "# HELP request_latency_seconds Request latency by endpoint",
+            "# TYPE request_latency_seconds histogram",
+        ]
+        with self._lock:
+            for endpoint, h in sorted(self.endpoint_latency.items()):
+                labels = f'endpoint="{_escape(endpoint)}"'
+                lines.extend(_histogram_lines("request_latency_seconds", labels, h))
+            lines += [
+                "# HELP request_stage_latency_seconds Time spent in each traced stage",
+                "# TYPE request_stage_latency_seconds histogram",
+            ]
+            for (endpoint, stage), h in sorted(self.stage_latency.items()):
+                labels = f'endpoint="{_escape(endpoint)}",stage="{_escape(stage)}"'
+                lines.extend(_histogram_lines("request_stage_latency_seconds", labels, h))
+            lines += [
+                "# HELP request_stage_errors_total Traced stages that raised",
+                "# TYPE request_stage_errors_total counter",
+            ]
+            for (endpoint, stage), n in sorted(self.stage_errors.items()):
+                labels = f'endpoint="{_escape(endpoint)}",stage="{_escape(stage)}"'
+                lines.append(f"request_stage_errors_total{{{labels}}} {n}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.endpoint_latency.clear()
+            self.stage_latency.clear()
+            self.stage_errors.clear()
+            self.profiles.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, h: LatencyHistogram) -> List[str]:
+    lines = [f'{name}_bucket{{{labels},le="{le}"}} {n}' for le, n in h.cumulative()]
+    lines.append(f"{name}_sum{{{labels}}} {h.total}")
+    lines.append(f"{name}_count{{{labels}}} {h.count}")
+    return lines
+
+
+# Global registry used by the request middleware and /metrics/prometheus
+trace_registry = TraceRegistry()